@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+AWS 계정 분석 파이프라인 (Make 방식 부분 재생성)
+데이터 수집 → Markdown 보고서 → HTML 변환 → 압축 단계의 대상 파일별 입력/출력을 선언하고
+마지막 실행 이후 입력 내용이 바뀐 대상만 다시 생성
+
+- 대상(Target)의 입력은 프로젝트 루트 기준 glob 패턴 (예: 05-database-analysis.md ← report/database_*.json)
+- 입력 해시 = 일치한 파일 경로 + 파일 내용 SHA-256 (내용이 같으면 수정 시각만 바뀌어도 재생성하지 않음)
+- 출력이 없거나 입력 해시가 마지막 성공 시점과 다르면 재생성, 성공한 대상만 해시를 기록
+- 파일 해시는 (수정 시각, 크기)가 같으면 상태 파일에 저장된 값을 재사용
+- 상태 파일: report/.pipeline/state.json
+
+사용법:
+    python3 analysis_pipeline.py                          # 바뀐 대상만 재생성
+    python3 analysis_pipeline.py --dry-run                # 재생성할 대상만 출력
+    python3 analysis_pipeline.py 05-database-analysis.html  # 지정 대상과 선행 대상만
+    python3 analysis_pipeline.py --collect                # 데이터 수집(증분)부터 실행
+    python3 analysis_pipeline.py --force                  # 모든 대상 재생성
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set
+
+sys.path.append(str(Path(__file__).parent))
+from generate_all_reports import REPORT_TASKS
+from report_orchestrator import ReportOrchestrator
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+REPORT_PATH = "aws-arch-analysis/report"
+SCRIPT_PATH = "aws-arch-analysis/script"
+HTML_PATH = "html-report"
+STATE_FILE = f"{REPORT_PATH}/.pipeline/state.json"
+
+# 단계 실행 순서
+STAGES = ("collect", "report", "html-assets", "html", "compress")
+
+# 모든 보고서 생성기가 공유하는 모듈 (바뀌면 모든 보고서 재생성)
+REPORT_COMMON_MODULES = ("report_data_loader.py", "recommendation_base.py", "enhanced_recommendations.py",
+                         "cost_history_store.py", "cost_timeseries_store.py", "cost_analytics.py")
+
+# HTML 공통 파일 (generate-html-reports.sh --assets-only 가 생성)
+HTML_ASSET_FILES = (
+    "assets/css/style.css", "assets/css/responsive.css", "assets/css/print.css",
+    "assets/js/main.js", "assets/js/navigation.js", "assets/js/charts.js", "assets/js/search.js",
+    "data/resource-counts.json", "data/cost-data.json", "data/security-metrics.json",
+    "index.html",
+)
+# HTML 공통 파일과 index.html이 읽는 수집 데이터
+HTML_ASSET_DATA_FILES = (
+    "compute_ec2_instances.json", "networking_vpc.json", "database_rds_instances.json",
+    "storage_ebs_volumes.json", "security_groups.json", "security_iam_roles.json",
+    "cost_by_service_monthly.json",
+)
+
+
+class Target(NamedTuple):
+    """파이프라인 대상
+
+    inputs/outputs: 프로젝트 루트 기준 경로 또는 glob 패턴
+    입력이 없는 대상(데이터 수집)은 출력이 없거나 --collect/--force 일 때만 실행
+    """
+    name: str
+    stage: str
+    inputs: Sequence[str]
+    outputs: Sequence[str]
+
+
+def build_targets() -> List[Target]:
+    """단계별 대상 목록 구성"""
+    targets = [
+        Target("collect", "collect", (), (f"{REPORT_PATH}/compute_ec2_instances.json",)),
+    ]
+
+    for task in REPORT_TASKS:
+        inputs = [f"{REPORT_PATH}/{pattern}" for pattern in task.inputs]
+        inputs += [f"{SCRIPT_PATH}/{task.script_name}"]
+        inputs += [f"{SCRIPT_PATH}/{module}" for module in REPORT_COMMON_MODULES]
+        targets.append(Target(task.report_file, "report", tuple(inputs), (f"{REPORT_PATH}/{task.report_file}",)))
+
+    targets.append(Target(
+        "html-assets", "html-assets",
+        tuple([f"{SCRIPT_PATH}/generate-html-reports.sh", f"{SCRIPT_PATH}/generate-dynamic-index.sh"]
+              + [f"{REPORT_PATH}/{filename}" for filename in HTML_ASSET_DATA_FILES]),
+        tuple(f"{HTML_PATH}/{filename}" for filename in HTML_ASSET_FILES),
+    ))
+
+    for task in REPORT_TASKS:
+        html_file = Path(task.report_file).with_suffix(".html").name
+        targets.append(Target(
+            html_file, "html",
+            (f"{REPORT_PATH}/{task.report_file}", f"{HTML_PATH}/assets/css/*.css",
+             f"{SCRIPT_PATH}/convert-md-to-html-simple.sh", f"{SCRIPT_PATH}/simple-md-to-html.py"),
+            (f"{HTML_PATH}/{html_file}",),
+        ))
+
+    # 압축 파일 이름에는 실행 시각이 들어가므로 출력 없이 입력 해시로만 판단
+    targets.append(Target(
+        "compress", "compress",
+        (f"{HTML_PATH}/*.html", f"{HTML_PATH}/assets/**/*", f"{HTML_PATH}/data/*.json",
+         f"{SCRIPT_PATH}/compress-html-reports.sh"),
+        (),
+    ))
+    return targets
+
+
+def expand_pattern(pattern: str) -> List[Path]:
+    """glob 패턴과 일치하는 파일 목록 (경로 순 정렬)"""
+    if not any(char in pattern for char in "*?["):
+        path = PROJECT_ROOT / pattern
+        return [path] if path.is_file() else []
+    return sorted(path for path in PROJECT_ROOT.glob(pattern) if path.is_file())
+
+
+def matches(pattern: str, path: str) -> bool:
+    """프로젝트 루트 기준 경로가 패턴과 일치하는지 확인 (선행 대상 탐색용)"""
+    return fnmatch.fnmatchcase(path, pattern.replace("**/", "*"))
+
+
+class PipelineState:
+    """대상별 마지막 성공 입력 해시와 파일 해시 캐시"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        data = self.load()
+        self.targets: Dict[str, Dict[str, str]] = data.get("targets", {})
+        self.file_hashes: Dict[str, List] = data.get("file_hashes", {})
+
+    def load(self) -> Dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": 1, "targets": self.targets, "file_hashes": self.file_hashes},
+                      f, indent=1, ensure_ascii=False, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def hash_file(self, path: Path) -> str:
+        """파일 내용 SHA-256 (수정 시각과 크기가 같으면 캐시 사용)"""
+        key = str(path.relative_to(PROJECT_ROOT))
+        stat = path.stat()
+        cached = self.file_hashes.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        self.file_hashes[key] = [stat.st_mtime_ns, stat.st_size, digest.hexdigest()]
+        return digest.hexdigest()
+
+    def input_hash(self, target: Target) -> str:
+        """대상의 입력 해시 (패턴별 일치 파일 경로와 내용 해시)"""
+        digest = hashlib.sha256()
+        for pattern in target.inputs:
+            digest.update(f"pattern:{pattern}\n".encode("utf-8"))
+            for path in expand_pattern(pattern):
+                relative = str(path.relative_to(PROJECT_ROOT))
+                digest.update(f"{relative}:{self.hash_file(path)}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+
+class AnalysisPipeline:
+    """Make 방식 분석 파이프라인 실행기"""
+
+    def __init__(self, force: bool = False, collect: bool = False, dry_run: bool = False, workers: int = 4):
+        self.targets = build_targets()
+        self.state = PipelineState(PROJECT_ROOT / STATE_FILE)
+        self.force = force
+        self.collect = collect
+        self.dry_run = dry_run
+        self.workers = workers
+        self.results: List[Dict] = []
+
+    def log_info(self, message: str):
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        print(f"\033[0;34m[{timestamp}]\033[0m {message}")
+
+    def log_success(self, message: str):
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        print(f"\033[0;32m[{timestamp}]\033[0m ✅ {message}")
+
+    def log_error(self, message: str):
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        print(f"\033[0;31m[{timestamp}]\033[0m ❌ {message}")
+
+    def select_targets(self, names: Sequence[str]) -> List[Target]:
+        """지정한 대상과 그 입력을 만드는 선행 대상 (이름을 지정하지 않으면 전체)"""
+        if not names:
+            return list(self.targets)
+
+        by_name = {target.name: target for target in self.targets}
+        unknown = [name for name in names if name not in by_name]
+        if unknown:
+            raise ValueError(f"알 수 없는 대상: {', '.join(unknown)} (--list 로 대상 목록 확인)")
+
+        selected: Set[str] = set()
+        queue = list(names)
+        while queue:
+            target = by_name[queue.pop()]
+            if target.name in selected:
+                continue
+            selected.add(target.name)
+            for other in self.targets:
+                if other.name not in selected and any(matches(pattern, output)
+                                                      for pattern in target.inputs for output in other.outputs):
+                    queue.append(other.name)
+        return [target for target in self.targets if target.name in selected]
+
+    def get_stale_reason(self, target: Target, input_hash: str, rebuilt_outputs: Set[str]) -> Optional[str]:
+        """재생성이 필요한 이유 (최신 상태면 None)"""
+        if self.force:
+            return "--force"
+        missing = [output for output in target.outputs if not (PROJECT_ROOT / output).exists()]
+        if missing:
+            return f"출력 없음 ({Path(missing[0]).name})"
+        if not target.inputs:
+            return "--collect" if self.collect else None
+        entry = self.state.targets.get(target.name)
+        if not entry:
+            return "이전 실행 기록 없음"
+        if entry.get("input_hash") != input_hash:
+            return "입력 변경"
+        # --dry-run 에서는 선행 대상을 실제로 실행하지 않으므로 출력 경로로 영향 추정
+        if any(any(matches(pattern, output) for output in rebuilt_outputs) for pattern in target.inputs):
+            return "선행 대상 재생성 예정"
+        return None
+
+    def run_stage(self, stage: str, targets: List[Target]) -> Dict[str, bool]:
+        """단계의 재생성 대상을 한 번에 실행하고 대상별 성공 여부 반환"""
+        start_time = time.time()
+        if stage == "collect":
+            result = subprocess.run([sys.executable, str(SCRIPT_DIR / "collect_all_data.py"), "--incremental"],
+                                    cwd=str(SCRIPT_DIR))
+            return {target.name: result.returncode == 0 for target in targets}
+
+        if stage == "report":
+            names = {target.name for target in targets}
+            tasks = [task._replace(depends_on=[dependency for dependency in task.depends_on if dependency in names])
+                     for task in REPORT_TASKS if task.report_file in names]
+            orchestrator = ReportOrchestrator(PROJECT_ROOT / REPORT_PATH, max_workers=self.workers)
+            results = orchestrator.run(tasks)
+            for result in results:
+                if not result.success:
+                    self.log_error(f"{result.task.description} 보고서 생성 실패: {result.error}")
+            return {result.task.report_file: result.success for result in results}
+
+        if stage == "html-assets":
+            command = ["bash", str(SCRIPT_DIR / "generate-html-reports.sh"), "--assets-only"]
+        elif stage == "html":
+            command = ["bash", str(SCRIPT_DIR / "convert-md-to-html-simple.sh")]
+            command += [Path(target.name).with_suffix(".md").name for target in targets]
+        else:
+            command = ["bash", str(SCRIPT_DIR / "compress-html-reports.sh")]
+        result = subprocess.run(command, cwd=str(SCRIPT_DIR), stdout=subprocess.DEVNULL)
+
+        # 이번 실행에서 모든 출력이 기록된 대상만 성공으로 판단
+        return {
+            target.name: result.returncode == 0 and all(
+                (PROJECT_ROOT / output).exists() and (PROJECT_ROOT / output).stat().st_mtime >= start_time - 1
+                for output in target.outputs)
+            for target in targets
+        }
+
+    def run(self, names: Sequence[str] = ()) -> bool:
+        """선택한 대상을 단계 순서대로 확인하고 입력이 바뀐 대상만 재생성"""
+        selected = self.select_targets(names)
+        rebuilt_outputs: Set[str] = set()
+        all_success = True
+
+        for stage in STAGES:
+            stale = []
+            for target in (target for target in selected if target.stage == stage):
+                input_hash = self.state.input_hash(target)
+                reason = self.get_stale_reason(target, input_hash, rebuilt_outputs if self.dry_run else set())
+                if reason:
+                    stale.append(target)
+                    self.log_info(f"🔄 [{stage}] {target.name}: {reason}")
+                else:
+                    self.results.append({"name": target.name, "stage": stage, "status": "up-to-date"})
+            if not stale:
+                continue
+            if self.dry_run:
+                rebuilt_outputs.update(output for target in stale for output in target.outputs)
+                self.results.extend({"name": target.name, "stage": stage, "status": "stale"} for target in stale)
+                continue
+
+            start_time = time.time()
+            outcomes = self.run_stage(stage, stale)
+            duration = time.time() - start_time
+            for target in stale:
+                success = outcomes.get(target.name, False)
+                if success:
+                    # 실행 후 입력 해시로 기록 (수집/공통 파일처럼 실행 중 입력이 바뀌는 경우 반영)
+                    self.state.targets[target.name] = {
+                        "input_hash": self.state.input_hash(target),
+                        "completed_at": datetime.now().isoformat(timespec="seconds"),
+                    }
+                all_success &= success
+                self.results.append({"name": target.name, "stage": stage,
+                                     "status": "rebuilt" if success else "failed"})
+            self.log_success(f"[{stage}] {len(stale)}개 대상 처리 ({duration:.1f}초)")
+            self.state.save()
+
+        if not self.dry_run:
+            self.state.save()
+        return all_success
+
+    def print_summary(self):
+        """대상별 처리 결과 요약"""
+        icons = {"up-to-date": "⏭️ ", "stale": "🔄", "rebuilt": "✅", "failed": "❌"}
+        counts: Dict[str, int] = {}
+        print()
+        for result in self.results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+            print(f"{icons[result['status']]} {result['stage']:<12} {result['name']:<36} {result['status']}")
+        print()
+        self.log_info("📊 " + ", ".join(f"{status}: {count}개" for status, count in counts.items()))
+
+
+def list_targets(targets: Iterable[Target]):
+    """대상 목록과 입력/출력 패턴 출력"""
+    for target in targets:
+        print(f"[{target.stage}] {target.name}")
+        for pattern in target.inputs:
+            print(f"    ← {pattern}")
+        for output in target.outputs:
+            print(f"    → {output}")
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AWS 계정 분석 파이프라인 (입력이 바뀐 대상만 재생성)")
+    parser.add_argument("targets", nargs="*", help="생성할 대상 (기본값: 전체, 선행 대상 포함)")
+    parser.add_argument("--collect", action="store_true", help="데이터 수집(증분) 단계 실행")
+    parser.add_argument("--force", action="store_true", help="입력 변경 여부와 관계없이 모든 대상 재생성")
+    parser.add_argument("--dry-run", action="store_true", help="재생성할 대상만 출력")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 생성할 보고서 수 (기본값: 4)")
+    parser.add_argument("--list", action="store_true", help="대상 목록 출력")
+    args = parser.parse_args()
+
+    pipeline = AnalysisPipeline(force=args.force, collect=args.collect, dry_run=args.dry_run, workers=args.workers)
+    if args.list:
+        list_targets(pipeline.targets)
+        return
+
+    try:
+        start_time = time.time()
+        success = pipeline.run(args.targets)
+        pipeline.print_summary()
+        pipeline.log_info(f"🕐 총 소요 시간: {time.time() - start_time:.1f}초")
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    except KeyboardInterrupt:
+        print("\n\n⚠️ 사용자에 의해 중단되었습니다.")
+        sys.exit(1)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,34 @@
 #!/usr/bin/env python3
 """
 AWS CLI 기반 애플리케이션 서비스 리소스 데이터 수집 스크립트
+
+- boto3가 설치되어 있으면 aws CLI 프로세스 대신 프로세스 내 SDK 클라이언트 풀(aws_sdk_client_pool.py)로 호출
+  (--backend cli 또는 AWS_COLLECTION_BACKEND=cli 로 aws CLI 강제)
+- 서비스별 수집은 스레드 풀에서 병렬 실행 (--workers, 기본값: 6)
+- AWS 호출은 다른 수집기 프로세스와 공유하는 서비스/리전별 호출 예산(aws_rate_limiter.py) 안에서 실행
+- 명령마다 소요 시간, 바이트, 항목 수, 재시도, 종료 상태를 collection_telemetry 기록 파일에 남김
+- --endpoint-url 로 로컬 AWS API 스텁(예: moto_server)에 연결해 테스트 가능
 """
 
 import json
 import os
 import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import logging
 
+sys.path.append(str(Path(__file__).parent))
+from aws_sdk_client_pool import SDK_ERRORS, AWSClientPool, get_cli_option, json_default, resolve_backend
+from aws_rate_limiter import call_with_retry
+from collection_telemetry import count_response_items, measure_query, query_context
+from json_filter import JSONFilterError, compile_filter
+
 class AWSApplicationCollector:
-    def __init__(self, region: str = "ap-northeast-2", report_dir: str = None):
+    def __init__(self, region: str = "ap-northeast-2", report_dir: str = None, backend: str = None,
+                 endpoint_url: str = None, max_workers: int = 6):
         # 스크립트의 실제 위치를 기준으로 경로 설정
         if report_dir is None:
             script_dir = Path(__file__).parent
@@ -28,6 +44,13 @@ class AWSApplicationCollector:
         # 성공/실패 카운터
         self.success_count = 0
         self.total_count = 0
+        self.count_lock = threading.Lock()
+        self.max_workers = max_workers
+        
+        # 호출 방식: sdk (프로세스 내 클라이언트 풀) 또는 cli (aws CLI 프로세스)
+        self.backend = resolve_backend(backend)
+        self.endpoint_url = endpoint_url or os.environ.get("AWS_ENDPOINT_URL")
+        self.client_pool = AWSClientPool(region, self.endpoint_url) if self.backend == "sdk" else None
 
     def setup_logging(self):
         """로깅 설정"""
@@ -77,38 +100,63 @@ class AWSApplicationCollector:
         self.logger.error(message)
         self.error_logger.error(message)
 
+    def run_aws_command(self, command: List[str]) -> Dict[str, Any]:
+        """AWS 명령 실행 결과 (SDK 클라이언트 풀 또는 aws CLI)"""
+        if self.client_pool is not None:
+            return self.client_pool.call_cli_command(command)
+        
+        if self.endpoint_url:
+            command = command + ["--endpoint-url", self.endpoint_url]
+        # 다른 수집기와 공유하는 호출 예산 안에서 실행하고 스로틀링/일시적 오류는 백오프 후 재시도
+        result = call_with_retry(command[1], get_cli_option(command, "--region") or self.region,
+                                 lambda: subprocess.run(command, capture_output=True, text=True, check=True))
+        return json.loads(result.stdout)
+
+    def apply_jq_filter(self, data: Any, jq_filter: str) -> Any:
+        """jq 필터 적용 (내장 필터 엔진으로 파싱된 결과에 직접 적용, 지원하지 않는 문법만 jq 프로세스로 처리)"""
+        try:
+            json_filter = compile_filter(jq_filter)
+        except JSONFilterError:
+            jq_result = subprocess.run(['jq', jq_filter], input=json.dumps(data, default=json_default),
+                                       capture_output=True, text=True)
+            if jq_result.returncode == 0:
+                return json.loads(jq_result.stdout)
+            self.log_warning(f"jq 필터 적용 실패: {jq_result.stderr}")
+            return data
+        
+        try:
+            return json_filter.apply(data)
+        except JSONFilterError as e:
+            self.log_warning(f"jq 필터 적용 실패: {e}")
+            return data
+
     def execute_aws_command(self, description: str, command: List[str], output_file: str, jq_filter: Optional[str] = None) -> bool:
-        """AWS CLI 명령 실행"""
+        """AWS 명령 실행 (SDK 클라이언트 풀이 있으면 프로세스 내 호출, 없으면 aws CLI)"""
         self.log_info(f"수집 중: {description}")
-        self.total_count += 1
+        with self.count_lock:
+            self.total_count += 1
         
         try:
-            # AWS CLI 명령 실행
-            result = subprocess.run(command, capture_output=True, text=True, check=True)
-            
-            # JSON 파싱 및 필터링
-            data = json.loads(result.stdout)
-            
-            if jq_filter:
-                # jq 필터 적용 (간단한 경우만 처리)
-                if jq_filter.startswith('.') and ' | map(' in jq_filter:
-                    # 복잡한 jq 필터는 subprocess로 처리
-                    jq_cmd = ['jq', jq_filter]
-                    jq_result = subprocess.run(jq_cmd, input=result.stdout, capture_output=True, text=True)
-                    if jq_result.returncode == 0:
-                        data = json.loads(jq_result.stdout)
-                    else:
-                        self.log_warning(f"jq 필터 적용 실패: {jq_result.stderr}")
-            
-            # 파일에 저장
-            output_path = self.report_dir / output_file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            plugin = "aws-sdk" if self.client_pool is not None else "aws-cli"
+            with query_context(description=description, output=output_file), \
+                    measure_query(" ".join(command), plugin) as record:
+                # AWS 명령 실행 (페이지네이션 포함)
+                data = self.run_aws_command(command)
+                
+                if jq_filter:
+                    data = self.apply_jq_filter(data, jq_filter)
+                
+                # 파일에 저장
+                output_path = self.report_dir / output_file
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False, default=json_default)
+                record.update(bytes=output_path.stat().st_size, rows=count_response_items(data))
             
             file_size = output_path.stat().st_size
             if file_size > 50:
                 self.log_success(f"{description} 완료 ({output_file}, {file_size} bytes)")
-                self.success_count += 1
+                with self.count_lock:
+                    self.success_count += 1
                 return True
             else:
                 self.log_warning(f"{description} - 데이터 없음 ({output_file}, {file_size} bytes)")
@@ -120,6 +168,11 @@ class AWSApplicationCollector:
             with open(self.report_dir / output_file, 'w') as f:
                 json.dump([], f)
             return False
+        except SDK_ERRORS as e:
+            self.log_error(f"{description} 실패: {e}")
+            with open(self.report_dir / output_file, 'w') as f:
+                json.dump([], f)
+            return False
         except json.JSONDecodeError as e:
             self.log_error(f"{description} JSON 파싱 실패: {e}")
             with open(self.report_dir / output_file, 'w') as f:
@@ -261,12 +314,9 @@ class AWSApplicationCollector:
     def check_aws_credentials(self) -> bool:
         """AWS 자격 증명 확인"""
         try:
-            result = subprocess.run(
-                ["aws", "sts", "get-caller-identity"],
-                capture_output=True, text=True, check=True
-            )
+            self.run_aws_command(["aws", "sts", "get-caller-identity", "--region", self.region])
             return True
-        except subprocess.CalledProcessError:
+        except (subprocess.CalledProcessError, json.JSONDecodeError, OSError, *SDK_ERRORS):
             return False
 
     def run_collection(self):
@@ -274,6 +324,8 @@ class AWSApplicationCollector:
         self.log_info("🚀 AWS CLI 기반 애플리케이션 서비스 데이터 수집 시작")
         self.log_info(f"Region: {self.region}")
         self.log_info(f"Report Directory: {self.report_dir}")
+        self.log_info(f"Backend: {'AWS SDK (boto3 클라이언트 풀)' if self.client_pool else 'AWS CLI'}"
+                      f"{f' - {self.endpoint_url}' if self.endpoint_url else ''}")
         
         # AWS 자격 증명 확인
         self.log_info("AWS CLI 연결 확인 중...")
@@ -283,17 +335,22 @@ class AWSApplicationCollector:
         
         self.log_info("📱 애플리케이션 서비스 리소스 수집 시작...")
         
-        # 각 서비스별 데이터 수집
-        self.collect_api_gateway_data()
-        self.collect_lambda_data()
-        self.collect_sns_data()
-        self.collect_sqs_data()
-        self.collect_eventbridge_data()
-        self.collect_step_functions_data()
-        self.collect_kinesis_data()
-        self.collect_cognito_data()
-        self.collect_app_sync_data()
-        self.collect_ses_data()
+        # 각 서비스별 데이터 수집 (서비스 단위 병렬 실행)
+        collectors = [
+            self.collect_api_gateway_data,
+            self.collect_lambda_data,
+            self.collect_sns_data,
+            self.collect_sqs_data,
+            self.collect_eventbridge_data,
+            self.collect_step_functions_data,
+            self.collect_kinesis_data,
+            self.collect_cognito_data,
+            self.collect_app_sync_data,
+            self.collect_ses_data,
+        ]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for future in [executor.submit(collector) for collector in collectors]:
+                future.result()
         
         # 결과 요약
         self.log_success("애플리케이션 서비스 데이터 수집 완료!")
@@ -314,10 +371,14 @@ def main():
     default_report_dir = str(project_root / "aws-arch-analysis" / "report")
     
     parser.add_argument("--report-dir", default=default_report_dir, help="보고서 디렉토리")
+    parser.add_argument("--backend", choices=["auto", "sdk", "cli"], default=None,
+                        help="호출 방식 (기본값: boto3가 있으면 sdk, 없으면 cli)")
+    parser.add_argument("--endpoint-url", default=None, help="AWS API 엔드포인트 (로컬 스텁 테스트용)")
+    parser.add_argument("--workers", type=int, default=6, help="동시에 수집할 서비스 수 (기본값: 6)")
     
     args = parser.parse_args()
     
-    collector = AWSApplicationCollector(args.region, args.report_dir)
+    collector = AWSApplicationCollector(args.region, args.report_dir, args.backend, args.endpoint_url, args.workers)
     collector.run_collection()
 
 if __name__ == "__main__":
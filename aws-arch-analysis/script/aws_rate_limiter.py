@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+AWS API 호출 속도 제한 및 재시도 계층
+병렬로 실행되는 여러 수집기 프로세스가 같은 AWS 서비스/리전 API 호출 예산을 공유
+
+- 서비스/리전별 토큰 버킷 상태를 잠금 파일(fcntl)로 보호되는 작은 파일에 저장해 프로세스 간 공유
+- 호출마다 토큰 하나를 예약하고 부족하면 채워질 때까지 대기 (먼저 예약한 호출이 먼저 실행)
+- 오류를 스로틀링/일시적 오류/그 외로 분류해 스로틀링과 일시적 오류만 지터가 있는 지수 백오프로 재시도
+- 스로틀링이 발생하면 공유 버킷을 비워 다른 프로세스도 백오프 시간 동안 호출을 멈춤
+- 초당 호출 수: AWS_RATE_LIMITS 환경 변수 (예: "default=10,ec2=20,ce=2", 0이면 제한 없음)
+- 상태 디렉토리: AWS_RATE_LIMIT_DIR 환경 변수 (기본값: aws-arch-analysis/report/.ratelimit)
+"""
+
+import fcntl
+import json
+import os
+import random
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from collection_telemetry import note_retry
+
+RATE_LIMITS_ENV = "AWS_RATE_LIMITS"
+RATE_LIMIT_DIR_ENV = "AWS_RATE_LIMIT_DIR"
+DEFAULT_RATE_LIMIT_DIR = Path(__file__).parent.parent / "report" / ".ratelimit"
+
+# 서비스별 초당 호출 수 (API 기본 한도가 낮은 서비스는 더 낮게 설정)
+DEFAULT_RATE_LIMITS = {
+    "default": 10.0,
+    "ce": 2.0,
+    "organizations": 2.0,
+    "cloudformation": 5.0,
+    "ssm": 5.0,
+}
+
+THROTTLING = "throttling"
+TRANSIENT = "transient"
+FATAL = "fatal"
+
+THROTTLING_PATTERNS = (
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequests",
+    "RequestLimitExceeded",
+    "Rate exceeded",
+    "Too Many Requests",
+    "SlowDown",
+    "ProvisionedThroughputExceeded",
+    "RequestThrottled",
+    "BandwidthLimitExceeded",
+)
+
+TRANSIENT_PATTERNS = (
+    "RequestTimeout",
+    "ServiceUnavailable",
+    "InternalError",
+    "InternalFailure",
+    "InternalServerError",
+    "Service Unavailable",
+    "Could not connect to the endpoint URL",
+    "Connection was closed",
+    "Connection reset",
+    "Read timeout on endpoint URL",
+    "EndpointConnectionError",
+)
+
+# 같은 API 서비스를 가리키는 Steampipe 테이블 접두사/aws CLI 서비스 이름
+SERVICE_ALIASES = {
+    "vpc": "ec2",
+    "ebs": "ec2",
+    "configservice": "config",
+}
+
+TABLE_PATTERN = re.compile(r"\b(?:from|join)\s+aws_([a-z0-9]+)_\w+", re.IGNORECASE)
+
+
+def classify_error(message: str) -> str:
+    """오류 메시지 분류 (throttling, transient, fatal)"""
+    if not message:
+        return FATAL
+    if any(pattern in message for pattern in THROTTLING_PATTERNS):
+        return THROTTLING
+    if any(pattern in message for pattern in TRANSIENT_PATTERNS):
+        return TRANSIENT
+    return FATAL
+
+
+def error_message(error: Exception) -> str:
+    """예외의 오류 메시지 (aws CLI 실패는 stderr)"""
+    if isinstance(error, subprocess.CalledProcessError) and error.stderr:
+        return error.stderr if isinstance(error.stderr, str) else error.stderr.decode("utf-8", errors="replace")
+    return str(error)
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """지터가 있는 지수 백오프 대기 시간 (절반은 고정, 절반은 무작위)"""
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def parse_rate_limits(value: str) -> Dict[str, float]:
+    """"default=10,ec2=20" 형식의 초당 호출 수 설정 파싱"""
+    limits = {}
+    for item in (value or "").split(","):
+        if "=" not in item:
+            continue
+        service, rate = item.split("=", 1)
+        try:
+            limits[service.strip().lower()] = max(0.0, float(rate))
+        except ValueError:
+            continue
+    return limits
+
+
+def get_rate_limit(service: str) -> float:
+    """서비스의 초당 호출 수 (0이면 제한 없음)"""
+    limits = dict(DEFAULT_RATE_LIMITS)
+    limits.update(parse_rate_limits(os.environ.get(RATE_LIMITS_ENV, "")))
+    return limits.get(service, limits["default"])
+
+
+def detect_query_services(query: str) -> Tuple[str, ...]:
+    """Steampipe 쿼리가 조회하는 aws 테이블의 API 서비스 목록"""
+    return tuple(sorted({match.lower() for match in TABLE_PATTERN.findall(query)}))
+
+
+class SharedTokenBucket:
+    """프로세스 간 공유되는 서비스/리전별 토큰 버킷 (상태 파일 + fcntl 잠금)"""
+
+    def __init__(self, service: str, region: str, rate: float, burst: float = None, state_dir=None):
+        self.service = service
+        self.region = region
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        state_dir = Path(state_dir or os.environ.get(RATE_LIMIT_DIR_ENV) or DEFAULT_RATE_LIMIT_DIR)
+        state_dir.mkdir(parents=True, exist_ok=True)
+        # 리전 자리에 kube 컨텍스트 이름(EKS ARN 등)도 오므로 파일 이름에 쓸 수 없는 문자는 대체
+        self.state_path = state_dir / re.sub(r"[^A-Za-z0-9._-]", "_", f"{service}.{region}.bucket")
+
+    def _update(self, update: Callable[[float], float]) -> float:
+        """잠금 안에서 현재 토큰 수를 채운 뒤 update(토큰 수)의 결과를 저장하고 반환"""
+        with open(self.state_path, "a+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                now = time.time()
+                tokens = state.get("tokens", self.burst)
+                elapsed = max(0.0, now - state.get("updated", now))
+                tokens = update(min(self.burst, tokens + elapsed * self.rate))
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps({"tokens": tokens, "updated": now}))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return tokens
+
+    def acquire(self):
+        """토큰 하나를 예약하고 예약한 토큰이 채워질 때까지 대기"""
+        if self.rate <= 0:
+            return
+        tokens = self._update(lambda tokens: tokens - 1)
+        if tokens < 0:
+            time.sleep(-tokens / self.rate)
+
+    def penalize(self, seconds: float):
+        """버킷을 비워 모든 프로세스가 최소 seconds 동안 새 호출을 하지 않도록 함"""
+        if self.rate <= 0:
+            return
+        self._update(lambda tokens: min(tokens, -seconds * self.rate))
+
+
+_buckets: Dict[Tuple[str, str], SharedTokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_bucket(service: str, region: Optional[str]) -> SharedTokenBucket:
+    """프로세스 전역 서비스/리전별 공유 토큰 버킷 반환"""
+    service = SERVICE_ALIASES.get(service, service)
+    key = (service, region or "global")
+    with _buckets_lock:
+        if key not in _buckets:
+            _buckets[key] = SharedTokenBucket(key[0], key[1], get_rate_limit(service))
+        return _buckets[key]
+
+
+def call_with_retry(service: str, region: Optional[str], execute: Callable[[], Any],
+                    get_error_message: Callable[[Exception], str] = error_message,
+                    max_retries: int = 5, base_backoff: float = 1.0, max_backoff: float = 30.0,
+                    acquire: bool = True) -> Any:
+    """공유 버킷의 토큰을 받아 호출하고 스로틀링/일시적 오류는 백오프 후 재시도, 그 외 오류는 그대로 전달
+
+    acquire=False 이면 토큰 예약은 호출자(예: SDK 요청 이벤트 훅)가 담당
+    """
+    bucket = get_bucket(service, region)
+    attempt = 0
+    while True:
+        if acquire:
+            bucket.acquire()
+        try:
+            return execute()
+        except Exception as e:
+            error_class = classify_error(get_error_message(e))
+            if attempt >= max_retries or error_class == FATAL:
+                raise
+            delay = backoff_delay(attempt, base_backoff, max_backoff)
+            if error_class == THROTTLING:
+                bucket.penalize(delay)
+            note_retry()
+            time.sleep(delay)
+            attempt += 1
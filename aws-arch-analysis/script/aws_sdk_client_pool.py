@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+AWS SDK(boto3) 클라이언트 풀
+aws CLI를 호출마다 새 프로세스로 실행하는 대신 프로세스 안에서 서비스별 클라이언트를 재사용
+
+- 서비스/리전별 클라이언트를 한 번만 생성하고 스레드 간 공유 (HTTP 연결 풀 재사용)
+- 페이지네이터가 있는 API는 모든 페이지를 읽어 aws CLI 자동 페이지네이션과 같은 형태로 병합
+- aws CLI와 같은 명령 형식(["aws", "<서비스>", "<명령>", "--옵션", "값", ...])을 그대로 받아 호출
+  (옵션 값은 서비스 모델의 입력 shape 타입으로 변환하므로 숫자로 된 이름/ID 등 문자열 파라미터는 그대로 유지)
+- 모든 HTTP 요청(페이지, botocore 재시도 포함)은 다른 수집기 프로세스와 공유하는 서비스/리전별 호출 예산(aws_rate_limiter.py)의 토큰을 받아 전송
+- botocore 재시도 후에도 스로틀링/일시적 오류이면 공유 예산을 비우고 지터가 있는 지수 백오프 후 호출 전체를 재시도
+- 엔드포인트 지정(--endpoint-url 또는 AWS_ENDPOINT_URL)으로 로컬 AWS API 스텁(moto_server 등)에 연결 가능
+- boto3가 설치되지 않은 환경에서는 sdk_available()이 False이며 호출자는 aws CLI를 사용
+- AWS_COLLECTION_BACKEND=cli 이면 boto3가 있어도 aws CLI 사용 (resolve_backend)
+"""
+
+import json
+import os
+import sys
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import boto3
+    from botocore.config import Config
+    from botocore.exceptions import BotoCoreError, ClientError
+except ImportError:
+    boto3 = None
+    Config = None
+    BotoCoreError = ClientError = None
+
+sys.path.append(str(Path(__file__).parent))
+from aws_rate_limiter import call_with_retry, get_bucket
+
+BACKEND_ENV = "AWS_COLLECTION_BACKEND"
+ENDPOINT_URL_ENV = "AWS_ENDPOINT_URL"
+MAX_POOL_CONNECTIONS_ENV = "AWS_SDK_MAX_POOL_CONNECTIONS"
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+# SDK 호출 실패 시 발생하는 예외 (boto3가 없으면 빈 튜플이라 except 절에서 아무것도 잡지 않음)
+SDK_ERRORS: Tuple[type, ...] = (ClientError, BotoCoreError) if boto3 is not None else ()
+
+# aws CLI 전역 옵션 (API 파라미터가 아님)
+CLI_GLOBAL_OPTIONS = {"--region", "--output", "--endpoint-url", "--profile", "--query"}
+
+
+def sdk_available() -> bool:
+    """boto3 사용 가능 여부"""
+    return boto3 is not None
+
+
+def resolve_backend(backend: str = None) -> str:
+    """호출 방식 결정 (sdk 또는 cli, 지정하지 않으면 AWS_COLLECTION_BACKEND, auto면 boto3 설치 여부)"""
+    backend = backend or os.environ.get(BACKEND_ENV, "auto")
+    if backend == "auto":
+        backend = "sdk" if sdk_available() else "cli"
+    return backend
+
+
+def json_default(value: Any) -> Any:
+    """boto3 응답의 datetime 등을 aws CLI 출력과 같은 ISO 8601 문자열로 변환"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return str(value)
+
+
+def parse_cli_command(command: List[str]) -> Tuple[str, str, Dict[str, Any]]:
+    """aws CLI 명령을 (서비스, 오퍼레이션, API 파라미터)로 변환
+
+    값은 문자열 그대로 두며 (여러 값이면 목록, 값 없는 옵션은 True), 타입 변환은 coerce_params()에서 수행
+    예: ["aws", "cognito-idp", "list-user-pools", "--max-results", "60", "--region", "..."]
+        -> ("cognito-idp", "list_user_pools", {"MaxResults": "60"})
+    """
+    if len(command) < 3 or command[0] != "aws":
+        raise ValueError(f"aws CLI 명령 형식이 아닙니다: {' '.join(command)}")
+
+    service = command[1]
+    operation = command[2].replace("-", "_")
+    params = {}
+    index = 3
+    while index < len(command):
+        option = command[index]
+        if not option.startswith("--"):
+            raise ValueError(f"지원하지 않는 인자: {option}")
+        index += 1
+        values = []
+        while index < len(command) and not command[index].startswith("--"):
+            values.append(command[index])
+            index += 1
+        if option in CLI_GLOBAL_OPTIONS:
+            continue
+        name = "".join(part.capitalize() for part in option[2:].split("-"))
+        if not values:
+            params[name] = True
+        else:
+            params[name] = values[0] if len(values) == 1 else values
+    return service, operation, params
+
+
+def coerce_value(shape, value: Any) -> Any:
+    """CLI 문자열 값을 입력 shape 타입으로 변환 (shape를 모르면 그대로)"""
+    if shape is None:
+        return value
+    type_name = shape.type_name
+    if type_name == "list":
+        if isinstance(value, str) and value.startswith("["):
+            return json.loads(value)
+        items = value if isinstance(value, list) else [value]
+        return [coerce_value(shape.member, item) for item in items]
+    if isinstance(value, list):
+        return value
+    if type_name in ("integer", "long"):
+        return int(value)
+    if type_name in ("float", "double"):
+        return float(value)
+    if type_name == "boolean":
+        return value if isinstance(value, bool) else value.lower() == "true"
+    if type_name in ("structure", "map") and isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def coerce_params(operation_model, params: Dict[str, Any]) -> Dict[str, Any]:
+    """parse_cli_command() 결과 파라미터를 오퍼레이션 입력 shape의 멤버 타입으로 변환"""
+    input_shape = operation_model.input_shape
+    members = input_shape.members if input_shape is not None else {}
+    return {name: coerce_value(members.get(name), value) for name, value in params.items()}
+
+
+def get_cli_option(command: List[str], option: str) -> Optional[str]:
+    """aws CLI 명령에서 옵션 값 추출 (없으면 None)"""
+    if option in command:
+        index = command.index(option)
+        if index + 1 < len(command):
+            return command[index + 1]
+    return None
+
+
+class AWSClientPool:
+    """서비스/리전별 boto3 클라이언트 재사용 풀 (스레드 안전)"""
+
+    def __init__(self, region: str, endpoint_url: str = None, max_pool_connections: int = None):
+        if boto3 is None:
+            raise RuntimeError("boto3가 설치되어 있지 않습니다 (pip install boto3)")
+        if max_pool_connections is None:
+            max_pool_connections = int(os.environ.get(MAX_POOL_CONNECTIONS_ENV, DEFAULT_MAX_POOL_CONNECTIONS))
+        self.region = region
+        self.endpoint_url = endpoint_url or os.environ.get(ENDPOINT_URL_ENV)
+        self.config = Config(
+            max_pool_connections=max_pool_connections,
+            retries={"mode": "standard", "max_attempts": 5},
+        )
+        # Session은 스레드 안전하지 않으므로 클라이언트 생성만 잠금 안에서 수행 (생성된 클라이언트는 스레드 안전)
+        self.session = boto3.session.Session(region_name=region)
+        self.clients: Dict[Tuple[str, str], Any] = {}
+        self.lock = threading.Lock()
+
+    def get_client(self, service: str, region: str = None):
+        region = region or self.region
+        key = (service, region)
+        with self.lock:
+            if key not in self.clients:
+                client = self.session.client(
+                    service, region_name=region, endpoint_url=self.endpoint_url, config=self.config
+                )
+                bucket = get_bucket(service, region)
+                # 핸들러가 값을 반환하면 응답으로 처리되므로 None 반환
+                client.meta.events.register("before-send", lambda **kwargs: bucket.acquire())
+                self.clients[key] = client
+            return self.clients[key]
+
+    def call(self, service: str, operation: str, region: str = None, **params) -> Dict[str, Any]:
+        """API 호출 (페이지네이터가 있으면 모든 페이지를 병합한 결과, ResponseMetadata 제외)"""
+        client = self.get_client(service, region)
+
+        def execute() -> Dict[str, Any]:
+            if client.can_paginate(operation):
+                return client.get_paginator(operation).paginate(**params).build_full_result()
+            return getattr(client, operation)(**params)
+
+        # 토큰 예약은 before-send 훅이 요청마다 수행
+        result = call_with_retry(service, region or self.region, execute, acquire=False)
+        result.pop("ResponseMetadata", None)
+        return result
+
+    def call_cli_command(self, command: List[str]) -> Dict[str, Any]:
+        """aws CLI 형식 명령을 SDK 호출로 실행"""
+        service, operation, params = parse_cli_command(command)
+        region = get_cli_option(command, "--region")
+        client = self.get_client(service, region)
+        operation_model = client.meta.service_model.operation_model(client.meta.method_to_api_mapping[operation])
+        return self.call(service, operation, region=region, **coerce_params(operation_model, params))
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+EC2 시작 템플릿/Lambda/Lambda 레이어 버전 수집
+aws_ec2_launch_template_version(launch_template_data 포함), aws_lambda_version, aws_lambda_layer_version의
+변하지 않는 과거 버전을 매 실행마다 다시 조회하지 않도록 사용 중인 버전만 조회하거나 처음 보는 버전만 이력에 추가
+
+- VERSION_COLLECTION_MODE=latest (기본값): 사용 중인 버전만 수집
+  - 시작 템플릿: 템플릿별 $Latest/$Default 버전(호출 1회)과 Auto Scaling 그룹이 번호로 지정한 버전
+  - Lambda: 함수별 $LATEST와 별칭이 가리키는 버전 (라우팅 가중치 버전 포함)
+  - 레이어: 레이어별 최신 버전과 위 Lambda 버전이 참조하는 이 계정의 레이어 버전
+- VERSION_COLLECTION_MODE=incremental: 버전 번호 인덱스(부모별 최대 버전 번호)보다 큰 버전만 이력 파일에 추가
+  - 시작 템플릿: LatestVersionNumber가 인덱스보다 큰 템플릿만 MinVersion으로 새 버전 조회
+  - 레이어: 최신 버전이 인덱스보다 큰 레이어만 버전 목록 조회
+  - Lambda: 버전 목록 API는 시작 위치를 지정할 수 없어 함수별 목록은 매번 조회하고 새 버전만 이력에 추가
+  - 출력 파일은 이력 전체 (시작 템플릿 기본 버전 여부와 Lambda $LATEST는 매번 현재 값 사용)
+- VERSION_COLLECTION_MODE=full: 기존 Steampipe 쿼리로 전체 이력 조회 (이 모듈은 사용하지 않음)
+- 인덱스와 이력: <보고서 디렉토리>/.version_history/<리전>/<데이터셋>.index.json, <데이터셋>.jsonl (VERSION_HISTORY_DIR로 변경)
+- 결과 파일은 Steampipe 쿼리와 같은 컬럼 이름(snake_case)과 형식
+- boto3가 있으면 SDK 클라이언트 풀(aws_sdk_client_pool.py), 없으면 aws CLI로 호출 (AWS_COLLECTION_BACKEND)
+- --endpoint-url 또는 AWS_ENDPOINT_URL로 로컬 AWS API 스텁(moto_server 등)에 연결해 테스트 가능
+
+사용법:
+    python aws_version_collection.py --region ap-northeast-2
+    python aws_version_collection.py --region ap-northeast-2 --mode incremental
+"""
+
+import argparse
+import fcntl
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple
+
+sys.path.append(str(Path(__file__).parent))
+from aws_rate_limiter import call_with_retry, error_message
+from aws_sdk_client_pool import SDK_ERRORS, AWSClientPool, json_default, resolve_backend
+from collection_telemetry import measure_query, query_context
+from steampipe_query_engine import StreamingResultWriter
+
+MODE_ENV = "VERSION_COLLECTION_MODE"
+HISTORY_DIR_ENV = "VERSION_HISTORY_DIR"
+HISTORY_DIR_NAME = ".version_history"
+
+LATEST = "latest"
+INCREMENTAL = "incremental"
+FULL = "full"
+MODES = (LATEST, INCREMENTAL, FULL)
+
+
+class VersionDataset(NamedTuple):
+    """버전 데이터셋 (columns는 기존 Steampipe 쿼리 컬럼, 나머지 컬럼 타입은 TEXT)"""
+    name: str
+    description: str
+    output_file: str
+    columns: Tuple[str, ...]
+    column_types: Dict[str, str]
+
+
+LAUNCH_TEMPLATE_VERSIONS = VersionDataset(
+    "launch_template_versions", "EC2 시작 템플릿 버전", "compute_ec2_launch_template_versions.json",
+    ("launch_template_id", "launch_template_name", "version_number", "version_description", "create_time",
+     "created_by", "default_version", "launch_template_data"),
+    {"version_number": "INT8", "create_time": "TIMESTAMP", "default_version": "BOOL",
+     "launch_template_data": "JSONB"},
+)
+LAMBDA_VERSIONS = VersionDataset(
+    "lambda_versions", "Lambda 버전", "compute_lambda_versions.json",
+    ("version", "function_name", "function_arn", "description", "code_size", "code_sha_256", "last_modified",
+     "master_arn", "revision_id", "layers", "state", "state_reason", "state_reason_code", "last_update_status",
+     "last_update_status_reason", "last_update_status_reason_code"),
+    {"code_size": "INT8", "layers": "JSONB"},
+)
+LAYER_VERSIONS = VersionDataset(
+    "layer_versions", "Lambda 레이어", "compute_lambda_layers.json",
+    ("layer_name", "layer_arn", "version", "description", "created_date", "compatible_runtimes", "license_info",
+     "compatible_architectures"),
+    {"version": "INT8", "created_date": "TIMESTAMP", "compatible_runtimes": "JSONB",
+     "compatible_architectures": "JSONB"},
+)
+# Lambda 버전이 참조하는 레이어를 레이어 수집에서 사용하므로 이 순서로 수집
+VERSION_DATASETS = [LAUNCH_TEMPLATE_VERSIONS, LAMBDA_VERSIONS, LAYER_VERSIONS]
+VERSION_OUTPUTS = {dataset.output_file for dataset in VERSION_DATASETS}
+
+
+def get_mode(mode: str = None) -> str:
+    """수집 방식 (지정하지 않으면 VERSION_COLLECTION_MODE, 알 수 없는 값이면 latest)"""
+    mode = (mode or os.environ.get(MODE_ENV) or LATEST).lower()
+    return mode if mode in MODES else LATEST
+
+
+def api_field(column: str) -> str:
+    """Steampipe 컬럼 이름에 해당하는 API 응답 필드 이름 (code_sha_256 -> CodeSha256)"""
+    return "".join(part.capitalize() for part in column.split("_"))
+
+
+def to_row(item: Dict[str, Any], dataset: VersionDataset, **values) -> Dict[str, Any]:
+    """API 응답 항목을 데이터셋 컬럼의 행으로 변환 (values가 응답 필드보다 우선)"""
+    return {column: values[column] if column in values else item.get(api_field(column))
+            for column in dataset.columns}
+
+
+def layer_row(item: Dict[str, Any]) -> Dict[str, Any]:
+    """레이어 버전 응답의 행 (layer_name, layer_arn, 누락된 version은 버전 ARN에서 추출)"""
+    layer_arn, version = item["LayerVersionArn"].rsplit(":", 1)
+    layer_arn = item.get("LayerArn") or layer_arn
+    return to_row(item, LAYER_VERSIONS, layer_arn=layer_arn, layer_name=layer_arn.rsplit(":", 1)[-1],
+                  version=item.get("Version") or int(version))
+
+
+def build_cli_command(service: str, operation: str, region: str, params: Dict[str, Any]) -> List[str]:
+    """API 호출을 aws CLI 명령으로 변환 (목록 값은 공백으로 구분된 여러 인자)"""
+    command = ["aws", service, operation.replace("_", "-")]
+    for name, value in params.items():
+        command.append("--" + re.sub(r"(?<!^)(?=[A-Z])", "-", name).lower())
+        command.extend(str(item) for item in (value if isinstance(value, list) else [value]))
+    return command + ["--region", region, "--output", "json"]
+
+
+class VersionHistory:
+    """데이터셋별 버전 번호 인덱스와 추가 전용 이력 파일 (프로세스 간 잠금)"""
+
+    def __init__(self, history_dir: Path, dataset: VersionDataset):
+        self.history_dir = Path(history_dir)
+        self.index_path = self.history_dir / f"{dataset.name}.index.json"
+        self.rows_path = self.history_dir / f"{dataset.name}.jsonl"
+        self.lock_path = self.history_dir / f"{dataset.name}.lock"
+
+    @contextmanager
+    def locked(self) -> Iterator[Dict[str, int]]:
+        """잠금을 잡고 인덱스(부모 키 -> 최대 버전 번호) 반환"""
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    index = json.loads(self.index_path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    index = {}
+                yield index
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def append(self, index: Dict[str, int], rows: Sequence[Tuple[str, int, Dict[str, Any]]]):
+        """(부모 키, 버전 번호, 행) 중 인덱스보다 큰 버전만 이력에 추가하고 인덱스 갱신 (locked() 안에서 호출)"""
+        new_rows = [(key, version, row) for key, version, row in rows if version > index.get(key, 0)]
+        if not new_rows:
+            return 0
+        with open(self.rows_path, "a", encoding="utf-8") as f:
+            for _, _, row in new_rows:
+                f.write(json.dumps(row, ensure_ascii=False, default=json_default) + "\n")
+        for key, version, _ in new_rows:
+            index[key] = max(index.get(key, 0), version)
+        temp_path = self.index_path.with_suffix(".tmp")
+        temp_path.write_text(json.dumps(index, ensure_ascii=False, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(temp_path, self.index_path)
+        return len(new_rows)
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """이력 행을 한 줄씩 읽음"""
+        if not self.rows_path.exists():
+            return
+        with open(self.rows_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class VersionCollector:
+    """시작 템플릿/Lambda/레이어 버전을 사용 중인 버전만 또는 새 버전만 수집"""
+
+    def __init__(self, region: str, report_dir, mode: str = None, backend: str = None, endpoint_url: str = None,
+                 history_dir=None, max_workers: int = 6, log: Callable[[str], None] = print):
+        self.region = region
+        self.report_dir = Path(report_dir)
+        self.mode = get_mode(mode)
+        self.backend = resolve_backend(backend)
+        self.endpoint_url = endpoint_url or os.environ.get("AWS_ENDPOINT_URL")
+        self.client_pool = (AWSClientPool(region, self.endpoint_url)
+                            if self.backend == "sdk" and self.mode != FULL else None)
+        history_root = Path(os.environ.get(HISTORY_DIR_ENV) or history_dir or self.report_dir / HISTORY_DIR_NAME)
+        self.history_dir = history_root / region
+        self.max_workers = max_workers
+        self.log = log
+        # 레이어 수집에서 참조하는 Lambda 버전 행
+        self.lambda_rows: List[Dict[str, Any]] = []
+
+    def exclude(self, queries: Sequence[tuple]) -> List[tuple]:
+        """Steampipe 쿼리 목록에서 이 모듈이 수집하는 출력 파일 제외 (full 모드는 그대로)"""
+        if self.mode == FULL:
+            return list(queries)
+        return [query for query in queries if query[2] not in VERSION_OUTPUTS]
+
+    def call(self, service: str, operation: str, **params) -> Dict[str, Any]:
+        """API 호출 (SDK 클라이언트 풀 또는 aws CLI, 페이지는 모두 병합)"""
+        if self.client_pool is not None:
+            return self.client_pool.call(service, operation, **params)
+        command = build_cli_command(service, operation, self.region, params)
+        if self.endpoint_url:
+            command += ["--endpoint-url", self.endpoint_url]
+        result = call_with_retry(service, self.region,
+                                 lambda: subprocess.run(command, capture_output=True, text=True, check=True))
+        return json.loads(result.stdout or "{}")
+
+    def map_parallel(self, function: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(function, items))
+
+    def collect(self) -> List[bool]:
+        """데이터셋별로 수집해 출력 파일을 쓰고 성공 여부 반환 (VERSION_DATASETS 순서, 실패하면 기존 출력 파일 유지)"""
+        if self.mode == FULL:
+            return []
+        results = []
+        plugin = "aws-sdk" if self.client_pool is not None else "aws-cli"
+        for dataset in VERSION_DATASETS:
+            output_path = self.report_dir / dataset.output_file
+            collect_rows = getattr(self, f"collect_{self.mode}_{dataset.name}")
+            try:
+                with query_context(description=f"{dataset.description} ({self.mode})", output=dataset.output_file), \
+                        measure_query(f"{self.mode}:{dataset.name}:{self.region}", plugin) as record:
+                    columns = [{"name": column, "data_type": dataset.column_types.get(column, "TEXT")}
+                               for column in dataset.columns]
+                    # 행은 API를 호출하며 생성되므로 임시 파일에 쓰고 모두 성공한 경우에만 출력 파일로 교체
+                    temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+                    try:
+                        with StreamingResultWriter(temp_path, columns) as writer:
+                            writer.write_rows(collect_rows())
+                        os.replace(temp_path, output_path)
+                    finally:
+                        temp_path.unlink(missing_ok=True)
+                    record.update(rows=writer.row_count, bytes=output_path.stat().st_size)
+                self.log(f"{dataset.description} 완료 ({dataset.output_file}, {self.mode}, {writer.row_count}개 행)")
+                results.append(True)
+            except (subprocess.CalledProcessError, ValueError, KeyError, OSError) + SDK_ERRORS as e:
+                self.log(f"{dataset.description} 실패: {error_message(e).strip()}")
+                results.append(False)
+        return results
+
+    # 시작 템플릿
+
+    def collect_latest_launch_template_versions(self) -> Iterator[Dict[str, Any]]:
+        """$Latest/$Default 버전과 Auto Scaling 그룹이 번호로 지정한 버전
+
+        Auto Scaling 그룹 조회가 실패하면 번호로 지정한 버전만 빼고 $Latest/$Default 버전은 수집
+        """
+        versions = self.call("ec2", "describe_launch_template_versions",
+                             Versions=["$Latest", "$Default"]).get("LaunchTemplateVersions", [])
+        seen = {(version["LaunchTemplateId"], version["VersionNumber"]) for version in versions}
+
+        try:
+            groups = self.call("autoscaling", "describe_auto_scaling_groups").get("AutoScalingGroups", [])
+        except (subprocess.CalledProcessError, ValueError) + SDK_ERRORS as e:
+            self.log(f"Auto Scaling 그룹 조회 실패로 그룹이 번호로 지정한 시작 템플릿 버전은 제외: "
+                     f"{error_message(e).strip()}")
+            groups = []
+        pinned = defaultdict(set)
+        for group in groups:
+            mixed_policy = (group.get("MixedInstancesPolicy") or {}).get("LaunchTemplate") or {}
+            for spec in (group.get("LaunchTemplate"), mixed_policy.get("LaunchTemplateSpecification")):
+                version = str((spec or {}).get("Version") or "")
+                if version.isdigit() and spec.get("LaunchTemplateId"):
+                    if (spec["LaunchTemplateId"], int(version)) not in seen:
+                        pinned[spec["LaunchTemplateId"]].add(int(version))
+        for template_id, numbers in sorted(pinned.items()):
+            versions.extend(self.call("ec2", "describe_launch_template_versions", LaunchTemplateId=template_id,
+                                      Versions=[str(number) for number in sorted(numbers)])
+                            .get("LaunchTemplateVersions", []))
+
+        emitted = set()
+        for version in versions:
+            key = (version["LaunchTemplateId"], version["VersionNumber"])
+            if key not in emitted:
+                emitted.add(key)
+                yield to_row(version, LAUNCH_TEMPLATE_VERSIONS)
+
+    def collect_incremental_launch_template_versions(self) -> Iterator[Dict[str, Any]]:
+        """최신 버전 번호가 인덱스보다 큰 템플릿만 새 버전을 조회해 이력에 추가"""
+        templates = self.call("ec2", "describe_launch_templates").get("LaunchTemplates", [])
+        history = VersionHistory(self.history_dir, LAUNCH_TEMPLATE_VERSIONS)
+        with history.locked() as index:
+            changed = [template for template in templates
+                       if template["LatestVersionNumber"] > index.get(template["LaunchTemplateId"], 0)]
+
+            def fetch(template):
+                return self.call("ec2", "describe_launch_template_versions",
+                                 LaunchTemplateId=template["LaunchTemplateId"],
+                                 MinVersion=str(index.get(template["LaunchTemplateId"], 0) + 1)
+                                 ).get("LaunchTemplateVersions", [])
+
+            new_rows = [(version["LaunchTemplateId"], version["VersionNumber"],
+                         to_row(version, LAUNCH_TEMPLATE_VERSIONS))
+                        for versions in self.map_parallel(fetch, changed) for version in versions]
+            added = history.append(index, new_rows)
+        self.log(f"시작 템플릿 {len(templates)}개 중 {len(changed)}개에서 새 버전 {added}개 추가")
+
+        # 기본 버전은 바뀔 수 있으므로 현재 템플릿 정보로 갱신
+        default_versions = {template["LaunchTemplateId"]: template["DefaultVersionNumber"] for template in templates}
+        for row in history.iter_rows():
+            if row["launch_template_id"] in default_versions:
+                row["default_version"] = row["version_number"] == default_versions[row["launch_template_id"]]
+            yield row
+
+    # Lambda
+
+    def list_functions(self) -> List[Dict[str, Any]]:
+        return self.call("lambda", "list_functions").get("Functions", [])
+
+    def collect_latest_lambda_versions(self) -> Iterator[Dict[str, Any]]:
+        """함수별 $LATEST와 별칭(라우팅 가중치 포함)이 가리키는 버전"""
+        functions = self.list_functions()
+
+        def alias_versions(function):
+            versions = set()
+            for alias in self.call("lambda", "list_aliases", FunctionName=function["FunctionName"]).get("Aliases", []):
+                versions.add(alias["FunctionVersion"])
+                versions.update(((alias.get("RoutingConfig") or {}).get("AdditionalVersionWeights") or {}).keys())
+            versions.discard("$LATEST")
+            return [(function["FunctionName"], version) for version in sorted(versions, key=int)]
+
+        targets = [target for targets in self.map_parallel(alias_versions, functions) for target in targets]
+        configurations = self.map_parallel(
+            lambda target: self.call("lambda", "get_function_configuration",
+                                     FunctionName=target[0], Qualifier=target[1]), targets)
+
+        self.lambda_rows = [to_row(function, LAMBDA_VERSIONS) for function in functions]
+        self.lambda_rows.extend(to_row(configuration, LAMBDA_VERSIONS) for configuration in configurations)
+        return iter(self.lambda_rows)
+
+    def collect_incremental_lambda_versions(self) -> Iterator[Dict[str, Any]]:
+        """함수별 버전 목록 중 인덱스보다 큰 버전만 이력에 추가 ($LATEST는 매번 현재 값)"""
+        functions = self.list_functions()
+        history = VersionHistory(self.history_dir, LAMBDA_VERSIONS)
+        listed = self.map_parallel(
+            lambda function: self.call("lambda", "list_versions_by_function",
+                                       FunctionName=function["FunctionName"]).get("Versions", []), functions)
+        with history.locked() as index:
+            new_rows = [(function["FunctionArn"], int(version["Version"]), to_row(version, LAMBDA_VERSIONS))
+                        for function, versions in zip(functions, listed)
+                        for version in versions if version["Version"] != "$LATEST"]
+            added = history.append(index, new_rows)
+        self.log(f"Lambda 함수 {len(functions)}개에서 새 버전 {added}개 추가")
+
+        for function in functions:
+            yield to_row(function, LAMBDA_VERSIONS)
+        yield from history.iter_rows()
+
+    # Lambda 레이어
+
+    def list_layers(self) -> List[Dict[str, Any]]:
+        return self.call("lambda", "list_layers").get("Layers", [])
+
+    def collect_latest_layer_versions(self) -> Iterator[Dict[str, Any]]:
+        """레이어별 최신 버전과 수집한 Lambda 버전이 참조하는 이 계정의 레이어 버전"""
+        layers = self.list_layers()
+        rows = {}
+        for layer in layers:
+            latest = dict(layer["LatestMatchingVersion"], LayerArn=layer["LayerArn"])
+            rows[latest["LayerVersionArn"]] = layer_row(latest)
+
+        own_layers = {layer["LayerArn"] for layer in layers}
+        referenced = sorted({item["Arn"] for row in self.lambda_rows for item in row.get("layers") or []
+                             if item.get("Arn", "").rsplit(":", 1)[0] in own_layers} - set(rows))
+        for arn, version in zip(referenced, self.map_parallel(
+                lambda arn: self.call("lambda", "get_layer_version_by_arn", Arn=arn), referenced)):
+            rows[arn] = layer_row(dict(version, LayerVersionArn=version.get("LayerVersionArn") or arn))
+        return iter(rows.values())
+
+    def collect_incremental_layer_versions(self) -> Iterator[Dict[str, Any]]:
+        """최신 버전이 인덱스보다 큰 레이어만 버전 목록을 조회해 새 버전을 이력에 추가"""
+        layers = self.list_layers()
+        history = VersionHistory(self.history_dir, LAYER_VERSIONS)
+        with history.locked() as index:
+            changed = [layer for layer in layers
+                       if layer["LatestMatchingVersion"]["Version"] > index.get(layer["LayerArn"], 0)]
+            listed = self.map_parallel(
+                lambda layer: self.call("lambda", "list_layer_versions",
+                                        LayerName=layer["LayerName"]).get("LayerVersions", []), changed)
+            new_rows = [(layer["LayerArn"], version["Version"], layer_row(dict(version, LayerArn=layer["LayerArn"])))
+                        for layer, versions in zip(changed, listed) for version in versions]
+            # 목록은 최신 버전부터 반환되므로 이력에는 버전 순서로 추가
+            new_rows.sort(key=lambda item: (item[0], item[1]))
+            added = history.append(index, new_rows)
+        self.log(f"Lambda 레이어 {len(layers)}개 중 {len(changed)}개에서 새 버전 {added}개 추가")
+        yield from history.iter_rows()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="시작 템플릿/Lambda/레이어 버전 수집")
+    parser.add_argument("--region", default=os.environ.get("AWS_DEFAULT_REGION", "ap-northeast-2"), help="AWS 리전")
+    parser.add_argument("--report-dir", default=str(Path(__file__).parent.parent / "report"), help="보고서 디렉토리")
+    parser.add_argument("--mode", choices=[LATEST, INCREMENTAL], default=None,
+                        help=f"수집 방식 (기본값: {MODE_ENV} 또는 {LATEST})")
+    parser.add_argument("--backend", choices=["auto", "sdk", "cli"], default=None, help="API 호출 방식")
+    parser.add_argument("--endpoint-url", default=None, help="AWS API 엔드포인트 (로컬 스텁 테스트용)")
+    args = parser.parse_args()
+
+    Path(args.report_dir).mkdir(parents=True, exist_ok=True)
+    collector = VersionCollector(args.region, args.report_dir, args.mode or get_mode(), args.backend,
+                                 args.endpoint_url)
+    if collector.mode == FULL:
+        print(f"{MODE_ENV}=full 에서는 Steampipe 쿼리로 전체 이력을 수집합니다 (steampipe_compute_collection.py)")
+        return 0
+    results = collector.collect()
+    print(f"성공: {sum(results)}/{len(results)}")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
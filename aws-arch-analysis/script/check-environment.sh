@@ -7,6 +7,11 @@ echo "📦 Python 패키지 확인:"
 python3 -c "import markdown; print('  ✅ markdown')" 2>/dev/null || echo "  ❌ markdown"
 python3 -c "import bs4; print('  ✅ beautifulsoup4')" 2>/dev/null || echo "  ❌ beautifulsoup4"
 python3 -c "import pygments; print('  ✅ pygments')" 2>/dev/null || echo "  ❌ pygments"
+# 선택 패키지 (없으면 느린 대체 경로로 동작하거나 일부 분석 생략)
+python3 -c "import psycopg2; print('  ✅ psycopg2')" 2>/dev/null || echo "  ❌ psycopg2 (선택: 없으면 쿼리마다 steampipe CLI 실행)"
+python3 -c "import boto3; print('  ✅ boto3')" 2>/dev/null || echo "  ❌ boto3 (선택: 없으면 aws CLI로 수집)"
+python3 -c "import numpy; print('  ✅ numpy')" 2>/dev/null || echo "  ❌ numpy (선택: 없으면 비용 이동 평균/이상 탐지/예측 섹션 생략)"
+python3 -c "import yaml; print('  ✅ PyYAML')" 2>/dev/null || echo "  ❌ PyYAML (선택: 없으면 JSON 형식 kubeconfig만 지원)"
 
 echo ""
 
@@ -54,7 +59,7 @@ echo "📋 설치가 필요한 패키지가 있다면 다음 명령어를 실행
 echo ""
 echo "# Python 패키지 설치:"
 echo "python3 -m ensurepip --default-pip --user 2>/dev/null || curl https://bootstrap.pypa.io/get-pip.py | python3 - --user"
-echo "pip3 install markdown beautifulsoup4 pygments --user"
+echo "pip3 install markdown beautifulsoup4 pygments psycopg2-binary boto3 numpy pyyaml --user"
 echo ""
 echo "# Steampipe 설치:"
 echo "sudo /bin/sh -c \"\$(curl -fsSL https://raw.githubusercontent.com/turbot/steampipe/main/install.sh)\""
@@ -6,9 +6,10 @@ AWS 계정 종합 데이터 수집 스크립트
 사용법:
     python collect_all_data.py              # 병렬 처리 (기본값, 빠름)
     python collect_all_data.py --sequential # 순차 처리 (안정적)
+    python collect_all_data.py --incremental # 증분 수집 (TTL이 지났거나 쿼리가 바뀐 파일만 다시 수집)
 
 병렬 처리 특징:
-- 최대 4개 스크립트 동시 실행
+- 최대 4개 스크립트 동시 실행 (COLLECTION_SCRIPT_WORKERS 환경 변수로 변경 가능)
 - 전체 실행 시간 단축 (약 50-70% 단축)
 - 시스템 리소스 효율적 활용
 - 타임아웃 10분으로 증가
@@ -18,9 +19,18 @@ AWS 계정 종합 데이터 수집 스크립트
 - 안정적이고 예측 가능한 실행
 - 디버깅 및 문제 해결에 유리
 - 타임아웃 10분
+
+쿼리 텔레메트리:
+- 모든 수집기의 쿼리별 소요 시간, 바이트, 행 수, 재시도, 종료 상태, 플러그인을 collection_metrics.jsonl에 기록
+- 실행이 끝나면 느린 쿼리 상위 10개와 처리량(bytes/s)을 출력하고 Prometheus textfile(collection_metrics.prom) 생성
+
+증분 수집 특징:
+- 리포트 디렉토리의 collection_manifest.json에 파일별 쿼리 해시, 수집 시각, 행 수, 소요 시간 기록
+- 쿼리별 TTL 클래스(static/daily/standard/volatile) 이내이고 쿼리가 같으면 건너뜀
 """
 
 import os
+import shutil
 import sys
 import subprocess
 import time
@@ -29,6 +39,18 @@ from datetime import datetime
 import concurrent.futures
 import threading
 
+# 공용 Steampipe 쿼리 엔진 import
+sys.path.append(str(Path(__file__).parent))
+from steampipe_query_engine import DATABASE_URL_ENV, QUERY_CACHE_DIR_ENV, start_service, stop_service
+from steampipe_collection_manifest import INCREMENTAL_ENV, MANIFEST_FILE
+from report_columnar_store import ColumnarStore, columnar_store_enabled
+from collection_telemetry import (METRICS_FILE, METRICS_FILE_ENV, PROMETHEUS_FILE, RUN_ID_ENV, format_summary,
+                                  load_records, summarize, write_prometheus)
+
+TELEMETRY_TOP_N = 10
+SCRIPT_WORKERS_ENV = "COLLECTION_SCRIPT_WORKERS"
+DEFAULT_SCRIPT_WORKERS = 4
+
 class AWSDataCollector:
     def __init__(self):
         self.script_dir = Path(__file__).parent
@@ -54,6 +76,9 @@ class AWSDataCollector:
         self.start_time = datetime.now()
         self.results = []
         self.lock = threading.Lock()  # 결과 리스트 동기화용
+        self.started_service = False
+        self.query_cache_dir = None
+        self.metrics_path = None
 
     def log_info(self, message: str):
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -71,6 +96,83 @@ class AWSDataCollector:
         timestamp = datetime.now().strftime("%H:%M:%S")
         print(f"\033[1;33m[{timestamp}]\033[0m ⚠️ {message}")
 
+    def start_query_service(self):
+        """Steampipe 서비스를 한 번만 기동하고 모든 수집 스크립트가 공유하도록 설정"""
+        if os.environ.get(DATABASE_URL_ENV):
+            self.log_info(f"🔌 기존 Steampipe 서비스 사용 ({DATABASE_URL_ENV})")
+            return
+        
+        database_url, self.started_service = start_service()
+        if database_url:
+            # 하위 수집 스크립트는 환경 변수를 상속받아 같은 서비스에 연결
+            os.environ[DATABASE_URL_ENV] = database_url
+            self.log_info("🔌 Steampipe 서비스 연결 풀 사용")
+        else:
+            self.log_warning("Steampipe 서비스를 시작할 수 없어 쿼리별 CLI 실행으로 진행합니다.")
+
+    def start_query_cache(self):
+        """이번 실행에서만 사용하는 쿼리 결과 캐시 디렉토리 설정 (수집기 간 중복 쿼리 공유)"""
+        if os.environ.get(QUERY_CACHE_DIR_ENV):
+            return
+        
+        self.query_cache_dir = self.report_dir / ".query_cache" / self.start_time.strftime("%Y%m%d_%H%M%S")
+        self.query_cache_dir.mkdir(parents=True, exist_ok=True)
+        os.environ[QUERY_CACHE_DIR_ENV] = str(self.query_cache_dir)
+
+    def stop_query_cache(self):
+        """실행이 끝나면 쿼리 결과 캐시 삭제"""
+        if self.query_cache_dir:
+            os.environ.pop(QUERY_CACHE_DIR_ENV, None)
+            shutil.rmtree(self.query_cache_dir, ignore_errors=True)
+            self.query_cache_dir = None
+
+    def start_query_metrics(self):
+        """이번 실행의 쿼리 텔레메트리 기록 파일 준비 (하위 수집 스크립트는 환경 변수로 같은 파일에 기록)"""
+        if os.environ.get(METRICS_FILE_ENV):
+            self.metrics_path = Path(os.environ[METRICS_FILE_ENV])
+        else:
+            self.metrics_path = self.report_dir / METRICS_FILE
+            self.metrics_path.unlink(missing_ok=True)
+            os.environ[METRICS_FILE_ENV] = str(self.metrics_path)
+        os.environ[RUN_ID_ENV] = self.start_time.strftime("%Y%m%d_%H%M%S")
+
+    def report_query_metrics(self):
+        """느린 쿼리 상위 N개와 처리량 요약 출력, Prometheus textfile 기록"""
+        records = load_records(self.metrics_path, os.environ.get(RUN_ID_ENV))
+        if not records:
+            return
+        
+        print()
+        self.log_info("⏱️ 쿼리 텔레메트리 요약")
+        print(format_summary(summarize(records, TELEMETRY_TOP_N)))
+        try:
+            prometheus_path = write_prometheus(records, self.metrics_path.with_name(PROMETHEUS_FILE))
+        except OSError as e:
+            self.log_warning(f"Prometheus textfile 기록 실패: {e}")
+            return
+        self.log_info(f"📈 쿼리 메트릭: {self.metrics_path}, {prometheus_path}")
+
+    def build_columnar_store(self):
+        """수집된 JSON 파일을 보고서 생성기용 컬럼 저장소로 변환 (변경된 파일만)"""
+        if not columnar_store_enabled():
+            return
+        
+        start_time = time.time()
+        store = ColumnarStore(self.report_dir)
+        try:
+            built, skipped = store.build()
+        except OSError as e:
+            self.log_warning(f"컬럼 저장소 생성 실패: {e}")
+            return
+        self.log_info(f"🗃️ 컬럼 저장소: {built}개 변환, {skipped}개 최신 상태 ({time.time() - start_time:.1f}초)")
+
+    def stop_query_service(self):
+        """직접 기동한 Steampipe 서비스 종료"""
+        if self.started_service:
+            os.environ.pop(DATABASE_URL_ENV, None)
+            stop_service()
+            self.started_service = False
+
     def run_collection_script(self, name: str, script_name: str) -> dict:
         """개별 수집 스크립트 실행 (병렬 처리용)"""
         script_path = self.script_dir / script_name
@@ -146,12 +248,12 @@ class AWSDataCollector:
         self.log_info("🎯 AWS 계정 종합 데이터 수집 시작 (병렬 처리)")
         self.log_info(f"📁 데이터 저장 위치: {self.report_dir}")
         self.log_info(f"📊 수집 대상: {len(self.collection_scripts)}개 영역")
-        self.log_info(f"🚀 최대 동시 실행: {min(4, len(self.collection_scripts))}개 스크립트")
+        script_workers = max(1, int(os.environ.get(SCRIPT_WORKERS_ENV, DEFAULT_SCRIPT_WORKERS)))
+        max_workers = min(script_workers, len(self.collection_scripts))
+        self.log_info(f"🚀 최대 동시 실행: {max_workers}개 스크립트")
         print()
         
         # ThreadPoolExecutor를 사용한 병렬 처리
-        max_workers = min(4, len(self.collection_scripts))  # 최대 4개 동시 실행
-        
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             # 모든 작업을 제출
             future_to_script = {
@@ -232,7 +334,7 @@ class AWSDataCollector:
         print()
         
         # 생성된 파일 통계
-        json_files = list(self.report_dir.glob("*.json"))
+        json_files = [f for f in self.report_dir.glob("*.json") if f.name != MANIFEST_FILE]
         log_files = list(self.report_dir.glob("*.log"))
         
         self.log_info(f"📁 생성된 파일: JSON {len(json_files)}개, 로그 {len(log_files)}개")
@@ -249,13 +351,27 @@ def main():
     """메인 실행 함수"""
     try:
         collector = AWSDataCollector()
+        collector.start_query_service()
+        collector.start_query_cache()
+        collector.start_query_metrics()
         
-        # 명령행 인수로 실행 모드 선택
-        if len(sys.argv) > 1 and sys.argv[1] == "--sequential":
-            collector.collect_all_data_sequential()
-        else:
-            # 기본값: 병렬 처리
-            collector.collect_all_data()
+        if "--incremental" in sys.argv:
+            # 하위 수집 스크립트는 환경 변수를 상속받아 최신 파일을 건너뜀
+            os.environ[INCREMENTAL_ENV] = "1"
+            collector.log_info("♻️ 증분 수집 모드: TTL 이내이고 쿼리가 바뀌지 않은 파일은 건너뜁니다")
+        
+        try:
+            # 명령행 인수로 실행 모드 선택
+            if "--sequential" in sys.argv:
+                collector.collect_all_data_sequential()
+            else:
+                # 기본값: 병렬 처리
+                collector.collect_all_data()
+            collector.report_query_metrics()
+            collector.build_columnar_store()
+        finally:
+            collector.stop_query_cache()
+            collector.stop_query_service()
             
     except KeyboardInterrupt:
         print("\n\n⚠️ 사용자에 의해 중단되었습니다.")
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+수집기 오프라인 재생(record/replay) 도구 및 종단 간 벤치마크
+실제 Steampipe/AWS 없이 수집기와 collect_all_data.py를 실행하고 수집 엔진 성능 변경을 측정
+
+- record: 실제 실행에서 `steampipe`/`aws` 명령의 출력, 종료 코드, 소요 시간을 명령 텍스트 기준으로 기록
+- replay: 같은 이름의 가짜 실행 파일이 기록을 반환 (기록된 소요 시간만큼 대기해 실제 지연을 재현)
+- benchmark: 재생 환경에서 collect_all_data.py를 동시 실행 수별로 실행해 전체 시간, 쿼리/s, bytes/s 비교
+- 기록 및 재생 중에는 `steampipe service`를 사용하지 않으므로 쿼리 엔진은 쿼리별 CLI 실행으로 동작하고,
+  AWS 수집기는 aws CLI 방식(AWS_COLLECTION_BACKEND=cli)으로 실행됨
+- 기록 키는 명령 텍스트 기준이며 날짜(YYYY-MM-DD)는 제외하므로 다른 날에 재생해도 같은 기록 사용
+- 기록 디렉토리: --dir 또는 COLLECTION_REPLAY_DIR (기본값: ~/.cache/aws-arch-analysis/replay, 보고서 디렉토리 밖)
+- 기록 파일 이름은 명령 텍스트 그대로의 해시이고, 파일에 저장하는 명령 텍스트(key)와 stderr는
+  Kubernetes 요약 쿼리의 HMAC 패딩 키를 가려서 저장 (k8s_payload_summary.redact_summary_key)
+- collect_all_data.py와 같은 리포트 디렉토리에 수집 파일을 기록하므로 기존 수집 결과는 덮어씀
+
+사용법:
+    python collection_replay.py record -- python3 collect_all_data.py     # 실제 실행을 기록
+    python collection_replay.py replay -- python3 collect_all_data.py     # 기록으로 재생
+    python collection_replay.py benchmark --concurrency 1,2,4,8           # 동시 실행 수별 벤치마크
+    python collection_replay.py stats                                     # 기록 현황
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.append(str(Path(__file__).parent))
+from collection_telemetry import METRICS_FILE, METRICS_FILE_ENV, load_records, summarize
+from k8s_payload_summary import redact_summary_key
+
+SCRIPT_DIR = Path(__file__).parent
+REPORT_DIR = SCRIPT_DIR.parent / "report"
+
+REPLAY_DIR_ENV = "COLLECTION_REPLAY_DIR"
+REPLAY_MODE_ENV = "COLLECTION_REPLAY_MODE"
+REAL_PATH_ENV = "COLLECTION_REPLAY_REAL_PATH"
+LATENCY_SCALE_ENV = "COLLECTION_REPLAY_LATENCY_SCALE"
+DEFAULT_REPLAY_DIR = Path.home() / ".cache" / "aws-arch-analysis" / "replay"
+
+TOOLS = ("steampipe", "aws")
+
+# 실행 날짜에 따라 바뀌는 기간 조건(Cost Explorer 등)도 같은 기록을 사용하도록 날짜를 키에서 제외
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ][\d:.]+Z?)?")
+
+
+def get_replay_dir(replay_dir=None) -> Path:
+    return Path(replay_dir or os.environ.get(REPLAY_DIR_ENV) or DEFAULT_REPLAY_DIR)
+
+
+def recording_key(tool: str, args: List[str]) -> str:
+    """기록 키 (도구 이름 + 공백과 날짜를 정규화한 명령 인자)"""
+    return DATE_PATTERN.sub("<date>", " ".join([tool] + [" ".join(arg.split()) for arg in args]))
+
+
+def recording_path(replay_dir: Path, tool: str, key: str) -> Path:
+    return replay_dir / tool / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}.json"
+
+
+def is_service_command(tool: str, args: List[str]) -> bool:
+    """기록/재생 중에는 지원하지 않는 `steampipe service` 명령인지 확인"""
+    return tool == "steampipe" and args[:1] == ["service"]
+
+
+def run_real(tool: str, args: List[str]) -> Dict[str, Any]:
+    """실제 실행 파일을 실행하고 기록 항목 반환"""
+    executable = shutil.which(tool, path=os.environ.get(REAL_PATH_ENV))
+    if executable is None:
+        return {"stdout": "", "stderr": f"replay: {tool} 실행 파일을 찾을 수 없습니다\n", "returncode": 127, "duration": 0.0}
+    start_time = time.time()
+    result = subprocess.run([executable] + args, capture_output=True, text=True)
+    return {
+        "stdout": result.stdout,
+        "stderr": result.stderr,
+        "returncode": result.returncode,
+        "duration": round(time.time() - start_time, 4),
+    }
+
+
+def save_recording(path: Path, recording: Dict[str, Any]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(recording, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def run_shim(tool: str, args: List[str]) -> int:
+    """가짜 `steampipe`/`aws` 실행 파일 본체 (기록 또는 재생)"""
+    if is_service_command(tool, args):
+        # 서비스를 띄우지 않아야 쿼리 엔진이 CLI로 쿼리를 실행하고 기록/재생 대상이 됨
+        sys.stderr.write("replay: steampipe service는 기록/재생 중 사용하지 않습니다\n")
+        return 1
+
+    replay_dir = get_replay_dir()
+    key = recording_key(tool, args)
+    path = recording_path(replay_dir, tool, key)
+    if os.environ.get(REPLAY_MODE_ENV) == "record":
+        recording = dict(run_real(tool, args), tool=tool)
+        save_recording(path, dict(recording, key=redact_summary_key(key),
+                                  stderr=redact_summary_key(recording["stderr"])))
+    else:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                recording = json.load(f)
+        except (OSError, ValueError):
+            sys.stderr.write(f"replay: 기록이 없습니다: {redact_summary_key(key)[:200]}\n")
+            return 1
+        time.sleep(recording.get("duration", 0.0) * float(os.environ.get(LATENCY_SCALE_ENV, "1.0")))
+
+    sys.stdout.write(recording["stdout"])
+    sys.stderr.write(recording["stderr"])
+    return recording["returncode"]
+
+
+def create_shim_dir() -> Path:
+    """가짜 실행 파일 디렉토리 생성 (PATH 앞에 추가해 사용)"""
+    shim_dir = Path(tempfile.mkdtemp(prefix="collection_replay_"))
+    for tool in TOOLS:
+        shim_path = shim_dir / tool
+        shim_path.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{Path(__file__).resolve()}" shim {tool} "$@"\n')
+        shim_path.chmod(0o755)
+    return shim_dir
+
+
+def build_env(mode: str, shim_dir: Path, replay_dir: Path, latency_scale: float = 1.0,
+              base_env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """기록/재생 환경 변수 (가짜 실행 파일을 PATH 앞에 두고 서비스/SDK 경로를 끔)"""
+    env = dict(base_env if base_env is not None else os.environ)
+    env[REAL_PATH_ENV] = env.get(REAL_PATH_ENV) or env.get("PATH", "")
+    env["PATH"] = f"{shim_dir}{os.pathsep}{env.get('PATH', '')}"
+    env[REPLAY_MODE_ENV] = mode
+    env[REPLAY_DIR_ENV] = str(replay_dir)
+    env[LATENCY_SCALE_ENV] = str(latency_scale)
+    env["AWS_COLLECTION_BACKEND"] = "cli"
+    env.pop("STEAMPIPE_DATABASE_URL", None)
+    return env
+
+
+def run_command(mode: str, command: List[str], replay_dir: Path, latency_scale: float = 1.0,
+                env: Optional[Dict[str, str]] = None, capture_output: bool = False) -> subprocess.CompletedProcess:
+    """가짜 실행 파일을 PATH에 둔 상태로 명령 실행"""
+    shim_dir = create_shim_dir()
+    try:
+        return subprocess.run(command, env=build_env(mode, shim_dir, replay_dir, latency_scale, env),
+                              cwd=str(SCRIPT_DIR), capture_output=capture_output, text=True)
+    finally:
+        shutil.rmtree(shim_dir, ignore_errors=True)
+
+
+def get_recording_stats(replay_dir: Path) -> Dict[str, Dict[str, float]]:
+    """도구별 기록 수, 크기, 기록된 소요 시간 합계"""
+    stats = {}
+    for tool in TOOLS:
+        paths = list((replay_dir / tool).glob("*.json"))
+        duration = 0.0
+        for path in paths:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    duration += json.load(f).get("duration", 0.0)
+            except (OSError, ValueError):
+                continue
+        stats[tool] = {
+            "recordings": len(paths),
+            "bytes": sum(path.stat().st_size for path in paths),
+            "duration": duration,
+        }
+    return stats
+
+
+def run_benchmark(levels: List[int], replay_dir: Path, latency_scale: float = 1.0,
+                  script_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """동시 실행 수별로 재생 환경에서 collect_all_data.py를 실행하고 처리량 측정"""
+    results = []
+    for level in levels:
+        env = dict(os.environ)
+        env["STEAMPIPE_CONCURRENCY"] = f"aws={level},kubernetes={level},other={level}"
+        env["IAC_STACK_CONCURRENCY"] = str(level)
+        if script_workers:
+            env["COLLECTION_SCRIPT_WORKERS"] = str(script_workers)
+        for name in ("STEAMPIPE_INCREMENTAL", METRICS_FILE_ENV):
+            env.pop(name, None)
+
+        print(f"▶ 동시 실행 {level}: collect_all_data.py 재생 실행 중...", flush=True)
+        start_time = time.time()
+        result = run_command("replay", [sys.executable, str(SCRIPT_DIR / "collect_all_data.py")],
+                             replay_dir, latency_scale, env, capture_output=True)
+        wall = time.time() - start_time
+
+        summary = summarize(load_records(REPORT_DIR / METRICS_FILE))
+        results.append({
+            "concurrency": level,
+            "returncode": result.returncode,
+            "wall_seconds": round(wall, 2),
+            "queries": summary["queries"],
+            "failed": summary["failed"],
+            "bytes": summary["bytes"],
+            "query_seconds": round(summary["query_seconds"], 2),
+            "queries_per_second": round(summary["queries"] / wall, 2) if wall else 0.0,
+            "bytes_per_second": round(summary["bytes"] / wall, 1) if wall else 0.0,
+        })
+    return results
+
+
+def print_benchmark(results: List[Dict[str, Any]]):
+    print(f"\n{'동시 실행':>8} {'전체(초)':>9} {'쿼리':>6} {'실패':>5} {'쿼리/s':>8} {'KB/s':>9} {'배속':>6}")
+    baseline = results[0]["wall_seconds"] if results else 0
+    for result in results:
+        speedup = baseline / result["wall_seconds"] if result["wall_seconds"] else 0.0
+        print(f"{result['concurrency']:>8} {result['wall_seconds']:>9.1f} {result['queries']:>6} {result['failed']:>5} "
+              f"{result['queries_per_second']:>8.1f} {result['bytes_per_second'] / 1024:>9.1f} {speedup:>5.2f}x")
+
+
+def strip_separator(command: List[str]) -> List[str]:
+    return command[1:] if command[:1] == ["--"] else command
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "shim":
+        sys.exit(run_shim(sys.argv[2], sys.argv[3:]))
+
+    parser = argparse.ArgumentParser(description="수집기 오프라인 재생 및 벤치마크")
+    parser.add_argument("--dir", default=None, help="기록 디렉토리 (기본값: ~/.cache/aws-arch-analysis/replay)")
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    record_parser = subparsers.add_parser("record", help="명령을 실행하며 steampipe/aws 출력 기록")
+    record_parser.add_argument("command", nargs=argparse.REMAINDER)
+
+    replay_parser = subparsers.add_parser("replay", help="기록으로 명령 재생")
+    replay_parser.add_argument("--latency-scale", type=float, default=1.0, help="기록된 지연 배율 (0이면 지연 없음)")
+    replay_parser.add_argument("command", nargs=argparse.REMAINDER)
+
+    benchmark_parser = subparsers.add_parser("benchmark", help="동시 실행 수별 collect_all_data.py 재생 벤치마크")
+    benchmark_parser.add_argument("--concurrency", default="1,2,4,8", help="플러그인별 동시 실행 수 목록 (기본값: 1,2,4,8)")
+    benchmark_parser.add_argument("--script-workers", type=int, default=None, help="동시에 실행할 수집 스크립트 수")
+    benchmark_parser.add_argument("--latency-scale", type=float, default=1.0, help="기록된 지연 배율")
+    benchmark_parser.add_argument("--output", default=None, help="결과 JSON 파일")
+
+    subparsers.add_parser("stats", help="기록 현황")
+    args = parser.parse_args()
+
+    replay_dir = get_replay_dir(args.dir)
+    if args.action in ("record", "replay"):
+        command = strip_separator(args.command)
+        if not command:
+            parser.error("실행할 명령을 지정하세요 (예: -- python3 collect_all_data.py)")
+        latency_scale = getattr(args, "latency_scale", 1.0)
+        sys.exit(run_command(args.action, command, replay_dir, latency_scale).returncode)
+
+    if args.action == "stats":
+        for tool, stats in get_recording_stats(replay_dir).items():
+            print(f"{tool:<10} 기록 {stats['recordings']:>5}개, {stats['bytes'] / 1024:>10.1f} KB, "
+                  f"기록된 소요 시간 합계 {stats['duration']:.1f}초")
+        return
+
+    if not any(stats["recordings"] for stats in get_recording_stats(replay_dir).values()):
+        print(f"기록이 없습니다: {replay_dir} (먼저 record로 실제 실행을 기록하세요)")
+        sys.exit(1)
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    results = run_benchmark(levels, replay_dir, args.latency_scale, args.script_workers)
+    print_benchmark(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
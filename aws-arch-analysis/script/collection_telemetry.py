@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+수집 쿼리 텔레메트리
+모든 수집기의 쿼리 실행마다 소요 시간, 바이트, 행 수, 재시도 횟수, 종료 상태, 플러그인을 기록
+
+- 쿼리 엔진(Steampipe)과 AWS CLI/SDK 수집기가 measure_query()로 쿼리 하나를 측정
+- 스케줄러가 query_context()로 작업 설명/출력 파일을 지정하면 같은 스레드의 측정 기록에 포함
+- 재시도 계층(run_with_backoff, call_with_retry)은 note_retry()로 진행 중인 기록의 재시도 횟수 증가
+- 기록은 실행 단위 JSON Lines 파일(COLLECTION_METRICS_FILE, 기본값: report/collection_metrics.jsonl)에
+  여러 수집기 프로세스가 잠금 파일(fcntl)로 추가 기록
+- 실행이 끝나면 Prometheus textfile(collection_metrics.prom)과 느린 쿼리 상위 N개, 처리량(bytes/s) 요약 생성
+
+사용법:
+    python collection_telemetry.py              # 마지막 실행 요약 출력 및 Prometheus textfile 생성
+    python collection_telemetry.py --top 20     # 느린 쿼리 상위 20개
+"""
+
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+METRICS_FILE_ENV = "COLLECTION_METRICS_FILE"
+RUN_ID_ENV = "COLLECTION_RUN_ID"
+METRICS_FILE = "collection_metrics.jsonl"
+PROMETHEUS_FILE = "collection_metrics.prom"
+DEFAULT_REPORT_DIR = Path(__file__).parent.parent / "report"
+METRIC_PREFIX = "aws_collection"
+
+_local = threading.local()
+_default_run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+
+
+def get_metrics_path() -> Path:
+    """이번 실행의 측정 기록 파일 경로"""
+    return Path(os.environ.get(METRICS_FILE_ENV) or DEFAULT_REPORT_DIR / METRICS_FILE)
+
+
+def get_run_id() -> str:
+    """실행 ID (collect_all_data.py가 지정하지 않으면 프로세스별 ID)"""
+    return os.environ.get(RUN_ID_ENV) or _default_run_id
+
+
+def _stack() -> List[Dict[str, Any]]:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+@contextmanager
+def query_context(**labels) -> Iterator[None]:
+    """같은 스레드에서 측정되는 쿼리 기록에 작업 라벨(description, output 등) 추가"""
+    previous = getattr(_local, "labels", {})
+    _local.labels = dict(previous, **{key: value for key, value in labels.items() if value is not None})
+    try:
+        yield
+    finally:
+        _local.labels = previous
+
+
+def note(**fields):
+    """진행 중인 측정 기록의 필드 갱신 (측정 중이 아니면 무시)"""
+    stack = _stack()
+    if stack:
+        stack[-1].update(fields)
+
+
+def note_retry():
+    """진행 중인 측정 기록의 재시도 횟수 증가"""
+    stack = _stack()
+    if stack:
+        stack[-1]["retries"] += 1
+
+
+@contextmanager
+def measure_query(query: str, plugin: str) -> Iterator[Dict[str, Any]]:
+    """쿼리 실행 하나를 측정해 기록 파일에 추가 (호출자는 yield된 기록에 bytes, rows 등을 채움)"""
+    record = {
+        "run_id": get_run_id(),
+        "collector": Path(sys.argv[0]).stem or "interactive",
+        "description": None,
+        "output": None,
+        "plugin": plugin,
+        "query_hash": hashlib.sha256(query.encode("utf-8")).hexdigest()[:12],
+        "started_at": datetime.now().isoformat(timespec="milliseconds"),
+        "duration": 0.0,
+        "bytes": None,
+        "rows": None,
+        "retries": 0,
+        "status": "ok",
+        "exit_code": 0,
+        "cached": False,
+    }
+    record.update(getattr(_local, "labels", {}))
+    stack = _stack()
+    stack.append(record)
+    start_time = time.time()
+    try:
+        yield record
+    except subprocess.TimeoutExpired:
+        record.update(status="timeout", exit_code=None)
+        raise
+    except subprocess.CalledProcessError as e:
+        record.update(status="error", exit_code=e.returncode)
+        raise
+    except Exception as e:
+        record.update(status="error", exit_code=None, error=type(e).__name__)
+        raise
+    finally:
+        record["duration"] = round(time.time() - start_time, 4)
+        stack.pop()
+        write_record(record)
+
+
+def count_response_items(data: Any) -> int:
+    """AWS API 응답의 항목 수 (목록이면 길이, 객체면 최상위 목록 값들의 길이 합계)"""
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict):
+        return sum(len(value) for value in data.values() if isinstance(value, list))
+    return 0
+
+
+def write_record(record: Dict[str, Any]):
+    """측정 기록 한 줄을 기록 파일에 추가 (여러 프로세스가 동시에 기록하므로 잠금 후 추가)"""
+    path = get_metrics_path()
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(line)
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    except OSError:
+        pass  # 측정 기록 실패가 수집을 중단시키지 않도록 무시
+
+
+def load_records(path=None, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """기록 파일의 측정 기록 (run_id를 지정하지 않으면 마지막 실행)"""
+    path = Path(path) if path else get_metrics_path()
+    if not path.exists():
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    if run_id is None and records:
+        run_id = records[-1].get("run_id")
+    return [record for record in records if record.get("run_id") == run_id]
+
+
+def query_label(record: Dict[str, Any]) -> str:
+    """요약에 표시할 쿼리 이름 (출력 파일, 설명, 쿼리 해시 순)"""
+    return record.get("output") or record.get("description") or record["query_hash"]
+
+
+def summarize(records: List[Dict[str, Any]], top_n: int = 10) -> Dict[str, Any]:
+    """전체/플러그인별 합계, 처리량, 가장 느린 쿼리 상위 N개"""
+    plugins = defaultdict(lambda: {"queries": 0, "failed": 0, "duration": 0.0, "bytes": 0, "rows": 0, "retries": 0})
+    for record in records:
+        totals = plugins[record.get("plugin") or "other"]
+        totals["queries"] += 1
+        totals["failed"] += record.get("status") != "ok"
+        totals["duration"] += record.get("duration") or 0.0
+        totals["bytes"] += record.get("bytes") or 0
+        totals["rows"] += record.get("rows") or 0
+        totals["retries"] += record.get("retries") or 0
+    for totals in plugins.values():
+        totals["bytes_per_second"] = totals["bytes"] / totals["duration"] if totals["duration"] else 0.0
+
+    total_duration = sum(totals["duration"] for totals in plugins.values())
+    total_bytes = sum(totals["bytes"] for totals in plugins.values())
+    window = 0.0
+    if records:
+        starts = [datetime.fromisoformat(record["started_at"]).timestamp() for record in records]
+        ends = [start + (record.get("duration") or 0.0) for start, record in zip(starts, records)]
+        window = max(ends) - min(starts)
+
+    return {
+        "queries": len(records),
+        "failed": sum(totals["failed"] for totals in plugins.values()),
+        "retries": sum(totals["retries"] for totals in plugins.values()),
+        "query_seconds": total_duration,
+        "window_seconds": window,
+        "bytes": total_bytes,
+        "bytes_per_second": total_bytes / window if window else 0.0,
+        "plugins": dict(sorted(plugins.items())),
+        "slowest": sorted(records, key=lambda record: record.get("duration") or 0.0, reverse=True)[:top_n],
+    }
+
+
+def format_bytes(size: float) -> str:
+    """바이트 수를 읽기 쉬운 단위로 변환"""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """요약을 콘솔 출력용 텍스트로 변환"""
+    lines = [
+        f"쿼리 {summary['queries']}개 (실패 {summary['failed']}개, 재시도 {summary['retries']}회), "
+        f"쿼리 시간 합계 {summary['query_seconds']:.1f}초, 수집 구간 {summary['window_seconds']:.1f}초",
+        f"수집 데이터 {format_bytes(summary['bytes'])}, 처리량 {format_bytes(summary['bytes_per_second'])}/s",
+    ]
+    for plugin, totals in summary["plugins"].items():
+        lines.append(f"  - {plugin:<12} 쿼리 {totals['queries']:>4}개, {totals['duration']:>8.1f}초, "
+                     f"{format_bytes(totals['bytes']):>10}, {format_bytes(totals['bytes_per_second'])}/s")
+    if summary["slowest"]:
+        lines.append(f"가장 느린 쿼리 상위 {len(summary['slowest'])}개:")
+        for index, record in enumerate(summary["slowest"], 1):
+            rows = record.get("rows")
+            lines.append(
+                f"  {index:>2}. {record.get('duration', 0.0):>7.1f}초  {query_label(record)} "
+                f"[{record.get('collector')}, {record.get('plugin')}, {record.get('status')}] "
+                f"{format_bytes(record.get('bytes') or 0)}, 행 {rows if rows is not None else '-'}, "
+                f"재시도 {record.get('retries', 0)}"
+            )
+    return "\n".join(lines)
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape_label(value)}"' for key, value in labels.items()) + "}"
+
+
+def format_prometheus(records: List[Dict[str, Any]]) -> str:
+    """측정 기록을 Prometheus textfile 형식으로 변환 (쿼리별 게이지 + 수집기/플러그인별 합계)"""
+    per_query = {}
+    per_collector = defaultdict(lambda: defaultdict(float))
+    for record in records:
+        key = (record.get("collector"), query_label(record), record["query_hash"], record.get("plugin") or "other")
+        values = per_query.setdefault(key, defaultdict(float))
+        values["duration_seconds"] += record.get("duration") or 0.0
+        values["bytes"] += record.get("bytes") or 0
+        values["rows"] += record.get("rows") or 0
+        values["retries"] += record.get("retries") or 0
+        values["failed"] = max(values["failed"], float(record.get("status") != "ok"))
+
+        totals = per_collector[(record.get("collector"), record.get("plugin") or "other", record.get("status"))]
+        totals["queries"] += 1
+        totals["duration_seconds"] += record.get("duration") or 0.0
+        totals["bytes"] += record.get("bytes") or 0
+        totals["retries"] += record.get("retries") or 0
+
+    lines = []
+    query_metrics = (
+        ("duration_seconds", "Wall time spent on the query in this run"),
+        ("bytes", "Bytes of query output written in this run"),
+        ("rows", "Rows returned by the query in this run"),
+        ("retries", "Retries caused by throttling or transient errors"),
+        ("failed", "1 if the query failed in this run"),
+    )
+    for field, help_text in query_metrics:
+        name = f"{METRIC_PREFIX}_query_{field}"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for (collector, query, query_hash, plugin), values in sorted(per_query.items()):
+            labels = _labels(collector=collector, query=query, query_hash=query_hash, plugin=plugin)
+            lines.append(f"{name}{labels} {values[field]:g}")
+
+    total_metrics = (
+        ("queries", "Queries executed in this run"),
+        ("duration_seconds", "Total query wall time in this run"),
+        ("bytes", "Total bytes of query output in this run"),
+        ("retries", "Total retries in this run"),
+    )
+    for field, help_text in total_metrics:
+        name = f"{METRIC_PREFIX}_{field}_total"
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for (collector, plugin, status), totals in sorted(per_collector.items()):
+            lines.append(f"{name}{_labels(collector=collector, plugin=plugin, status=status)} {totals[field]:g}")
+
+    name = f"{METRIC_PREFIX}_last_run_timestamp_seconds"
+    lines += [f"# HELP {name} Time the metrics file was written", f"# TYPE {name} gauge", f"{name} {time.time():.0f}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(records: List[Dict[str, Any]], path) -> Path:
+    """Prometheus textfile 기록 (node_exporter가 쓰는 도중의 파일을 읽지 않도록 임시 파일 후 교체)"""
+    path = Path(path)
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(format_prometheus(records))
+    os.replace(temp_path, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 쿼리 텔레메트리 요약")
+    parser.add_argument("--metrics-file", default=None, help=f"측정 기록 파일 (기본값: report/{METRICS_FILE})")
+    parser.add_argument("--run-id", default=None, help="요약할 실행 ID (기본값: 마지막 실행)")
+    parser.add_argument("--top", type=int, default=10, help="표시할 느린 쿼리 수 (기본값: 10)")
+    parser.add_argument("--prometheus", default=None, help=f"Prometheus textfile 경로 (기본값: 기록 파일 옆 {PROMETHEUS_FILE})")
+    args = parser.parse_args()
+
+    metrics_path = Path(args.metrics_file) if args.metrics_file else get_metrics_path()
+    records = load_records(metrics_path, args.run_id)
+    if not records:
+        print(f"측정 기록이 없습니다: {metrics_path}")
+        sys.exit(1)
+
+    print(format_summary(summarize(records, args.top)))
+    prometheus_path = write_prometheus(records, args.prometheus or metrics_path.with_name(PROMETHEUS_FILE))
+    print(f"Prometheus textfile: {prometheus_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -320,16 +320,28 @@ ls -la "$REPORT_DIR"/*.md
 echo ""
 echo "🔄 변환 시작..."
 
-convert_markdown_to_html "01-executive-summary.md" "01-executive-summary.html" "경영진 요약"
-convert_markdown_to_html "02-networking-analysis.md" "02-networking-analysis.html" "네트워킹 분석"
-convert_markdown_to_html "03-compute-analysis.md" "03-compute-analysis.html" "컴퓨팅 분석"
-convert_markdown_to_html "04-storage-analysis.md" "04-storage-analysis.html" "스토리지 분석"
-convert_markdown_to_html "05-database-analysis.md" "05-database-analysis.html" "데이터베이스 분석"
-convert_markdown_to_html "06-security-analysis.md" "06-security-analysis.html" "보안 분석"
-convert_markdown_to_html "07-cost-optimization.md" "07-cost-optimization.html" "비용 최적화"
-convert_markdown_to_html "08-application-analysis.md" "08-application-analysis.html" "애플리케이션 분석"
-convert_markdown_to_html "09-monitoring-analysis.md" "09-monitoring-analysis.html" "모니터링 분석"
-convert_markdown_to_html "10-recommendations.md" "10-recommendations.html" "종합 권장사항"
+# 변환 대상 (Markdown 파일|HTML 파일|제목)
+REPORTS=(
+    "01-executive-summary.md|01-executive-summary.html|경영진 요약"
+    "02-networking-analysis.md|02-networking-analysis.html|네트워킹 분석"
+    "03-compute-analysis.md|03-compute-analysis.html|컴퓨팅 분석"
+    "04-storage-analysis.md|04-storage-analysis.html|스토리지 분석"
+    "05-database-analysis.md|05-database-analysis.html|데이터베이스 분석"
+    "06-security-analysis.md|06-security-analysis.html|보안 분석"
+    "07-cost-optimization.md|07-cost-optimization.html|비용 최적화"
+    "08-application-analysis.md|08-application-analysis.html|애플리케이션 분석"
+    "09-monitoring-analysis.md|09-monitoring-analysis.html|모니터링 분석"
+    "10-recommendations.md|10-recommendations.html|종합 권장사항"
+)
+
+# 인자로 Markdown 파일명을 주면 해당 보고서만 변환 (analysis_pipeline.py의 부분 재생성용)
+for report in "${REPORTS[@]}"; do
+    IFS='|' read -r md_file html_file title <<< "$report"
+    if [ $# -gt 0 ] && [[ ! " $* " == *" $md_file "* ]]; then
+        continue
+    fi
+    convert_markdown_to_html "$md_file" "$html_file" "$title"
+done
 
 echo ""
 echo "🎉 Markdown → HTML 변환 완료!"
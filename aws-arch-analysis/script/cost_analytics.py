@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+비용 분석 엔진 (NumPy 벡터 연산)
+비용 시계열 저장소(cost_timeseries_store.py)의 일간 비용을 (서비스 x 일) 배열로 읽어 추세, 이상, 예측을 계산
+
+- 확정일(settled_through) 이후의 부분 반영된 날짜는 제외 (마지막 날이 이상으로 잡히거나 주간 변화/예측이 왜곡되지 않도록)
+
+- 7일 이동 평균, 주간(최근 7일 대 직전 7일) 변화
+- 서비스별 z-score 이상 탐지: 각 날짜를 직전 28일 평균/표준편차와 비교 (누적합으로 모든 서비스와 날짜를 한 번에 계산)
+- 로컬 예측: 최근 90일 총비용에 추세 + 요일 효과 선형 회귀를 적합하고 예측 구간(신뢰 대역) 계산
+  (과금되는 aws_cost_forecast_* API 호출 없이 수집된 이력만 사용)
+- NumPy는 선택적 의존성이며, 설치되지 않았으면 available()이 False이고 보고서는 해당 섹션을 생략
+
+사용법:
+    python cost_analytics.py                                   # 리포트 디렉토리의 비용 이력 분석 결과 표시
+    python cost_analytics.py --benchmark --services 500 --days 1095
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+sys.path.append(str(Path(__file__).parent))
+from cost_timeseries_store import CostTimeSeriesStore
+
+ROLLING_WINDOW = 7
+ANOMALY_WINDOW = 28
+ANOMALY_THRESHOLD = 3.0
+ANOMALY_LOOKBACK_DAYS = 7
+# 표준편차가 매우 작은 서비스에서 사소한 변화가 이상으로 잡히지 않도록 하는 최소 금액 변화
+ANOMALY_MIN_AMOUNT = 1.0
+FORECAST_TRAINING_DAYS = 90
+FORECAST_HORIZON_DAYS = 30
+CONFIDENCE_Z = 1.96
+
+
+def available() -> bool:
+    """NumPy 사용 가능 여부"""
+    return np is not None
+
+
+class CostMatrix(NamedTuple):
+    """키(서비스 등) x 일 비용 배열 (데이터가 없는 날은 0)"""
+    keys: List[str]
+    days: List[str]
+    values: Any
+
+
+def load_cost_matrix(store: CostTimeSeriesStore, dimension: str = "service") -> Optional[CostMatrix]:
+    """저장소의 일간 비용을 첫 날부터 확정일까지 빈 날 없는 배열로 로드"""
+    # 확정일이 없으면 (기록 전 데이터베이스) 모든 날짜 사용
+    settled_through = store.settled_through(dimension) or "9999-12-31"
+    rows = store.connection.execute(
+        "select key, cast(julianday(day) as integer), amount from daily_cost where dimension = ? and day <= ?",
+        (dimension, settled_through)).fetchall()
+    if not rows:
+        return None
+    keys, day_numbers, amounts = zip(*rows)
+    key_names, key_index = np.unique(np.array(keys, dtype=object), return_inverse=True)
+    day_numbers = np.array(day_numbers, dtype=np.int64)
+    first_day = day_numbers.min()
+    day_count = int(day_numbers.max() - first_day) + 1
+    values = np.zeros((len(key_names), day_count))
+    np.add.at(values, (key_index, day_numbers - first_day), np.array(amounts, dtype=float))
+    start = date.fromisoformat(store.coverage(dimension)[0])
+    days = [(start + timedelta(days=offset)).isoformat() for offset in range(day_count)]
+    return CostMatrix(list(key_names), days, values)
+
+
+def rolling_mean(values, window: int = ROLLING_WINDOW):
+    """마지막 축 기준 이동 평균 (앞쪽 window-1일은 NaN)"""
+    cumulative = np.cumsum(np.insert(values, 0, 0.0, axis=-1), axis=-1)
+    result = np.full(values.shape, np.nan)
+    result[..., window - 1:] = (cumulative[..., window:] - cumulative[..., :-window]) / window
+    return result
+
+
+def week_over_week(matrix: CostMatrix, limit: int = 10) -> List[Dict[str, Any]]:
+    """최근 7일과 직전 7일의 키별 합계 비교 (변화 금액 절댓값 큰 순)"""
+    if len(matrix.days) < 2 * ROLLING_WINDOW:
+        return []
+    current = matrix.values[:, -ROLLING_WINDOW:].sum(axis=1)
+    previous = matrix.values[:, -2 * ROLLING_WINDOW:-ROLLING_WINDOW].sum(axis=1)
+    change = current - previous
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = np.where(previous > 0, change * 100 / previous, np.nan)
+    order = np.argsort(-np.abs(change))[:limit]
+    return [{
+        "key": matrix.keys[index],
+        "current": float(current[index]),
+        "previous": float(previous[index]),
+        "change": float(change[index]),
+        "change_pct": None if np.isnan(change_pct[index]) else float(change_pct[index]),
+    } for index in order if change[index] != 0]
+
+
+def detect_anomalies(matrix: CostMatrix, window: int = ANOMALY_WINDOW, threshold: float = ANOMALY_THRESHOLD,
+                     lookback: int = ANOMALY_LOOKBACK_DAYS, limit: int = 20) -> List[Dict[str, Any]]:
+    """최근 lookback일 중 직전 window일 대비 |z| >= threshold인 (키, 날짜), |z| 큰 순"""
+    values = matrix.values
+    if values.shape[1] <= window:
+        return []
+    cumulative = np.cumsum(np.insert(values, 0, 0.0, axis=1), axis=1)
+    cumulative_squares = np.cumsum(np.insert(values ** 2, 0, 0.0, axis=1), axis=1)
+    # day >= window인 각 날짜의 직전 window일 (현재 날짜 제외) 평균/표준편차
+    window_sum = cumulative[:, window:-1] - cumulative[:, :-window - 1]
+    window_square_sum = cumulative_squares[:, window:-1] - cumulative_squares[:, :-window - 1]
+    mean = window_sum / window
+    std = np.sqrt(np.maximum(window_square_sum / window - mean ** 2, 0.0))
+    actual = values[:, window:]
+
+    lookback = min(lookback, actual.shape[1])
+    mean, std, actual = mean[:, -lookback:], std[:, -lookback:], actual[:, -lookback:]
+    deviation = actual - mean
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_scores = np.where(std > 0, deviation / std, 0.0)
+    flagged = (np.abs(z_scores) >= threshold) & (np.abs(deviation) >= ANOMALY_MIN_AMOUNT)
+
+    key_indexes, day_offsets = np.nonzero(flagged)
+    order = np.argsort(-np.abs(z_scores[key_indexes, day_offsets]))[:limit]
+    first_day = len(matrix.days) - lookback
+    return [{
+        "key": matrix.keys[key_indexes[i]],
+        "day": matrix.days[first_day + day_offsets[i]],
+        "amount": float(actual[key_indexes[i], day_offsets[i]]),
+        "expected": float(mean[key_indexes[i], day_offsets[i]]),
+        "z_score": float(z_scores[key_indexes[i], day_offsets[i]]),
+    } for i in order]
+
+
+def forecast(daily_totals, last_day: str, training_days: int = FORECAST_TRAINING_DAYS,
+             horizon: int = FORECAST_HORIZON_DAYS, confidence_z: float = CONFIDENCE_Z) -> Optional[Dict[str, Any]]:
+    """추세 + 요일 효과 선형 회귀로 일별 예측값과 예측 구간 계산
+
+    예측 구간은 잔차 분산과 설계 행렬의 레버리지로 계산 (sigma^2 * (1 + x0^T (X^T X)^-1 x0))
+    """
+    history = np.asarray(daily_totals, dtype=float)[-training_days:]
+    if len(history) < 2 * ROLLING_WINDOW:
+        return None
+    last = date.fromisoformat(last_day)
+    offsets = np.arange(-len(history) + 1, horizon + 1)
+    weekdays = np.array([(last + timedelta(days=int(offset))).weekday() for offset in offsets])
+    # 절편, 추세, 요일 더미(월요일 기준 6개)
+    design = np.column_stack([np.ones(len(offsets)), offsets / len(history)] +
+                             [(weekdays == weekday).astype(float) for weekday in range(1, 7)])
+    train, future = design[:len(history)], design[len(history):]
+
+    coefficients, _, rank, _ = np.linalg.lstsq(train, history, rcond=None)
+    residuals = history - train @ coefficients
+    degrees_of_freedom = max(1, len(history) - rank)
+    sigma = np.sqrt(residuals @ residuals / degrees_of_freedom)
+    leverage = np.einsum("ij,jk,ik->i", future, np.linalg.pinv(train.T @ train), future)
+    mean = np.maximum(future @ coefficients, 0.0)
+    band = confidence_z * sigma * np.sqrt(1 + leverage)
+
+    # 기간 합계의 구간은 일별 오차가 독립이라고 보고 분산을 합산
+    total_band = confidence_z * sigma * np.sqrt(np.sum(1 + leverage))
+    return {
+        "days": [(last + timedelta(days=offset)).isoformat() for offset in range(1, horizon + 1)],
+        "mean": mean,
+        "lower": np.maximum(mean - band, 0.0),
+        "upper": mean + band,
+        "total": float(mean.sum()),
+        "total_lower": float(max(0.0, mean.sum() - total_band)),
+        "total_upper": float(mean.sum() + total_band),
+        "daily_trend": float(coefficients[1] / len(history)),
+        "residual_std": float(sigma),
+    }
+
+
+def analyze(store: CostTimeSeriesStore, dimension: str = "service") -> Optional[Dict[str, Any]]:
+    """보고서용 분석 결과 (NumPy가 없거나 데이터가 없으면 None)"""
+    if not available():
+        return None
+    matrix = load_cost_matrix(store, dimension)
+    if matrix is None:
+        return None
+    totals = matrix.values.sum(axis=0)
+    return {
+        "first_day": matrix.days[0],
+        "last_day": matrix.days[-1],
+        "key_count": len(matrix.keys),
+        "daily_totals": totals,
+        "rolling_mean": rolling_mean(totals),
+        "week_over_week": week_over_week(matrix),
+        "anomalies": detect_anomalies(matrix),
+        "forecast": forecast(totals, matrix.days[-1]),
+    }
+
+
+def run_benchmark(services: int, days: int, seed: int = 42):
+    """임의의 서비스 x 일 비용 배열로 분석 함수별 실행 시간 측정"""
+    random = np.random.default_rng(seed)
+    base = random.gamma(2.0, 50.0, size=(services, 1))
+    values = base * (1 + 0.1 * random.standard_normal((services, days)))
+    values[random.integers(services, size=services // 10), -random.integers(1, 7, size=services // 10)] *= 5
+    last_day = date.today() - timedelta(days=1)
+    matrix = CostMatrix([f"service-{i}" for i in range(services)],
+                        [(last_day - timedelta(days=days - 1 - i)).isoformat() for i in range(days)], values)
+
+    timings = {}
+    for name, run in (
+        ("rolling_mean", lambda: rolling_mean(matrix.values)),
+        ("week_over_week", lambda: week_over_week(matrix)),
+        ("detect_anomalies", lambda: detect_anomalies(matrix)),
+        ("forecast", lambda: forecast(matrix.values.sum(axis=0), matrix.days[-1])),
+    ):
+        start_time = time.perf_counter()
+        result = run()
+        timings[name] = (time.perf_counter() - start_time, result)
+
+    print(f"비용 분석 벤치마크: 서비스 {services}개 x {days}일 ({services * days:,}개 값)")
+    for name, (duration, _) in timings.items():
+        print(f"  {name:<18} {duration * 1000:>8.1f} ms")
+    print(f"  이상 탐지 건수: {len(timings['detect_anomalies'][1])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비용 추세/이상/예측 분석")
+    parser.add_argument("--benchmark", action="store_true", help="임의 데이터로 분석 함수 실행 시간 측정")
+    parser.add_argument("--services", type=int, default=500, help="벤치마크 서비스 수 (기본값: 500)")
+    parser.add_argument("--days", type=int, default=1095, help="벤치마크 일수 (기본값: 1095)")
+    args = parser.parse_args()
+
+    if not available():
+        print("NumPy가 설치되지 않았습니다: pip install numpy")
+        return 1
+    if args.benchmark:
+        run_benchmark(args.services, args.days)
+        return 0
+
+    with CostTimeSeriesStore(Path(__file__).parent.parent / "report") as store:
+        store.sync()
+        result = analyze(store)
+    if result is None:
+        print("분석할 일간 비용 데이터가 없습니다.")
+        return 1
+    print(f"기간: {result['first_day']} ~ {result['last_day']}, 서비스 {result['key_count']}개")
+    for anomaly in result["anomalies"][:10]:
+        print(f"  이상: {anomaly['day']} {anomaly['key'][:40]:<40} ${anomaly['amount']:,.2f} "
+              f"(평소 ${anomaly['expected']:,.2f}, z={anomaly['z_score']:+.1f})")
+    if result["forecast"]:
+        prediction = result["forecast"]
+        print(f"  향후 {len(prediction['days'])}일 예측: ${prediction['total']:,.2f} "
+              f"(${prediction['total_lower']:,.2f} ~ ${prediction['total_upper']:,.2f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
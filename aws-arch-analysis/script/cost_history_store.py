@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Cost Explorer 비용 이력 저장소
+월간/일간 비용 시계열을 로컬에 누적해 매 수집마다 새로 생긴 기간만 Cost Explorer에서 조회
+
+- 시계열(조회 차원 x 월간/일간)별로 행과 마지막 확정일을 report/.cost_history/<시계열>.json에 저장
+- 조회 구간은 확정일 다음 날부터 오늘까지이며, 늦게 반영되는 정정(크레딧, 환불 등)을 위해 정정 기간만큼 앞당김
+  (월간 시계열은 해당 월의 1일부터)
+- 조회 구간의 기존 행은 새 결과로 교체하고, 오늘에서 확정 지연일을 뺀 날짜까지를 확정으로 기록
+- 첫 수집(또는 COST_HISTORY_FULL=1)은 시계열별 초기 구간 전체를 조회
+- cost_*.json은 저장소에서 기존 쿼리와 같은 정렬 및 개수 제한으로 생성
+- 확정 지연일: COST_SETTLE_DAYS 환경 변수 (기본값: 2), 정정 기간: COST_RESTATEMENT_DAYS 환경 변수 (기본값: 3)
+- 여러 프로세스가 같은 시계열을 갱신할 수 있으므로 잠금 파일(fcntl)로 읽기-병합-쓰기
+
+사용법:
+    python cost_history_store.py            # 시계열별 저장 행 수와 확정일 표시
+"""
+
+import fcntl
+import json
+import os
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Sequence, Tuple
+
+sys.path.append(str(Path(__file__).parent))
+from steampipe_query_engine import StreamingResultWriter
+
+HISTORY_DIR_ENV = "COST_HISTORY_DIR"
+FULL_REFRESH_ENV = "COST_HISTORY_FULL"
+SETTLE_DAYS_ENV = "COST_SETTLE_DAYS"
+RESTATEMENT_DAYS_ENV = "COST_RESTATEMENT_DAYS"
+DEFAULT_HISTORY_DIR = Path(__file__).parent.parent / "report" / ".cost_history"
+DEFAULT_SETTLE_DAYS = 2
+DEFAULT_RESTATEMENT_DAYS = 3
+
+MONTHLY = "MONTHLY"
+DAILY = "DAILY"
+
+COST_METRIC_COLUMNS = (
+    "period_start", "period_end", "blended_cost_amount", "blended_cost_unit", "unblended_cost_amount",
+    "unblended_cost_unit",
+)
+
+
+class CostSeries(NamedTuple):
+    """저장소에 누적하는 비용 시계열
+
+    dimensions: 기간 외에 행을 구분하는 컬럼
+    initial_days: 저장소가 비어 있을 때 조회하는 구간 (일)
+    limit, order_by_amount: cost_*.json 생성 시 기존 쿼리와 같은 개수 제한과 정렬
+    """
+    name: str
+    description: str
+    table: str
+    dimensions: Tuple[str, ...]
+    granularity: str
+    output_file: str
+    initial_days: int
+    limit: int
+    order_by_amount: bool = True
+
+
+COST_SERIES = [
+    CostSeries("account_monthly", "계정별 월간 비용", "aws_cost_by_account_monthly",
+               ("linked_account_id", "linked_account_name"), MONTHLY, "cost_by_account_monthly.json",
+               365, 12, order_by_amount=False),
+    CostSeries("account_daily", "계정별 일간 비용", "aws_cost_by_account_daily",
+               ("linked_account_id", "linked_account_name"), DAILY, "cost_by_account_daily.json",
+               90, 30, order_by_amount=False),
+    CostSeries("service_monthly", "서비스별 월간 비용", "aws_cost_by_service_monthly",
+               ("service",), MONTHLY, "cost_by_service_monthly.json", 365, 50),
+    CostSeries("service_daily", "서비스별 일간 비용", "aws_cost_by_service_daily",
+               ("service",), DAILY, "cost_by_service_daily.json", 90, 100),
+    # Cost Explorer의 리소스 단위 비용은 최근 14일만 제공
+    CostSeries("resource_monthly", "리소스별 월간 비용", "aws_cost_by_resource_monthly",
+               ("resource_id", "service"), MONTHLY, "cost_by_resource_monthly.json", 14, 50),
+    CostSeries("resource_daily", "리소스별 일간 비용", "aws_cost_by_resource_daily",
+               ("resource_id", "service"), DAILY, "cost_by_resource_daily.json", 14, 100),
+    CostSeries("record_type_monthly", "레코드 타입별 월간 비용", "aws_cost_by_record_type_monthly",
+               ("record_type",), MONTHLY, "cost_by_record_type_monthly.json", 365, 50, order_by_amount=False),
+    CostSeries("record_type_daily", "레코드 타입별 일간 비용", "aws_cost_by_record_type_daily",
+               ("record_type",), DAILY, "cost_by_record_type_daily.json", 90, 100, order_by_amount=False),
+    CostSeries("service_usage_type_monthly", "서비스 사용 타입별 월간 비용", "aws_cost_by_service_usage_type_monthly",
+               ("service", "usage_type"), MONTHLY, "cost_by_service_usage_type_monthly.json", 365, 100),
+    CostSeries("service_usage_type_daily", "서비스 사용 타입별 일간 비용", "aws_cost_by_service_usage_type_daily",
+               ("service", "usage_type"), DAILY, "cost_by_service_usage_type_daily.json", 90, 200),
+]
+COST_SERIES_BY_OUTPUT = {series.output_file: series for series in COST_SERIES}
+
+
+def get_env_days(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def period_day(row: Dict[str, Any]) -> str:
+    """행의 period_start 날짜 (YYYY-MM-DD)"""
+    return str(row.get("period_start") or "")[:10]
+
+
+class CostHistoryStore:
+    """시계열별 비용 이력 파일 (프로세스 간 잠금)"""
+
+    def __init__(self, history_dir=None, settle_days: int = None, restatement_days: int = None,
+                 full_refresh: bool = None):
+        # 환경 변수가 수집기별 기본 경로보다 우선
+        self.history_dir = Path(os.environ.get(HISTORY_DIR_ENV) or history_dir or DEFAULT_HISTORY_DIR)
+        self.settle_days = get_env_days(SETTLE_DAYS_ENV, DEFAULT_SETTLE_DAYS) if settle_days is None else settle_days
+        self.restatement_days = (get_env_days(RESTATEMENT_DAYS_ENV, DEFAULT_RESTATEMENT_DAYS)
+                                 if restatement_days is None else restatement_days)
+        self.full_refresh = (os.environ.get(FULL_REFRESH_ENV) == "1") if full_refresh is None else full_refresh
+
+    def path(self, series: CostSeries) -> Path:
+        return self.history_dir / f"{series.name}.json"
+
+    def load(self, series: CostSeries) -> Dict[str, Any]:
+        """저장된 시계열 (없으면 빈 상태)"""
+        try:
+            with open(self.path(series), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"settled_through": None, "columns": [], "rows": []}
+
+    def fetch_start(self, series: CostSeries, today: date = None) -> date:
+        """이번 수집에서 조회할 구간의 시작일"""
+        today = today or date.today()
+        settled_through = None if self.full_refresh else self.load(series).get("settled_through")
+        if settled_through:
+            start = date.fromisoformat(settled_through) + timedelta(days=1 - self.restatement_days)
+        else:
+            start = today - timedelta(days=series.initial_days)
+        start = min(start, today)
+        return start.replace(day=1) if series.granularity == MONTHLY else start
+
+    def build_query(self, series: CostSeries, start: date) -> str:
+        """조회 구간의 시계열 쿼리"""
+        columns = ", ".join(series.dimensions + COST_METRIC_COLUMNS)
+        return f"select {columns} from {series.table} where period_start >= '{start.isoformat()}' order by period_start"
+
+    def merge(self, series: CostSeries, start: date, columns: List[Dict[str, str]], rows: Sequence[Dict[str, Any]],
+              today: date = None) -> Dict[str, Any]:
+        """조회 구간의 행을 새 결과로 교체하고 확정일을 갱신한 시계열 반환"""
+        today = today or date.today()
+        self.history_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(series)
+        with open(path.with_suffix(".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                state = self.load(series)
+                start_day = start.isoformat()
+                kept = [row for row in state.get("rows", []) if period_day(row) < start_day]
+                merged = kept + list(rows)
+                merged.sort(key=lambda row: (period_day(row),) + tuple(str(row.get(d) or "") for d in series.dimensions))
+                settled_through = (today - timedelta(days=self.settle_days)).isoformat()
+                state = {
+                    "series": series.name,
+                    "table": series.table,
+                    "settled_through": max(settled_through, state.get("settled_through") or ""),
+                    "columns": columns or state.get("columns", []),
+                    "rows": merged,
+                }
+                temp_path = path.with_suffix(".tmp")
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(state, f, ensure_ascii=False, default=str)
+                os.replace(temp_path, path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return state
+
+    @staticmethod
+    def materialize(series: CostSeries, state: Dict[str, Any], output_path) -> int:
+        """기존 쿼리(최근 기간 우선, 금액 내림차순, 개수 제한)와 같은 결과 파일 생성 후 행 수 반환"""
+        rows = state.get("rows", [])
+        if series.order_by_amount:
+            rows = sorted(rows, key=lambda row: float(row.get("blended_cost_amount") or 0), reverse=True)
+        rows = sorted(rows, key=period_day, reverse=True)[:series.limit]
+        columns = state.get("columns") or [{"name": name, "data_type": "TEXT"}
+                                           for name in series.dimensions + COST_METRIC_COLUMNS]
+        with StreamingResultWriter(output_path, columns) as writer:
+            writer.write_rows(rows)
+        return len(rows)
+
+
+def main():
+    store = CostHistoryStore()
+    print(f"비용 이력 저장소: {store.history_dir}")
+    print(f"{'시계열':<30} {'확정일':>12} {'행 수':>8}  기간")
+    for series in COST_SERIES:
+        state = store.load(series)
+        rows = state.get("rows", [])
+        period = f"{period_day(rows[0])} ~ {period_day(rows[-1])}" if rows else "-"
+        print(f"{series.name:<30} {state.get('settled_through') or '-':>12} {len(rows):>8}  {period}")
+
+
+if __name__ == "__main__":
+    main()
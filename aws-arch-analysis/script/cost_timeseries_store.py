@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+비용 시계열 SQLite 저장소
+서비스/사용 타입/계정/태그별 일간 비용을 SQLite에 적재하고 주간/월간 합계와 기간별 상위 N개를 미리 집계
+
+- 원본: 비용 이력 저장소(report/.cost_history/*.json, cost_history_store.py)의 전체 이력,
+  이력이 없으면 report/cost_*.json
+- 데이터베이스: report/.cost_history/cost_timeseries.db
+- sync()는 원본 파일의 수정 시각/크기가 바뀐 차원만 다시 적재하고 집계 테이블을 재생성 (바뀌지 않았으면 바로 반환)
+- 차원별 확정일(settled_through)을 함께 기록: 이력 저장소의 확정일, 이력이 없으면 파일 수정일에서 확정 지연일을 뺀 날짜
+  (확정일 이후 날짜는 Cost Explorer에 아직 부분 반영된 비용이므로 완료 월 판정과 부분 기간 표시에 사용)
+- 보고서는 monthly_totals(), month_over_month(), weekly_totals(), top_keys()로 몇 년 치 이력도 SQL 한 번으로 조회
+- 비용 수집기가 수집 후 sync()를 호출하고, 보고서 생성기도 조회 전에 호출
+
+사용법:
+    python cost_timeseries_store.py                 # 동기화 후 차원별 적재 현황과 최근 월 전월 대비 표시
+"""
+
+import calendar
+import json
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent))
+from cost_history_store import CostHistoryStore
+from report_data_loader import extract_rows
+
+DB_FILE = "cost_timeseries.db"
+HISTORY_DIR_NAME = ".cost_history"
+TOP_N = 10
+
+
+class CostDimension(NamedTuple):
+    """적재할 비용 차원
+
+    key_columns: 차원 값을 이루는 컬럼 (여러 개면 " / "로 연결)
+    label_column: 표시용 이름 컬럼 (예: 계정 이름)
+    """
+    name: str
+    history_file: Optional[str]
+    report_file: str
+    key_columns: Tuple[str, ...]
+    label_column: Optional[str] = None
+
+
+COST_DIMENSIONS = [
+    CostDimension("service", "service_daily.json", "cost_by_service_daily.json", ("service",)),
+    CostDimension("usage_type", "service_usage_type_daily.json", "cost_by_service_usage_type_daily.json",
+                  ("service", "usage_type")),
+    CostDimension("account", "account_daily.json", "cost_by_account_daily.json", ("linked_account_id",),
+                  "linked_account_name"),
+    CostDimension("tag", None, "cost_by_tag.json", ("tag_key", "tag_value")),
+]
+
+SCHEMA = """
+create table if not exists daily_cost (
+    dimension text not null, key text not null, label text, day text not null,
+    amount real not null, unblended_amount real not null, unit text,
+    primary key (dimension, key, day)
+);
+create index if not exists daily_cost_day on daily_cost (dimension, day);
+create table if not exists weekly_cost (
+    dimension text not null, key text not null, week text not null,
+    amount real not null, unblended_amount real not null, days integer not null,
+    primary key (dimension, key, week)
+);
+create table if not exists monthly_cost (
+    dimension text not null, key text not null, month text not null,
+    amount real not null, unblended_amount real not null, days integer not null,
+    primary key (dimension, key, month)
+);
+create table if not exists top_keys (
+    dimension text not null, period_type text not null, period text not null,
+    rank integer not null, key text not null, amount real not null,
+    primary key (dimension, period_type, period, rank)
+);
+create table if not exists sources (
+    dimension text primary key, path text not null, mtime_ns integer not null, size integer not null,
+    rows integer not null, synced_at real not null, settled_through text
+);
+"""
+
+# 일간 비용에서 주간(월요일 시작)/월간 합계 생성
+ROLLUPS = {
+    "weekly_cost": ("week", "date(day, 'weekday 0', '-6 days')"),
+    "monthly_cost": ("month", "substr(day, 1, 7)"),
+}
+
+
+def to_amount(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def is_partial_month(month: str, days: int, settled_through: Optional[str]) -> bool:
+    """월의 일부 날짜만 있거나 확정되지 않은 날짜가 포함된 월인지 (month: YYYY-MM)"""
+    year, month_number = int(month[:4]), int(month[5:7])
+    month_length = calendar.monthrange(year, month_number)[1]
+    month_end = f"{month}-{month_length:02d}"
+    return days < month_length or (settled_through is not None and month_end > settled_through)
+
+
+def is_partial_week(week: str, days: int, settled_through: Optional[str]) -> bool:
+    """주의 일부 날짜만 있거나 확정되지 않은 날짜가 포함된 주인지 (week: 월요일 날짜)"""
+    week_end = (date.fromisoformat(week) + timedelta(days=6)).isoformat()
+    return days < 7 or (settled_through is not None and week_end > settled_through)
+
+
+class CostTimeSeriesStore:
+    """비용 시계열 SQLite 저장소"""
+
+    def __init__(self, report_dir, db_path=None):
+        self.report_dir = Path(report_dir)
+        self.history_dir = self.report_dir / HISTORY_DIR_NAME
+        self.db_path = Path(db_path) if db_path else self.history_dir / DB_FILE
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 비용 보고서와 경영진 요약이 동시에 동기화할 수 있으므로 잠금 대기
+        self.connection = sqlite3.connect(str(self.db_path), timeout=60, isolation_level=None)
+        self.connection.executescript(SCHEMA)
+        columns = [row[1] for row in self.connection.execute("pragma table_info(sources)")]
+        if "settled_through" not in columns:
+            # 확정일을 기록하기 전의 데이터베이스는 모든 차원을 다시 적재
+            self.connection.execute("drop table sources")
+            self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def source_path(self, dimension: CostDimension) -> Optional[Path]:
+        """차원의 원본 파일 (전체 이력 우선)"""
+        if dimension.history_file and (self.history_dir / dimension.history_file).exists():
+            return self.history_dir / dimension.history_file
+        path = self.report_dir / dimension.report_file
+        return path if path.exists() else None
+
+    def sync(self) -> Dict[str, int]:
+        """원본이 바뀐 차원을 다시 적재하고 차원별 적재 행 수 반환"""
+        synced = {}
+        for dimension in COST_DIMENSIONS:
+            path = self.source_path(dimension)
+            if path is None:
+                continue
+            stat = path.stat()
+            source = self.connection.execute(
+                "select path, mtime_ns, size from sources where dimension = ?", (dimension.name,)).fetchone()
+            if source == (str(path), stat.st_mtime_ns, stat.st_size):
+                continue
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            settled_through = data.get("settled_through") if isinstance(data, dict) else None
+            if not settled_through:
+                settle_days = CostHistoryStore().settle_days
+                settled_through = (date.fromtimestamp(stat.st_mtime) - timedelta(days=settle_days)).isoformat()
+            synced[dimension.name] = self.load_dimension(dimension, extract_rows(data), path, stat, settled_through)
+        return synced
+
+    def load_dimension(self, dimension: CostDimension, rows: List[Dict[str, Any]], path: Path, stat,
+                       settled_through: str = None) -> int:
+        """한 차원의 일간 비용을 교체하고 집계 테이블 재생성"""
+        records = []
+        for row in rows:
+            day = str(row.get("period_start") or "")[:10]
+            if not day:
+                continue
+            key = " / ".join(str(row.get(column) or "") for column in dimension.key_columns)
+            label = row.get(dimension.label_column) if dimension.label_column else None
+            records.append((dimension.name, key, label, day, to_amount(row.get("blended_cost_amount")),
+                            to_amount(row.get("unblended_cost_amount")), row.get("blended_cost_unit")))
+
+        cursor = self.connection.cursor()
+        cursor.execute("begin immediate")
+        try:
+            for table in ("daily_cost", "weekly_cost", "monthly_cost", "top_keys"):
+                cursor.execute(f"delete from {table} where dimension = ?", (dimension.name,))
+            # 같은 날 같은 키가 여러 행이면 (예: 태그 값이 빈 행) 합산
+            cursor.executemany(
+                "insert into daily_cost values (?, ?, ?, ?, ?, ?, ?) on conflict (dimension, key, day) do update set "
+                "amount = amount + excluded.amount, unblended_amount = unblended_amount + excluded.unblended_amount",
+                records)
+            for table, (period_column, period_expression) in ROLLUPS.items():
+                cursor.execute(
+                    f"insert into {table} (dimension, key, {period_column}, amount, unblended_amount, days) "
+                    f"select dimension, key, {period_expression}, sum(amount), sum(unblended_amount), count(distinct day) "
+                    f"from daily_cost where dimension = ? group by dimension, key, {period_expression}",
+                    (dimension.name,))
+                cursor.execute(
+                    f"insert into top_keys select dimension, ?, {period_column}, rank, key, amount from ("
+                    f"select dimension, {period_column}, key, amount, row_number() over ("
+                    f"partition by {period_column} order by amount desc, key) as rank "
+                    f"from {table} where dimension = ?) where rank <= ?",
+                    (period_column, dimension.name, TOP_N))
+            cursor.execute(
+                "insert or replace into sources values (?, ?, ?, ?, ?, ?, ?)",
+                (dimension.name, str(path), stat.st_mtime_ns, stat.st_size, len(records), time.time(),
+                 settled_through))
+            cursor.execute("commit")
+        except BaseException:
+            cursor.execute("rollback")
+            raise
+        return len(records)
+
+    def coverage(self, dimension: str = "service") -> Optional[Tuple[str, str, int]]:
+        """적재된 (첫 날짜, 마지막 날짜, 행 수)"""
+        first_day, last_day, rows = self.connection.execute(
+            "select min(day), max(day), count(*) from daily_cost where dimension = ?", (dimension,)).fetchone()
+        return (first_day, last_day, rows) if rows else None
+
+    def settled_through(self, dimension: str = "service") -> Optional[str]:
+        """적재된 원본의 확정일 (YYYY-MM-DD, 이후 날짜는 부분 반영된 비용)"""
+        row = self.connection.execute(
+            "select settled_through from sources where dimension = ?", (dimension,)).fetchone()
+        return row[0] if row else None
+
+    def latest_complete_month(self, dimension: str = "service") -> Optional[str]:
+        """모든 날짜의 데이터가 있고 확정된 가장 최근 월 (YYYY-MM)"""
+        settled_through = self.settled_through(dimension)
+        rows = self.connection.execute(
+            "select month, max(days) from monthly_cost where dimension = ? group by month order by month desc",
+            (dimension,))
+        for month, days in rows:
+            if not is_partial_month(month, days, settled_through):
+                return month
+        return None
+
+    def monthly_totals(self, dimension: str = "service", months: int = 12) -> List[Tuple[str, float, int]]:
+        """최근 월별 (월, 합계, 데이터 일수), 오래된 월부터"""
+        rows = self.connection.execute(
+            "select month, sum(amount), max(days) from monthly_cost where dimension = ? "
+            "group by month order by month desc limit ?", (dimension, months)).fetchall()
+        return list(reversed(rows))
+
+    def weekly_totals(self, dimension: str = "service", weeks: int = 8) -> List[Tuple[str, float, int]]:
+        """최근 주별 (주 시작일, 합계, 데이터 일수), 오래된 주부터"""
+        rows = self.connection.execute(
+            "select week, sum(amount), max(days) from weekly_cost where dimension = ? "
+            "group by week order by week desc limit ?", (dimension, weeks)).fetchall()
+        return list(reversed(rows))
+
+    def month_over_month(self, dimension: str = "service", month: str = None,
+                         limit: int = TOP_N) -> List[Dict[str, Any]]:
+        """지정 월(기본값: 최근 완료 월)과 전월의 키별 비용 비교, 변화 금액 절댓값 큰 순"""
+        month = month or self.latest_complete_month(dimension)
+        if month is None:
+            return []
+        previous = self.connection.execute(
+            "select max(month) from monthly_cost where dimension = ? and month < ?", (dimension, month)).fetchone()[0]
+        rows = self.connection.execute(
+            "select key, sum(case when month = ? then amount else 0 end) as current, "
+            "sum(case when month = ? then amount else 0 end) as previous "
+            "from monthly_cost where dimension = ? and month in (?, ?) group by key "
+            "order by abs(current - previous) desc limit ?",
+            (month, previous, dimension, month, previous, limit)).fetchall()
+        return [{
+            "key": key,
+            "month": month,
+            "previous_month": previous,
+            "current": current,
+            "previous": previous_amount,
+            "change": current - previous_amount,
+            "change_pct": (current - previous_amount) * 100 / previous_amount if previous_amount else None,
+        } for key, current, previous_amount in rows]
+
+    def key_count(self, dimension: str = "service", month: str = None) -> int:
+        """월(기본값: 전체 기간)에 비용이 있는 키 개수"""
+        if month is None:
+            return self.connection.execute(
+                "select count(distinct key) from monthly_cost where dimension = ?", (dimension,)).fetchone()[0]
+        return self.connection.execute(
+            "select count(*) from monthly_cost where dimension = ? and month = ?", (dimension, month)).fetchone()[0]
+
+    def top_keys(self, dimension: str = "service", period_type: str = "month", period: str = None,
+                 limit: int = TOP_N) -> List[Tuple[str, float]]:
+        """기간(기본값: 최근 기간)의 비용 상위 키 (키, 금액)"""
+        if period is None:
+            period = self.connection.execute(
+                "select max(period) from top_keys where dimension = ? and period_type = ?",
+                (dimension, period_type)).fetchone()[0]
+        return self.connection.execute(
+            "select key, amount from top_keys where dimension = ? and period_type = ? and period = ? "
+            "order by rank limit ?", (dimension, period_type, period, limit)).fetchall()
+
+
+def open_synced_store(report_dir) -> Optional[CostTimeSeriesStore]:
+    """동기화된 저장소 (비용 데이터가 없거나 열 수 없으면 None)"""
+    try:
+        store = CostTimeSeriesStore(report_dir)
+        store.sync()
+    except (sqlite3.Error, OSError, ValueError) as e:
+        print(f"Warning: 비용 시계열 저장소를 사용할 수 없습니다: {e}")
+        return None
+    if store.coverage() is None:
+        store.close()
+        return None
+    return store
+
+
+def main():
+    report_dir = Path(__file__).parent.parent / "report"
+    with CostTimeSeriesStore(report_dir) as store:
+        start_time = time.time()
+        synced = store.sync()
+        print(f"비용 시계열 저장소: {store.db_path} (동기화 {time.time() - start_time:.2f}초, "
+              f"재적재: {', '.join(synced) or '없음'})")
+        for dimension in COST_DIMENSIONS:
+            coverage = store.coverage(dimension.name)
+            if coverage:
+                print(f"  {dimension.name:<12} {coverage[0]} ~ {coverage[1]} ({coverage[2]}행)")
+        for change in store.month_over_month(limit=5):
+            pct = f"{change['change_pct']:+.1f}%" if change["change_pct"] is not None else "신규"
+            print(f"  {change['month']} {change['key'][:40]:<40} ${change['current']:,.2f} ({pct})")
+
+
+if __name__ == "__main__":
+    main()
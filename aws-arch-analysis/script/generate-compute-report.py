@@ -9,13 +9,14 @@ import json
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 from collections import Counter, defaultdict
 from datetime import datetime
 
 # Enhanced 권장사항 모듈 import
 sys.path.append(str(Path(__file__).parent))
 from enhanced_recommendations import ComputeRecommendations
+from report_data_loader import load_report_rows
 
 class ExtendedComputeReportGenerator(ComputeRecommendations):
     def __init__(self, report_dir: str = None):
@@ -28,18 +29,10 @@ class ExtendedComputeReportGenerator(ComputeRecommendations):
         self.report_dir = Path(report_dir)
         self.report_dir.mkdir(parents=True, exist_ok=True)
 
-    def load_json_file(self, filename: str) -> Optional[List[Dict[str, Any]]]:
-        """JSON 파일을 로드합니다."""
-        file_path = self.report_dir / filename
+    def load_json_file(self, filename: str, columns: Sequence[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """JSON 파일을 로드합니다. (columns를 지정하면 해당 컬럼만 로드)"""
         try:
-            if file_path.exists() and file_path.stat().st_size > 0:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict) and 'rows' in data:
-                        return data['rows']
-                    elif isinstance(data, list):
-                        return data
-                    return []
+            return load_report_rows(self.report_dir / filename, columns=columns)
         except (json.JSONDecodeError, IOError) as e:
             print(f"Warning: Failed to load {filename}: {e}")
         return None
@@ -218,11 +211,13 @@ class ExtendedComputeReportGenerator(ComputeRecommendations):
         report_file.write("## ☸️ Kubernetes 워크로드 분석\n\n")
         
         # K8s 리소스 데이터 로드
-        namespaces = self.load_json_file("k8s_namespaces.json")
-        deployments = self.load_json_file("k8s_deployments.json")
-        nodes = self.load_json_file("k8s_nodes.json")
-        configmaps = self.load_json_file("k8s_configmaps.json")
-        daemonsets = self.load_json_file("k8s_daemonsets.json")
+        # 컨피그맵/데몬셋은 개수만 사용하므로 클러스터 이름만 로드
+        namespaces = self.load_json_file("k8s_namespaces.json", ["name", "creation_timestamp", "labels", "cluster_name"])
+        deployments = self.load_json_file("k8s_deployments.json", ["name", "namespace", "replicas", "ready_replicas",
+                                                                   "available_replicas", "cluster_name"])
+        nodes = self.load_json_file("k8s_nodes.json", ["name", "creation_timestamp", "labels", "cluster_name"])
+        configmaps = self.load_json_file("k8s_configmaps.json", ["cluster_name"])
+        daemonsets = self.load_json_file("k8s_daemonsets.json", ["cluster_name"])
         
         # 기본 통계
         ns_count = len(namespaces) if namespaces else 0
@@ -237,7 +232,23 @@ class ExtendedComputeReportGenerator(ComputeRecommendations):
         report_file.write(f"**노드:** {node_count}개\n")
         report_file.write(f"**컨피그맵:** {cm_count}개\n")
         report_file.write(f"**데몬셋:** {ds_count}개\n\n")
-        
+
+        # 다중 클러스터 수집 결과는 행마다 cluster_name이 있음
+        cluster_counts = {}
+        for key, rows in (("namespaces", namespaces), ("deployments", deployments), ("nodes", nodes),
+                          ("configmaps", configmaps), ("daemonsets", daemonsets)):
+            for row in rows or []:
+                if row.get('cluster_name'):
+                    cluster_counts.setdefault(row['cluster_name'], Counter())[key] += 1
+        if cluster_counts:
+            report_file.write("### 클러스터별 리소스\n")
+            report_file.write("| 클러스터 | 네임스페이스 | 디플로이먼트 | 노드 | 컨피그맵 | 데몬셋 |\n")
+            report_file.write("|----------|--------------|--------------|------|----------|--------|\n")
+            for cluster_name, counts in sorted(cluster_counts.items()):
+                report_file.write(f"| {cluster_name} | {counts['namespaces']} | {counts['deployments']} | "
+                                  f"{counts['nodes']} | {counts['configmaps']} | {counts['daemonsets']} |\n")
+            report_file.write("\n")
+
         # 네임스페이스 상세
         if namespaces:
             report_file.write("### 네임스페이스 목록\n")
@@ -110,12 +110,12 @@ MDEOF
 
 # Lambda 함수 데이터 분석
 if [ -f "iac_lambda_functions.json" ] && [ -s "iac_lambda_functions.json" ]; then
-    LAMBDA_COUNT=$(jq '.Functions | length' iac_lambda_functions.json)
+    LAMBDA_COUNT=$(jq '(.Functions? // .) | length' iac_lambda_functions.json)
     echo "**총 Lambda 함수:** ${LAMBDA_COUNT}개" >> 03-compute-analysis.md
     echo "" >> 03-compute-analysis.md
     echo "| 함수명 | 런타임 | 메모리 | 타임아웃 | 마지막 수정 | 코드 크기 |" >> 03-compute-analysis.md
     echo "|--------|---------|--------|----------|-------------|-----------|" >> 03-compute-analysis.md
-    jq -r '.Functions[] | "| \(.FunctionName) | \(.Runtime) | \(.MemorySize)MB | \(.Timeout)s | \(.LastModified) | \(.CodeSize)B |"' iac_lambda_functions.json >> 03-compute-analysis.md
+    jq -r '(.Functions? // .)[] | "| \(.FunctionName) | \(.Runtime) | \(.MemorySize)MB | \(.Timeout)s | \(.LastModified) | \(.CodeSize)B |"' iac_lambda_functions.json >> 03-compute-analysis.md
 else
     echo "Lambda 함수 데이터를 찾을 수 없습니다." >> 03-compute-analysis.md
 fi
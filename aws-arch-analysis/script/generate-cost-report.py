@@ -8,10 +8,16 @@ generate-cost-report.sh를 참조하여 Python으로 재구현
 import json
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
+# 공유 데이터 로더 import
+sys.path.append(str(Path(__file__).parent))
+from report_data_loader import load_report_data
+from cost_timeseries_store import is_partial_month, is_partial_week, open_synced_store
+import cost_analytics
+
 class CostReportGenerator:
     def __init__(self, report_dir: str = None):
         # 스크립트의 실제 위치를 기준으로 경로 설정
@@ -34,13 +40,8 @@ class CostReportGenerator:
 
     def load_json_data(self, filename: str) -> Optional[Dict]:
         """JSON 데이터 파일 로드"""
-        file_path = self.report_dir / filename
         try:
-            if file_path.exists() and file_path.stat().st_size > 16:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data
-            return None
+            return load_report_data(self.report_dir / filename, min_size=16)
         except (json.JSONDecodeError, FileNotFoundError) as e:
             print(f"Warning: Failed to load {filename}: {e}")
             return None
@@ -240,6 +241,153 @@ class CostReportGenerator:
         
         return analysis
 
+    def analyze_cost_history(self) -> str:
+        """비용 시계열 저장소 기반 월별/주별 추세 및 전월 대비 분석"""
+        store = open_synced_store(self.report_dir)
+        if store is None:
+            return ""
+
+        try:
+            first_day, last_day, _ = store.coverage()
+            monthly = store.monthly_totals(months=12)
+            weekly = store.weekly_totals(weeks=8)
+            changes = store.month_over_month(limit=10)
+            complete_month = store.latest_complete_month()
+            settled_through = store.settled_through()
+        finally:
+            store.close()
+
+        analysis = f"""
+### 월별 비용 추세 및 전월 대비
+
+**📅 이력 기간**: {first_day} ~ {last_day} (확정: {settled_through or '-'}까지)
+
+| 월 | 월간 비용 (USD) | 전월 대비 | 데이터 일수 |
+|----|----------------|-----------|-------------|
+"""
+        # 일부 날짜만 있거나 확정되지 않은 월은 전월 대비를 계산하지 않음 (부분 기간과 비교하면 변화율이 왜곡됨)
+        partial_months = {month for month, _, days in monthly if is_partial_month(month, days, settled_through)}
+        previous_month, previous_amount = None, None
+        for month, amount, days in monthly:
+            if complete_month and month > complete_month:
+                change = "진행 중"
+            elif month in partial_months:
+                change = "부분 기간"
+            elif previous_amount and previous_month not in partial_months:
+                change = f"{(amount - previous_amount) * 100 / previous_amount:+.1f}%"
+            else:
+                change = "-"
+            label = f"{month} (부분)" if month in partial_months else month
+            analysis += f"| {label} | {self.format_currency(amount)} | {change} | {days}일 |\n"
+            previous_month, previous_amount = month, amount
+        if partial_months:
+            analysis += "\n> (부분): 월의 일부 날짜만 수집되었거나 확정되지 않은 비용이 포함된 기간이며, 전월 대비를 계산하지 않습니다.\n"
+
+        if changes and changes[0]['previous_month'] in partial_months:
+            analysis += f"\n> 💡 전월({changes[0]['previous_month']})이 부분 기간이므로 서비스별 전월 대비 변화는 생략합니다.\n"
+        elif changes:
+            analysis += f"""
+#### 📋 전월 대비 변화가 큰 서비스 ({changes[0]['previous_month'] or '-'} → {changes[0]['month']})
+
+| 서비스 | 전월 (USD) | 당월 (USD) | 변화 금액 | 변화율 |
+|--------|-----------|-----------|-----------|--------|
+"""
+            for change in changes:
+                pct = f"{change['change_pct']:+.1f}%" if change['change_pct'] is not None else "신규"
+                analysis += (f"| {self.get_service_short_name(change['key'])} | {self.format_currency(change['previous'])} | "
+                             f"{self.format_currency(change['current'])} | {self.format_currency(change['change'])} | {pct} |\n")
+
+        if weekly:
+            analysis += """
+#### 📈 최근 주간 비용 (월요일 시작)
+
+| 주 시작일 | 주간 비용 (USD) | 데이터 일수 |
+|-----------|----------------|-------------|
+"""
+            for week, amount, days in weekly:
+                label = f"{week} (부분)" if is_partial_week(week, days, settled_through) else week
+                analysis += f"| {label} | {self.format_currency(amount)} | {days}일 |\n"
+
+        return analysis
+
+    def analyze_cost_analytics(self) -> str:
+        """일간 비용 배열 기반 이동 평균, 주간 변화, 이상 탐지, 로컬 예측"""
+        if not cost_analytics.available():
+            return "\n> 💡 NumPy를 설치하면(`pip install numpy`) 이동 평균, 이상 탐지, 로컬 비용 예측 섹션이 추가됩니다.\n"
+        store = open_synced_store(self.report_dir)
+        if store is None:
+            return ""
+        try:
+            result = cost_analytics.analyze(store)
+        finally:
+            store.close()
+        if result is None:
+            return ""
+
+        totals = result['daily_totals']
+        moving_average = result['rolling_mean']
+        analysis = f"""
+### 📉 일간 비용 추세 (7일 이동 평균)
+
+**분석 기간**: {result['first_day']} ~ {result['last_day']} (서비스 {result['key_count']}개)
+
+| 날짜 | 일간 비용 (USD) | 7일 이동 평균 (USD) |
+|------|----------------|---------------------|
+"""
+        first_day = datetime.fromisoformat(result['first_day'])
+        for offset in range(max(0, len(totals) - 14), len(totals)):
+            day = (first_day + timedelta(days=offset)).strftime('%Y-%m-%d')
+            # 이동 평균은 앞쪽 6일이 NaN
+            average = self.format_currency(moving_average[offset]) if moving_average[offset] == moving_average[offset] else "-"
+            analysis += f"| {day} | {self.format_currency(totals[offset])} | {average} |\n"
+
+        if result['week_over_week']:
+            analysis += """
+#### 📋 주간 변화 상위 서비스 (최근 7일 vs 직전 7일)
+
+| 서비스 | 직전 7일 (USD) | 최근 7일 (USD) | 변화 금액 | 변화율 |
+|--------|---------------|---------------|-----------|--------|
+"""
+            for change in result['week_over_week']:
+                pct = f"{change['change_pct']:+.1f}%" if change['change_pct'] is not None else "신규"
+                analysis += (f"| {self.get_service_short_name(change['key'])} | {self.format_currency(change['previous'])} | "
+                             f"{self.format_currency(change['current'])} | {self.format_currency(change['change'])} | {pct} |\n")
+
+        analysis += f"""
+### 🚨 비용 이상 탐지
+
+최근 {cost_analytics.ANOMALY_LOOKBACK_DAYS}일 동안 서비스별 일간 비용을 직전 {cost_analytics.ANOMALY_WINDOW}일 평균과 비교해 z-score가 {cost_analytics.ANOMALY_THRESHOLD:.0f} 이상인 항목입니다.
+
+"""
+        if result['anomalies']:
+            analysis += "| 날짜 | 서비스 | 비용 (USD) | 평소 (USD) | z-score |\n"
+            analysis += "|------|--------|-----------|-----------|---------|\n"
+            for anomaly in result['anomalies']:
+                analysis += (f"| {anomaly['day']} | {self.get_service_short_name(anomaly['key'])} | "
+                             f"{self.format_currency(anomaly['amount'])} | {self.format_currency(anomaly['expected'])} | "
+                             f"{anomaly['z_score']:+.1f} |\n")
+        else:
+            analysis += "✅ 탐지된 비용 이상이 없습니다.\n"
+
+        prediction = result['forecast']
+        if prediction:
+            analysis += f"""
+### 🔮 로컬 비용 예측 (향후 {len(prediction['days'])}일)
+
+최근 {cost_analytics.FORECAST_TRAINING_DAYS}일 일간 비용의 추세와 요일 패턴으로 계산한 예측입니다 (Cost Explorer 예측 API 미사용, 95% 예측 구간).
+
+- **예측 합계**: {self.format_currency(prediction['total'])} USD ({self.format_currency(prediction['total_lower'])} ~ {self.format_currency(prediction['total_upper'])})
+- **일간 추세**: 하루 {self.format_currency(prediction['daily_trend'])} 변화
+
+| 날짜 | 예측 (USD) | 하한 (USD) | 상한 (USD) |
+|------|-----------|-----------|-----------|
+"""
+            for index, day in enumerate(prediction['days'][:7]):
+                analysis += (f"| {day} | {self.format_currency(prediction['mean'][index])} | "
+                             f"{self.format_currency(prediction['lower'][index])} | {self.format_currency(prediction['upper'][index])} |\n")
+
+        return analysis
+
     def analyze_usage_types(self) -> str:
         """사용량 타입별 분석"""
         usage_data = self.load_json_data('cost_by_service_usage_type_monthly.json')
@@ -474,6 +622,8 @@ class CostReportGenerator:
         executive_summary = self.generate_executive_summary()
         service_analysis = self.analyze_service_costs()
         daily_trends = self.analyze_daily_trends()
+        cost_history = self.analyze_cost_history()
+        cost_analytics_section = self.analyze_cost_analytics()
         usage_analysis = self.analyze_usage_types()
         record_analysis = self.analyze_record_types()
         recommendations = self.generate_recommendations()
@@ -484,6 +634,8 @@ class CostReportGenerator:
             executive_summary +
             service_analysis +
             daily_trends +
+            cost_history +
+            cost_analytics_section +
             usage_analysis +
             record_analysis +
             recommendations +
@@ -12,6 +12,10 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 import logging
 
+# 공유 데이터 로더 import
+sys.path.append(str(Path(__file__).parent))
+from report_data_loader import load_report_data
+
 class DatabaseReportGenerator:
     def __init__(self, report_dir: str = None):
         # 스크립트의 실제 위치를 기준으로 경로 설정
@@ -53,13 +57,10 @@ class DatabaseReportGenerator:
 
     def load_json_data(self, filename: str) -> Optional[Dict]:
         """JSON 데이터 파일 로드"""
-        file_path = self.report_dir / filename
         try:
-            if file_path.exists() and file_path.stat().st_size > 16:  # 빈 파일이 아닌 경우
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if data.get('rows') and len(data['rows']) > 0:
-                        return data
+            data = load_report_data(self.report_dir / filename, min_size=16)  # 빈 파일이 아닌 경우
+            if data is not None and data.get('rows') and len(data['rows']) > 0:
+                return data
             return None
         except (json.JSONDecodeError, FileNotFoundError) as e:
             self.logger.warning(f"데이터 파일 로드 실패: {filename} - {e}")
@@ -18,7 +18,7 @@ VPC_COUNT=$(jq '.rows | length' networking_vpc.json 2>/dev/null || echo "0")
 EC2_COUNT=$(jq '.rows | length' compute_ec2_instances.json 2>/dev/null || echo "0")
 RDS_COUNT=$(jq '.rows | length' database_rds_instances.json 2>/dev/null || echo "0")
 S3_COUNT=$(jq '.rows | length' storage_s3_buckets.json 2>/dev/null || echo "0")
-LAMBDA_COUNT=$(jq '.Functions | length' iac_lambda_functions.json 2>/dev/null || echo "0")
+LAMBDA_COUNT=$(jq '(.Functions? // .) | length' iac_lambda_functions.json 2>/dev/null || echo "0")
 
 # 추가 상세 정보
 RUNNING_EC2=$(jq '[.rows[] | select(.instance_state == "running")] | length' compute_ec2_instances.json 2>/dev/null || echo "0")
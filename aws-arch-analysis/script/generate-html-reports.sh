@@ -11,6 +11,12 @@ HTML_DIR="${PROJECT_ROOT}/html-report"
 SAMPLE_DIR="${PROJECT_ROOT}/aws-arch-analysis/sample"
 SCRIPT_DIR="${PROJECT_ROOT}/aws-arch-analysis/script"
 
+# --assets-only: CSS/JS/데이터 파일과 index.html만 생성 (보고서 변환 및 압축은 analysis_pipeline.py가 따로 실행)
+ASSETS_ONLY=false
+if [ "$1" = "--assets-only" ]; then
+    ASSETS_ONLY=true
+fi
+
 echo "🌐 HTML 보고서 생성 시작..."
 echo "📁 출력 디렉토리: $HTML_DIR"
 
@@ -330,6 +336,11 @@ else
     fi
 fi
 
+if [ "$ASSETS_ONLY" = true ]; then
+    echo "✅ HTML 공통 파일 생성 완료 (--assets-only)"
+    exit 0
+fi
+
 # 10. Markdown 파일들을 HTML로 변환
 echo "📝 Markdown 파일들을 HTML로 변환 중..."
 if [ -f "$SCRIPT_DIR/convert-md-to-html-simple.sh" ]; then
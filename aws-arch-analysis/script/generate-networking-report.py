@@ -15,6 +15,7 @@ from datetime import datetime
 # Enhanced 권장사항 모듈 import
 sys.path.append(str(Path(__file__).parent))
 from enhanced_recommendations import NetworkingRecommendations
+from report_data_loader import load_report_rows
 
 class NetworkingReportGenerator(NetworkingRecommendations):
     def __init__(self, report_dir: str = None):
@@ -29,16 +30,8 @@ class NetworkingReportGenerator(NetworkingRecommendations):
 
     def load_json_file(self, filename: str) -> Optional[List[Dict[str, Any]]]:
         """JSON 파일을 로드합니다."""
-        file_path = self.report_dir / filename
         try:
-            if file_path.exists() and file_path.stat().st_size > 0:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict) and 'rows' in data:
-                        return data['rows']
-                    elif isinstance(data, list):
-                        return data
-                    return []
+            return load_report_rows(self.report_dir / filename)
         except (json.JSONDecodeError, IOError) as e:
             print(f"Warning: Failed to load {filename}: {e}")
         return None
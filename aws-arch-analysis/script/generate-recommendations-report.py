@@ -12,6 +12,10 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 import logging
 
+# 공유 데이터 로더 import
+sys.path.append(str(Path(__file__).parent))
+from report_data_loader import load_report_rows
+
 class RecommendationsReportGenerator:
     def __init__(self, report_dir: str = None):
         # 스크립트의 실제 위치를 기준으로 경로 설정
@@ -48,16 +52,8 @@ class RecommendationsReportGenerator:
 
     def load_json_file(self, filename: str) -> Optional[List[Dict[str, Any]]]:
         """JSON 파일을 로드합니다."""
-        file_path = self.report_dir / filename
         try:
-            if file_path.exists() and file_path.stat().st_size > 0:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict) and 'rows' in data:
-                        return data['rows']
-                    elif isinstance(data, list):
-                        return data
-                    return []
+            return load_report_rows(self.report_dir / filename)
         except (json.JSONDecodeError, IOError) as e:
             self.log_warning(f"파일 로드 실패: {filename} - {str(e)}")
         return None
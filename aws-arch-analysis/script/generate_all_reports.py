@@ -2,36 +2,96 @@
 """
 AWS 계정 분석 - 모든 보고서 일괄 생성 스크립트
 수집된 JSON 데이터를 바탕으로 10개 분석 보고서를 생성합니다.
+
+보고서 생성기 클래스를 한 프로세스에서 import 해 병렬로 실행하며 (report_orchestrator.py),
+로드한 JSON 데이터는 생성기 간에 공유됩니다. 경영진 요약과 종합 권장사항은 다른 보고서가 끝난 뒤 생성합니다.
+
+사용법:
+    python3 generate_all_reports.py                 # 기본 4개 작업 병렬 실행
+    python3 generate_all_reports.py --workers 1     # 순차 실행
 """
 
 import os
 import sys
-import subprocess
-import time
 from pathlib import Path
 from datetime import datetime
 
+sys.path.append(str(Path(__file__).parent))
+from report_data_loader import get_cache_stats
+from report_orchestrator import ReportOrchestrator, ReportResult, ReportTask
+
+# 다른 보고서가 끝난 뒤에 생성하는 보고서의 선행 보고서
+INVENTORY_REPORTS = (
+    "02-networking-analysis.md",
+    "03-compute-analysis.md",
+    "04-storage-analysis.md",
+    "05-database-analysis.md",
+    "06-security-analysis.md",
+    "07-cost-optimization.md",
+    "08-application-analysis.md",
+    "09-monitoring-analysis.md",
+)
+
+
+def generate_report(generator):
+    return generator.generate_report()
+
+
+def generate_application_report(generator):
+    if not generator.collect_all_data():
+        return False
+    return generator.generate_markdown_report()
+
+
+def generate_cost_report(generator):
+    generator.save_report(generator.generate_report())
+
+
+# 보고서 생성 작업 (보고서 파일, 스크립트, 생성기 클래스, 설명, 실행 함수, 선행 보고서, 입력 데이터 파일)
+REPORT_TASKS = [
+    ReportTask("02-networking-analysis.md", "generate-networking-report.py", "NetworkingReportGenerator",
+               "네트워킹 분석", generate_report,
+               inputs=("networking_*.json", "security_groups*.json")),
+    ReportTask("03-compute-analysis.md", "generate-compute-report.py", "ExtendedComputeReportGenerator",
+               "컴퓨팅 분석", generate_report,
+               inputs=("compute_*.json", "k8s_*.json", "iac_lambda_functions.json")),
+    ReportTask("04-storage-analysis.md", "generate_storage_report.py", "StorageReportGenerator",
+               "스토리지 분석", generate_report, inputs=("storage_*.json",)),
+    ReportTask("05-database-analysis.md", "generate_database_report.py", "EnhancedDatabaseReportGenerator",
+               "데이터베이스 분석", generate_report, inputs=("database_*.json",)),
+    ReportTask("06-security-analysis.md", "generate_security_report.py", "EnhancedSecurityReportGenerator",
+               "보안 분석", generate_report, inputs=("security_*.json",)),
+    ReportTask("07-cost-optimization.md", "generate-cost-report.py", "CostReportGenerator",
+               "비용 최적화", generate_cost_report, inputs=("cost_*.json", ".cost_history/*.json")),
+    ReportTask("08-application-analysis.md", "generate-application-report.py", "ApplicationReportGenerator",
+               "애플리케이션 분석", generate_application_report,
+               inputs=("application_*.json",)),
+    ReportTask("09-monitoring-analysis.md", "generate_monitoring_report.py", "MonitoringReportGenerator",
+               "모니터링 분석", generate_report, inputs=("monitoring_*.json",)),
+    ReportTask("01-executive-summary.md", "generate_executive_summary.py", "ExecutiveSummaryGenerator",
+               "경영진 요약", generate_report, depends_on=INVENTORY_REPORTS,
+               inputs=("compute_ec2_instances.json", "networking_vpc.json", "database_rds_instances.json",
+                       "storage_ebs_volumes.json", "storage_s3_buckets.json", "security_iam_users.json",
+                       "cost_*.json", ".cost_history/*.json")),
+    ReportTask("10-recommendations.md", "generate_recommendations.py", "EnhancedRecommendationsGenerator",
+               "종합 권장사항", generate_report, depends_on=INVENTORY_REPORTS,
+               inputs=("compute_ec2_instances.json", "networking_vpc.json", "networking_eip.json",
+                       "storage_ebs_volumes.json", "security_groups.json", "security_iam_roles.json",
+                       "monitoring_cloudwatch_log_groups.json", "cost_by_service_monthly.json")),
+]
+
 class ReportGenerator:
-    def __init__(self):
+    def __init__(self, report_dir: str = None, max_workers: int = 4):
         self.script_dir = Path(__file__).parent
         # 스크립트의 실제 위치를 기준으로 경로 설정
-        script_dir = Path(__file__).parent
-        project_root = script_dir.parent.parent
-        self.report_dir = project_root / "aws-arch-analysis" / "report"
+        if report_dir is None:
+            project_root = self.script_dir.parent.parent
+            report_dir = str(project_root / "aws-arch-analysis" / "report")
+        self.report_dir = Path(report_dir)
         self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
         
-        # 보고서 생성 스크립트 매핑 (실제 존재하는 스크립트만)
-        self.report_scripts = [
-            ("01-executive-summary.md", "generate_executive_summary.py", "경영진 요약"),
-            ("02-networking-analysis.md", "generate-networking-report-awscli.py", "네트워킹 분석"),
-            ("05-storage-analysis.md", "generate_storage_report.py", "스토리지 분석"),
-            ("05-database-analysis.md", "generate_database_report.py", "데이터베이스 분석"),
-            ("06-security-analysis.md", "generate_security_report.py", "보안 분석"),
-            ("07-application-analysis.md", "generate-application-report.py", "애플리케이션 분석"),
-            ("09-cost-optimization.md", "generate-cost-report.py", "비용 최적화"),
-            ("09-monitoring-analysis.md", "generate_monitoring_report.py", "모니터링 분석"),
-            ("10-comprehensive-recommendations.md", "generate_recommendations.py", "종합 권장사항")
-        ]
+        self.report_tasks = REPORT_TASKS
         
         self.start_time = datetime.now()
         self.results = []
@@ -48,87 +108,43 @@ class ReportGenerator:
         timestamp = datetime.now().strftime("%H:%M:%S")
         print(f"\033[0;31m[{timestamp}]\033[0m ❌ {message}")
 
-    def run_report_script(self, report_name: str, script_name: str, description: str) -> bool:
-        """개별 보고서 생성 스크립트 실행"""
-        script_path = self.script_dir / script_name
-        
-        if not script_path.exists():
-            self.log_error(f"{description} 스크립트를 찾을 수 없습니다: {script_path}")
-            return False
-        
-        self.log_info(f"📝 {description} 보고서 생성 중...")
-        
-        try:
-            start_time = time.time()
-            result = subprocess.run(
-                [sys.executable, str(script_path)],
-                cwd=str(self.script_dir),
-                capture_output=True,
-                text=True,
-                timeout=120  # 2분 타임아웃
-            )
-            
-            end_time = time.time()
-            duration = end_time - start_time
-            
-            if result.returncode == 0:
-                # 생성된 보고서를 올바른 위치로 이동
-                old_path = self.report_dir / report_name
-                new_path = self.report_dir / report_name
-                
-                if old_path.exists():
-                    old_path.rename(new_path)
-                
-                if new_path.exists():
-                    self.log_success(f"{description} 보고서 생성 완료 ({duration:.1f}초)")
-                    self.results.append({
-                        "name": description,
-                        "file": report_name,
-                        "status": "success",
-                        "duration": duration
-                    })
-                    return True
-                else:
-                    self.log_error(f"{description} 보고서 파일을 찾을 수 없습니다")
-                    return False
-            else:
-                self.log_error(f"{description} 보고서 생성 실패: {result.stderr}")
-                self.results.append({
-                    "name": description,
-                    "file": report_name,
-                    "status": "failed",
-                    "duration": duration,
-                    "error": result.stderr
-                })
-                return False
-                
-        except subprocess.TimeoutExpired:
-            self.log_error(f"{description} 보고서 생성 타임아웃")
-            return False
-        except Exception as e:
-            self.log_error(f"{description} 보고서 생성 중 예외 발생: {str(e)}")
-            return False
+    def on_report_start(self, task: ReportTask):
+        self.log_info(f"📝 {task.description} 보고서 생성 중...")
+
+    def on_report_complete(self, result: ReportResult):
+        """개별 보고서 생성 결과 기록"""
+        description = result.task.description
+        if result.success:
+            self.log_success(f"{description} 보고서 생성 완료 ({result.duration:.1f}초)")
+            self.results.append({
+                "name": description,
+                "file": result.task.report_file,
+                "status": "success",
+                "duration": result.duration
+            })
+        else:
+            self.log_error(f"{description} 보고서 생성 실패: {result.error}")
+            if result.output.strip():
+                print(result.output.rstrip())
+            self.results.append({
+                "name": description,
+                "file": result.task.report_file,
+                "status": "failed",
+                "duration": result.duration,
+                "error": result.error
+            })
 
     def generate_all_reports(self):
         """모든 보고서 생성 실행"""
         self.log_info("📋 AWS 계정 분석 보고서 일괄 생성 시작")
         self.log_info(f"📁 보고서 저장 위치: {self.report_dir}")
-        self.log_info(f"📊 생성 대상: {len(self.report_scripts)}개 보고서")
+        self.log_info(f"📊 생성 대상: {len(self.report_tasks)}개 보고서 (병렬 작업 {self.max_workers}개)")
         print()
         
-        success_count = 0
-        
-        for i, (report_name, script_name, description) in enumerate(self.report_scripts, 1):
-            self.log_info(f"[{i}/{len(self.report_scripts)}] {description} 처리 중...")
-            
-            if self.run_report_script(report_name, script_name, description):
-                success_count += 1
-            
-            # 스크립트 간 간격
-            if i < len(self.report_scripts):
-                time.sleep(1)
-            
-            print()
+        orchestrator = ReportOrchestrator(self.report_dir, max_workers=self.max_workers)
+        results = orchestrator.run(self.report_tasks, self.on_report_start, self.on_report_complete)
+        success_count = len([result for result in results if result.success])
+        print()
         
         # 결과 요약
         self.print_summary(success_count)
@@ -142,8 +158,10 @@ class ReportGenerator:
         print("=" * 80)
         
         print(f"🕐 총 소요 시간: {total_time}")
-        print(f"✅ 성공: {success_count}/{len(self.report_scripts)}")
-        print(f"❌ 실패: {len(self.report_scripts) - success_count}/{len(self.report_scripts)}")
+        print(f"✅ 성공: {success_count}/{len(self.report_tasks)}")
+        print(f"❌ 실패: {len(self.report_tasks) - success_count}/{len(self.report_tasks)}")
+        cache_stats = get_cache_stats()
+        print(f"📦 데이터 파일 로드: {cache_stats['misses']}회 파싱, {cache_stats['hits']}회 공유 캐시 재사용")
         print()
         
         # 상세 결과
@@ -175,8 +193,15 @@ class ReportGenerator:
 
 def main():
     """메인 실행 함수"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="AWS 계정 분석 보고서 일괄 생성")
+    parser.add_argument("--report-dir", default=os.getenv("REPORT_DIR"), help="보고서 디렉토리")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 생성할 보고서 수 (기본값: 4)")
+    args = parser.parse_args()
+    
     try:
-        generator = ReportGenerator()
+        generator = ReportGenerator(args.report_dir, max_workers=args.workers)
         generator.generate_all_reports()
     except KeyboardInterrupt:
         print("\n\n⚠️ 사용자에 의해 중단되었습니다.")
@@ -11,6 +11,10 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+# 공유 데이터 로더 import
+sys.path.append(str(Path(__file__).parent))
+from report_data_loader import load_report_rows
+
 class EnhancedDatabaseReportGenerator:
     def __init__(self, report_dir: str = None):
         # 스크립트의 실제 위치를 기준으로 경로 설정
@@ -47,16 +51,8 @@ class EnhancedDatabaseReportGenerator:
 
     def load_json_file(self, filename: str) -> Optional[List[Dict[str, Any]]]:
         """JSON 파일을 로드합니다."""
-        file_path = self.report_dir / filename
         try:
-            if file_path.exists() and file_path.stat().st_size > 0:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict) and 'rows' in data:
-                        return data['rows']
-                    elif isinstance(data, list):
-                        return data
-                    return []
+            return load_report_rows(self.report_dir / filename)
         except (json.JSONDecodeError, IOError) as e:
             print(f"Warning: Failed to load {filename}: {e}")
         return None
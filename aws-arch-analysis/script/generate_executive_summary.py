@@ -10,6 +10,11 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 
+# 공유 데이터 로더 import
+sys.path.append(str(Path(__file__).parent))
+from report_data_loader import load_report_rows
+from cost_timeseries_store import is_partial_month, open_synced_store
+
 class ExecutiveSummaryGenerator:
     def __init__(self, report_dir: str = None):
         # 스크립트의 실제 위치를 기준으로 경로 설정
@@ -22,16 +27,8 @@ class ExecutiveSummaryGenerator:
 
     def load_json_file(self, filename: str) -> Optional[List[Dict[str, Any]]]:
         """JSON 파일을 로드합니다."""
-        file_path = self.report_dir / filename
         try:
-            if file_path.exists() and file_path.stat().st_size > 0:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict) and 'rows' in data:
-                        return data['rows']
-                    elif isinstance(data, list):
-                        return data
-                    return []
+            return load_report_rows(self.report_dir / filename)
         except (json.JSONDecodeError, IOError) as e:
             print(f"Warning: Failed to load {filename}: {e}")
         return None
@@ -145,6 +142,46 @@ class ExecutiveSummaryGenerator:
         report_file.write("| 스토리지 클래스 최적화 | 15-25% | 보통 |\n")
         report_file.write("| 인스턴스 타입 최적화 | 10-20% | 어려움 |\n\n")
 
+        self.write_cost_trend(report_file)
+
+    def write_cost_trend(self, report_file) -> None:
+        """비용 시계열 저장소의 최근 월 비용과 전월 대비 변화를 작성합니다."""
+        store = open_synced_store(self.report_dir)
+        if store is None:
+            return
+
+        try:
+            month = store.latest_complete_month()
+            settled_through = store.settled_through()
+            monthly_totals = store.monthly_totals(months=24)
+            top_services = store.top_keys(period_type="month", period=month, limit=3)
+            changes = store.month_over_month(month=month, limit=3)
+        finally:
+            store.close()
+        monthly = dict((period, amount) for period, amount, _ in monthly_totals)
+        if month is None or month not in monthly:
+            return
+
+        previous_months = [period for period in monthly if period < month]
+        # 전월이 일부 날짜만 있거나 확정되지 않았으면 전월 대비를 표시하지 않음
+        partial_months = {period for period, _, days in monthly_totals
+                          if is_partial_month(period, days, settled_through)}
+        if previous_months and previous_months[-1] in partial_months:
+            previous_months, changes = [], []
+        current = monthly[month]
+        report_file.write("### 비용 추세\n")
+        report_file.write(f"- **{month} 월간 비용**: ${current:,.2f}")
+        if previous_months and monthly[previous_months[-1]]:
+            previous = monthly[previous_months[-1]]
+            report_file.write(f" (전월 대비 {(current - previous) * 100 / previous:+.1f}%)")
+        report_file.write("\n")
+        if top_services:
+            services = ", ".join(f"{service} (${amount:,.2f})" for service, amount in top_services)
+            report_file.write(f"- **상위 서비스**: {services}\n")
+        for change in changes:
+            report_file.write(f"- **전월 대비 변화**: {change['key']} {change['change']:+,.2f} USD\n")
+        report_file.write("\n")
+
     def generate_report(self):
         """경영진 요약 보고서를 생성합니다."""
         print("📊 Executive Summary 보고서 생성 중...")
@@ -11,6 +11,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+# 공유 데이터 로더 import
+sys.path.append(str(Path(__file__).parent))
+from report_data_loader import load_report_data
+
 class EnhancedRecommendationsGenerator:
     def __init__(self, report_dir: str = None):
         # 스크립트의 실제 위치를 기준으로 경로 설정
@@ -40,13 +44,8 @@ class EnhancedRecommendationsGenerator:
 
     def load_json_file(self, filename: str) -> Optional[Dict]:
         """JSON 파일을 로드합니다."""
-        file_path = self.report_dir / filename
         try:
-            if file_path.exists() and file_path.stat().st_size > 16:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data
-            return None
+            return load_report_data(self.report_dir / filename, min_size=16)
         except (json.JSONDecodeError, FileNotFoundError) as e:
             print(f"Warning: Failed to load {filename}: {e}")
             return None
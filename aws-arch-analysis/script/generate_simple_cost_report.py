@@ -2,13 +2,21 @@
 """
 간단한 비용 최적화 보고서 생성기
 수집된 비용 데이터를 바탕으로 기본적인 비용 분석 보고서 생성
+
+- 월간 비용과 상위 서비스는 비용 시계열 저장소(cost_timeseries_store.py)의 가장 최근 완료 월 기준
+  (저장소를 사용할 수 없으면 cost_by_service_monthly.json / cost_by_service_daily.json)
 """
 
-import json
 import os
+import sys
 from datetime import datetime
 from pathlib import Path
 
+# 공유 데이터 로더 import
+sys.path.append(str(Path(__file__).parent))
+from report_data_loader import load_report_data
+from cost_timeseries_store import open_synced_store
+
 class SimpleCostReportGenerator:
     def __init__(self, report_dir: str = None):
         # 스크립트의 실제 위치를 기준으로 경로 설정
@@ -22,13 +30,8 @@ class SimpleCostReportGenerator:
 
     def load_json_data(self, filename: str):
         """JSON 데이터 파일 로드"""
-        file_path = self.report_dir / filename
         try:
-            if file_path.exists() and file_path.stat().st_size > 16:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return data
-            return None
+            return load_report_data(self.report_dir / filename, min_size=16)
         except Exception as e:
             print(f"Warning: Failed to load {filename}: {e}")
             return None
@@ -39,13 +42,54 @@ class SimpleCostReportGenerator:
             return "$0.00"
         return f"${float(amount):,.2f}"
 
+    def summarize_cost_history(self):
+        """비용 시계열 저장소 기반 월간 비용/상위 서비스/일간 데이터 섹션 (저장소가 없으면 None)"""
+        store = open_synced_store(self.report_dir)
+        if store is None:
+            return None
+
+        try:
+            month = store.latest_complete_month()
+            monthly = {period: amount for period, amount, _ in store.monthly_totals(months=24)}
+            top_services = store.top_keys(period_type="month", period=month, limit=10) if month else []
+            service_count = store.key_count(month=month) if month else 0
+            first_day, last_day, daily_points = store.coverage()
+            settled_through = store.settled_through()
+        finally:
+            store.close()
+        if month is None:
+            return None
+
+        total_cost = monthly.get(month, 0)
+        content = f"""### 월간 총 비용 ({month})
+**총 비용:** {self.format_currency(total_cost)}
+**분석 서비스 수:** {service_count}개
+
+### 상위 비용 서비스 (Top 10)
+
+| 순위 | 서비스명 | 월간 비용 | 비율 |
+|------|----------|-----------|------|
+"""
+        for i, (service_name, cost) in enumerate(top_services, 1):
+            percentage = (cost * 100 / total_cost) if total_cost > 0 else 0
+            content += f"| {i} | {service_name[:40]} | {self.format_currency(cost)} | {percentage:.1f}% |\n"
+
+        content += f"""
+### 일간 비용 트렌드
+**일간 데이터 포인트:** {daily_points}개
+**분석 기간:** {first_day} ~ {last_day} (확정: {settled_through or '-'}까지)
+
+"""
+        return content
+
     def generate_report(self):
         """비용 최적화 보고서 생성"""
         print("💰 Simple Cost Analysis 보고서 생성 중...")
         
         # 데이터 로드
-        service_monthly = self.load_json_data('cost_by_service_monthly.json')
-        service_daily = self.load_json_data('cost_by_service_daily.json')
+        cost_history = self.summarize_cost_history()
+        service_monthly = self.load_json_data('cost_by_service_monthly.json') if cost_history is None else None
+        service_daily = self.load_json_data('cost_by_service_daily.json') if cost_history is None else None
         
         # 보고서 내용 생성
         report_content = f"""# 💰 비용 최적화 종합 분석
@@ -63,7 +107,9 @@ class SimpleCostReportGenerator:
 """
         
         # 서비스별 월간 비용 분석
-        if service_monthly and 'rows' in service_monthly and len(service_monthly['rows']) > 0:
+        if cost_history is not None:
+            report_content += cost_history
+        elif service_monthly and 'rows' in service_monthly and len(service_monthly['rows']) > 0:
             rows = service_monthly['rows']
             total_cost = sum(row.get('blended_cost_amount', 0) for row in rows)
             
@@ -89,8 +135,8 @@ class SimpleCostReportGenerator:
 
 """
 
-        # 일간 비용 트렌드
-        if service_daily and 'rows' in service_daily and len(service_daily['rows']) > 0:
+        # 일간 비용 트렌드 (저장소 기반 섹션에 포함)
+        if cost_history is None and service_daily and 'rows' in service_daily and len(service_daily['rows']) > 0:
             daily_rows = service_daily['rows']
             report_content += f"""
 ### 일간 비용 트렌드
@@ -98,7 +144,7 @@ class SimpleCostReportGenerator:
 **분석 기간:** 최근 데이터 기준
 
 """
-        else:
+        elif cost_history is None:
             report_content += """
 ### 일간 비용 트렌드
 ❌ 일간 비용 데이터를 찾을 수 없습니다.
@@ -8,10 +8,14 @@ import json
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import datetime
 from collections import Counter, defaultdict
 
+# 공유 데이터 로더 import
+sys.path.append(str(Path(__file__).parent))
+from report_data_loader import load_report_rows
+
 class StorageReportGenerator:
     def __init__(self, report_dir: str = None):
         # 스크립트의 실제 위치를 기준으로 경로 설정
@@ -22,18 +26,10 @@ class StorageReportGenerator:
         self.report_dir = Path(report_dir)
         self.report_dir.mkdir(parents=True, exist_ok=True)
 
-    def load_json_file(self, filename: str) -> Optional[List[Dict[str, Any]]]:
-        """JSON 파일을 로드합니다."""
-        file_path = self.report_dir / filename
+    def load_json_file(self, filename: str, columns: Sequence[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """JSON 파일을 로드합니다. (columns를 지정하면 해당 컬럼만 로드)"""
         try:
-            if file_path.exists() and file_path.stat().st_size > 0:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, dict) and 'rows' in data:
-                        return data['rows']
-                    elif isinstance(data, list):
-                        return data
-                    return []
+            return load_report_rows(self.report_dir / filename, columns=columns)
         except (json.JSONDecodeError, IOError) as e:
             print(f"Warning: Failed to load {filename}: {e}")
         return None
@@ -115,8 +111,8 @@ class StorageReportGenerator:
         report_file.write("## 📊 EBS 성능 분석\n\n")
         
         # 읽기 IOPS 메트릭
-        read_ops_data = self.load_json_file("storage_ebs_volume_metric_read_ops.json")
-        write_ops_data = self.load_json_file("storage_ebs_volume_metric_write_ops.json")
+        read_ops_data = self.load_json_file("storage_ebs_volume_metric_read_ops.json", ["volume_id", "average"])
+        write_ops_data = self.load_json_file("storage_ebs_volume_metric_write_ops.json", ["volume_id", "average"])
         
         if read_ops_data or write_ops_data:
             report_file.write("### IOPS 성능 메트릭 (최근 1시간)\n")
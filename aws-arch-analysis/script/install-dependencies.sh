@@ -49,7 +49,7 @@ install_amazon_linux() {
     sudo yum install -y python3 python3-pip jq git zip curl unzip || handle_error "기본 도구 설치 실패"
     
     show_progress "Python 패키지 설치"
-    pip3 install markdown beautifulsoup4 pygments --user || handle_error "Python 패키지 설치 실패"
+    pip3 install markdown beautifulsoup4 pygments psycopg2-binary boto3 numpy pyyaml --user || handle_error "Python 패키지 설치 실패"
     
     show_progress "AWS CLI v2 설치"
     if ! command -v aws >/dev/null 2>&1; then
@@ -79,7 +79,7 @@ install_ubuntu() {
     sudo apt install -y python3 python3-pip jq git zip curl unzip || handle_error "기본 도구 설치 실패"
     
     show_progress "Python 패키지 설치"
-    pip3 install markdown beautifulsoup4 pygments --user || handle_error "Python 패키지 설치 실패"
+    pip3 install markdown beautifulsoup4 pygments psycopg2-binary boto3 numpy pyyaml --user || handle_error "Python 패키지 설치 실패"
     
     show_progress "AWS CLI v2 설치"
     if ! command -v aws >/dev/null 2>&1; then
@@ -124,7 +124,7 @@ install_macos() {
     brew install python3 jq git curl || handle_error "기본 도구 설치 실패"
     
     show_progress "Python 패키지 설치"
-    pip3 install markdown beautifulsoup4 pygments --user || handle_error "Python 패키지 설치 실패"
+    pip3 install markdown beautifulsoup4 pygments psycopg2-binary boto3 numpy pyyaml --user || handle_error "Python 패키지 설치 실패"
     
     show_progress "AWS CLI 설치"
     if ! command -v aws >/dev/null 2>&1; then
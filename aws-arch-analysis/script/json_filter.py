@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+jq 호환 JSON 필터 엔진 (부분 집합)
+수집기에서 jq 프로세스로 넘기던 필터를 이미 파싱된 객체에 직접 적용
+
+- 식은 compile_filter()로 한 번 컴파일하고 캐시 (같은 식은 재컴파일하지 않음)
+- 지원 문법: . / .a.b / .a? / .["a"] / .[0] / .[] / | / map(f) / select(f) / {a: f, b} / [f]
+  비교(== != < <= > >=), and / or / not, length, keys, has("a"), 문자열/숫자/true/false/null 리터럴
+- jq처럼 하나의 필터가 여러 값을 낼 수 있으며(.[] 등), apply()는 결과가 정확히 하나일 때 그 값을 반환
+
+사용법:
+    python3 json_filter.py '.Functions | map({FunctionName, Runtime})' < lambda.json
+    python3 json_filter.py --benchmark                    # jq 프로세스 방식과 비교
+"""
+
+import json
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+Filter = Callable[[Any], Iterator[Any]]
+
+
+class JSONFilterError(Exception):
+    """필터 문법 오류 또는 적용 오류"""
+
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<op>==|!=|<=|>=|[.|,:()\[\]{}<>?])
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_]*)
+""", re.VERBOSE)
+
+KEYWORDS = {"and", "or", "true", "false", "null"}
+COMPARISONS = {"==", "!=", "<", "<=", ">", ">="}
+
+
+def tokenize(expression: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    while position < len(expression):
+        match = TOKEN_PATTERN.match(expression, position)
+        if not match:
+            raise JSONFilterError(f"해석할 수 없는 문자: {expression[position:position + 10]!r}")
+        position = match.end()
+        if match.lastgroup != "space":
+            tokens.append((match.lastgroup, match.group()))
+    return tokens
+
+
+def is_truthy(value: Any) -> bool:
+    return value is not None and value is not False
+
+
+def type_rank(value: Any) -> int:
+    """jq 정렬 순서: null < false < true < 숫자 < 문자열 < 배열 < 객체"""
+    if value is None:
+        return 0
+    if value is False:
+        return 1
+    if value is True:
+        return 2
+    if isinstance(value, (int, float)):
+        return 3
+    if isinstance(value, str):
+        return 4
+    if isinstance(value, list):
+        return 5
+    return 6
+
+
+def compare(op: str, left: Any, right: Any) -> bool:
+    if op == "==":
+        return left == right and type_rank(left) == type_rank(right)
+    if op == "!=":
+        return not (left == right and type_rank(left) == type_rank(right))
+    key_left, key_right = (type_rank(left), left), (type_rank(right), right)
+    if type_rank(left) != type_rank(right):
+        key_left, key_right = (type_rank(left),), (type_rank(right),)
+    try:
+        if op == "<":
+            return key_left < key_right
+        if op == "<=":
+            return key_left <= key_right
+        if op == ">":
+            return key_left > key_right
+        return key_left >= key_right
+    except TypeError:
+        raise JSONFilterError(f"비교할 수 없는 값: {left!r} {op} {right!r}")
+
+
+def get_field(value: Any, key: Any, optional: bool) -> Iterator[Any]:
+    if value is None:
+        yield None
+    elif isinstance(key, str) and isinstance(value, dict):
+        yield value.get(key)
+    elif isinstance(key, int) and isinstance(value, list):
+        yield value[key] if -len(value) <= key < len(value) else None
+    elif not optional:
+        raise JSONFilterError(f"{type(value).__name__}에서 {key!r} 조회 불가")
+
+
+def iterate(value: Any, optional: bool) -> Iterator[Any]:
+    if isinstance(value, list):
+        yield from value
+    elif isinstance(value, dict):
+        yield from value.values()
+    elif not optional:
+        raise JSONFilterError(f"{type(value).__name__}은(는) 순회할 수 없습니다")
+
+
+def length(value: Any) -> Any:
+    if value is None:
+        return 0
+    if isinstance(value, (list, dict, str)):
+        return len(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return abs(value)
+    raise JSONFilterError(f"{type(value).__name__}의 length를 구할 수 없습니다")
+
+
+class Parser:
+    """재귀 하강 파서: 식을 입력 -> 출력 반복자 함수로 컴파일"""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = tokenize(expression)
+        self.position = 0
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def accept(self, text: str) -> bool:
+        if self.peek()[1] == text:
+            self.position += 1
+            return True
+        return False
+
+    def expect(self, text: str):
+        if not self.accept(text):
+            raise JSONFilterError(f"'{text}'이(가) 필요합니다: {self.expression}")
+
+    def parse(self) -> Filter:
+        result = self.parse_pipe()
+        if self.position != len(self.tokens):
+            raise JSONFilterError(f"해석하지 못한 토큰 {self.peek()[1]!r}: {self.expression}")
+        return result
+
+    def parse_pipe(self) -> Filter:
+        left = self.parse_comma()
+        while self.accept("|"):
+            right = self.parse_comma()
+            left = (lambda first, second: lambda value: (
+                output for item in first(value) for output in second(item)))(left, right)
+        return left
+
+    def parse_comma(self) -> Filter:
+        filters = [self.parse_or()]
+        while self.accept(","):
+            filters.append(self.parse_or())
+        if len(filters) == 1:
+            return filters[0]
+        return lambda value: (output for item in filters for output in item(value))
+
+    def parse_or(self) -> Filter:
+        left = self.parse_and()
+        while self.accept("or"):
+            right = self.parse_and()
+            left = (lambda first, second: lambda value: (
+                is_truthy(a) or is_truthy(b) for a in first(value) for b in second(value)))(left, right)
+        return left
+
+    def parse_and(self) -> Filter:
+        left = self.parse_comparison()
+        while self.accept("and"):
+            right = self.parse_comparison()
+            left = (lambda first, second: lambda value: (
+                is_truthy(a) and is_truthy(b) for a in first(value) for b in second(value)))(left, right)
+        return left
+
+    def parse_comparison(self) -> Filter:
+        left = self.parse_postfix()
+        if self.peek()[1] in COMPARISONS:
+            op = self.peek()[1]
+            self.position += 1
+            right = self.parse_postfix()
+            return lambda value: (compare(op, a, b) for a in left(value) for b in right(value))
+        return left
+
+    def parse_postfix(self) -> Filter:
+        result = self.parse_primary()
+        while True:
+            kind, text = self.peek()
+            if text == "." and self.peek(1)[0] in ("ident", "string"):
+                self.position += 1
+                result = self.chain(result, self.parse_field_access())
+            elif text == "[":
+                result = self.chain(result, self.parse_bracket())
+            else:
+                return result
+
+    @staticmethod
+    def chain(first: Filter, second: Filter) -> Filter:
+        return lambda value: (output for item in first(value) for output in second(item))
+
+    def parse_field_access(self) -> Filter:
+        """'.' 다음의 필드 이름 (ident 또는 "문자열")"""
+        kind, text = self.peek()
+        self.position += 1
+        key = json.loads(text) if kind == "string" else text
+        optional = self.accept("?")
+        return lambda value: get_field(value, key, optional)
+
+    def parse_bracket(self) -> Filter:
+        """[] / ["키"] / [숫자] 접미사"""
+        self.expect("[")
+        if self.accept("]"):
+            optional = self.accept("?")
+            return lambda value: iterate(value, optional)
+        kind, text = self.peek()
+        if kind not in ("string", "number"):
+            raise JSONFilterError(f"지원하지 않는 인덱스 식: {self.expression}")
+        self.position += 1
+        self.expect("]")
+        key = json.loads(text)
+        if isinstance(key, float):
+            key = int(key)
+        optional = self.accept("?")
+        return lambda value: get_field(value, key, optional)
+
+    def parse_primary(self) -> Filter:
+        kind, text = self.peek()
+        if text == ".":
+            self.position += 1
+            next_kind, next_text = self.peek()
+            if next_kind in ("ident", "string") and next_text not in KEYWORDS:
+                return self.parse_field_access()
+            if next_text == "[":
+                return self.parse_bracket()
+            return lambda value: iter((value,))
+        if kind in ("string", "number"):
+            self.position += 1
+            literal = json.loads(text)
+            return lambda value: iter((literal,))
+        if text in ("true", "false", "null"):
+            self.position += 1
+            literal = json.loads(text)
+            return lambda value: iter((literal,))
+        if text == "(":
+            self.position += 1
+            inner = self.parse_pipe()
+            self.expect(")")
+            return inner
+        if text == "[":
+            self.position += 1
+            if self.accept("]"):
+                return lambda value: iter(([],))
+            inner = self.parse_pipe()
+            self.expect("]")
+            return lambda value: iter((list(inner(value)),))
+        if text == "{":
+            return self.parse_object()
+        if kind == "ident":
+            return self.parse_function()
+        raise JSONFilterError(f"예상하지 못한 토큰 {text!r}: {self.expression}")
+
+    def parse_object(self) -> Filter:
+        """{키: 식, 키, "키": 식} 객체 생성 (값이 여러 개면 조합별로 객체 생성)"""
+        self.expect("{")
+        entries = []
+        while not self.accept("}"):
+            kind, text = self.peek()
+            if kind not in ("ident", "string"):
+                raise JSONFilterError(f"객체 키가 필요합니다: {self.expression}")
+            self.position += 1
+            key = json.loads(text) if kind == "string" else text
+            if self.accept(":"):
+                entries.append((key, self.parse_or()))
+            else:
+                entries.append((key, (lambda name: lambda value: get_field(value, name, False))(key)))
+            if not self.accept(","):
+                self.expect("}")
+                break
+
+        def build(value: Any) -> Iterator[Any]:
+            result = {}
+            combinations = None
+            for key, value_filter in entries:
+                outputs = list(value_filter(value))
+                if combinations is None and len(outputs) == 1:
+                    result[key] = outputs[0]
+                    continue
+                # 값이 여러 개(또는 0개)인 키가 나오면 조합별 객체 목록으로 전환
+                combinations = [result] if combinations is None else combinations
+                combinations = [{**combination, key: output} for combination in combinations for output in outputs]
+            yield from ([result] if combinations is None else combinations)
+
+        return build
+
+    def parse_function(self) -> Filter:
+        name = self.peek()[1]
+        self.position += 1
+        if name in ("map", "select", "has"):
+            self.expect("(")
+            argument = self.parse_pipe()
+            self.expect(")")
+            if name == "map":
+                return lambda value: iter(([output for item in iterate(value, False) for output in argument(item)],))
+            if name == "select":
+                return lambda value: (value for condition in argument(value) if is_truthy(condition))
+            return lambda value: (key in value if isinstance(value, dict) else
+                                  isinstance(key, int) and 0 <= key < len(value)
+                                  for key in argument(value))
+        if name == "length":
+            return lambda value: iter((length(value),))
+        if name == "keys":
+            return lambda value: iter((sorted(value) if isinstance(value, dict) else list(range(len(value))),))
+        if name == "not":
+            return lambda value: iter((not is_truthy(value),))
+        if name == "empty":
+            return lambda value: iter(())
+        raise JSONFilterError(f"지원하지 않는 함수 {name!r}: {self.expression}")
+
+
+class JSONFilter:
+    """컴파일된 필터"""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.function = Parser(expression).parse()
+
+    def evaluate(self, data: Any) -> List[Any]:
+        """필터의 모든 출력 값"""
+        try:
+            return list(self.function(data))
+        except (TypeError, KeyError, IndexError) as e:
+            raise JSONFilterError(f"{self.expression}: {e}")
+
+    def apply(self, data: Any) -> Any:
+        """필터의 출력 값 (출력이 정확히 하나가 아니면 JSONFilterError)"""
+        outputs = self.evaluate(data)
+        if len(outputs) != 1:
+            raise JSONFilterError(f"{self.expression}: 출력 값이 {len(outputs)}개입니다 (1개 필요)")
+        return outputs[0]
+
+
+@lru_cache(maxsize=256)
+def compile_filter(expression: str) -> JSONFilter:
+    """필터 컴파일 (같은 식은 캐시된 결과 재사용)"""
+    return JSONFilter(expression)
+
+
+def make_benchmark_data(count: int) -> dict:
+    """Lambda list-functions 응답 형태의 벤치마크 데이터"""
+    runtimes = ["python3.12", "nodejs20.x", "java21", "python3.9", "go1.x"]
+    return {"Functions": [{
+        "FunctionName": f"function-{index}",
+        "FunctionArn": f"arn:aws:lambda:ap-northeast-2:123456789012:function:function-{index}",
+        "Runtime": runtimes[index % len(runtimes)],
+        "MemorySize": 128 * (1 + index % 8),
+        "Timeout": 3 + index % 60,
+        "CodeSize": 1000 + index * 7,
+        "LastModified": "2024-01-01T00:00:00.000+0000",
+        "Environment": {"Variables": {"STAGE": "prod", "INDEX": str(index)}},
+        "Layers": [{"Arn": f"arn:aws:lambda:ap-northeast-2:123456789012:layer:common:{index % 5}"}],
+    } for index in range(count)]}
+
+
+def run_benchmark(sizes: List[int], repeat: int = 3):
+    """jq 프로세스 방식(직렬화 → jq → 재파싱)과 내장 엔진 비교"""
+    import subprocess
+    import time
+
+    expressions = [
+        ".Functions | map({FunctionName, Runtime, MemorySize})",
+        '.Functions | map(select(.Runtime == "python3.9" or .MemorySize >= 512)) | map(.FunctionName)',
+    ]
+    print(f"{'함수 수':>8} {'방식':<8} {'필터':<60} {'시간(ms)':>10}")
+    print("-" * 92)
+    for size in sizes:
+        data = make_benchmark_data(size)
+        for expression in expressions:
+            timings = {}
+            results = {}
+            for mode in ("jq", "native"):
+                samples = []
+                for _ in range(repeat):
+                    start_time = time.perf_counter()
+                    if mode == "jq":
+                        completed = subprocess.run(["jq", expression], input=json.dumps(data),
+                                                   capture_output=True, text=True, check=True)
+                        results[mode] = json.loads(completed.stdout)
+                    else:
+                        results[mode] = compile_filter(expression).apply(data)
+                    samples.append(time.perf_counter() - start_time)
+                timings[mode] = min(samples)
+                print(f"{size:>8} {mode:<8} {expression[:60]:<60} {timings[mode] * 1000:>10.1f}")
+            status = "일치" if results["jq"] == results["native"] else "불일치"
+            print(f"{'':>8} {'':<8} 속도 향상 {timings['jq'] / timings['native']:.1f}배, 결과 {status}")
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="jq 호환 JSON 필터 (부분 집합)")
+    parser.add_argument("filter", nargs="?", help="필터 식")
+    parser.add_argument("file", nargs="?", help="입력 JSON 파일 (기본값: 표준 입력)")
+    parser.add_argument("--benchmark", action="store_true", help="jq 프로세스 방식과 성능 비교")
+    parser.add_argument("--sizes", default="100,1000,10000", help="벤치마크 데이터 크기 (쉼표 구분)")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark([int(size) for size in args.sizes.split(",")])
+        return
+    if not args.filter:
+        parser.error("필터 식이 필요합니다")
+
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    else:
+        data = json.load(sys.stdin)
+    try:
+        for output in compile_filter(args.filter).evaluate(data):
+            print(json.dumps(output, indent=2, ensure_ascii=False))
+    except JSONFilterError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
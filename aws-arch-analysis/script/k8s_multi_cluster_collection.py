@@ -0,0 +1,646 @@
+#!/usr/bin/env python3
+"""
+Kubernetes 다중 클러스터 수집
+Steampipe kubernetes 플러그인은 연결에 설정된 kube 컨텍스트 하나만 조회하므로,
+클러스터마다 Kubernetes API 목록 엔드포인트를 직접 조회해 kubernetes_* 테이블과 같은 컬럼으로 수집
+
+- 대상 클러스터: kubeconfig(KUBECONFIG 또는 ~/.kube/config)의 컨텍스트와 compute_eks_clusters.json의 EKS 클러스터
+  (엔드포인트가 같으면 kubeconfig 인증 정보를 쓰고, kubeconfig에 없는 EKS 클러스터는 `aws eks get-token` 토큰 사용)
+- K8S_CLUSTERS 환경 변수(쉼표 구분)로 수집할 클러스터/컨텍스트 이름 제한
+- K8S_MULTI_CLUSTER: auto(기본값, 클러스터가 2개 이상이면 사용), 1(항상 사용), 0(사용 안 함, Steampipe 단일 컨텍스트)
+- 클러스터별 결과는 report/k8s_clusters/<클러스터>/k8s_*.json에 분할 저장 (두 수집기 컬럼의 합집합)
+- report/k8s_*.json은 분할 파일을 이어 붙여 생성하며, 행마다 cluster_name 컬럼으로 클러스터 구분
+- 클러스터는 K8S_CLUSTER_CONCURRENCY(기본값: 4)개, 클러스터 안의 테이블은 K8S_CONTEXT_CONCURRENCY(기본값: 4)개까지 동시 조회
+- 목록 API는 K8S_PAGE_SIZE(기본값: 500)개 단위 페이지로 읽고 페이지마다 파일에 기록 (메모리 사용량 일정)
+- 요청은 aws_rate_limiter.py의 클러스터별 호출 예산(kubernetes 서비스)을 받아 전송하고 429/5xx는 백오프 후 재시도
+- 같은 실행(COLLECTION_RUN_ID)에서 이미 수집한 분할은 다시 조회하지 않음 (컴퓨팅/컨테이너 수집기가 공유, 클러스터별 잠금)
+- 수집 매니페스트(CollectionManifest)를 지정하면 병합 출력 파일의 수집 이력을 기록하고, 증분 모드에서는
+  쿼리와 대상 클러스터 목록이 같고 TTL 이내인 출력 파일은 다시 수집하지 않음
+- ConfigMap/Secret 페이로드는 기본적으로 키별 크기/해시 요약 컬럼(<컬럼>_keys)으로 기록 (k8s_payload_summary.py)
+- kubeconfig의 server만 바꾸면 로컬 대체 API 서버(kubectl proxy, kind, 테스트용 HTTP 서버 등)로 수집 가능
+
+사용법:
+    python k8s_multi_cluster_collection.py --list
+    python k8s_multi_cluster_collection.py --kubeconfig ./kubeconfig --clusters dev,prod
+"""
+
+import argparse
+import base64
+import fcntl
+import json
+import os
+import re
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+sys.path.append(str(Path(__file__).parent))
+from aws_rate_limiter import call_with_retry, error_message
+from collection_telemetry import get_run_id, measure_query, query_context
+from k8s_payload_summary import (PAYLOAD_COLUMNS, get_summary_key, payload_source, summarize_payload,
+                                 summary_columns, summary_enabled, table_summary_key)
+from report_data_loader import load_report_rows
+from steampipe_derived_datasets import parse_simple_query
+from steampipe_query_engine import StreamingResultWriter
+from steampipe_shared_datasets import SHARED_TABLE_COLUMNS
+
+MULTI_CLUSTER_ENV = "K8S_MULTI_CLUSTER"
+CLUSTERS_ENV = "K8S_CLUSTERS"
+CLUSTER_CONCURRENCY_ENV = "K8S_CLUSTER_CONCURRENCY"
+CONTEXT_CONCURRENCY_ENV = "K8S_CONTEXT_CONCURRENCY"
+PAGE_SIZE_ENV = "K8S_PAGE_SIZE"
+REQUEST_TIMEOUT_ENV = "K8S_REQUEST_TIMEOUT"
+DEFAULT_CLUSTER_CONCURRENCY = 4
+DEFAULT_CONTEXT_CONCURRENCY = 4
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_REQUEST_TIMEOUT = 60
+
+PARTITION_DIR = "k8s_clusters"
+MARKER_FILE = "_collection.json"
+CLUSTER_COLUMN = "cluster_name"
+EKS_CLUSTERS_FILE = "compute_eks_clusters.json"
+
+# Steampipe kubernetes 테이블별 목록 API 경로
+TABLE_RESOURCES = {
+    "kubernetes_namespace": "/api/v1/namespaces",
+    "kubernetes_pod": "/api/v1/pods",
+    "kubernetes_service": "/api/v1/services",
+    "kubernetes_node": "/api/v1/nodes",
+    "kubernetes_config_map": "/api/v1/configmaps",
+    "kubernetes_secret": "/api/v1/secrets",
+    "kubernetes_persistent_volume": "/api/v1/persistentvolumes",
+    "kubernetes_persistent_volume_claim": "/api/v1/persistentvolumeclaims",
+    "kubernetes_deployment": "/apis/apps/v1/deployments",
+    "kubernetes_daemonset": "/apis/apps/v1/daemonsets",
+    "kubernetes_stateful_set": "/apis/apps/v1/statefulsets",
+    "kubernetes_job": "/apis/batch/v1/jobs",
+    "kubernetes_cronjob": "/apis/batch/v1/cronjobs",
+    "kubernetes_ingress": "/apis/networking.k8s.io/v1/ingresses",
+}
+
+# 필드 이름을 snake_case 변환으로 찾을 수 없는 컬럼 (컬럼 -> 필드 경로)
+COLUMN_FIELDS = {
+    "storage_class": ("spec", "storageClassName"),
+    "reclaim_policy": ("spec", "persistentVolumeReclaimPolicy"),
+    "spec_finalizers": ("spec", "finalizers"),
+}
+
+OBJECT_SECTIONS = ("metadata", "spec", "status")
+
+# 컬럼 타입 추정 (Steampipe 결과 파일의 columns 항목)
+TIMESTAMP_COLUMN_SUFFIX = "_timestamp"
+
+
+class KubeCluster(NamedTuple):
+    """수집 대상 클러스터 (cluster/user는 kubeconfig 형식의 항목)"""
+    name: str
+    server: str
+    source: str
+    context: Optional[str]
+    cluster: Dict[str, Any]
+    user: Dict[str, Any]
+
+
+class TableSpec(NamedTuple):
+    """출력 파일 하나의 수집 명세"""
+    description: str
+    table: str
+    output_file: str
+    columns: Tuple[str, ...]
+
+
+def get_env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.environ.get(name, default)))
+    except ValueError:
+        return default
+
+
+def partition_name(cluster_name: str) -> str:
+    """클러스터 이름을 분할 디렉토리 이름으로 변환"""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", cluster_name) or "_"
+
+
+def normalize_server(server: str) -> str:
+    return (server or "").strip().rstrip("/").lower()
+
+
+def load_kubeconfig(paths: Sequence[Path]) -> Dict[str, Any]:
+    """kubeconfig 파일들을 병합 (같은 이름은 앞 파일 우선, PyYAML이 없으면 JSON 형식만 지원)"""
+    merged = {"clusters": {}, "users": {}, "contexts": [], "current-context": None}
+    context_names = set()
+    for path in paths:
+        try:
+            text = Path(path).read_text(encoding="utf-8")
+            config = yaml.safe_load(text) if yaml else json.loads(text)
+        except (OSError, ValueError) as e:
+            print(f"kubeconfig를 읽을 수 없습니다: {path} ({e})", file=sys.stderr)
+            continue
+        if not isinstance(config, dict):
+            continue
+
+        base_dir = Path(path).parent
+        for kind in ("clusters", "users"):
+            item_key = kind[:-1]
+            for item in config.get(kind) or []:
+                entry = dict(item.get(item_key) or {})
+                # 상대 경로 파일 참조는 kubeconfig 위치 기준
+                for key in ("certificate-authority", "client-certificate", "client-key", "tokenFile"):
+                    if entry.get(key) and not os.path.isabs(entry[key]):
+                        entry[key] = str(base_dir / entry[key])
+                merged[kind].setdefault(item.get("name"), entry)
+        for item in config.get("contexts") or []:
+            if item.get("name") not in context_names:
+                context_names.add(item.get("name"))
+                merged["contexts"].append(item)
+        merged["current-context"] = merged["current-context"] or config.get("current-context")
+    return merged
+
+
+def get_kubeconfig_paths(kubeconfig: str = None) -> List[Path]:
+    value = kubeconfig or os.environ.get("KUBECONFIG") or str(Path.home() / ".kube" / "config")
+    return [Path(path) for path in value.split(os.pathsep) if path and Path(path).is_file()]
+
+
+def load_eks_clusters(report_dir: Path) -> List[Dict[str, Any]]:
+    """compute_eks_clusters.json의 클러스터 (이름, 엔드포인트, CA, 리전)"""
+    clusters = []
+    for row in load_report_rows(report_dir / EKS_CLUSTERS_FILE) or []:
+        if not row.get("name") or not row.get("endpoint"):
+            continue
+        certificate_authority = row.get("certificate_authority") or {}
+        if isinstance(certificate_authority, str):
+            try:
+                certificate_authority = json.loads(certificate_authority)
+            except ValueError:
+                certificate_authority = {}
+        arn_parts = (row.get("arn") or "").split(":")
+        clusters.append({
+            "name": row["name"],
+            "endpoint": row["endpoint"],
+            "certificate_authority_data": certificate_authority.get("Data") or certificate_authority.get("data"),
+            "region": arn_parts[3] if len(arn_parts) > 3 else os.environ.get("AWS_DEFAULT_REGION"),
+        })
+    return clusters
+
+
+def discover_clusters(report_dir, kubeconfig: str = None, names: Sequence[str] = None) -> List[KubeCluster]:
+    """kubeconfig 컨텍스트와 EKS 클러스터를 엔드포인트 기준으로 합친 수집 대상 목록"""
+    config = load_kubeconfig(get_kubeconfig_paths(kubeconfig))
+    eks_clusters = load_eks_clusters(Path(report_dir))
+    eks_by_server = {normalize_server(cluster["endpoint"]): cluster for cluster in eks_clusters}
+
+    # 현재 컨텍스트를 먼저 보고, 같은 서버를 가리키는 컨텍스트는 첫 번째만 사용
+    contexts = sorted(config["contexts"], key=lambda item: item.get("name") != config["current-context"])
+    clusters: Dict[str, KubeCluster] = {}
+    for item in contexts:
+        context = item.get("context") or {}
+        cluster_entry = config["clusters"].get(context.get("cluster"))
+        if not cluster_entry or not cluster_entry.get("server"):
+            continue
+        server = normalize_server(cluster_entry["server"])
+        if server in clusters:
+            continue
+        eks = eks_by_server.get(server)
+        clusters[server] = KubeCluster(
+            eks["name"] if eks else item.get("name"), cluster_entry["server"], "kubeconfig", item.get("name"),
+            cluster_entry, config["users"].get(context.get("user")) or {})
+
+    for eks in eks_clusters:
+        server = normalize_server(eks["endpoint"])
+        if server in clusters:
+            continue
+        args = ["eks", "get-token", "--cluster-name", eks["name"], "--output", "json"]
+        if eks["region"]:
+            args += ["--region", eks["region"]]
+        clusters[server] = KubeCluster(
+            eks["name"], eks["endpoint"], "eks", None,
+            {"server": eks["endpoint"], "certificate-authority-data": eks["certificate_authority_data"]},
+            {"exec": {"command": "aws", "args": args}})
+
+    names = set(names or [name.strip() for name in os.environ.get(CLUSTERS_ENV, "").split(",") if name.strip()])
+    return [cluster for cluster in clusters.values()
+            if not names or cluster.name in names or cluster.context in names]
+
+
+def multi_cluster_enabled(clusters: Sequence[KubeCluster]) -> bool:
+    """다중 클러스터 수집 사용 여부 (K8S_MULTI_CLUSTER)"""
+    mode = os.environ.get(MULTI_CLUSTER_ENV, "auto").lower()
+    if mode in ("0", "false", "off"):
+        return False
+    if mode in ("1", "true", "on"):
+        return bool(clusters)
+    return len(clusters) > 1
+
+
+def api_error_message(error: Exception) -> str:
+    """재시도 분류용 오류 메시지 (HTTP 상태 코드를 aws_rate_limiter 분류 문자열로 변환)"""
+    if isinstance(error, urllib.error.HTTPError):
+        if error.code == 429:
+            return f"TooManyRequests: HTTP {error.code}"
+        if error.code >= 500:
+            return f"ServiceUnavailable: HTTP {error.code} {error.reason}"
+        return f"HTTP {error.code} {error.reason}"
+    if isinstance(error, (urllib.error.URLError, ConnectionError, TimeoutError)):
+        return f"RequestTimeout: {error}"
+    return error_message(error)
+
+
+class KubeApiClient:
+    """kubeconfig 항목(cluster/user)으로 인증하는 Kubernetes API 목록 조회 클라이언트"""
+
+    def __init__(self, cluster: KubeCluster, timeout: int = None):
+        self.cluster = cluster
+        self.timeout = timeout or get_env_int(REQUEST_TIMEOUT_ENV, DEFAULT_REQUEST_TIMEOUT)
+        self.temp_dir = None
+        self.token = None
+        self.token_expires = 0.0
+        self.token_lock = threading.Lock()
+        self.ssl_context = self.build_ssl_context() if cluster.server.startswith("https") else None
+
+    def write_temp_file(self, name: str, data: str) -> str:
+        if self.temp_dir is None:
+            self.temp_dir = tempfile.mkdtemp(prefix="k8s-auth-")
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "wb") as f:
+            f.write(base64.b64decode(data))
+        os.chmod(path, 0o600)
+        return path
+
+    def build_ssl_context(self) -> ssl.SSLContext:
+        cluster, user = self.cluster.cluster, self.cluster.user
+        if cluster.get("insecure-skip-tls-verify"):
+            context = ssl.create_default_context()
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        elif cluster.get("certificate-authority-data"):
+            context = ssl.create_default_context(
+                cadata=base64.b64decode(cluster["certificate-authority-data"]).decode("ascii"))
+        else:
+            context = ssl.create_default_context(cafile=cluster.get("certificate-authority"))
+
+        # 클라이언트 인증서 (kubeconfig의 *-data 항목은 임시 파일로 기록)
+        certificate = user.get("client-certificate")
+        key = user.get("client-key")
+        if user.get("client-certificate-data"):
+            certificate = self.write_temp_file("client.crt", user["client-certificate-data"])
+        if user.get("client-key-data"):
+            key = self.write_temp_file("client.key", user["client-key-data"])
+        if certificate:
+            context.load_cert_chain(certificate, key)
+        return context
+
+    def get_token(self) -> Optional[str]:
+        """Bearer 토큰 (exec 인증은 만료 전까지 재사용)"""
+        user = self.cluster.user
+        if user.get("token"):
+            return user["token"]
+        if user.get("tokenFile"):
+            return Path(user["tokenFile"]).read_text().strip()
+        if not user.get("exec"):
+            return None
+
+        with self.token_lock:
+            if self.token and time.time() < self.token_expires:
+                return self.token
+            spec = user["exec"]
+            env = dict(os.environ)
+            env.update({item["name"]: item["value"] for item in spec.get("env") or []})
+            result = subprocess.run([spec["command"]] + list(spec.get("args") or []),
+                                    capture_output=True, text=True, check=True, env=env, timeout=self.timeout)
+            status = json.loads(result.stdout).get("status") or {}
+            self.token = status.get("token")
+            # 만료 시각을 알 수 없으면 10분 동안 재사용
+            self.token_expires = time.time() + 600
+            expiration = status.get("expirationTimestamp")
+            if expiration:
+                try:
+                    expires_at = datetime.fromisoformat(expiration.replace("Z", "+00:00")).timestamp()
+                    self.token_expires = min(self.token_expires, expires_at - 60)
+                except ValueError:
+                    pass
+            return self.token
+
+    def get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        url = self.cluster.server.rstrip("/") + path
+        query = urllib.parse.urlencode({key: value for key, value in params.items() if value})
+        request = urllib.request.Request(f"{url}?{query}" if query else url, headers={"Accept": "application/json"})
+        token = self.get_token()
+        if token:
+            request.add_header("Authorization", f"Bearer {token}")
+        with urllib.request.urlopen(request, timeout=self.timeout, context=self.ssl_context) as response:
+            return json.load(response)
+
+    def list_pages(self, path: str, page_size: int):
+        """목록 API를 페이지 단위로 조회 (continue 토큰이 없을 때까지)"""
+        continue_token = None
+        while True:
+            page = call_with_retry(
+                "kubernetes", partition_name(self.cluster.name),
+                lambda: self.get(path, {"limit": page_size, "continue": continue_token}),
+                get_error_message=api_error_message)
+            yield page.get("items") or []
+            continue_token = (page.get("metadata") or {}).get("continue")
+            if not continue_token:
+                break
+
+    def close(self):
+        if self.temp_dir:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+            self.temp_dir = None
+
+
+def find_field(item: Dict[str, Any], column: str) -> Any:
+    """Steampipe 컬럼 값 (최상위 -> metadata -> spec -> status 순으로 대소문자/밑줄 무시하고 필드 검색)"""
+    if column in COLUMN_FIELDS:
+        section, field = COLUMN_FIELDS[column]
+        return (item.get(section) or {}).get(field)
+    key = column.replace("_", "")
+    for name, value in item.items():
+        if name not in OBJECT_SECTIONS and name.lower() == key:
+            return value
+    for section in OBJECT_SECTIONS:
+        for name, value in (item.get(section) or {}).items():
+            if name.lower() == key:
+                return value
+    return None
+
+
+def column_type(column: str, value: Any) -> str:
+    if column.endswith(TIMESTAMP_COLUMN_SUFFIX):
+        return "TIMESTAMP"
+    if isinstance(value, bool):
+        return "BOOL"
+    if isinstance(value, int):
+        return "INT8"
+    if isinstance(value, (dict, list)):
+        return "JSONB"
+    return "TEXT"
+
+
+def build_table_specs(queries: Sequence[tuple], summarize: bool = False) -> Tuple[List[TableSpec], List[tuple]]:
+    """k8s 쿼리 목록을 수집 명세로 변환 (지원하지 않는 쿼리는 두 번째 목록으로 반환)
+
+    summarize=True 이면 ConfigMap/Secret 페이로드 컬럼을 키별 크기/해시 요약 컬럼으로 대체
+    """
+    specs, unsupported = [], []
+    for description, query, output_file in queries:
+        parsed = parse_simple_query(query)
+        if parsed is None or parsed.table not in TABLE_RESOURCES or parsed.where or parsed.region or parsed.not_null:
+            unsupported.append((description, query, output_file))
+            continue
+        columns = summary_columns(parsed.table, parsed.columns) if summarize else parsed.columns
+        specs.append(TableSpec(description, parsed.table, output_file, tuple(columns)))
+    return specs, unsupported
+
+
+class MultiClusterCollector:
+    """클러스터별 k8s_*.json 분할 수집 후 클러스터 컬럼을 붙여 병합"""
+
+    def __init__(self, report_dir, clusters: Sequence[KubeCluster] = None, log: Callable[[str], None] = print,
+                 cluster_concurrency: int = None, context_concurrency: int = None, page_size: int = None,
+                 manifest=None):
+        self.report_dir = Path(report_dir)
+        self.partition_root = self.report_dir / PARTITION_DIR
+        self.clusters = list(discover_clusters(self.report_dir) if clusters is None else clusters)
+        self.log = log
+        self.cluster_concurrency = cluster_concurrency or get_env_int(CLUSTER_CONCURRENCY_ENV,
+                                                                      DEFAULT_CLUSTER_CONCURRENCY)
+        self.context_concurrency = context_concurrency or get_env_int(CONTEXT_CONCURRENCY_ENV,
+                                                                      DEFAULT_CONTEXT_CONCURRENCY)
+        self.page_size = page_size or get_env_int(PAGE_SIZE_ENV, DEFAULT_PAGE_SIZE)
+        self.summary_key = get_summary_key() if summary_enabled() else None
+        self.manifest = manifest
+
+    @staticmethod
+    def partition_columns(spec: TableSpec) -> List[str]:
+        """분할 파일 컬럼 (공용 기준 쿼리 컬럼과 이 쿼리 컬럼의 합집합)"""
+        columns = list(SHARED_TABLE_COLUMNS.get(spec.table, []))
+        columns.extend(column for column in spec.columns if column not in columns)
+        return columns
+
+    def manifest_query(self, query: str) -> str:
+        """매니페스트에 기록하는 쿼리 (대상 클러스터나 페이로드 요약 여부가 바뀌면 다시 수집)"""
+        clusters = ",".join(sorted(cluster.name for cluster in self.clusters))
+        return f"{query} -- k8s api: clusters={clusters} summary={self.summary_key is not None}"
+
+    def collect(self, queries: Sequence[tuple]) -> List[bool]:
+        """모든 클러스터에서 k8s 쿼리를 수집하고 출력 파일별 성공 여부 반환 (쿼리 순서, 건너뛴 출력은 성공)"""
+        results = {}
+        if self.manifest is not None and self.manifest.incremental:
+            for description, query, output_file in queries:
+                if self.manifest.is_fresh(output_file, self.manifest_query(query)):
+                    self.log(f"⏭️  {description}: 최신 상태 (TTL 이내) - 건너뜀")
+                    with self.manifest.lock:
+                        self.manifest.skipped.append(output_file)
+                    results[output_file] = True
+        pending = [query for query in queries if query[2] not in results]
+        if pending:
+            try:
+                results.update(self.collect_pending(pending))
+            finally:
+                if self.manifest is not None:
+                    self.manifest.save()
+        return [results.get(output_file, False) for _, _, output_file in queries]
+
+    def collect_pending(self, queries: Sequence[tuple]) -> Dict[str, bool]:
+        """쿼리 목록을 모든 클러스터에서 수집해 병합하고 출력 파일별 성공 여부 반환"""
+        start_time = time.time()
+        specs, unsupported = build_table_specs(queries, summarize=self.summary_key is not None)
+        for description, _, _ in unsupported:
+            self.log(f"다중 클러스터 수집을 지원하지 않는 쿼리: {description}")
+        spec_queries = {output_file: query for _, query, output_file in queries}
+
+        self.log(f"{len(self.clusters)}개 클러스터 수집 (동시 클러스터 {self.cluster_concurrency}개, "
+                 f"클러스터당 동시 테이블 {self.context_concurrency}개)")
+        with ThreadPoolExecutor(max_workers=self.cluster_concurrency) as executor:
+            cluster_results = list(executor.map(lambda cluster: self.collect_cluster(cluster, specs), self.clusters))
+
+        results = {}
+        for spec in specs:
+            succeeded = [(cluster, entries[spec.output_file]) for cluster, entries in zip(self.clusters, cluster_results)
+                         if entries[spec.output_file]]
+            failed = [cluster.name for cluster, entries in zip(self.clusters, cluster_results)
+                      if not entries[spec.output_file]]
+            rows = self.merge_partitions(spec, succeeded) if succeeded else 0
+            if failed:
+                self.log(f"{spec.description} 수집 실패 클러스터: {', '.join(failed)}")
+            if succeeded:
+                self.log(f"{spec.description} 완료 ({spec.output_file}, {len(succeeded)}개 클러스터, {rows}개 행)")
+            # 일부 클러스터가 실패한 출력은 다음 증분 수집에서 다시 조회하도록 미완료로 기록
+            if self.manifest is not None and succeeded:
+                self.manifest.record(spec.output_file, self.manifest_query(spec_queries[spec.output_file]),
+                                     time.time() - start_time, complete=not failed)
+            results[spec.output_file] = bool(succeeded)
+        return results
+
+    def collect_cluster(self, cluster: KubeCluster, specs: Sequence[TableSpec]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """클러스터 하나의 출력 파일별 분할 정보 (실패하면 None, 같은 실행에서 다른 수집기가 이미 수집한 출력은 재사용)"""
+        partition_dir = self.partition_root / partition_name(cluster.name)
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        marker_path = partition_dir / MARKER_FILE
+        entries = {}
+
+        with open(partition_dir / ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    marker = json.loads(marker_path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    marker = {}
+                if marker.get("run_id") != get_run_id():
+                    marker = {"run_id": get_run_id(), "cluster": cluster.name, "server": cluster.server,
+                              "outputs": {}}
+
+                pending = []
+                for spec in specs:
+                    done = marker["outputs"].get(spec.output_file)
+                    if done and set(spec.columns) <= set(done["columns"]):
+                        entries[spec.output_file] = done
+                    else:
+                        pending.append(spec)
+
+                if pending:
+                    client = None
+                    try:
+                        client = KubeApiClient(cluster)
+                        with ThreadPoolExecutor(max_workers=self.context_concurrency) as executor:
+                            collected = list(executor.map(
+                                lambda spec: self.collect_table(client, cluster, partition_dir, spec), pending))
+                    except Exception as e:
+                        # 인증서/토큰 준비 실패는 클러스터 전체 실패
+                        self.log(f"클러스터 연결 실패: {cluster.name} ({api_error_message(e)})")
+                        collected = [None] * len(pending)
+                    finally:
+                        if client:
+                            client.close()
+                    for spec, entry in zip(pending, collected):
+                        entries[spec.output_file] = entry
+                        if entry is not None:
+                            marker["outputs"][spec.output_file] = entry
+
+                temp_path = marker_path.with_suffix(".tmp")
+                temp_path.write_text(json.dumps(marker, ensure_ascii=False, indent=2), encoding="utf-8")
+                os.replace(temp_path, marker_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return entries
+
+    def collect_table(self, client: KubeApiClient, cluster: KubeCluster, partition_dir: Path,
+                      spec: TableSpec) -> Optional[Dict[str, Any]]:
+        """테이블 하나를 페이지 단위로 분할 파일에 기록하고 분할 정보 반환 (실패하면 None)"""
+        columns = self.partition_columns(spec)
+        # 요약 컬럼 -> (페이로드 컬럼, 인코딩)
+        payload = {column: (payload_source(spec.table, column),
+                            PAYLOAD_COLUMNS[spec.table][payload_source(spec.table, column)])
+                   for column in columns if payload_source(spec.table, column)}
+        summary_key = table_summary_key(spec.table, self.summary_key)
+        output_path = partition_dir / spec.output_file
+        temp_path = output_path.with_suffix(".tmp")
+        path = TABLE_RESOURCES[spec.table]
+        try:
+            with query_context(description=f"{spec.description} ({cluster.name})",
+                               output=f"{PARTITION_DIR}/{partition_dir.name}/{spec.output_file}"), \
+                    measure_query(f"{cluster.server}{path}", "kubernetes") as record:
+                writer = None
+                column_types = {}
+                try:
+                    for items in client.list_pages(path, self.page_size):
+                        rows = []
+                        for item in items:
+                            row = {CLUSTER_COLUMN: cluster.name}
+                            for column in columns:
+                                if column in payload:
+                                    source, encoding = payload[column]
+                                    row[column] = summarize_payload(find_field(item, source), encoding,
+                                                                    summary_key)
+                                else:
+                                    row[column] = find_field(item, column)
+                                if row[column] is not None:
+                                    column_types.setdefault(column, column_type(column, row[column]))
+                            rows.append(row)
+                        if writer is None:
+                            # 컬럼 타입은 첫 페이지 값으로 추정
+                            writer = StreamingResultWriter(temp_path, [
+                                {"name": column, "data_type": column_types.get(column, "TEXT")}
+                                for column in [CLUSTER_COLUMN] + columns])
+                        writer.write_rows(rows)
+                except BaseException:
+                    if writer:
+                        writer.file.close()
+                    raise
+                writer.close()
+                os.replace(temp_path, output_path)
+                record["rows"] = writer.row_count
+                record["bytes"] = output_path.stat().st_size
+        except Exception as e:
+            temp_path.unlink(missing_ok=True)
+            self.log(f"{spec.description} 수집 실패: {cluster.name} ({api_error_message(e)})")
+            return None
+        return {"columns": columns, "column_types": column_types, "rows": writer.row_count}
+
+    def merge_partitions(self, spec: TableSpec, partitions: Sequence[Tuple[KubeCluster, Dict[str, Any]]]) -> int:
+        """클러스터 분할 파일을 차례로 이어 붙여 report/<출력 파일> 생성 (cluster_name + 원래 쿼리 컬럼)"""
+        columns = [CLUSTER_COLUMN] + list(spec.columns)
+        column_types = {CLUSTER_COLUMN: "TEXT"}
+        for _, entry in partitions:
+            for column, data_type in (entry.get("column_types") or {}).items():
+                column_types.setdefault(column, data_type)
+
+        with StreamingResultWriter(self.report_dir / spec.output_file,
+                                   [{"name": column, "data_type": column_types.get(column, "TEXT")}
+                                    for column in columns]) as writer:
+            # 한 번에 분할 파일 하나만 메모리에 올림
+            for cluster, _ in partitions:
+                with open(self.partition_root / partition_name(cluster.name) / spec.output_file, "r",
+                          encoding="utf-8") as f:
+                    rows = json.load(f).get("rows") or []
+                writer.write_rows({column: row.get(column) for column in columns} for row in rows)
+        return writer.row_count
+
+def main():
+    from steampipe_compute_collection import SteampipeComputeCollector
+
+    parser = argparse.ArgumentParser(description="Kubernetes 다중 클러스터 수집")
+    parser.add_argument("--report-dir", default=str(Path(__file__).parent.parent / "report"), help="보고서 디렉토리")
+    parser.add_argument("--kubeconfig", default=None, help="kubeconfig 경로 (기본값: KUBECONFIG 또는 ~/.kube/config)")
+    parser.add_argument("--clusters", default="", help="수집할 클러스터/컨텍스트 이름 (쉼표 구분)")
+    parser.add_argument("--list", action="store_true", help="수집 대상 클러스터만 표시")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.clusters.split(",") if name.strip()]
+    clusters = discover_clusters(args.report_dir, args.kubeconfig, names)
+    if args.list or not clusters:
+        print(f"{'클러스터':<30} {'출처':<12} {'컨텍스트':<24} 서버")
+        for cluster in clusters:
+            print(f"{cluster.name:<30} {cluster.source:<12} {cluster.context or '-':<24} {cluster.server}")
+        if not clusters:
+            print("수집 대상 클러스터가 없습니다.")
+        return 0
+
+    report_dir = Path(args.report_dir)
+    queries = SteampipeComputeCollector(report_dir=str(report_dir)).get_k8s_queries()
+    collector = MultiClusterCollector(report_dir, clusters)
+    results = collector.collect(queries)
+    print(f"성공: {sum(results)}/{len(results)}")
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Kubernetes ConfigMap/Secret 페이로드 요약
+kubernetes_config_map, kubernetes_secret의 data/binary_data/string_data 값 대신 키별 크기와 해시만 수집
+
+- 요약 컬럼 <페이로드 컬럼>_keys: ConfigMap은 {"<키>": {"size": <바이트 수>, "hmac_sha256": "<해시>"}},
+  Secret은 {"<키>": {"size": <바이트 수>}} (비밀 값은 해시도 기록하지 않음)
+- 크기는 디코딩한 값의 바이트 수 (Secret data, ConfigMap binary_data는 base64 디코딩, 올바른 base64가 아니면 원래 문자열)
+- ConfigMap 해시는 보고서 밖에 보관하는 키의 HMAC-SHA256 (보고서만으로는 값을 대입해 해시를 대조할 수 없음)
+  키: K8S_SUMMARY_KEY 환경 변수 또는 K8S_SUMMARY_KEY_FILE(기본값: ~/.config/aws-arch-analysis/k8s_summary_key,
+  없으면 생성, 실행 간 같은 키이면 해시 비교 가능)
+- Steampipe 수집은 SQL에서 요약을 계산해 결과 파일과 수집기 메모리에 페이로드가 남지 않음
+  (요약 쿼리에는 HMAC 패딩 키가 들어가므로 오류 로그에는 redact_summary_key()로 가려서 기록)
+- Kubernetes API 직접 수집(k8s_multi_cluster_collection.py)은 페이지를 읽는 즉시 객체별로 요약하고 페이로드는 버림
+- K8S_CONFIG_PAYLOAD=full 이면 기존처럼 페이로드 전체 수집 (기본값: summary)
+"""
+
+import base64
+import hashlib
+import hmac
+import os
+import re
+import secrets
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+PAYLOAD_MODE_ENV = "K8S_CONFIG_PAYLOAD"
+KEY_ENV = "K8S_SUMMARY_KEY"
+KEY_FILE_ENV = "K8S_SUMMARY_KEY_FILE"
+DEFAULT_KEY_FILE = Path.home() / ".config" / "aws-arch-analysis" / "k8s_summary_key"
+SUMMARY = "summary"
+FULL = "full"
+SUMMARY_SUFFIX = "_keys"
+
+TEXT = "text"
+BASE64 = "base64"
+
+# 테이블별 페이로드 컬럼과 값 인코딩
+PAYLOAD_COLUMNS = {
+    "kubernetes_config_map": {"data": TEXT, "binary_data": BASE64},
+    "kubernetes_secret": {"data": BASE64, "string_data": TEXT},
+}
+# 해시 없이 크기만 기록하는 테이블
+SIZE_ONLY_TABLES = {"kubernetes_secret"}
+
+HMAC_BLOCK_SIZE = 64
+# 패딩까지 올바른 base64 문자열 (Python과 SQL에서 같은 식으로 확인해 두 수집 경로의 결과를 맞춤)
+BASE64_PATTERN = "^([A-Za-z0-9+/]{4})*([A-Za-z0-9+/]{2}==|[A-Za-z0-9+/]{3}=)?$"
+
+# 요약 쿼리에 들어가는 HMAC 패딩 키 리터럴 (오류 로그 등 보고서 디렉토리에 기록하기 전에 가림)
+KEY_LITERAL_PATTERN = re.compile(r"[0-9a-f]{32,}")
+
+SELECT_PATTERN = re.compile(r"^\s*select\s+(?P<columns>.+?)\s+from\s+(?P<table>\w+)(?P<rest>.*)$",
+                            re.IGNORECASE | re.DOTALL)
+
+
+def summary_enabled() -> bool:
+    """페이로드 대신 요약을 수집하는지 여부 (K8S_CONFIG_PAYLOAD)"""
+    return os.environ.get(PAYLOAD_MODE_ENV, SUMMARY).lower() != FULL
+
+
+def get_summary_key() -> bytes:
+    """HMAC 키 (보고서 디렉토리 밖의 키 파일에 한 번 생성해 재사용)"""
+    key = os.environ.get(KEY_ENV)
+    if key:
+        return key.encode("utf-8")
+
+    path = Path(os.environ.get(KEY_FILE_ENV) or DEFAULT_KEY_FILE).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    try:
+        # 여러 수집기가 동시에 만들 수 있으므로 O_EXCL로 한 프로세스만 생성
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+    except FileExistsError:
+        pass
+    return path.read_text().strip().encode("utf-8")
+
+
+def table_summary_key(table: str, key: Optional[bytes]) -> Optional[bytes]:
+    """테이블 요약에 사용할 HMAC 키 (크기만 기록하는 테이블은 None)"""
+    return None if table in SIZE_ONLY_TABLES else key
+
+
+def hmac_pads(key: bytes) -> Tuple[bytes, bytes]:
+    """HMAC-SHA256의 (내부, 외부) 패딩 키 (SQL에서 sha256()만으로 HMAC을 계산하기 위해 사용)"""
+    if len(key) > HMAC_BLOCK_SIZE:
+        key = hashlib.sha256(key).digest()
+    key = key.ljust(HMAC_BLOCK_SIZE, b"\0")
+    return bytes(byte ^ 0x36 for byte in key), bytes(byte ^ 0x5C for byte in key)
+
+
+def redact_summary_key(text: str) -> str:
+    """요약 쿼리/오류 메시지의 HMAC 패딩 키(키를 그대로 복원할 수 있음)를 가린 문자열"""
+    return KEY_LITERAL_PATTERN.sub("<redacted>", text or "")
+
+
+def summary_column(column: str) -> str:
+    return column + SUMMARY_SUFFIX
+
+
+def summary_columns(table: str, columns: Sequence[str]) -> List[str]:
+    """원래 컬럼 목록의 페이로드 컬럼을 요약 컬럼으로 대체"""
+    payload = PAYLOAD_COLUMNS.get(table, {})
+    return [summary_column(column) if column in payload else column for column in columns]
+
+
+def payload_source(table: str, column: str) -> Optional[str]:
+    """요약 컬럼의 원래 페이로드 컬럼 (요약 컬럼이 아니면 None)"""
+    if not column.endswith(SUMMARY_SUFFIX):
+        return None
+    source = column[:-len(SUMMARY_SUFFIX)]
+    return source if source in PAYLOAD_COLUMNS.get(table, {}) else None
+
+
+def summarize_payload(values: Optional[Dict[str, Any]], encoding: str, key: Optional[bytes]) -> Optional[Dict[str, Any]]:
+    """키별 크기와 HMAC (값이 없으면 None, key가 None이면 크기만)"""
+    if not values:
+        return None
+    summary = {}
+    for name, value in values.items():
+        if encoding == BASE64 and isinstance(value, str) and re.fullmatch(BASE64_PATTERN, value):
+            raw = base64.b64decode(value)
+        else:
+            raw = (value if isinstance(value, str) else str(value or "")).encode("utf-8")
+        summary[name] = {"size": len(raw)}
+        if key is not None:
+            summary[name]["hmac_sha256"] = hmac.new(key, raw, hashlib.sha256).hexdigest()
+    return summary
+
+
+def summary_sql(column: str, encoding: str, key: Optional[bytes]) -> str:
+    """Steampipe(PostgreSQL)에서 페이로드 컬럼 요약을 계산하는 식 (summarize_payload와 같은 결과)
+
+    올바른 base64가 아닌 값은 decode()가 오류를 내므로 형식을 먼저 확인하고 원래 문자열 사용,
+    객체가 아닌 페이로드(JSON null 등)는 jsonb_each_text()가 오류를 내므로 NULL로 취급
+    """
+    text = "convert_to(coalesce(value, ''), 'UTF8')"
+    if encoding == BASE64:
+        value = f"case when value ~ '{BASE64_PATTERN}' then decode(value, 'base64') else {text} end"
+    else:
+        value = text
+    fields = "'size', octet_length(raw)"
+    if key is not None:
+        inner, outer = hmac_pads(key)
+        fields += (f", 'hmac_sha256', encode(sha256('\\x{outer.hex()}'::bytea || "
+                   f"sha256('\\x{inner.hex()}'::bytea || raw)), 'hex')")
+    return (f"(select jsonb_object_agg(key, jsonb_build_object({fields})) "
+            f"from (select key, {value} as raw from jsonb_each_text(case when jsonb_typeof({column}) = 'object' then {column} end)) payload) as {summary_column(column)}")
+
+
+def summarize_query(query: str, key: Optional[bytes]) -> str:
+    """ConfigMap/Secret 쿼리의 페이로드 컬럼을 요약 식으로 대체 (해당 없는 쿼리는 그대로 반환)"""
+    match = SELECT_PATTERN.match(query)
+    if not match or match.group("table") not in PAYLOAD_COLUMNS:
+        return query
+    table = match.group("table")
+    payload = PAYLOAD_COLUMNS[table]
+    key = table_summary_key(table, key)
+    columns = [column.strip() for column in match.group("columns").split(",")]
+    selected = [summary_sql(column, payload[column], key) if column in payload else column for column in columns]
+    return f"select {', '.join(selected)} from {table}{match.group('rest')}"
+
+
+def summarize_queries(queries: Sequence[tuple]) -> List[tuple]:
+    """요약 모드이면 쿼리 목록의 ConfigMap/Secret 쿼리를 요약 쿼리로 대체"""
+    if not summary_enabled():
+        return list(queries)
+    key = get_summary_key()
+    return [(description, summarize_query(query, key), output_file) for description, query, output_file in queries]
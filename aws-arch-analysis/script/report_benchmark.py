@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+보고서 생성기 벤치마크
+합성 대규모 계정 데이터셋(synthetic_dataset.py)으로 각 보고서 생성기의 실행 시간과 메모리 사용량 측정
+
+- 생성기마다 데이터 로더 캐시를 비운 상태에서 단독 실행 (선행 보고서 의존 관계는 무시)
+- 시간 측정 후 tracemalloc으로 한 번 더 실행해 최대 Python 메모리 할당량 측정 (--skip-memory로 생략)
+- generate_all_reports.py의 모든 보고서와 RecommendationBase 공통 권장사항 분석을 측정 (입력 파일이 없는 보고서는 생략)
+- --data-dir를 지정하지 않으면 임시 디렉토리에 합성 데이터셋을 만들고 측정 후 삭제
+
+사용법:
+    python report_benchmark.py --scale large
+    python report_benchmark.py --instances 20000 --security-group-rules 100000 --snapshots 50000 --output result.json
+    python report_benchmark.py --data-dir /tmp/large-account --reports 02-networking-analysis.md,06-security-analysis.md
+"""
+
+import argparse
+import gc
+import json
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, NamedTuple, Optional
+
+sys.path.append(str(Path(__file__).parent))
+from generate_all_reports import REPORT_TASKS
+from recommendation_base import RecommendationBase
+from report_data_loader import clear_cache
+from report_orchestrator import ReportOrchestrator, ReportTask
+from synthetic_dataset import SCALE_PRESETS, DatasetScale, generate_dataset
+
+RECOMMENDATION_BASE_NAME = "RecommendationBase"
+
+# RecommendationBase.generate_all_recommendations 입력 키별 수집 파일
+RECOMMENDATION_INPUTS = {
+    "iam_users": "security_iam_users.json",
+    "guardduty_detectors": "security_guardduty_detectors.json",
+    "security_groups": "security_groups.json",
+    "compute_ec2_instances": "compute_ec2_instances.json",
+    "storage_ebs_volumes": "storage_ebs_volumes.json",
+    "monitoring_cloudwatch_alarms": "monitoring_cloudwatch_alarms.json",
+    "networking_flow_logs": "networking_flow_logs.json",
+    "database_rds_instances": "database_rds_instances.json",
+    "storage_s3_buckets": "storage_s3_buckets.json",
+    "storage_s3_public_access_block": "storage_s3_public_access_block.json",
+}
+
+
+class BenchmarkResult(NamedTuple):
+    """생성기 하나의 측정 결과"""
+    name: str
+    success: bool
+    duration: float
+    peak_memory: Optional[int]
+    error: Optional[str] = None
+
+
+def run_report_task(data_dir: Path, task: ReportTask) -> Optional[str]:
+    """보고서 하나를 단독 생성하고 실패 시 오류 메시지 반환"""
+    # 대규모 데이터셋의 생성 시간을 측정하므로 보고서별 제한 시간은 적용하지 않음
+    orchestrator = ReportOrchestrator(data_dir, max_workers=1, timeout=0)
+    result = orchestrator.run([task._replace(depends_on=())])[0]
+    return None if result.success else (result.error or "실패").strip().splitlines()[0]
+
+
+def run_recommendation_base(data_dir: Path) -> Optional[str]:
+    """수집 파일을 읽어 RecommendationBase 공통 권장사항 분석 실행"""
+    base = RecommendationBase(str(data_dir))
+    data_dict = {key: base.load_json_file(filename) for key, filename in RECOMMENDATION_INPUTS.items()}
+    base.generate_all_recommendations(data_dict)
+    return None
+
+
+def measure(name: str, run: Callable[[], Optional[str]], profile_memory: bool) -> BenchmarkResult:
+    """캐시를 비운 상태에서 실행 시간 측정 후 필요하면 메모리 측정을 위해 한 번 더 실행"""
+    clear_cache()
+    gc.collect()
+    start_time = time.perf_counter()
+    try:
+        error = run()
+    except Exception as e:
+        error = str(e) or type(e).__name__
+    duration = time.perf_counter() - start_time
+    if error or not profile_memory:
+        return BenchmarkResult(name, error is None, duration, None, error)
+
+    clear_cache()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(name, True, duration, peak_memory)
+
+
+def run_benchmark(data_dir, report_files: Optional[List[str]] = None,
+                  profile_memory: bool = True) -> List[BenchmarkResult]:
+    """선택한 보고서 생성기(기본값: 전체)와 RecommendationBase 측정"""
+    data_dir = Path(data_dir)
+    results = []
+    for task in REPORT_TASKS:
+        if report_files and task.report_file not in report_files:
+            continue
+        if task.inputs and not any(any(data_dir.glob(pattern)) for pattern in task.inputs):
+            print(f"  입력 데이터 없음, 생략: {task.script_name}", file=sys.stderr)
+            continue
+        print(f"  측정 중: {task.script_name}", file=sys.stderr)
+        results.append(measure(task.script_name, lambda task=task: run_report_task(data_dir, task), profile_memory))
+
+    if not report_files or RECOMMENDATION_BASE_NAME in report_files:
+        print(f"  측정 중: {RECOMMENDATION_BASE_NAME}", file=sys.stderr)
+        results.append(measure(RECOMMENDATION_BASE_NAME, lambda: run_recommendation_base(data_dir), profile_memory))
+    return results
+
+
+def print_results(results: List[BenchmarkResult]):
+    print(f"{'생성기':<34} {'시간(초)':>9} {'최대 메모리(MB)':>16}  상태")
+    for result in results:
+        peak = f"{result.peak_memory / 1024 / 1024:.1f}" if result.peak_memory is not None else "-"
+        status = "성공" if result.success else f"실패: {result.error}"
+        print(f"{result.name:<34} {result.duration:>9.2f} {peak:>16}  {status}")
+    total = sum(result.duration for result in results)
+    # Linux의 ru_maxrss 단위는 KB
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"총 {total:.2f}초, 프로세스 최대 RSS {max_rss:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="보고서 생성기 시간/메모리 벤치마크")
+    parser.add_argument("--data-dir", default=None, help="수집 파일 디렉토리 (지정하지 않으면 합성 데이터셋 생성)")
+    parser.add_argument("--scale", choices=sorted(SCALE_PRESETS), default="large", help="합성 데이터셋 규모 프리셋")
+    parser.add_argument("--instances", type=int, default=None, help="EC2 인스턴스 수")
+    parser.add_argument("--security-group-rules", type=int, default=None, help="보안 그룹 규칙 수")
+    parser.add_argument("--snapshots", type=int, default=None, help="EBS 스냅샷 수")
+    parser.add_argument("--seed", type=int, default=42, help="합성 데이터셋 난수 시드")
+    parser.add_argument("--reports", default="",
+                        help=f"측정할 보고서 파일 목록 (쉼표 구분, {RECOMMENDATION_BASE_NAME} 포함 가능)")
+    parser.add_argument("--skip-memory", action="store_true", help="tracemalloc 메모리 측정 생략")
+    parser.add_argument("--output", default=None, help="측정 결과 JSON 파일")
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir) if args.data_dir else Path(tempfile.mkdtemp(prefix="report-benchmark-"))
+    try:
+        if not args.data_dir:
+            preset = SCALE_PRESETS[args.scale]
+            scale = DatasetScale(
+                args.instances if args.instances is not None else preset.instances,
+                args.security_group_rules if args.security_group_rules is not None else preset.security_group_rules,
+                args.snapshots if args.snapshots is not None else preset.snapshots,
+            )
+            print(f"합성 데이터셋 생성 중: {scale}", file=sys.stderr)
+            generate_dataset(data_dir, scale, seed=args.seed)
+
+        report_files = [name.strip() for name in args.reports.split(",") if name.strip()]
+        results = run_benchmark(data_dir, report_files, not args.skip_memory)
+    finally:
+        if not args.data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump([result._asdict() for result in results], f, indent=2, ensure_ascii=False)
+    return 0 if all(result.success for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+보고서 데이터 컬럼 저장소
+수집된 JSON 파일(steampipe `--output json` 형태 또는 목록)을 출력 파일별 테이블로 변환해
+report/columnar/<테이블>/ 아래에 컬럼마다 압축된 JSON 배열 파일로 저장
+
+- 보고서 생성기는 ColumnarStore.load_rows(파일명, 컬럼 목록)으로 필요한 컬럼 파일만 읽음
+- 원본 JSON의 수정 시각/크기가 저장소와 다르면(또는 테이블이 없으면) 원본 JSON에서 읽어 같은 형태로 반환
+- REPORT_COLUMNAR_STORE=1 이면 collect_all_data.py가 수집 완료 후 변경된 파일만 변환하고,
+  report_data_loader.load_report_rows(columns=[...])가 저장소에서 필요한 컬럼만 읽음 (기본값: 사용 안 함)
+
+사용법:
+    python3 report_columnar_store.py                                  # 리포트 디렉토리 전체 변환
+    python3 report_columnar_store.py --benchmark compute_ec2_instances.json --columns instance_id,instance_type
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+COLUMNAR_STORE_ENV = "REPORT_COLUMNAR_STORE"
+COLUMNAR_DIR_NAME = "columnar"
+SCHEMA_FILE = "_schema.json"
+# 변환 대상에서 제외할 파일 (수집 매니페스트 등)
+EXCLUDED_FILES = {"collection_manifest.json"}
+
+
+def columnar_store_enabled() -> bool:
+    """컬럼 저장소 생성/사용 여부 (기본값: 사용 안 함)"""
+    return os.environ.get(COLUMNAR_STORE_ENV, "0") == "1"
+
+
+def get_default_report_dir() -> Path:
+    """스크립트 위치 기준 기본 리포트 디렉토리"""
+    project_root = Path(__file__).parent.parent.parent
+    return project_root / "aws-arch-analysis" / "report"
+
+
+def extract_table(data: Any) -> Tuple[List[Dict[str, str]], List[Dict[str, Any]]]:
+    """JSON 데이터를 (컬럼 정의, 행 목록)으로 변환 ({"columns", "rows"} 또는 행 목록)"""
+    if isinstance(data, dict):
+        rows = data.get("rows") or []
+        columns = list(data.get("columns") or [])
+    elif isinstance(data, list):
+        rows = data
+        columns = []
+    else:
+        return [], []
+
+    rows = [row for row in rows if isinstance(row, dict)]
+    if not columns:
+        # 컬럼 정의가 없으면 행에 나타난 순서대로 컬럼 구성
+        names = {}
+        for row in rows:
+            for name in row:
+                names.setdefault(name, None)
+        columns = [{"name": name, "data_type": "JSON"} for name in names]
+    return columns, rows
+
+
+class ColumnarStore:
+    """출력 파일별 컬럼 테이블 저장소"""
+
+    def __init__(self, report_dir=None):
+        self.report_dir = Path(report_dir) if report_dir else get_default_report_dir()
+        self.store_dir = self.report_dir / COLUMNAR_DIR_NAME
+
+    def get_table_dir(self, filename: str) -> Path:
+        return self.store_dir / Path(filename).stem
+
+    def load_schema(self, filename: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.get_table_dir(filename) / SCHEMA_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, filename: str, schema: Dict[str, Any] = None) -> bool:
+        """원본 JSON이 변환 이후 바뀌지 않았는지 확인"""
+        schema = schema or self.load_schema(filename)
+        source_path = self.report_dir / filename
+        if not schema or not source_path.exists():
+            return False
+        stat = source_path.stat()
+        return schema.get("source_mtime_ns") == stat.st_mtime_ns and schema.get("source_size") == stat.st_size
+
+    def build_table(self, filename: str) -> Optional[int]:
+        """원본 JSON 하나를 컬럼 테이블로 변환하고 행 수 반환 (JSON이 아니면 None)"""
+        source_path = self.report_dir / filename
+        stat = source_path.stat()
+        try:
+            with open(source_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        columns, rows = extract_table(data)
+        del data
+
+        table_dir = self.get_table_dir(filename)
+        temp_dir = table_dir.with_name(f".{table_dir.name}.{os.getpid()}.tmp")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        temp_dir.mkdir(parents=True)
+        try:
+            column_schema = []
+            for index, column in enumerate(columns):
+                column_file = f"{index:04d}.json"
+                values = [row.get(column["name"]) for row in rows]
+                with open(temp_dir / column_file, 'w', encoding='utf-8') as f:
+                    json.dump(values, f, ensure_ascii=False, separators=(",", ":"), default=str)
+                column_schema.append({
+                    "name": column["name"],
+                    "data_type": column.get("data_type", "JSON"),
+                    "file": column_file,
+                })
+
+            schema = {
+                "source": filename,
+                "source_mtime_ns": stat.st_mtime_ns,
+                "source_size": stat.st_size,
+                "rows": len(rows),
+                "columns": column_schema,
+            }
+            with open(temp_dir / SCHEMA_FILE, 'w', encoding='utf-8') as f:
+                json.dump(schema, f, ensure_ascii=False, indent=1)
+
+            shutil.rmtree(table_dir, ignore_errors=True)
+            os.rename(temp_dir, table_dir)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        return len(rows)
+
+    def build(self, filenames: Sequence[str] = None, force: bool = False) -> Tuple[int, int]:
+        """리포트 디렉토리의 JSON 파일을 변환하고 (변환 수, 최신 상태로 건너뛴 수) 반환"""
+        if filenames is None:
+            filenames = sorted(path.name for path in self.report_dir.glob("*.json")
+                               if path.name not in EXCLUDED_FILES)
+        built = skipped = 0
+        for filename in filenames:
+            if not force and self.is_fresh(filename):
+                skipped += 1
+                continue
+            if self.build_table(filename) is not None:
+                built += 1
+        return built, skipped
+
+    def load_columns(self, filename: str, columns: Sequence[str] = None,
+                     fill_missing: bool = True) -> Optional[Dict[str, List[Any]]]:
+        """컬럼 이름 -> 값 목록 (테이블이 없거나 오래된 경우 None)
+
+        columns를 지정하면 해당 컬럼 파일만 읽으며, 테이블에 없는 컬럼은 None 값으로 채움 (fill_missing=False면 제외)
+        """
+        schema = self.load_schema(filename)
+        if not self.is_fresh(filename, schema):
+            return None
+
+        table_dir = self.get_table_dir(filename)
+        column_files = {column["name"]: column["file"] for column in schema["columns"]}
+        names = list(columns) if columns is not None else list(column_files)
+        result = {}
+        for name in names:
+            if name not in column_files:
+                if fill_missing:
+                    result[name] = [None] * schema["rows"]
+                continue
+            with open(table_dir / column_files[name], 'r', encoding='utf-8') as f:
+                result[name] = json.load(f)
+        return result
+
+    def load_rows(self, filename: str, columns: Sequence[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """필요한 컬럼만 포함한 행 목록 (파일이 없으면 None)
+
+        컬럼 테이블이 최신이 아니면 원본 JSON을 읽어 같은 형태로 반환
+        """
+        column_values = self.load_columns(filename, columns)
+        if column_values is not None:
+            names = list(column_values)
+            return [dict(zip(names, values)) for values in zip(*column_values.values())] if names else []
+
+        source_path = self.report_dir / filename
+        if not source_path.exists():
+            return None
+        try:
+            with open(source_path, 'r', encoding='utf-8') as f:
+                _, rows = extract_table(json.load(f))
+        except (OSError, ValueError):
+            return None
+        if columns is None:
+            return rows
+        return [{name: row.get(name) for name in columns} for row in rows]
+
+
+def measure_load(mode: str, report_dir: str, filename: str, columns: Optional[List[str]]):
+    """벤치마크용: 한 가지 방식으로 로드한 시간과 최대 RSS를 JSON으로 출력 (별도 프로세스에서 실행)"""
+    import resource
+
+    start_time = time.perf_counter()
+    if mode == "json":
+        with open(Path(report_dir) / filename, 'r', encoding='utf-8') as f:
+            _, rows = extract_table(json.load(f))
+        if columns:
+            rows = [{name: row.get(name) for name in columns} for row in rows]
+    else:
+        rows = ColumnarStore(report_dir).load_rows(filename, columns) or []
+    elapsed = time.perf_counter() - start_time
+
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        max_rss_kb //= 1024
+    print(json.dumps({"seconds": elapsed, "max_rss_kb": max_rss_kb, "rows": len(rows)}))
+
+
+def run_benchmark(store: ColumnarStore, filenames: List[str], columns: Optional[List[str]], repeat: int = 3):
+    """JSON 전체 로드와 컬럼 저장소 로드의 시간/RSS 비교 (방식별로 새 프로세스에서 측정)"""
+    store.build(filenames)
+    print(f"{'파일':<45} {'방식':<10} {'행 수':>8} {'시간(초)':>10} {'최대 RSS(MB)':>14}")
+    print("-" * 92)
+    for filename in filenames:
+        for mode in ("json", "columnar"):
+            samples = []
+            for _ in range(repeat):
+                command = [sys.executable, __file__, "--measure", mode, "--report-dir", str(store.report_dir), filename]
+                if columns:
+                    command += ["--columns", ",".join(columns)]
+                result = subprocess.run(command, capture_output=True, text=True, check=True)
+                samples.append(json.loads(result.stdout))
+            best = min(samples, key=lambda sample: sample["seconds"])
+            print(f"{filename:<45} {mode:<10} {best['rows']:>8} {best['seconds']:>10.3f} "
+                  f"{best['max_rss_kb'] / 1024:>14.1f}")
+
+
+def main():
+    """메인 함수"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="보고서 데이터 컬럼 저장소 생성 및 로드 벤치마크")
+    parser.add_argument("--report-dir", default=os.getenv("REPORT_DIR", str(get_default_report_dir())), help="보고서 디렉토리")
+    parser.add_argument("--force", action="store_true", help="최신 상태인 테이블도 다시 변환")
+    parser.add_argument("--benchmark", nargs="+", metavar="FILE", help="JSON/컬럼 저장소 로드 시간 및 RSS 비교")
+    parser.add_argument("--columns", help="벤치마크에서 읽을 컬럼 목록 (쉼표 구분, 기본값: 전체)")
+    parser.add_argument("--repeat", type=int, default=3, help="벤치마크 반복 횟수")
+    parser.add_argument("--measure", choices=["json", "columnar"], help=argparse.SUPPRESS)
+    parser.add_argument("files", nargs="*", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    columns = [name.strip() for name in args.columns.split(",") if name.strip()] if args.columns else None
+
+    if args.measure:
+        measure_load(args.measure, args.report_dir, args.files[0], columns)
+        return
+
+    store = ColumnarStore(args.report_dir)
+    if args.benchmark:
+        run_benchmark(store, args.benchmark, columns, args.repeat)
+        return
+
+    start_time = time.time()
+    built, skipped = store.build(force=args.force)
+    print(f"✅ 컬럼 저장소 생성 완료: {built}개 변환, {skipped}개 최신 상태 ({time.time() - start_time:.1f}초)")
+    print(f"📁 저장 위치: {store.store_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+보고서 데이터 공유 로더
+보고서 생성기마다 따로 있던 JSON 로드 코드를 대신하는 프로세스 단위 메모이즈 로더
+
+- 파일 경로 + 수정 시각(ns) + 크기를 키로 파싱 결과를 LRU 캐시에 보관 (파일이 바뀌면 다시 읽음)
+- 같은 파일을 여러 생성기/스레드가 동시에 요청해도 파싱은 한 번만 수행
+- steampipe `--output json` 형태({"columns", "rows"})와 행 목록 형태를 load_report_rows()에서 한 번에 처리
+- load_report_rows(columns=[...])는 필요한 컬럼만 반환하며, 컬럼 저장소(report_columnar_store.py)가 켜져 있고
+  최신이면 해당 컬럼 파일만 읽음 (없거나 오래되었으면 JSON에서 읽어 같은 형태로 반환)
+- 캐시된 객체는 모든 호출자가 공유하므로 읽기 전용으로 사용해야 함 (변경이 필요하면 복사 후 사용)
+- REPORT_DATA_CACHE_MB 로 캐시할 원본 파일 크기 합계 상한 지정 (기본값: 512MB, 0이면 캐시 사용 안 함)
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from report_columnar_store import ColumnarStore, columnar_store_enabled
+
+CACHE_SIZE_ENV = "REPORT_DATA_CACHE_MB"
+DEFAULT_CACHE_SIZE_MB = 512
+
+_cache: "OrderedDict[Tuple[str, int, int], Any]" = OrderedDict()
+_cache_bytes = 0
+_cache_lock = threading.Lock()
+_loading_locks: Dict[str, threading.Lock] = {}
+_stats = {"hits": 0, "misses": 0}
+
+
+def get_cache_limit() -> int:
+    """캐시할 원본 파일 크기 합계 상한 (bytes)"""
+    try:
+        return max(int(os.environ.get(CACHE_SIZE_ENV, DEFAULT_CACHE_SIZE_MB)), 0) * 1024 * 1024
+    except ValueError:
+        return DEFAULT_CACHE_SIZE_MB * 1024 * 1024
+
+
+def extract_rows(data: Any) -> List[Dict[str, Any]]:
+    """JSON 데이터에서 행 목록 추출 ({"rows": [...]} 또는 목록, 그 외 형태는 빈 목록)"""
+    if isinstance(data, dict) and 'rows' in data:
+        return data['rows']
+    if isinstance(data, list):
+        return data
+    return []
+
+
+def _get_loading_lock(path: str) -> threading.Lock:
+    with _cache_lock:
+        return _loading_locks.setdefault(path, threading.Lock())
+
+
+def _store(key: Tuple[str, int, int], data: Any):
+    global _cache_bytes
+    limit = get_cache_limit()
+    size = key[2]
+    if size > limit:
+        return
+    with _cache_lock:
+        # 같은 파일의 이전 버전 제거
+        for old_key in [old_key for old_key in _cache if old_key[0] == key[0]]:
+            _cache.pop(old_key)
+            _cache_bytes -= old_key[2]
+        _cache[key] = data
+        _cache_bytes += size
+        while _cache_bytes > limit and _cache:
+            old_key, _ = _cache.popitem(last=False)
+            _cache_bytes -= old_key[2]
+
+
+def load_report_data(path, min_size: int = 0) -> Any:
+    """파싱된 JSON 데이터 (파일이 없거나 크기가 min_size 이하이면 None)
+
+    파일을 읽을 수 없거나 JSON이 아니면 OSError/ValueError(json.JSONDecodeError)를 그대로 전달
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    if stat.st_size <= min_size:
+        return None
+
+    resolved = str(path.resolve())
+    key = (resolved, stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _stats["hits"] += 1
+            return _cache[key]
+
+    # 같은 파일은 한 스레드만 파싱하고 나머지는 결과를 기다려 재사용
+    with _get_loading_lock(resolved):
+        with _cache_lock:
+            if key in _cache:
+                _cache.move_to_end(key)
+                _stats["hits"] += 1
+                return _cache[key]
+            _stats["misses"] += 1
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        _store(key, data)
+    return data
+
+
+def load_report_rows(path, min_size: int = 0, columns: Sequence[str] = None) -> Optional[List[Dict[str, Any]]]:
+    """JSON 파일의 행 목록 (파일이 없거나 비어 있으면 None, 행을 찾을 수 없는 형태면 빈 목록)
+
+    columns를 지정하면 해당 컬럼만 포함한 새 행 목록 반환 (행에 없는 컬럼은 키를 만들지 않음)
+    """
+    if columns is not None and columnar_store_enabled():
+        path = Path(path)
+        try:
+            if path.stat().st_size <= min_size:
+                return None
+        except FileNotFoundError:
+            return None
+        # 요청한 컬럼이 하나도 없는 테이블은 행 수를 알 수 없으므로 JSON에서 읽음
+        column_values = ColumnarStore(path.parent).load_columns(path.name, columns, fill_missing=False)
+        if column_values:
+            names = list(column_values)
+            return [dict(zip(names, values)) for values in zip(*column_values.values())]
+
+    data = load_report_data(path, min_size)
+    if data is None:
+        return None
+    rows = extract_rows(data)
+    if columns is None:
+        return rows
+    return [{name: row[name] for name in columns if name in row} for row in rows if isinstance(row, dict)]
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """캐시 적중/미스 횟수와 현재 캐시 항목 수, 원본 크기 합계"""
+    with _cache_lock:
+        return dict(_stats, entries=len(_cache), bytes=_cache_bytes)
+
+
+def clear_cache():
+    """캐시 비우기"""
+    global _cache_bytes
+    with _cache_lock:
+        _cache.clear()
+        _loading_locks.clear()
+        _cache_bytes = 0
+        _stats.update(hits=0, misses=0)
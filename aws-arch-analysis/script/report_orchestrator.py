@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+보고서 생성 오케스트레이터
+보고서 생성기 클래스를 한 프로세스에서 import 해 작업 풀에서 병렬로 실행
+
+- 생성기들은 report_data_loader의 프로세스 단위 캐시를 공유하므로 같은 JSON은 한 번만 파싱
+- ReportTask.depends_on에 지정한 보고서가 모두 끝난 뒤에 실행 (경영진 요약, 종합 권장사항 등)
+- 생성기의 출력(print)은 작업별로 버퍼에 모아 실패한 경우에만 표시 (스레드별 stdout 분리)
+- 생성기 내부의 sys.exit()는 해당 보고서의 실패로 처리
+- 보고서별 제한 시간(REPORT_TIMEOUT, 기본값: 120초)을 넘기면 실패로 처리하고 후속 보고서를 계속 실행
+  (스레드는 강제 종료할 수 없으므로 멈춘 생성기는 데몬 스레드로 남겨 두고 작업 슬롯만 반환)
+"""
+
+import importlib.util
+import io
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+SCRIPT_DIR = Path(__file__).parent
+sys.path.append(str(SCRIPT_DIR))
+
+REPORT_TIMEOUT_ENV = "REPORT_TIMEOUT"
+DEFAULT_REPORT_TIMEOUT = 120
+
+
+def get_report_timeout() -> float:
+    """보고서별 제한 시간 (초, 0이면 제한 없음)"""
+    try:
+        return max(float(os.environ.get(REPORT_TIMEOUT_ENV, DEFAULT_REPORT_TIMEOUT)), 0.0)
+    except ValueError:
+        return float(DEFAULT_REPORT_TIMEOUT)
+
+
+class ReportTask(NamedTuple):
+    """오케스트레이터가 실행하는 보고서 생성 작업
+
+    run: 생성기 인스턴스를 받아 보고서를 생성하는 함수 (False를 반환하면 실패)
+    depends_on: 먼저 끝나야 하는 보고서 파일 목록
+    inputs: 보고서가 읽는 수집 데이터 파일 패턴 (리포트 디렉토리 기준, 파이프라인의 재생성 판단용)
+    """
+    report_file: str
+    script_name: str
+    class_name: str
+    description: str
+    run: Callable[[Any], Any]
+    depends_on: Sequence[str] = ()
+    inputs: Sequence[str] = ()
+
+
+class ReportResult(NamedTuple):
+    """보고서 생성 결과"""
+    task: ReportTask
+    success: bool
+    duration: float
+    output: str
+    error: Optional[str] = None
+
+
+def load_script_module(script_name: str):
+    """하이픈이 포함된 스크립트도 import 할 수 있도록 파일 경로로 모듈 로드 (한 번만 로드)"""
+    module_name = "report_" + Path(script_name).stem.replace("-", "_")
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPT_DIR / script_name)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        sys.modules.pop(module_name, None)
+        raise
+    return module
+
+
+class ThreadOutput(io.TextIOBase):
+    """스레드별로 출력 버퍼를 지정할 수 있는 stdout 대체 객체 (지정하지 않은 스레드는 원래 stdout 사용)"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def capture(self, buffer: Optional[io.StringIO]):
+        self.local.buffer = buffer
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self.local, "buffer", None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        buffer = getattr(self.local, "buffer", None)
+        if buffer is None:
+            self.stream.flush()
+
+
+def validate_tasks(tasks: Sequence[ReportTask]):
+    """의존 관계가 작업 목록 안에서 닫혀 있고 순환이 없는지 확인"""
+    report_files = {task.report_file for task in tasks}
+    for task in tasks:
+        missing = [dependency for dependency in task.depends_on if dependency not in report_files]
+        if missing:
+            raise ValueError(f"{task.report_file}: 알 수 없는 의존 보고서 {', '.join(missing)}")
+
+    remaining = {task.report_file: set(task.depends_on) for task in tasks}
+    while remaining:
+        ready = [report_file for report_file, dependencies in remaining.items() if not dependencies]
+        if not ready:
+            raise ValueError(f"보고서 의존 관계에 순환이 있습니다: {', '.join(sorted(remaining))}")
+        for report_file in ready:
+            del remaining[report_file]
+        for dependencies in remaining.values():
+            dependencies.difference_update(ready)
+
+
+class ReportOrchestrator:
+    """보고서 생성 작업을 의존 관계 순서에 맞춰 병렬 실행"""
+
+    def __init__(self, report_dir, max_workers: int = 4, capture_output: bool = True, timeout: float = None):
+        self.report_dir = Path(report_dir)
+        self.max_workers = max(1, max_workers)
+        self.capture_output = capture_output
+        self.timeout = get_report_timeout() if timeout is None else timeout
+        self.output: Optional[ThreadOutput] = None
+
+    def run_task(self, task: ReportTask) -> ReportResult:
+        """보고서 하나 생성 (예외와 sys.exit는 실패 결과로 변환)"""
+        buffer = io.StringIO()
+        if self.output is not None:
+            self.output.capture(buffer)
+
+        start_time = time.time()
+        success = False
+        error = None
+        try:
+            module = load_script_module(task.script_name)
+            generator = getattr(module, task.class_name)(str(self.report_dir))
+            report_path = self.report_dir / task.report_file
+            # 이전 실행에서 남은 파일이 아니라 이번 실행에서 기록된 보고서인지 확인
+            success = (task.run(generator) is not False and report_path.exists()
+                       and report_path.stat().st_mtime >= start_time - 1)
+            if not success:
+                error = "보고서 파일이 생성되지 않았습니다"
+        except SystemExit as e:
+            error = f"생성기가 종료 코드 {e.code}로 종료되었습니다"
+        except Exception as e:
+            error = f"{e}\n{traceback.format_exc()}"
+        finally:
+            if self.output is not None:
+                self.output.capture(None)
+
+        return ReportResult(task, success, time.time() - start_time, buffer.getvalue(), error)
+
+    def start_task(self, task: ReportTask) -> Future:
+        """데몬 스레드에서 보고서 생성 (제한 시간을 넘긴 생성기가 프로세스 종료를 막지 않도록 함)"""
+        future = Future()
+        future.set_running_or_notify_cancel()
+
+        def target():
+            try:
+                future.set_result(self.run_task(task))
+            except BaseException as e:
+                future.set_result(ReportResult(task, False, 0.0, "", f"{type(e).__name__}: {e}"))
+
+        threading.Thread(target=target, name=f"report-{task.report_file}", daemon=True).start()
+        return future
+
+    def run(self, tasks: Sequence[ReportTask],
+            on_start: Callable[[ReportTask], None] = None,
+            on_complete: Callable[[ReportResult], None] = None) -> List[ReportResult]:
+        """의존하는 보고서가 모두 끝난 작업부터 실행하고 입력 순서대로 결과 반환
+
+        의존 보고서가 실패하거나 제한 시간을 넘겨도 후속 작업은 실행 (생성기는 각자 수집 데이터를 읽으므로 순서만 보장)
+        """
+        validate_tasks(tasks)
+        # 모듈 import는 스레드 시작 전에 순서대로 수행
+        for task in tasks:
+            try:
+                load_script_module(task.script_name)
+            except Exception:
+                pass  # 실패는 run_task에서 해당 보고서의 오류로 보고
+
+        if self.capture_output:
+            self.output = ThreadOutput(sys.stdout)
+            sys.stdout = self.output
+
+        results: Dict[str, ReportResult] = {}
+        pending = list(tasks)
+        running: Dict[Future, ReportTask] = {}
+        started: Dict[Future, float] = {}
+        try:
+            while pending or running:
+                ready = [task for task in pending if all(dependency in results for dependency in task.depends_on)]
+                for task in ready[:self.max_workers - len(running)]:
+                    pending.remove(task)
+                    if on_start:
+                        on_start(task)
+                    future = self.start_task(task)
+                    running[future] = task
+                    started[future] = time.time()
+
+                wait_timeout = None
+                if self.timeout:
+                    wait_timeout = max(0.0, min(started[future] for future in running) + self.timeout - time.time())
+                done, _ = wait(running, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+
+                finished = [(future, future.result()) for future in done]
+                if self.timeout:
+                    now = time.time()
+                    finished += [
+                        (future, ReportResult(running[future], False, now - started[future], "",
+                                              f"제한 시간({self.timeout:g}초)을 초과했습니다"))
+                        for future in running if future not in done and now - started[future] >= self.timeout
+                    ]
+                for future, result in finished:
+                    task = running.pop(future)
+                    started.pop(future)
+                    results[task.report_file] = result
+                    if on_complete:
+                        on_complete(result)
+        finally:
+            if self.output is not None:
+                sys.stdout = self.output.stream
+                self.output = None
+
+        return [results[task.report_file] for task in tasks]
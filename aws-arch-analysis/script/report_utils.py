@@ -8,6 +8,8 @@ import os
 from datetime import datetime
 from typing import Dict, List, Any
 
+from report_data_loader import load_report_data
+
 class ReportUtils:
     """보고서 생성을 위한 유틸리티 클래스"""
     
@@ -15,10 +17,10 @@ class ReportUtils:
     def load_json_data(filename: str) -> List[Dict]:
         """JSON 파일 로드"""
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            data = load_report_data(filename)
         except (FileNotFoundError, json.JSONDecodeError):
             return []
+        return data if data is not None else []
     
     @staticmethod
     def format_cost(cost: float) -> str:
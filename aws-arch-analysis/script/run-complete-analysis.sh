@@ -12,70 +12,24 @@ HTML_DIR="${PROJECT_ROOT}/html-report"
 
 echo "🚀 AWS 아키텍처 분석 전체 프로세스 시작..."
 echo "📅 시작 시간: $(date)"
-echo "🏗️ 분석 단계: 데이터 수집 → Markdown 보고서 → HTML 대시보드"
+echo "🏗️ 분석 단계: 데이터 수집 → Markdown 보고서 → HTML 대시보드 → 압축"
 echo ""
 
-# 1단계: 데이터 수집 (이미 완료된 경우 스킵)
-if [ ! -f "$REPORT_DIR/compute_ec2_instances.json" ]; then
-    echo "📊 1단계: 데이터 수집 실행 중..."
-    cd "$SCRIPT_DIR"
-    
-    # 각 데이터 수집 스크립트 실행
-    echo "  🖥️ 컴퓨팅 데이터 수집..."
-    ./steampipe_compute_collection.sh
-    
-    echo "  🌐 네트워킹 데이터 수집..."
-    ./steampipe_networking_collection.sh
-    
-    echo "  💾 스토리지 데이터 수집..."
-    ./steampipe_storage_collection.sh
-    
-    echo "  🗄️ 데이터베이스 데이터 수집..."
-    ./steampipe_database_collection.sh
-    
-    echo "  🔒 보안 데이터 수집..."
-    ./steampipe_security_collection.sh
-    
-    echo "  📱 애플리케이션 데이터 수집..."
-    ./steampipe_application_collection.sh
-    
-    echo "  📊 모니터링 데이터 수집..."
-    ./steampipe_monitoring_collection.sh
-    
-    if [ $? -ne 0 ]; then
-        echo "❌ 데이터 수집 실패"
-        exit 1
-    fi
-    echo "✅ 데이터 수집 완료"
-else
-    echo "✅ 데이터 수집 이미 완료 (스킵)"
-fi
-
-echo ""
-
-# 2단계: Markdown 보고서 생성
-echo "📝 2단계: Markdown 보고서 생성 중..."
-cd "$SCRIPT_DIR"
-./generate-all-reports.sh
-if [ $? -ne 0 ]; then
-    echo "❌ Markdown 보고서 생성 실패"
-    exit 1
-fi
-echo "✅ Markdown 보고서 생성 완료"
-
-echo ""
-
-# 3단계: HTML 대시보드 생성
-echo "🌐 3단계: HTML 대시보드 생성 중..."
-echo "  📊 실제 AWS 데이터 기반 동적 생성"
-echo "  🎨 샘플 디자인 기반 전문적 스타일"
+# 1~4단계: 데이터 수집 → Markdown 보고서 → HTML 변환 → 압축
+# analysis_pipeline.py가 단계별 입력 파일의 내용 해시를 기록하고, 입력이 바뀐 대상만 다시 생성
+#   - 데이터 수집: 수집 데이터가 없거나 --collect 옵션을 준 경우에만 실행 (증분 수집)
+#   - 보고서: 해당 보고서가 읽는 JSON 파일 또는 생성기 스크립트가 바뀐 경우
+#   - HTML: Markdown 보고서 또는 CSS가 바뀐 경우
+# 사용 예: ./run-complete-analysis.sh --collect   (데이터 새로 수집)
+#          ./run-complete-analysis.sh --force     (전체 재생성)
+echo "📊 분석 파이프라인 실행 중 (변경된 대상만 재생성)..."
 cd "$SCRIPT_DIR"
-./generate-html-reports.sh
+python3 analysis_pipeline.py "$@"
 if [ $? -ne 0 ]; then
-    echo "❌ HTML 대시보드 생성 실패"
+    echo "❌ 분석 파이프라인 실패 (성공한 대상은 기록되어 다음 실행 시 실패한 대상만 다시 생성)"
     exit 1
 fi
-echo "✅ HTML 대시보드 생성 완료"
+echo "✅ 분석 파이프라인 완료"
 
 echo ""
 echo "🎉 AWS 아키텍처 분석 전체 프로세스 완료!"
@@ -5,6 +5,7 @@ Shell 스크립트와 동일한 쿼리 구조 사용
 """
 
 import subprocess
+import threading
 import json
 import os
 import sys
@@ -12,6 +13,12 @@ from pathlib import Path
 from typing import List, Tuple
 from datetime import datetime
 
+# 공용 Steampipe 쿼리 엔진 import
+sys.path.append(str(Path(__file__).parent))
+from steampipe_query_engine import get_query_engine
+from steampipe_query_scheduler import QueryScheduler
+from steampipe_collection_manifest import CollectionManifest
+
 class SteampipeApplicationCollector:
     def __init__(self, region: str = "ap-northeast-2"):
         self.region = region
@@ -20,6 +27,9 @@ class SteampipeApplicationCollector:
         project_root = script_dir.parent.parent
         self.report_dir = project_root / "aws-arch-analysis" / "report"
         self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.query_engine = get_query_engine()
+        self.query_scheduler = QueryScheduler(manifest=CollectionManifest(self.report_dir))
+        self.count_lock = threading.Lock()  # 병렬 쿼리 실행 시 카운터 동기화용
         self.total_count = 0
         self.success_count = 0
         self.error_log = self.report_dir / "application_collection_errors.log"
@@ -61,27 +71,19 @@ class SteampipeApplicationCollector:
 
     def execute_steampipe_query(self, description: str, query: str, output_file: str) -> bool:
         self.log_info(f"수집 중: {description}")
-        self.total_count += 1
+        with self.count_lock:
+            self.total_count += 1
         
         try:
-            # 작업 디렉토리를 report_dir로 변경
-            os.chdir(self.report_dir)
-            
-            result = subprocess.run(
-                ["steampipe", "query", query, "--output", "json"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
+            # 결과를 메모리에 모으지 않고 행 단위로 파일에 기록
             output_path = self.report_dir / output_file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(result.stdout)
+            row_count = self.query_engine.run_query_to_file(query, output_path)
             
             file_size = output_path.stat().st_size
             if file_size > 100:
-                self.log_success(f"{description} 완료 ({output_file}, {file_size} bytes)")
-                self.success_count += 1
+                self.log_success(f"{description} 완료 ({output_file}, {row_count}개 행, {file_size} bytes)")
+                with self.count_lock:
+                    self.success_count += 1
                 return True
             else:
                 self.log_warning(f"{description} - 데이터 없음 ({output_file}, {file_size} bytes)")
@@ -369,8 +371,7 @@ class SteampipeApplicationCollector:
         
         # 쿼리 실행
         queries = self.get_application_queries()
-        for description, query, output_file in queries:
-            self.execute_steampipe_query(description, query, output_file)
+        self.query_scheduler.run(queries, self.execute_steampipe_query)
         
         # 결과 요약
         self.log_success("API 및 애플리케이션 서비스 데이터 수집 완료!")
@@ -390,7 +391,8 @@ class SteampipeApplicationCollector:
         print(f"총 쿼리 수: {self.total_count}")
         print(f"성공한 쿼리: {self.success_count}")
         print(f"실패한 쿼리: {self.total_count - self.success_count}")
-        print(f"성공률: {(self.success_count/self.total_count*100):.1f}%")
+        if self.total_count > 0:
+            print(f"성공률: {(self.success_count/self.total_count*100):.1f}%")
         
         if self.error_log.exists():
             print(f"\n{self.YELLOW}⚠️ 오류 로그: {self.error_log}{self.NC}")
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Steampipe 수집 매니페스트 및 증분 수집
+리포트 디렉토리의 collection_manifest.json에 출력 파일별 쿼리 해시, 수집 시각, 행 수, 소요 시간, TTL 클래스를 기록
+
+- 모든 수집은 매니페스트를 갱신하며, STEAMPIPE_INCREMENTAL=1 (collect_all_data.py --incremental) 이면
+  쿼리가 바뀌지 않았고 TTL 이내인 출력 파일은 다시 수집하지 않음
+- TTL 클래스는 쿼리가 조회하는 테이블 이름으로 결정 (여러 테이블이면 가장 짧은 TTL)
+- 여러 수집기 프로세스가 병렬로 갱신하므로 잠금 파일(fcntl)로 읽기-병합-쓰기
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from steampipe_query_engine import count_result_rows, normalize_query
+
+INCREMENTAL_ENV = "STEAMPIPE_INCREMENTAL"
+MANIFEST_FILE = "collection_manifest.json"
+
+# TTL 클래스별 유효 시간 (초)
+TTL_CLASSES = {
+    "static": 7 * 24 * 3600,    # 인스턴스 타입, 가격표, 관리형 정책 등 거의 바뀌지 않는 데이터
+    "daily": 24 * 3600,         # IAM, Organizations, Config, 월별 비용 등
+    "standard": 6 * 3600,       # 일반 리소스 인벤토리 (기본값)
+    "volatile": 15 * 60,        # 메트릭, 로그 스트림, 태스크/파드 등 자주 바뀌는 데이터
+}
+DEFAULT_TTL_CLASS = "standard"
+
+# 테이블 이름 패턴 -> TTL 클래스 (위에서부터 먼저 일치하는 규칙 적용)
+TTL_CLASS_RULES = [
+    (r"^aws_ec2_instance_type$", "static"),
+    (r"^aws_pricing_", "static"),
+    (r"^aws_iam_policy$", "static"),
+    (r"^aws_ec2_regional_settings$", "static"),
+    (r"^aws_caller_identity$", "static"),
+    (r"^aws_cloudwatch_metric", "volatile"),
+    (r"^aws_cloudwatch_log_stream$", "volatile"),
+    (r"^aws_cloudwatch_alarm$", "volatile"),
+    (r"^aws_ecs_task$", "volatile"),
+    (r"^aws_backup_job$", "volatile"),
+    (r"^aws_ec2_spot_price$", "volatile"),
+    (r"^kubernetes_(pod|job)$", "volatile"),
+    (r"^aws_cost_.*_monthly$", "daily"),
+    (r"^aws_iam_", "daily"),
+    (r"^aws_organizations_", "daily"),
+    (r"^aws_config_", "daily"),
+    (r"^aws_servicecatalog_", "daily"),
+    (r"^aws_cloudtrail_", "daily"),
+    (r"^aws_kms_", "daily"),
+    (r"^aws_ec2_reserved_instance$", "daily"),
+    (r"^aws_ec2_ami$", "daily"),
+]
+
+TABLE_PATTERN = re.compile(r"\b(?:from|join)\s+((?:aws|kubernetes)_\w+)", re.IGNORECASE)
+
+
+def incremental_enabled() -> bool:
+    """증분 수집 모드 사용 여부 (기본값: 사용 안 함)"""
+    return os.environ.get(INCREMENTAL_ENV, "0") == "1"
+
+
+def get_ttl_class(query: str) -> str:
+    """쿼리가 조회하는 테이블 중 가장 짧은 TTL 클래스"""
+    ttl_classes = []
+    for table in TABLE_PATTERN.findall(query):
+        for pattern, ttl_class in TTL_CLASS_RULES:
+            if re.search(pattern, table.lower()):
+                ttl_classes.append(ttl_class)
+                break
+        else:
+            ttl_classes.append(DEFAULT_TTL_CLASS)
+    if not ttl_classes:
+        return DEFAULT_TTL_CLASS
+    return min(ttl_classes, key=lambda ttl_class: TTL_CLASSES[ttl_class])
+
+
+def get_query_hash(query: str) -> str:
+    """정규화된 SQL의 해시 (쿼리 변경 감지용)"""
+    return hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+
+
+def get_task_outputs(query: str, output: Any) -> List[Tuple[str, str]]:
+    """스케줄러 작업의 (출력 파일, 해당 파일을 만드는 쿼리) 목록
+
+    output이 파생 출력(DerivedOutput) 목록이면 각 출력의 원래 쿼리 기준으로 추적
+    """
+    if isinstance(output, str):
+        return [(output, query)]
+    if isinstance(output, list):
+        return [(derived.output_file, derived.query or query) for derived in output]
+    return []
+
+
+class CollectionManifest:
+    """출력 파일별 수집 이력 (스레드/프로세스 안전)"""
+
+    def __init__(self, report_dir, incremental: bool = None):
+        self.report_dir = Path(report_dir)
+        self.manifest_path = self.report_dir / MANIFEST_FILE
+        self.lock_path = self.report_dir / f"{MANIFEST_FILE}.lock"
+        self.incremental = incremental_enabled() if incremental is None else incremental
+        self.entries = self.load().get("outputs", {})
+        self.updates: Dict[str, Dict[str, Any]] = {}
+        self.skipped: List[str] = []
+        self.lock = threading.Lock()
+
+    def load(self) -> Dict[str, Any]:
+        """매니페스트 파일 읽기 (없거나 손상된 경우 빈 매니페스트)"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def is_fresh(self, output_file: str, query: str) -> bool:
+        """쿼리가 바뀌지 않았고 TTL 이내에 수집된 출력 파일인지 확인"""
+        entry = self.entries.get(output_file)
+        if not entry or entry.get("query_hash") != get_query_hash(query) or entry.get("complete") is False:
+            return False
+        if not (self.report_dir / output_file).exists():
+            return False
+        try:
+            collected_at = datetime.fromisoformat(entry["collected_at"])
+        except (KeyError, ValueError):
+            return False
+        ttl = TTL_CLASSES.get(entry.get("ttl_class"), TTL_CLASSES[DEFAULT_TTL_CLASS])
+        return (datetime.now() - collected_at).total_seconds() < ttl
+
+    @staticmethod
+    def count_rows(path: Path) -> Optional[int]:
+        """결과 파일의 행 수 (파일을 한 줄씩 읽으므로 결과 크기와 관계없이 메모리 사용량 일정)"""
+        try:
+            return count_result_rows(path)
+        except (OSError, ValueError):
+            return None
+
+    def record(self, output_file: str, query: str, duration: float, complete: bool = True):
+        """출력 파일 수집 결과 기록 (complete=False 이면 일부만 수집된 출력으로 기록해 증분 모드에서도 다시 수집)"""
+        output_path = self.report_dir / output_file
+        entry = {
+            "query_hash": get_query_hash(query),
+            "ttl_class": get_ttl_class(query),
+            "collected_at": datetime.now().isoformat(timespec="seconds"),
+            "rows": self.count_rows(output_path),
+            "bytes": output_path.stat().st_size,
+            "duration": round(duration, 3),
+        }
+        if not complete:
+            entry["complete"] = False
+        with self.lock:
+            self.entries[output_file] = entry
+            self.updates[output_file] = entry
+
+    def track(self, execute: Callable[..., Any], skipped_result: Any = True) -> Callable[..., Any]:
+        """스케줄러 작업 실행 함수를 감싸 증분 모드의 건너뛰기와 매니페스트 기록을 추가"""
+
+        def tracked(description: str, query: str, output: Any, *args):
+            outputs = get_task_outputs(query, output)
+            if self.incremental and outputs and all(self.is_fresh(output_file, output_query)
+                                                    for output_file, output_query in outputs):
+                with self.lock:
+                    self.skipped.extend(output_file for output_file, _ in outputs)
+                print(f"⏭️  {description}: 최신 상태 (TTL 이내) - 건너뜀")
+                return skipped_result
+
+            start_time = time.time()
+            result = execute(description, query, output, *args)
+            duration = time.time() - start_time
+
+            # 이번 실행에서 새로 기록된 파일만 매니페스트에 반영
+            for output_file, output_query in outputs:
+                output_path = self.report_dir / output_file
+                if output_path.exists() and output_path.stat().st_mtime >= start_time - 1:
+                    self.record(output_file, output_query, duration)
+            return result
+
+        return tracked
+
+    def save(self):
+        """이번 수집기의 변경 사항을 매니페스트 파일에 병합 저장"""
+        with self.lock:
+            updates = dict(self.updates)
+            self.updates.clear()
+        if not updates:
+            return
+
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                manifest = self.load()
+                outputs = manifest.get("outputs", {})
+                outputs.update(updates)
+                manifest = {
+                    "version": 1,
+                    "updated_at": datetime.now().isoformat(timespec="seconds"),
+                    "outputs": dict(sorted(outputs.items())),
+                }
+                temp_path = self.manifest_path.with_suffix(f".{os.getpid()}.tmp")
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(manifest, f, indent=2, ensure_ascii=False)
+                os.replace(temp_path, self.manifest_path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -5,6 +5,7 @@ Shell 스크립트와 동일한 기능 및 출력 형식 제공
 """
 
 import subprocess
+import threading
 import json
 import os
 import sys
@@ -12,7 +13,20 @@ from pathlib import Path
 from typing import List, Tuple
 from datetime import datetime
 
-class SteampipeComputeCollector:
+# 공용 Steampipe 쿼리 엔진 import
+sys.path.append(str(Path(__file__).parent))
+from steampipe_query_engine import get_query_engine
+from steampipe_derived_datasets import BaseDataset, DerivedDatasetMixin
+from steampipe_shared_datasets import get_shared_table_datasets
+from steampipe_query_scheduler import QueryScheduler
+from steampipe_collection_manifest import CollectionManifest
+from k8s_multi_cluster_collection import MultiClusterCollector, multi_cluster_enabled
+from k8s_payload_summary import redact_summary_key, summarize_queries
+from aws_version_collection import VersionCollector
+
+class SteampipeComputeCollector(DerivedDatasetMixin):
+    min_output_size = 50
+    
     def __init__(self, region: str = "ap-northeast-2", report_dir: str = None):
         # 스크립트의 실제 위치를 기준으로 경로 설정
         if report_dir is None:
@@ -22,6 +36,9 @@ class SteampipeComputeCollector:
         self.region = region
         self.report_dir = Path(report_dir)
         self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.query_engine = get_query_engine()
+        self.query_scheduler = QueryScheduler(manifest=CollectionManifest(self.report_dir))
+        self.count_lock = threading.Lock()  # 병렬 쿼리 실행 시 카운터 동기화용
         
         self.log_file = self.report_dir / "steampipe_compute_collection.log"
         self.error_log = self.report_dir / "steampipe_compute_errors.log"
@@ -147,27 +164,19 @@ class SteampipeComputeCollector:
 
     def execute_steampipe_query(self, description: str, query: str, output_file: str) -> bool:
         self.log_info(f"수집 중: {description}")
-        self.total_count += 1
+        with self.count_lock:
+            self.total_count += 1
         
         try:
-            # 작업 디렉토리를 report_dir로 변경
-            os.chdir(self.report_dir)
-            
-            result = subprocess.run(
-                ["steampipe", "query", query, "--output", "json"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
+            # 결과를 메모리에 모으지 않고 행 단위로 파일에 기록
             output_path = self.report_dir / output_file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(result.stdout)
+            row_count = self.query_engine.run_query_to_file(query, output_path)
             
             file_size = output_path.stat().st_size
             if file_size > 50:
-                self.log_success(f"{description} 완료 ({output_file}, {file_size} bytes)")
-                self.success_count += 1
+                self.log_success(f"{description} 완료 ({output_file}, {row_count}개 행, {file_size} bytes)")
+                with self.count_lock:
+                    self.success_count += 1
                 return True
             else:
                 self.log_warning(f"{description} - 데이터 없음 ({output_file}, {file_size} bytes)")
@@ -175,15 +184,16 @@ class SteampipeComputeCollector:
                 
         except subprocess.CalledProcessError as e:
             # 오류 메시지를 error_log에 기록
+            # (Kubernetes 요약 쿼리의 HMAC 키는 가려서 기록)
             error_msg = f"{description} 실패 - {output_file}"
             if e.stderr:
-                error_msg += f": {e.stderr.strip()}"
+                error_msg += f": {redact_summary_key(e.stderr.strip())}"
             self.log_error(error_msg)
             
             # 오류 로그에 추가 정보 기록
             with open(self.error_log, 'a') as f:
-                f.write(f"\nQuery failed: {query}\n")
-                f.write(f"Error: {e.stderr}\n")
+                f.write(f"\nQuery failed: {redact_summary_key(query)}\n")
+                f.write(f"Error: {redact_summary_key(e.stderr)}\n")
             
             return False
 
@@ -377,6 +387,10 @@ class SteampipeComputeCollector:
             )
         ]
 
+    def get_derived_datasets(self) -> List[BaseDataset]:
+        """컨테이너 수집기와 공유하는 ECS/EKS/Kubernetes 테이블은 공용 기준 쿼리로 한 번만 조회"""
+        return get_shared_table_datasets(self.get_container_queries() + self.get_k8s_queries())
+
     def get_k8s_queries(self) -> List[Tuple[str, str, str]]:
         """Kubernetes 관련 리소스 쿼리"""
         return [
@@ -497,47 +511,56 @@ class SteampipeComputeCollector:
         # EC2 관련 리소스 수집
         self.log_info("💻 EC2 관련 리소스 수집 시작...")
         ec2_queries = self.get_ec2_queries()
-        for description, query, output_file in ec2_queries:
-            self.execute_steampipe_query(description, query, output_file)
+        self.query_scheduler.run(ec2_queries, self.execute_steampipe_query)
         
         # Auto Scaling 관련 리소스 수집
         self.log_info("⚖️ Auto Scaling 관련 리소스 수집 시작...")
-        autoscaling_queries = self.get_autoscaling_queries()
-        for description, query, output_file in autoscaling_queries:
-            self.execute_steampipe_query(description, query, output_file)
+        # 시작 템플릿/Lambda/레이어 버전은 VERSION_COLLECTION_MODE에 따라 사용 중인 버전 또는 새 버전만 수집
+        version_collector = VersionCollector(self.region, self.report_dir, log=self.log_info)
+        autoscaling_queries = version_collector.exclude(self.get_autoscaling_queries())
+        self.query_scheduler.run(autoscaling_queries, self.execute_steampipe_query)
         
         # 로드 밸런싱 관련 리소스 수집
         self.log_info("🔄 로드 밸런싱 관련 리소스 수집 시작...")
         loadbalancer_queries = self.get_loadbalancer_queries()
-        for description, query, output_file in loadbalancer_queries:
-            self.execute_steampipe_query(description, query, output_file)
+        self.query_scheduler.run(loadbalancer_queries, self.execute_steampipe_query)
         
         # 서버리스 컴퓨팅 리소스 수집
         self.log_info("🚀 서버리스 컴퓨팅 리소스 수집 시작...")
-        serverless_queries = self.get_serverless_queries()
-        for description, query, output_file in serverless_queries:
-            self.execute_steampipe_query(description, query, output_file)
+        serverless_queries = version_collector.exclude(self.get_serverless_queries())
+        self.query_scheduler.run(serverless_queries, self.execute_steampipe_query)
+        version_results = version_collector.collect()
+        with self.count_lock:
+            self.total_count += len(version_results)
+            self.success_count += sum(version_results)
         
         # 컨테이너 서비스 리소스 수집
         self.log_container("📦 컨테이너 서비스 리소스 수집 시작...")
-        container_queries = self.get_container_queries()
-        for description, query, output_file in container_queries:
-            self.execute_steampipe_query(description, query, output_file)
+        container_queries = self.plan_collection_tasks(self.get_container_queries())
+        self.query_scheduler.run(container_queries, self.execute_collection_task)
         
         # Kubernetes 리소스 수집
         self.log_k8s("☸️ Kubernetes 리소스 수집 시작...")
-        k8s_queries = self.get_k8s_queries()
-        for description, query, output_file in k8s_queries:
-            if self.execute_steampipe_query(description, query, output_file):
-                pass
-            else:
+        multi_cluster = MultiClusterCollector(self.report_dir, log=self.log_k8s,
+                                              manifest=self.query_scheduler.manifest)
+        if multi_cluster_enabled(multi_cluster.clusters):
+            # EKS 클러스터/kubeconfig 컨텍스트별로 Kubernetes API 직접 조회
+            k8s_queries = self.get_k8s_queries()
+            k8s_results = multi_cluster.collect(k8s_queries)
+            with self.count_lock:
+                self.total_count += len(k8s_results)
+                self.success_count += sum(k8s_results)
+        else:
+            k8s_queries = self.plan_collection_tasks(summarize_queries(self.get_k8s_queries()))
+            k8s_results = self.query_scheduler.run(k8s_queries, self.execute_collection_task)
+        for (description, _, _), success in zip(k8s_queries, k8s_results):
+            if not success:
                 self.log_warning(f"Kubernetes 리소스 수집 실패: {description} (클러스터 연결 확인 필요)")
         
         # 기타 컴퓨팅 서비스 수집
         self.log_info("🏗️ 기타 컴퓨팅 서비스 수집 시작...")
         other_queries = self.get_other_queries()
-        for description, query, output_file in other_queries:
-            self.execute_steampipe_query(description, query, output_file)
+        self.query_scheduler.run(other_queries, self.execute_steampipe_query)
         
         # 결과 요약
         self.log_success("완전한 컴퓨팅 리소스 데이터 수집 완료!")
@@ -5,6 +5,7 @@ Shell 스크립트와 동일한 쿼리 구조 사용
 """
 
 import subprocess
+import threading
 import json
 import os
 import sys
@@ -12,7 +13,16 @@ from pathlib import Path
 from typing import List, Tuple
 from datetime import datetime
 
-class SteampipeContainerCollector:
+# 공용 Steampipe 쿼리 엔진 import
+sys.path.append(str(Path(__file__).parent))
+from steampipe_query_engine import get_query_engine
+from steampipe_derived_datasets import BaseDataset, DerivedDatasetMixin
+from steampipe_shared_datasets import get_shared_table_datasets
+from steampipe_query_scheduler import QueryScheduler
+from steampipe_collection_manifest import CollectionManifest
+from k8s_multi_cluster_collection import MultiClusterCollector, multi_cluster_enabled
+
+class SteampipeContainerCollector(DerivedDatasetMixin):
     def __init__(self, region: str = "ap-northeast-2"):
         self.region = region
         # 스크립트의 실제 위치를 기준으로 경로 설정
@@ -20,6 +30,9 @@ class SteampipeContainerCollector:
         project_root = script_dir.parent.parent
         self.report_dir = project_root / "aws-arch-analysis" / "report"
         self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.query_engine = get_query_engine()
+        self.query_scheduler = QueryScheduler(manifest=CollectionManifest(self.report_dir))
+        self.count_lock = threading.Lock()  # 병렬 쿼리 실행 시 카운터 동기화용
         self.total_count = 0
         self.success_count = 0
         self.error_log = self.report_dir / "container_collection_errors.log"
@@ -72,27 +85,19 @@ class SteampipeContainerCollector:
 
     def execute_steampipe_query(self, description: str, query: str, output_file: str) -> bool:
         self.log_info(f"수집 중: {description}")
-        self.total_count += 1
+        with self.count_lock:
+            self.total_count += 1
         
         try:
-            # 작업 디렉토리를 report_dir로 변경
-            os.chdir(self.report_dir)
-            
-            result = subprocess.run(
-                ["steampipe", "query", query, "--output", "json"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
+            # 결과를 메모리에 모으지 않고 행 단위로 파일에 기록
             output_path = self.report_dir / output_file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(result.stdout)
+            row_count = self.query_engine.run_query_to_file(query, output_path)
             
             file_size = output_path.stat().st_size
             if file_size > 100:
-                self.log_success(f"{description} 완료 ({output_file}, {file_size} bytes)")
-                self.success_count += 1
+                self.log_success(f"{description} 완료 ({output_file}, {row_count}개 행, {file_size} bytes)")
+                with self.count_lock:
+                    self.success_count += 1
                 return True
             else:
                 self.log_warning(f"{description} - 데이터 없음 ({output_file}, {file_size} bytes)")
@@ -112,6 +117,10 @@ class SteampipeContainerCollector:
             
             return False
 
+    def get_derived_datasets(self) -> List[BaseDataset]:
+        """컴퓨팅 수집기와 공유하는 ECS/EKS/Kubernetes 테이블은 공용 기준 쿼리로 한 번만 조회"""
+        return get_shared_table_datasets(self.get_container_queries())
+
     def get_container_queries(self) -> List[Tuple[str, str, str]]:
         """Shell 스크립트와 동일한 쿼리 구조 사용"""
         return [
@@ -263,10 +272,22 @@ class SteampipeContainerCollector:
         # Steampipe 플러그인 확인
         self.check_steampipe_plugin()
         
-        # 쿼리 실행
-        queries = self.get_container_queries()
-        for description, query, output_file in queries:
-            self.execute_steampipe_query(description, query, output_file)
+        # 쿼리 실행 (EKS 클러스터 목록이 먼저 있어야 하므로 Kubernetes 쿼리는 나중에 실행)
+        container_queries = [query for query in self.get_container_queries() if not query[2].startswith("k8s_")]
+        k8s_queries = [query for query in self.get_container_queries() if query[2].startswith("k8s_")]
+        queries = self.plan_collection_tasks(container_queries)
+        self.query_scheduler.run(queries, self.execute_collection_task)
+
+        multi_cluster = MultiClusterCollector(self.report_dir, log=self.log_container,
+                                              manifest=self.query_scheduler.manifest)
+        if multi_cluster_enabled(multi_cluster.clusters):
+            # EKS 클러스터/kubeconfig 컨텍스트별로 Kubernetes API 직접 조회
+            k8s_results = multi_cluster.collect(k8s_queries)
+            with self.count_lock:
+                self.total_count += len(k8s_results)
+                self.success_count += sum(k8s_results)
+        else:
+            self.query_scheduler.run(self.plan_collection_tasks(k8s_queries), self.execute_collection_task)
         
         # 결과 요약
         self.log_success("컨테이너 서비스 리소스 데이터 수집 완료!")
@@ -293,7 +314,8 @@ class SteampipeContainerCollector:
         print(f"총 쿼리 수: {self.total_count}")
         print(f"성공한 쿼리: {self.success_count}")
         print(f"실패한 쿼리: {self.total_count - self.success_count}")
-        print(f"성공률: {(self.success_count/self.total_count*100):.1f}%")
+        if self.total_count > 0:
+            print(f"성공률: {(self.success_count/self.total_count*100):.1f}%")
         
         if self.error_log.exists():
             print(f"\n{self.YELLOW}⚠️ 오류 로그: {self.error_log}{self.NC}")
@@ -6,12 +6,21 @@ Cost Explorer, Budgets, Savings Plans, CUR 등 모든 비용 관련 서비스 
 
 import os
 import subprocess
+import sys
 import json
 import glob
 from pathlib import Path
 from typing import List, Tuple
 from datetime import datetime
 
+# 공용 Steampipe 쿼리 엔진 import
+sys.path.append(str(Path(__file__).parent))
+from steampipe_query_engine import get_query_engine
+from steampipe_query_scheduler import QueryScheduler
+from steampipe_collection_manifest import CollectionManifest
+from cost_history_store import COST_SERIES_BY_OUTPUT, CostHistoryStore
+from cost_timeseries_store import CostTimeSeriesStore
+
 class SteampipeCostCollector:
     def __init__(self, region: str = "ap-northeast-2", report_dir: str = None):
         # 스크립트의 실제 위치를 기준으로 경로 설정
@@ -22,6 +31,11 @@ class SteampipeCostCollector:
         self.region = region
         self.report_dir = Path(report_dir)
         self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.query_engine = get_query_engine()
+        self.query_scheduler = QueryScheduler(manifest=CollectionManifest(self.report_dir))
+        # 월간/일간 비용 시계열은 이력 저장소에 누적하고 새 기간만 조회
+        self.history_store = CostHistoryStore(self.report_dir / ".cost_history")
+        self.history_starts = {}
         
         self.log_file = self.report_dir / "steampipe_cost_collection.log"
         self.error_log = self.report_dir / "steampipe_cost_errors.log"
@@ -98,74 +112,83 @@ class SteampipeCostCollector:
             # 출력 파일 경로
             output_path = self.report_dir / output_file
             
-            # Steampipe 쿼리 실행
-            result = subprocess.run([
-                'steampipe', 'query', query, '--output', 'json'
-            ], capture_output=True, text=True, cwd=self.report_dir)
+            # Steampipe 쿼리 실행 (결과를 메모리에 모으지 않고 행 단위로 파일에 저장)
+            row_count = self.query_engine.run_query_to_file(query, output_path)
             
-            if result.returncode == 0:
-                # 결과를 파일에 저장
-                with open(output_path, 'w') as f:
-                    f.write(result.stdout)
-                
-                # 파일 크기 확인
-                file_size = output_path.stat().st_size
-                
-                if file_size > 50:  # 50바이트 이상이면 데이터가 있다고 판단
-                    self.log_success(f"{description} 완료 ({output_file}, {file_size} bytes)")
-                    return True
-                else:
-                    self.log_warning(f"{description} - 데이터 없음 ({output_file}, {file_size} bytes)")
-                    return False
+            # 파일 크기 확인
+            file_size = output_path.stat().st_size
+            
+            if file_size > 50:  # 50바이트 이상이면 데이터가 있다고 판단
+                self.log_success(f"{description} 완료 ({output_file}, {row_count}개 행, {file_size} bytes)")
+                return True
             else:
-                self.log_error(f"{description} 실패 - {output_file}: {result.stderr}")
-                with open(self.error_log, 'a') as f:
-                    f.write(f"Query failed: {query}\n")
-                    f.write(f"Error: {result.stderr}\n\n")
+                self.log_warning(f"{description} - 데이터 없음 ({output_file}, {file_size} bytes)")
                 return False
                 
+        except subprocess.CalledProcessError as e:
+            self.log_error(f"{description} 실패 - {output_file}: {e.stderr}")
+            with open(self.error_log, 'a') as f:
+                f.write(f"Query failed: {query}\n")
+                f.write(f"Error: {e.stderr}\n\n")
+            return False
         except Exception as e:
             self.log_error(f"{description} 실행 중 오류: {str(e)}")
             return False
 
+    def get_history_query(self, output_file: str) -> Tuple[str, str, str]:
+        """이력 저장소의 확정일 이후 구간만 조회하는 비용 시계열 쿼리"""
+        series = COST_SERIES_BY_OUTPUT[output_file]
+        start = self.history_store.fetch_start(series)
+        self.history_starts[output_file] = start
+        return (series.description, self.history_store.build_query(series, start), output_file)
+
+    def execute_history_query(self, description: str, query: str, output_file: str) -> bool:
+        """비용 시계열의 새 구간을 조회해 이력 저장소에 병합하고 저장소에서 출력 파일 생성"""
+        self.log_info(f"수집 중: {description} ({self.history_starts[output_file]} 이후)")
+        series = COST_SERIES_BY_OUTPUT[output_file]
+        try:
+            result = json.loads(self.query_engine.run_query(query))
+            columns = result.get("columns", []) if isinstance(result, dict) else []
+            rows = result.get("rows", []) if isinstance(result, dict) else result
+            state = self.history_store.merge(series, self.history_starts[output_file], columns, rows)
+            row_count = self.history_store.materialize(series, state, self.report_dir / output_file)
+        except subprocess.CalledProcessError as e:
+            self.log_error(f"{description} 실패 - {output_file}: {e.stderr}")
+            with open(self.error_log, 'a') as f:
+                f.write(f"Query failed: {query}\n")
+                f.write(f"Error: {e.stderr}\n\n")
+            return False
+        except Exception as e:
+            self.log_error(f"{description} 실행 중 오류: {str(e)}")
+            return False
+
+        if row_count:
+            self.log_success(f"{description} 완료 ({output_file}, 신규 조회 {len(rows)}개 행, "
+                             f"저장소 {len(state['rows'])}개 행, 확정일 {state['settled_through']})")
+            return True
+        self.log_warning(f"{description} - 데이터 없음 ({output_file})")
+        return False
+
+    def execute_query(self, description: str, query: str, output_file: str) -> bool:
+        """비용 시계열은 이력 저장소를 거쳐, 나머지는 바로 파일로 수집"""
+        if output_file in COST_SERIES_BY_OUTPUT:
+            return self.execute_history_query(description, query, output_file)
+        return self.execute_steampipe_query(description, query, output_file)
+
     def get_billing_queries(self) -> List[Tuple[str, str, str]]:
         """청구 및 계정 관련 쿼리 (실제 사용 가능한 테이블 기준)"""
         return [
-            (
-                "계정별 월간 비용",
-                "select linked_account_id, linked_account_name, period_start, period_end, blended_cost_amount, blended_cost_unit, unblended_cost_amount, unblended_cost_unit from aws_cost_by_account_monthly order by period_start desc limit 12",
-                "cost_by_account_monthly.json"
-            ),
-            (
-                "계정별 일간 비용",
-                "select linked_account_id, linked_account_name, period_start, period_end, blended_cost_amount, blended_cost_unit, unblended_cost_amount, unblended_cost_unit from aws_cost_by_account_daily order by period_start desc limit 30",
-                "cost_by_account_daily.json"
-            )
+            self.get_history_query("cost_by_account_monthly.json"),
+            self.get_history_query("cost_by_account_daily.json")
         ]
 
     def get_cost_explorer_queries(self) -> List[Tuple[str, str, str]]:
         """Cost Explorer 관련 쿼리 (실제 사용 가능한 테이블 기준)"""
         return [
-            (
-                "서비스별 월간 비용",
-                "select service, period_start, period_end, blended_cost_amount, blended_cost_unit, unblended_cost_amount, unblended_cost_unit from aws_cost_by_service_monthly order by period_start desc, blended_cost_amount desc limit 50",
-                "cost_by_service_monthly.json"
-            ),
-            (
-                "서비스별 일간 비용",
-                "select service, period_start, period_end, blended_cost_amount, blended_cost_unit, unblended_cost_amount, unblended_cost_unit from aws_cost_by_service_daily order by period_start desc, blended_cost_amount desc limit 100",
-                "cost_by_service_daily.json"
-            ),
-            (
-                "리소스별 월간 비용",
-                "select resource_id, service, period_start, period_end, blended_cost_amount, blended_cost_unit, unblended_cost_amount, unblended_cost_unit from aws_cost_by_resource_monthly order by period_start desc, blended_cost_amount desc limit 50",
-                "cost_by_resource_monthly.json"
-            ),
-            (
-                "리소스별 일간 비용",
-                "select resource_id, service, period_start, period_end, blended_cost_amount, blended_cost_unit, unblended_cost_amount, unblended_cost_unit from aws_cost_by_resource_daily order by period_start desc, blended_cost_amount desc limit 100",
-                "cost_by_resource_daily.json"
-            ),
+            self.get_history_query("cost_by_service_monthly.json"),
+            self.get_history_query("cost_by_service_daily.json"),
+            self.get_history_query("cost_by_resource_monthly.json"),
+            self.get_history_query("cost_by_resource_daily.json"),
             (
                 "태그별 비용",
                 "select tag_key, tag_value, period_start, period_end, blended_cost_amount, blended_cost_unit, unblended_cost_amount, unblended_cost_unit from aws_cost_by_tag order by period_start desc, blended_cost_amount desc limit 50",
@@ -201,31 +224,15 @@ class SteampipeCostCollector:
                 f"select recommendation_id, account_id, region, resource_arn, resource_id, resource_type, action_type, estimated_monthly_cost, estimated_monthly_savings, implementation_effort, last_refresh_timestamp, rollback_possible, source from aws_costoptimizationhub_recommendation where region = '{self.region}' limit 50",
                 "cost_optimization_recommendations.json"
             ),
-            (
-                "레코드 타입별 월간 비용",
-                "select record_type, period_start, period_end, blended_cost_amount, blended_cost_unit, unblended_cost_amount, unblended_cost_unit from aws_cost_by_record_type_monthly order by period_start desc limit 50",
-                "cost_by_record_type_monthly.json"
-            ),
-            (
-                "레코드 타입별 일간 비용",
-                "select record_type, period_start, period_end, blended_cost_amount, blended_cost_unit, unblended_cost_amount, unblended_cost_unit from aws_cost_by_record_type_daily order by period_start desc limit 100",
-                "cost_by_record_type_daily.json"
-            )
+            self.get_history_query("cost_by_record_type_monthly.json"),
+            self.get_history_query("cost_by_record_type_daily.json")
         ]
 
     def get_savings_plans_queries(self) -> List[Tuple[str, str, str]]:
         """서비스 사용 타입별 비용 분석"""
         return [
-            (
-                "서비스 사용 타입별 월간 비용",
-                "select service, usage_type, period_start, period_end, blended_cost_amount, blended_cost_unit, unblended_cost_amount, unblended_cost_unit from aws_cost_by_service_usage_type_monthly order by period_start desc, blended_cost_amount desc limit 100",
-                "cost_by_service_usage_type_monthly.json"
-            ),
-            (
-                "서비스 사용 타입별 일간 비용",
-                "select service, usage_type, period_start, period_end, blended_cost_amount, blended_cost_unit, unblended_cost_amount, unblended_cost_unit from aws_cost_by_service_usage_type_daily order by period_start desc, blended_cost_amount desc limit 200",
-                "cost_by_service_usage_type_daily.json"
-            )
+            self.get_history_query("cost_by_service_usage_type_monthly.json"),
+            self.get_history_query("cost_by_service_usage_type_daily.json")
         ]
 
     def get_pricing_queries(self) -> List[Tuple[str, str, str]]:
@@ -261,50 +268,53 @@ class SteampipeCostCollector:
         # 계정별 비용 정보 수집
         self.log_category("ACCOUNT_COSTS", "💳 계정별 비용 정보 수집 시작...")
         billing_queries = self.get_billing_queries()
-        for description, query, output_file in billing_queries:
-            self.total_count += 1
-            if self.execute_steampipe_query(description, query, output_file):
-                self.success_count += 1
+        results = self.query_scheduler.run(billing_queries, self.execute_query)
+        self.total_count += len(results)
+        self.success_count += sum(results)
         
         # 서비스별 비용 분석 수집
         self.log_category("SERVICE_COSTS", "📊 서비스별 비용 분석 수집 시작...")
         ce_queries = self.get_cost_explorer_queries()
-        for description, query, output_file in ce_queries:
-            self.total_count += 1
-            if self.execute_steampipe_query(description, query, output_file):
-                self.success_count += 1
+        results = self.query_scheduler.run(ce_queries, self.execute_query)
+        self.total_count += len(results)
+        self.success_count += sum(results)
         
         # 비용 예측 및 사용량 수집
         self.log_category("FORECASTS", "🔮 비용 예측 및 사용량 데이터 수집 시작...")
         budget_queries = self.get_budgets_queries()
-        for description, query, output_file in budget_queries:
-            self.total_count += 1
-            if self.execute_steampipe_query(description, query, output_file):
-                self.success_count += 1
+        results = self.query_scheduler.run(budget_queries, self.execute_steampipe_query)
+        self.total_count += len(results)
+        self.success_count += sum(results)
         
         # 비용 최적화 권장사항 수집
         self.log_category("OPTIMIZATION", "💡 비용 최적화 권장사항 수집 시작...")
         cur_queries = self.get_cur_queries()
-        for description, query, output_file in cur_queries:
-            self.total_count += 1
-            if self.execute_steampipe_query(description, query, output_file):
-                self.success_count += 1
+        results = self.query_scheduler.run(cur_queries, self.execute_query)
+        self.total_count += len(results)
+        self.success_count += sum(results)
         
         # 사용 타입별 비용 분석 수집
         self.log_category("USAGE_TYPES", "📈 사용 타입별 비용 분석 수집 시작...")
         savings_queries = self.get_savings_plans_queries()
-        for description, query, output_file in savings_queries:
-            self.total_count += 1
-            if self.execute_steampipe_query(description, query, output_file):
-                self.success_count += 1
+        results = self.query_scheduler.run(savings_queries, self.execute_query)
+        self.total_count += len(results)
+        self.success_count += sum(results)
         
         # 가격 정보 수집
         self.log_category("PRICING", "💲 AWS 서비스 가격 정보 수집 시작...")
         pricing_queries = self.get_pricing_queries()
-        for description, query, output_file in pricing_queries:
-            self.total_count += 1
-            if self.execute_steampipe_query(description, query, output_file):
-                self.success_count += 1
+        results = self.query_scheduler.run(pricing_queries, self.execute_steampipe_query)
+        self.total_count += len(results)
+        self.success_count += sum(results)
+
+        # 보고서가 바로 조회할 수 있도록 비용 시계열 저장소 집계 갱신
+        try:
+            with CostTimeSeriesStore(self.report_dir) as store:
+                synced = store.sync()
+            if synced:
+                self.log_info(f"비용 시계열 저장소 갱신: {', '.join(f'{name} {rows}행' for name, rows in synced.items())}")
+        except Exception as e:
+            self.log_warning(f"비용 시계열 저장소 갱신 실패: {e}")
         
         return True
 
@@ -6,10 +6,18 @@ Shell 스크립트와 동일한 기능 및 출력 형식 제공
 
 import os
 import subprocess
+import threading
+import sys
 import glob
 from pathlib import Path
 from typing import List, Tuple
 
+# 공용 Steampipe 쿼리 엔진 import
+sys.path.append(str(Path(__file__).parent))
+from steampipe_query_engine import get_query_engine
+from steampipe_query_scheduler import QueryScheduler
+from steampipe_collection_manifest import CollectionManifest
+
 class SteampipeDatabaseCollector:
     def __init__(self, region: str = "ap-northeast-2", report_dir: str = None):
         # 스크립트의 실제 위치를 기준으로 경로 설정
@@ -20,6 +28,9 @@ class SteampipeDatabaseCollector:
         self.region = region
         self.report_dir = Path(report_dir)
         self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.query_engine = get_query_engine()
+        self.query_scheduler = QueryScheduler(manifest=CollectionManifest(self.report_dir))
+        self.count_lock = threading.Lock()  # 병렬 쿼리 실행 시 카운터 동기화용
         
         self.log_file = self.report_dir / "steampipe_database_collection.log"
         self.error_log = self.report_dir / "steampipe_database_errors.log"
@@ -88,27 +99,19 @@ class SteampipeDatabaseCollector:
 
     def execute_steampipe_query(self, description: str, query: str, output_file: str) -> bool:
         self.log_info(f"수집 중: {description}")
-        self.total_count += 1
+        with self.count_lock:
+            self.total_count += 1
         
         try:
-            # 작업 디렉토리를 report_dir로 변경
-            os.chdir(self.report_dir)
-            
-            result = subprocess.run(
-                ["steampipe", "query", query, "--output", "json"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
+            # 결과를 메모리에 모으지 않고 행 단위로 파일에 기록
             output_path = self.report_dir / output_file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(result.stdout)
+            row_count = self.query_engine.run_query_to_file(query, output_path)
             
             file_size = output_path.stat().st_size
             if file_size > 50:
-                self.log_success(f"{description} 완료 ({output_file}, {file_size} bytes)")
-                self.success_count += 1
+                self.log_success(f"{description} 완료 ({output_file}, {row_count}개 행, {file_size} bytes)")
+                with self.count_lock:
+                    self.success_count += 1
                 return True
             else:
                 self.log_warning(f"{description} - 데이터 없음 ({output_file}, {file_size} bytes)")
@@ -240,32 +243,27 @@ class SteampipeDatabaseCollector:
         # RDS 리소스 수집
         self.log_rds("🏛️ RDS 인스턴스 및 클러스터 수집 시작...")
         rds_queries = self.get_rds_queries()
-        for description, query, output_file in rds_queries:
-            self.execute_steampipe_query(description, query, output_file)
+        self.query_scheduler.run(rds_queries, self.execute_steampipe_query)
         
         # DynamoDB 리소스 수집
         self.log_nosql("🔥 DynamoDB 리소스 수집 시작...")
         dynamodb_queries = self.get_dynamodb_queries()
-        for description, query, output_file in dynamodb_queries:
-            self.execute_steampipe_query(description, query, output_file)
+        self.query_scheduler.run(dynamodb_queries, self.execute_steampipe_query)
         
         # ElastiCache 리소스 수집
         self.log_nosql("⚡ ElastiCache 리소스 수집 시작...")
         elasticache_queries = self.get_elasticache_queries()
-        for description, query, output_file in elasticache_queries:
-            self.execute_steampipe_query(description, query, output_file)
+        self.query_scheduler.run(elasticache_queries, self.execute_steampipe_query)
         
         # 데이터 웨어하우스 서비스 수집
         self.log_info("🏢 데이터 웨어하우스 서비스 수집 시작...")
         warehouse_queries = self.get_warehouse_queries()
-        for description, query, output_file in warehouse_queries:
-            self.execute_steampipe_query(description, query, output_file)
+        self.query_scheduler.run(warehouse_queries, self.execute_steampipe_query)
         
         # 빅데이터 처리 서비스 수집
         self.log_info("🚀 빅데이터 처리 서비스 수집 시작...")
         bigdata_queries = self.get_bigdata_queries()
-        for description, query, output_file in bigdata_queries:
-            self.execute_steampipe_query(description, query, output_file)
+        self.query_scheduler.run(bigdata_queries, self.execute_steampipe_query)
         
         # 결과 요약
         self.log_success("완전한 데이터베이스 리소스 데이터 수집 완료!")
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Steampipe 파생 데이터셋 레이어
+같은 테이블을 컬럼/조건만 바꿔 여러 번 조회하던 출력 파일을
+기준 쿼리(BaseDataset) 1회 실행 결과의 투영(컬럼 선택) 및 필터(DerivedOutput)로 선언하고
+기준 쿼리 결과 임시 파일을 한 행씩 읽어 생성 (결과 전체를 메모리에 올리지 않음)
+
+- 수집기는 get_derived_datasets()로 기준 쿼리와 파생 출력 파일 목록을 선언
+- plan_collection_tasks()가 기존 쿼리 목록에서 파생 파일에 해당하는 쿼리를 기준 쿼리 작업 하나로 대체
+- parse_simple_query()로 단순 select 쿼리를 테이블/컬럼/조건으로 분해해 파생 출력 선언에 재사용
+- STEAMPIPE_DERIVED_OUTPUTS=0 이면 기존처럼 파일별로 개별 쿼리 실행
+"""
+
+import os
+import re
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from steampipe_query_engine import project_result_file, read_result_columns
+
+DERIVED_OUTPUTS_ENV = "STEAMPIPE_DERIVED_OUTPUTS"
+
+
+class DerivedOutput(NamedTuple):
+    """기준 쿼리 결과에서 생성하는 출력 파일
+
+    columns: 선택할 컬럼 (원래 쿼리의 select 순서와 동일해야 함)
+    not_null: `<컬럼> is not null` 조건
+    where: `<컬럼> = <값>` 조건 (예: {"is_egress": False})
+    query: 기준 쿼리를 사용할 수 없을 때 개별 실행할 원래 쿼리
+    """
+    description: str
+    columns: List[str]
+    output_file: str
+    not_null: Optional[str] = None
+    where: Optional[Dict[str, Any]] = None
+    query: Optional[str] = None
+
+
+class SimpleQuery(NamedTuple):
+    """`select <컬럼> from <테이블> [where ...]` 형태 쿼리의 분해 결과"""
+    table: str
+    columns: List[str]
+    region: Optional[str] = None
+    not_null: Optional[str] = None
+    where: Optional[Dict[str, Any]] = None
+
+
+class BaseDataset(NamedTuple):
+    """한 번만 실행되는 기준 쿼리 (모든 파생 출력의 컬럼과 조건 컬럼을 포함해야 함)"""
+    description: str
+    query: str
+    outputs: List[DerivedOutput]
+
+
+SIMPLE_QUERY_PATTERN = re.compile(
+    r"^\s*select\s+(?P<columns>.+?)\s+from\s+(?P<table>\w+)(?:\s+where\s+(?P<where>.+?))?\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL
+)
+COLUMN_PATTERN = re.compile(r'^"?(\w+)"?$')
+EQUALS_CONDITION_PATTERN = re.compile(r"^(\w+)\s*=\s*(?:'((?:[^']|'')*)'|(true|false))$", re.IGNORECASE)
+NOT_NULL_CONDITION_PATTERN = re.compile(r"^(\w+)\s+is\s+not\s+null$", re.IGNORECASE)
+
+
+def parse_simple_query(query: str) -> Optional[SimpleQuery]:
+    """단순 select 쿼리를 분해 (함수, 별칭, 조인, or 조건 등이 있으면 None)
+
+    조건은 `<컬럼> = '<문자열>'`, `<컬럼> = true|false`, `<컬럼> is not null`의 and 조합만 지원하며
+    `region = '<리전>'` 조건은 region 필드로 분리
+    """
+    match = SIMPLE_QUERY_PATTERN.match(query)
+    if not match:
+        return None
+
+    columns = []
+    for column in match.group("columns").split(","):
+        column_match = COLUMN_PATTERN.match(column.strip())
+        if not column_match:
+            return None
+        columns.append(column_match.group(1))
+
+    region = None
+    not_null = None
+    where = {}
+    conditions = re.split(r"\s+and\s+", match.group("where").strip(), flags=re.IGNORECASE) if match.group("where") else []
+    for condition in conditions:
+        equals_match = EQUALS_CONDITION_PATTERN.match(condition.strip())
+        not_null_match = NOT_NULL_CONDITION_PATTERN.match(condition.strip())
+        if equals_match:
+            column, text, boolean = equals_match.groups()
+            if column == "region" and text is not None:
+                region = text.replace("''", "'")
+            elif text is not None:
+                where[column] = text.replace("''", "'")
+            else:
+                where[column] = boolean.lower() == "true"
+        elif not_null_match and not_null is None:
+            not_null = not_null_match.group(1)
+        else:
+            return None
+
+    return SimpleQuery(match.group("table").lower(), columns, region, not_null, where or None)
+
+
+def derived_outputs_enabled() -> bool:
+    """파생 데이터셋 모드 사용 여부 (기본값: 사용)"""
+    return os.environ.get(DERIVED_OUTPUTS_ENV, "1") != "0"
+
+
+def build_row_filter(output: DerivedOutput) -> Optional[Callable[[Dict[str, Any]], bool]]:
+    """파생 출력의 조건을 행 필터 함수로 변환"""
+    if not output.not_null and not output.where:
+        return None
+
+    conditions = dict(output.where or {})
+
+    def row_filter(row: Dict[str, Any]) -> bool:
+        if output.not_null and row.get(output.not_null) is None:
+            return False
+        return all(row.get(column) == value for column, value in conditions.items())
+
+    return row_filter
+
+
+def missing_columns(columns: Optional[List[Dict[str, str]]], output: DerivedOutput) -> List[str]:
+    """기준 쿼리 결과 컬럼 정의에 없는 파생 출력 컬럼 목록 (선언 오류 검출용, 컬럼 정의가 없으면 빈 목록)"""
+    if not columns:
+        return []
+    available = {column["name"] for column in columns}
+    required = list(output.columns) + ([output.not_null] if output.not_null else []) + list(output.where or {})
+    return [column for column in required if column not in available]
+
+
+def plan_collection_tasks(queries: Sequence[tuple], datasets: Sequence[BaseDataset],
+                          enabled: bool = None) -> List[tuple]:
+    """쿼리 목록 중 파생 출력 파일에 해당하는 쿼리를 기준 쿼리 작업으로 대체
+
+    반환되는 작업은 (설명, 쿼리, 출력 파일) 또는 (설명, 기준 쿼리, [DerivedOutput, ...]) 형태
+    """
+    if enabled is None:
+        enabled = derived_outputs_enabled()
+    if not enabled or not datasets:
+        return list(queries)
+
+    # 이 쿼리 목록에 있는 출력 파일만 기준 쿼리 작업으로 대체
+    original_queries = {output_file: query for _, query, output_file in queries}
+    tasks = []
+    derived_files = set()
+    for dataset in datasets:
+        outputs = [output if output.query else output._replace(query=original_queries[output.output_file])
+                   for output in dataset.outputs if output.output_file in original_queries]
+        if outputs:
+            tasks.append((dataset.description, dataset.query, outputs))
+            derived_files.update(output.output_file for output in outputs)
+    tasks.extend(query for query in queries if query[2] not in derived_files)
+    return tasks
+
+
+class DerivedDatasetMixin:
+    """수집기에서 기준 쿼리 1회 실행 후 파생 출력 파일들을 생성하는 기능
+
+    사용하는 수집기 속성: query_engine, report_dir, error_log, count_lock, total_count, success_count,
+    log_info/log_success/log_warning/log_error, execute_steampipe_query
+    """
+
+    # 이 크기(bytes)를 넘어야 데이터가 있는 것으로 판단
+    min_output_size = 100
+
+    def get_derived_datasets(self) -> List[BaseDataset]:
+        """수집기별 기준 쿼리 및 파생 출력 선언 (기본값: 없음)"""
+        return []
+
+    def plan_collection_tasks(self, queries: Sequence[tuple]) -> List[tuple]:
+        """쿼리 목록에 이 수집기의 파생 데이터셋 선언을 적용"""
+        return plan_collection_tasks(queries, self.get_derived_datasets())
+
+    def execute_collection_task(self, description: str, query: str, output) -> bool:
+        """스케줄러 작업 실행 (output이 목록이면 기준 쿼리 + 파생 출력)"""
+        if isinstance(output, list):
+            return self.execute_base_dataset(description, query, output)
+        return self.execute_steampipe_query(description, query, output)
+
+    def execute_base_dataset(self, description: str, query: str, outputs: List[DerivedOutput]) -> bool:
+        """기준 쿼리를 한 번 실행하고 결과를 나눠 파생 출력 파일 생성
+
+        기준 쿼리가 실패하거나 컬럼이 부족하면 원래 쿼리(DerivedOutput.query)가 있는 출력은 개별 실행
+        """
+        self.log_info(f"수집 중: {description} ({len(outputs)}개 파일)")
+
+        # 기준 쿼리 결과는 임시 파일에 행 단위로 기록하고 파생 출력마다 한 행씩 다시 읽음
+        base_path = self.report_dir / f".{outputs[0].output_file}.base.{os.getpid()}.tmp"
+        try:
+            return self.project_base_dataset(query, outputs, base_path)
+        finally:
+            base_path.unlink(missing_ok=True)
+
+    def project_base_dataset(self, query: str, outputs: List[DerivedOutput], base_path) -> bool:
+        """기준 쿼리를 base_path에 기록하고 파생 출력 파일 생성"""
+        try:
+            self.query_engine.run_query_to_file(query, base_path)
+            columns = read_result_columns(base_path)
+        except Exception as e:
+            # 타임아웃, 잘못된 JSON, 파일 오류 등도 스케줄러로 전파하지 않고 개별 쿼리로 대체
+            error = (getattr(e, "stderr", None) or str(e) or type(e).__name__).strip()
+            # 오류 로그에 추가 정보 기록
+            with open(self.error_log, 'a') as f:
+                f.write(f"\nQuery failed: {query}\n")
+                f.write(f"Error: {error}\n")
+
+            return all([self.execute_derived_fallback(output, error) for output in outputs])
+
+        all_success = True
+        for output in outputs:
+            missing = missing_columns(columns, output)
+            if missing:
+                all_success &= self.execute_derived_fallback(output, f"기준 쿼리에 없는 컬럼 {', '.join(missing)}")
+                continue
+
+            with self.count_lock:
+                self.total_count += 1
+
+            output_path = self.report_dir / output.output_file
+            try:
+                project_result_file(base_path, output_path, output.columns, build_row_filter(output))
+                file_size = output_path.stat().st_size
+            except Exception as e:
+                self.log_error(f"{output.description} 실패 - {output.output_file}: {e}")
+                all_success = False
+                continue
+
+            if file_size > self.min_output_size:
+                self.log_success(f"{output.description} 완료 ({output.output_file}, {file_size} bytes)")
+                with self.count_lock:
+                    self.success_count += 1
+            else:
+                self.log_warning(f"{output.description} - 데이터 없음 ({output.output_file}, {file_size} bytes)")
+                all_success = False
+
+        return all_success
+
+    def execute_derived_fallback(self, output: DerivedOutput, error: str) -> bool:
+        """기준 쿼리로 생성하지 못한 파생 출력을 원래 쿼리로 개별 수집"""
+        if output.query:
+            self.log_warning(f"{output.description} - 기준 쿼리 사용 불가, 개별 쿼리로 수집 ({error})")
+            return self.execute_steampipe_query(output.description, output.query, output.output_file)
+
+        with self.count_lock:
+            self.total_count += 1
+        error_msg = f"{output.description} 실패 - {output.output_file}"
+        if error:
+            error_msg += f": {error}"
+        self.log_error(error_msg)
+        return False
@@ -2,19 +2,46 @@
 """
 AWS IaC 분석 및 관리 리소스 데이터 수집 스크립트
 Shell 스크립트와 동일한 쿼리 구조 사용
+
+- CloudFormation 스택 리소스/이벤트는 iac_cloudformation_stacks.json의 모든 스택에 대해 병렬 수집
+  (동시 실행 수: IAC_STACK_CONCURRENCY, 기본값: 8)
+- 스택별 결과는 스택 이름을 키로 하나의 파일에 병합 (iac_cloudformation_resources.json, iac_cloudformation_events.json)
+- boto3가 설치되어 있으면 SDK 클라이언트 풀 페이지네이터로, 없으면 aws CLI 자동 페이지네이션으로 모든 페이지 수집
+- AWS 호출은 다른 수집기 프로세스와 공유하는 서비스/리전별 호출 예산(aws_rate_limiter.py) 안에서 실행
+- 명령마다 소요 시간, 바이트, 항목 수, 재시도, 종료 상태를 collection_telemetry 기록 파일에 남김
 """
 
 import subprocess
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Tuple
 from datetime import datetime, timedelta
 
+sys.path.append(str(Path(__file__).parent))
+from aws_sdk_client_pool import SDK_ERRORS, AWSClientPool, get_cli_option, json_default, resolve_backend
+from aws_rate_limiter import call_with_retry
+from collection_telemetry import measure_query, query_context
+from report_data_loader import load_report_data
+
+STACK_CONCURRENCY_ENV = "IAC_STACK_CONCURRENCY"
+DEFAULT_STACK_CONCURRENCY = 8
+
+# 스택별 수집 항목: (설명, aws CLI 명령, 응답의 목록 키, 출력 파일)
+STACK_DETAIL_COMMANDS = [
+    ("CloudFormation 스택 리소스", "list-stack-resources", "StackResourceSummaries", "iac_cloudformation_resources.json"),
+    ("CloudFormation 스택 이벤트", "describe-stack-events", "StackEvents", "iac_cloudformation_events.json"),
+]
+
 class SteampipeIaCCollector:
-    def __init__(self, region: str = "ap-northeast-2"):
+    def __init__(self, region: str = "ap-northeast-2", max_workers: int = None):
         self.region = region
+        if max_workers is None:
+            max_workers = int(os.environ.get(STACK_CONCURRENCY_ENV, DEFAULT_STACK_CONCURRENCY))
+        self.max_workers = max(1, max_workers)
+        self.client_pool = AWSClientPool(region) if resolve_backend() == "sdk" else None
         # 스크립트의 실제 위치를 기준으로 경로 설정
         script_dir = Path(__file__).parent
         project_root = script_dir.parent.parent
@@ -48,31 +75,36 @@ class SteampipeIaCCollector:
         self.total_count += 1
         
         try:
-            # 작업 디렉토리를 report_dir로 변경
-            os.chdir(self.report_dir)
-            
             # 특별한 명령어 처리
             if "echo" in command:
                 # echo 명령어는 직접 실행
-                result = subprocess.run(
+                run = lambda: subprocess.run(
                     command,
                     shell=True,
+                    cwd=self.report_dir,
                     capture_output=True,
                     text=True,
                     check=True
                 )
             else:
                 # AWS CLI 명령어 실행
-                result = subprocess.run(
+                run = lambda: subprocess.run(
                     command.split(),
+                    cwd=self.report_dir,
                     capture_output=True,
                     text=True,
                     check=True
                 )
-            
-            output_path = self.report_dir / output_file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(result.stdout)
+            # 다른 수집기와 공유하는 호출 예산 안에서 실행하고 스로틀링/일시적 오류는 백오프 후 재시도
+            parts = command.split()
+            with query_context(description=description, output=output_file), \
+                    measure_query(command, "aws-cli") as record:
+                result = call_with_retry(parts[1], get_cli_option(parts, "--region") or self.region, run)
+                
+                output_path = self.report_dir / output_file
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(result.stdout)
+                record["bytes"] = output_path.stat().st_size
             
             file_size = output_path.stat().st_size
             if file_size > 100:
@@ -110,20 +142,8 @@ class SteampipeIaCCollector:
                 f"aws cloudformation describe-stacks --region {self.region} --output json",
                 "iac_cloudformation_stacks.json"
             ),
-            
-            # CloudFormation 스택 리소스 (첫 번째 스택이 있는 경우)
-            (
-                "CloudFormation 스택 리소스",
-                f"aws cloudformation list-stack-resources --region {self.region} --stack-name dummy --output json 2>/dev/null || echo '[]'",
-                "iac_cloudformation_resources.json"
-            ),
-            
-            # CloudFormation 스택 이벤트
-            (
-                "CloudFormation 스택 이벤트",
-                f"aws cloudformation describe-stack-events --region {self.region} --stack-name dummy --output json 2>/dev/null || echo '[]'",
-                "iac_cloudformation_events.json"
-            ),
+
+            # CloudFormation 스택 리소스/이벤트는 collect_stack_details()에서 스택별로 수집
             
             # AWS Config
             (
@@ -198,6 +218,86 @@ class SteampipeIaCCollector:
             )
         ]
 
+    def get_stack_names(self) -> List[str]:
+        """iac_cloudformation_stacks.json의 스택 이름 목록"""
+        try:
+            data = load_report_data(self.report_dir / "iac_cloudformation_stacks.json")
+        except (json.JSONDecodeError, IOError) as e:
+            self.log_warning(f"CloudFormation 스택 목록을 읽을 수 없습니다: {e}")
+            return []
+        stacks = data.get("Stacks", []) if isinstance(data, dict) else []
+        return [stack["StackName"] for stack in stacks if stack.get("StackName")]
+
+    def fetch_stack_items(self, command: str, list_key: str, stack_name: str) -> List[Dict[str, Any]]:
+        """스택 하나의 모든 페이지를 병합한 목록 (SDK 페이지네이터 또는 aws CLI 자동 페이지네이션)"""
+        cli_command = ["aws", "cloudformation", command, "--region", self.region,
+                       "--stack-name", stack_name, "--output", "json"]
+        plugin = "aws-sdk" if self.client_pool is not None else "aws-cli"
+        with measure_query(" ".join(cli_command), plugin) as record:
+            if self.client_pool is not None:
+                result = self.client_pool.call_cli_command(cli_command)
+            else:
+                output = call_with_retry(
+                    "cloudformation", self.region,
+                    lambda: subprocess.run(cli_command, capture_output=True, text=True, check=True)
+                ).stdout
+                result = json.loads(output) if output.strip() else {}
+            items = result.get(list_key, [])
+            record.update(rows=len(items), bytes=len(json.dumps(items, default=json_default)))
+        return items
+
+    def fetch_stack_details(self, stack_name: str) -> Dict[str, Tuple[List[Dict[str, Any]], str]]:
+        """스택 하나의 출력 파일별 (항목 목록, 오류 메시지) - 성공하면 오류 메시지는 None"""
+        details = {}
+        for description, command, list_key, output_file in STACK_DETAIL_COMMANDS:
+            try:
+                # 스택별 기록은 출력 파일 대신 스택 이름이 포함된 설명으로 구분
+                with query_context(description=f"{description}: {stack_name}"):
+                    details[output_file] = (self.fetch_stack_items(command, list_key, stack_name), None)
+            except subprocess.CalledProcessError as e:
+                details[output_file] = ([], (e.stderr or "").strip() or f"exit code {e.returncode}")
+            except (json.JSONDecodeError, *SDK_ERRORS) as e:
+                details[output_file] = ([], str(e))
+            except OSError as e:
+                # aws 실행 파일이 없는 경우 등 - 다른 스택 수집은 계속
+                details[output_file] = ([], str(e) or type(e).__name__)
+        return details
+
+    def collect_stack_details(self):
+        """모든 CloudFormation 스택의 리소스/이벤트를 병렬 수집해 스택 이름을 키로 병합"""
+        stack_names = self.get_stack_names()
+        self.log_info(f"수집 중: CloudFormation 스택 리소스/이벤트 ({len(stack_names)}개 스택, 동시 {self.max_workers}개)")
+
+        merged = {output_file: {"Stacks": {}, "Errors": {}} for *_, output_file in STACK_DETAIL_COMMANDS}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for stack_name, details in zip(stack_names, executor.map(self.fetch_stack_details, stack_names)):
+                for output_file, (items, error) in details.items():
+                    if error is None:
+                        merged[output_file]["Stacks"][stack_name] = items
+                    else:
+                        merged[output_file]["Errors"][stack_name] = error
+
+        for description, command, _, output_file in STACK_DETAIL_COMMANDS:
+            self.total_count += 1
+            output = merged[output_file]
+            output_path = self.report_dir / output_file
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2, ensure_ascii=False, default=json_default)
+
+            if output["Errors"]:
+                with open(self.error_log, 'a') as f:
+                    for stack_name, error in output["Errors"].items():
+                        f.write(f"\nCommand failed: aws cloudformation {command} --stack-name {stack_name}\n")
+                        f.write(f"Error: {error}\n")
+                self.log_warning(f"{description} - {len(output['Errors'])}개 스택 실패")
+
+            item_count = sum(len(items) for items in output["Stacks"].values())
+            if item_count:
+                self.log_success(f"{description} 완료 ({output_file}, {len(output['Stacks'])}개 스택, {item_count}건)")
+                self.success_count += 1
+            else:
+                self.log_warning(f"{description} - 데이터 없음 ({output_file})")
+
     def collect_data(self):
         """데이터 수집 실행"""
         self.log_info("🏗️ Infrastructure as Code 분석 시작...")
@@ -206,6 +306,7 @@ class SteampipeIaCCollector:
         commands = self.get_iac_commands()
         for description, command, output_file in commands:
             self.execute_aws_command(description, command, output_file)
+        self.collect_stack_details()
         
         # 결과 요약
         self.log_success("IaC 분석 및 관리 리소스 데이터 수집 완료!")
@@ -13,18 +13,34 @@ import json
 import os
 import sys
 from datetime import datetime
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import time
 
+# 공용 Steampipe 쿼리 엔진 import
+sys.path.append(str(Path(__file__).parent))
+from steampipe_query_engine import StreamingResultWriter, get_query_engine, iter_result_rows, read_result_columns
+from steampipe_query_scheduler import QueryScheduler
+from steampipe_collection_manifest import CollectionManifest
+
 class MonitoringDataCollector:
-    def __init__(self):
+    def __init__(self, regions=None, multi_region: bool = False, report_dir: str = None):
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # 수집 대상 리전 (기본값: AWS_REGION 또는 ap-northeast-2) - 모든 쿼리에 리전 조건으로 적용
+        self.regions = list(regions) if regions else [os.getenv("AWS_REGION", "ap-northeast-2")]
+        # 멀티 리전 모드: 리전별로 병렬 수집해 리전 파티션과 병합 결과를 함께 저장
+        self.multi_region = multi_region and len(self.regions) > 1
         # 스크립트의 실제 위치를 기준으로 경로 설정
-        script_dir = Path(__file__).parent
-        project_root = script_dir.parent.parent
-        self.report_dir = project_root / "aws-arch-analysis" / "report"
+        if report_dir is None:
+            script_dir = Path(__file__).parent
+            project_root = script_dir.parent.parent
+            report_dir = str(project_root / "aws-arch-analysis" / "report")
+        self.report_dir = Path(report_dir)
+        self.partition_dir = self.report_dir / "monitoring_regions"
         self.create_output_directory()
+        self.query_engine = get_query_engine()
+        self.query_scheduler = QueryScheduler(manifest=CollectionManifest(self.report_dir))
+        # 쿼리 오류로 실패한 출력 파일 (데이터 없음과 구분해 병합 결과가 일부 리전만 포함하는지 판단)
+        self.failed_outputs = set()
         
     def create_output_directory(self):
         """출력 디렉토리 생성"""
@@ -35,142 +51,219 @@ class MonitoringDataCollector:
             print(f"❌ 디렉토리 생성 실패: {e}")
             sys.exit(1)
 
-    def run_steampipe_query(self, service_name, query):
-        """Steampipe 쿼리 실행 및 결과 저장"""
+    @staticmethod
+    def build_region_filter(regions):
+        """리전 목록을 쿼리 조건으로 변환"""
+        if len(regions) == 1:
+            return f"where region = '{regions[0]}'"
+        return f"where region in ({', '.join(repr(region) for region in regions)})"
+
+    @staticmethod
+    def get_output_filename(service_name):
+        """서비스 이름에 해당하는 출력 파일 이름"""
+        return f"monitoring_{service_name.lower().replace(' ', '_')}.json"
+
+    def get_partition_filename(self, service_name, region):
+        """리전 파티션 파일 경로 (리포트 디렉토리 기준)"""
+        return f"{self.partition_dir.name}/{region}/{self.get_output_filename(service_name)}"
+
+    def run_steampipe_query(self, service_name, query, output_file=None):
+        """Steampipe 쿼리 실행 및 결과 저장 (output_file은 리포트 디렉토리 기준 경로)"""
+        filename = self.report_dir / (output_file or self.get_output_filename(service_name))
+        output_dir = filename.parent
+        if output_dir != self.report_dir:
+            service_name = f"{service_name} [{output_dir.name}]"
         try:
             print(f"🔍 {service_name} 데이터 수집 중...")
             
-            # Steampipe 쿼리 실행
-            result = subprocess.run(
-                ['steampipe', 'query', query, '--output', 'json'],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            
-            if result.returncode == 0 and result.stdout.strip():
-                # JSON 파싱 시도
-                try:
-                    data = json.loads(result.stdout)
-                    if data and len(data) > 0:
-                        # 파일에 저장
-                        filename = self.report_dir / f"monitoring_{service_name.lower().replace(' ', '_')}.json"
-                        with open(filename, 'w', encoding='utf-8') as f:
-                            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-                        
-                        print(f"✅ {service_name}: {len(data)}개 항목 수집 완료")
-                        return True, len(data)
-                    else:
-                        print(f"⚠️  {service_name}: 데이터 없음")
-                        return False, 0
-                except json.JSONDecodeError as e:
-                    print(f"❌ {service_name}: JSON 파싱 오류 - {e}")
-                    return False, 0
-            else:
-                error_msg = result.stderr.strip() if result.stderr else "알 수 없는 오류"
+            # Steampipe 쿼리 실행 (결과를 메모리에 모으지 않고 행 단위로 임시 파일에 저장)
+            temp_filename = filename.with_name(f".{filename.name}.tmp")
+            try:
+                output_dir.mkdir(parents=True, exist_ok=True)
+                row_count = self.query_engine.run_query_to_file(query, temp_filename, timeout=60)
+            except subprocess.CalledProcessError as e:
+                error_msg = e.stderr.strip() if e.stderr else "알 수 없는 오류"
                 print(f"❌ {service_name}: 쿼리 실행 실패 - {error_msg}")
+                self.failed_outputs.add(output_file)
                 return False, 0
+            except json.JSONDecodeError as e:
+                print(f"❌ {service_name}: JSON 파싱 오류 - {e}")
+                self.failed_outputs.add(output_file)
+                return False, 0
+            
+            # 결과가 없으면 파일을 만들지 않고 실패로 처리
+            if row_count == 0:
+                temp_filename.unlink()
+                print(f"⚠️  {service_name}: 데이터 없음")
+                return False, 0
+            
+            os.replace(temp_filename, filename)
+            print(f"✅ {service_name}: {row_count}개 항목 수집 완료")
+            return True, row_count
                 
         except subprocess.TimeoutExpired:
             print(f"⏰ {service_name}: 쿼리 타임아웃 (60초)")
+            self.failed_outputs.add(output_file)
             return False, 0
         except Exception as e:
             print(f"❌ {service_name}: 예외 발생 - {e}")
+            self.failed_outputs.add(output_file)
             return False, 0
 
-    def get_monitoring_queries(self):
-        """모니터링 및 리소스 관리 서비스 쿼리 정의 (실제 사용 가능한 테이블 기반)"""
+    def get_monitoring_queries(self, regions):
+        """모니터링 및 리소스 관리 서비스 쿼리 정의 (실제 사용 가능한 테이블 기반, 리전 조건 포함)"""
+        region_filter = self.build_region_filter(regions)
         return {
             # CloudWatch 알람 (실제 테이블명: aws_cloudwatch_alarm)
-            "CloudWatch Alarms": "select name, arn, alarm_description, state_value, metric_name, namespace, statistic, threshold, comparison_operator, evaluation_periods, datapoints_to_alarm, treat_missing_data, alarm_actions, ok_actions, insufficient_data_actions, region, account_id from aws_cloudwatch_alarm;",
+            "CloudWatch Alarms": f"select name, arn, alarm_description, state_value, metric_name, namespace, statistic, threshold, comparison_operator, evaluation_periods, datapoints_to_alarm, treat_missing_data, alarm_actions, ok_actions, insufficient_data_actions, region, account_id from aws_cloudwatch_alarm {region_filter}",
             
             # CloudWatch 이벤트 규칙 (EventBridge)
-            "CloudWatch Event Rules": "select name, arn, description, event_pattern, schedule_expression, state, role_arn, managed_by, event_bus_name, targets, tags, region, account_id from aws_cloudwatch_event_rule;",
+            "CloudWatch Event Rules": f"select name, arn, description, event_pattern, schedule_expression, state, role_arn, managed_by, event_bus_name, targets, tags, region, account_id from aws_cloudwatch_event_rule {region_filter}",
             
             # CloudWatch Logs
-            "CloudWatch Log Groups": "select name, arn, creation_time, retention_in_days, stored_bytes, metric_filter_count, kms_key_id, tags, region, account_id from aws_cloudwatch_log_group;",
+            "CloudWatch Log Groups": f"select name, arn, creation_time, retention_in_days, stored_bytes, metric_filter_count, kms_key_id, tags, region, account_id from aws_cloudwatch_log_group {region_filter}",
             
-            "CloudWatch Log Streams": "select log_group_name, name, arn, creation_time, first_event_time, last_event_time, last_ingestion_time, upload_sequence_token, stored_bytes, region, account_id from aws_cloudwatch_log_stream;",
+            "CloudWatch Log Streams": f"select log_group_name, name, arn, creation_time, first_event_time, last_event_time, last_ingestion_time, upload_sequence_token, stored_bytes, region, account_id from aws_cloudwatch_log_stream {region_filter}",
             
-            "CloudWatch Log Metric Filters": "select name, log_group_name, filter_pattern, metric_transformations, creation_time, region, account_id from aws_cloudwatch_log_metric_filter;",
+            "CloudWatch Log Metric Filters": f"select name, log_group_name, filter_pattern, metric_transformations, creation_time, region, account_id from aws_cloudwatch_log_metric_filter {region_filter}",
             
-            "CloudWatch Log Subscription Filters": "select name, log_group_name, filter_pattern, destination_arn, role_arn, distribution, creation_time, region, account_id from aws_cloudwatch_log_subscription_filter;",
+            "CloudWatch Log Subscription Filters": f"select name, log_group_name, filter_pattern, destination_arn, role_arn, distribution, creation_time, region, account_id from aws_cloudwatch_log_subscription_filter {region_filter}",
             
-            "CloudWatch Log Destinations": "select destination_name, arn, role_arn, target_arn, access_policy, creation_time, region, account_id from aws_cloudwatch_log_destination;",
+            "CloudWatch Log Destinations": f"select destination_name, arn, role_arn, target_arn, access_policy, creation_time, region, account_id from aws_cloudwatch_log_destination {region_filter}",
             
-            "CloudWatch Log Resource Policies": "select policy_name, policy_document, last_updated_time, region, account_id from aws_cloudwatch_log_resource_policy;",
+            "CloudWatch Log Resource Policies": f"select policy_name, policy_document, last_updated_time, region, account_id from aws_cloudwatch_log_resource_policy {region_filter}",
             
             # CloudWatch 메트릭
-            "CloudWatch Metrics": "select metric_name, namespace, dimensions, region, account_id from aws_cloudwatch_metric;",
+            "CloudWatch Metrics": f"select metric_name, namespace, dimensions, region, account_id from aws_cloudwatch_metric {region_filter}",
             
             # CloudTrail
-            "CloudTrail Trails": "select name, arn, s3_bucket_name, s3_key_prefix, include_global_service_events, is_multi_region_trail, home_region, trail_arn, log_file_validation_enabled, cloud_watch_logs_log_group_arn, cloud_watch_logs_role_arn, kms_key_id, has_custom_event_selectors, has_insight_selectors, is_organization_trail, is_logging, latest_delivery_time, latest_notification_time, start_logging_time, stop_logging_time, tags, region, account_id from aws_cloudtrail_trail;",
+            "CloudTrail Trails": f"select name, arn, s3_bucket_name, s3_key_prefix, include_global_service_events, is_multi_region_trail, home_region, trail_arn, log_file_validation_enabled, cloud_watch_logs_log_group_arn, cloud_watch_logs_role_arn, kms_key_id, has_custom_event_selectors, has_insight_selectors, is_organization_trail, is_logging, latest_delivery_time, latest_notification_time, start_logging_time, stop_logging_time, tags, region, account_id from aws_cloudtrail_trail {region_filter}",
             
-            "CloudTrail Event Data Stores": "select arn, name, status, advanced_event_selectors, multi_region_enabled, organization_enabled, retention_period, termination_protection_enabled, kms_key_id, created_timestamp, updated_timestamp, region, account_id from aws_cloudtrail_event_data_store;",
+            "CloudTrail Event Data Stores": f"select arn, name, status, advanced_event_selectors, multi_region_enabled, organization_enabled, retention_period, termination_protection_enabled, kms_key_id, created_timestamp, updated_timestamp, region, account_id from aws_cloudtrail_event_data_store {region_filter}",
             
-            "CloudTrail Channels": "select arn, name, source, destinations, region, account_id from aws_cloudtrail_channel;",
+            "CloudTrail Channels": f"select arn, name, source, destinations, region, account_id from aws_cloudtrail_channel {region_filter}",
             
             # Config
-            "Config Configuration Recorders": "select name, role_arn, recording_group, status, region, account_id from aws_config_configuration_recorder;",
+            "Config Configuration Recorders": f"select name, role_arn, recording_group, status, region, account_id from aws_config_configuration_recorder {region_filter}",
             
-            "Config Delivery Channels": "select name, s3_bucket_name, s3_key_prefix, sns_topic_arn, region, account_id from aws_config_delivery_channel;",
+            "Config Delivery Channels": f"select name, s3_bucket_name, s3_key_prefix, sns_topic_arn, region, account_id from aws_config_delivery_channel {region_filter}",
             
-            "Config Rules": "select name, arn, rule_id, description, source, input_parameters, maximum_execution_frequency, state, created_by, region, account_id from aws_config_rule;",
+            "Config Rules": f"select name, arn, rule_id, description, source, input_parameters, maximum_execution_frequency, state, created_by, region, account_id from aws_config_rule {region_filter}",
             
-            "Config Conformance Packs": "select name, arn, conformance_pack_id, delivery_s3_bucket, delivery_s3_key_prefix, conformance_pack_input_parameters, last_update_requested_time, created_by, region, account_id from aws_config_conformance_pack;",
+            "Config Conformance Packs": f"select name, arn, conformance_pack_id, delivery_s3_bucket, delivery_s3_key_prefix, conformance_pack_input_parameters, last_update_requested_time, created_by, region, account_id from aws_config_conformance_pack {region_filter}",
             
-            "Config Aggregate Authorizations": "select authorized_account_id, authorized_aws_region, creation_time, region, account_id from aws_config_aggregate_authorization;",
+            "Config Aggregate Authorizations": f"select authorized_account_id, authorized_aws_region, creation_time, region, account_id from aws_config_aggregate_authorization {region_filter}",
             
-            "Config Retention Configurations": "select name, retention_period_in_days, region, account_id from aws_config_retention_configuration;",
+            "Config Retention Configurations": f"select name, retention_period_in_days, region, account_id from aws_config_retention_configuration {region_filter}",
             
             # Service Catalog
-            "Service Catalog Portfolios": "select id, arn, display_name, description, provider_name, created_time, tags, region, account_id from aws_servicecatalog_portfolio;",
+            "Service Catalog Portfolios": f"select id, arn, display_name, description, provider_name, created_time, tags, region, account_id from aws_servicecatalog_portfolio {region_filter}",
             
-            "Service Catalog Products": "select product_id, name, owner, short_description, type, distributor, has_default_path, support_description, support_email, support_url, created_time, tags, region, account_id from aws_servicecatalog_product;",
-            
-            "Service Catalog Provisioned Products": "select name, arn, id, type, provisioning_artifact_id, product_id, user_arn, user_arn_session, status, status_message, created_time, last_updated_time, last_record_id, last_provisioning_record_id, last_successful_provisioning_record_id, tags, region, account_id from aws_servicecatalog_provisioned_product;",
+            "Service Catalog Products": f"select product_id, name, owner, short_description, type, distributor, has_default_path, support_description, support_email, support_url, created_time, tags, region, account_id from aws_servicecatalog_product {region_filter}",
             
+            "Service Catalog Provisioned Products": f"select name, arn, id, type, provisioning_artifact_id, product_id, user_arn, user_arn_session, status, status_message, created_time, last_updated_time, last_record_id, last_provisioning_record_id, last_successful_provisioning_record_id, tags, region, account_id from aws_servicecatalog_provisioned_product {region_filter}"
+        }
+
+    def get_global_queries(self):
+        """리전과 무관한 글로벌 서비스 쿼리 (리전별로 나누지 않고 한 번만 실행)"""
+        return {
             # Organizations (권한 필요)
-            "Organizations Accounts": "select id, arn, email, name, status, joined_method, joined_timestamp, region, account_id from aws_organizations_account;",
+            "Organizations Accounts": "select id, arn, email, name, status, joined_method, joined_timestamp, region, account_id from aws_organizations_account",
             
-            "Organizations Organizational Units": "select id, arn, name, parent_id, region, account_id from aws_organizations_organizational_unit;",
+            "Organizations Organizational Units": "select id, arn, name, parent_id, region, account_id from aws_organizations_organizational_unit",
             
-            "Organizations Policies": "select id, arn, name, description, type, aws_managed, content, region, account_id from aws_organizations_policy;",
+            "Organizations Policies": "select id, arn, name, description, type, aws_managed, content, region, account_id from aws_organizations_policy",
             
-            "Organizations Policy Targets": "select policy_id, target_id, target_type, region, account_id from aws_organizations_policy_target;",
+            "Organizations Policy Targets": "select policy_id, target_id, target_type, region, account_id from aws_organizations_policy_target",
             
-            "Organizations Delegated Administrators": "select account_id, service_principal, delegation_enabled_date, region from aws_organizations_delegated_administrator;",
+            "Organizations Delegated Administrators": "select account_id, service_principal, delegation_enabled_date, region from aws_organizations_delegated_administrator",
             
-            "Organizations Root": "select id, arn, name, policy_types, region, account_id from aws_organizations_root;"
+            "Organizations Root": "select id, arn, name, policy_types, region, account_id from aws_organizations_root"
         }
 
+    def merge_region_partitions(self, service_name, regions, query, failed_regions=()):
+        """리전 파티션 파일들을 행 단위로 이어 붙여 리포트 디렉토리의 병합 결과 파일로 저장
+
+        단일 리전 수집과 같은 `steampipe query --output json` 형식이며 컬럼 정의는 첫 파티션 기준,
+        쿼리 오류로 빠진 리전이 있으면 경고하고 매니페스트에 일부만 수집된 출력으로 기록
+        """
+        start_time = time.time()
+        output_file = self.get_output_filename(service_name)
+        partition_files = [self.partition_dir / region / output_file for region in regions]
+        filename = self.report_dir / output_file
+        temp_filename = filename.with_name(f".{filename.name}.tmp")
+        try:
+            with StreamingResultWriter(temp_filename, read_result_columns(partition_files[0]) or []) as writer:
+                # 한 번에 행 하나만 메모리에 올림
+                for partition_file in partition_files:
+                    writer.write_rows(iter_result_rows(partition_file))
+            os.replace(temp_filename, filename)
+        finally:
+            temp_filename.unlink(missing_ok=True)
+
+        if failed_regions:
+            print(f"⚠️  {service_name}: 일부 리전 수집 실패 ({', '.join(failed_regions)}) - "
+                  f"병합 결과({output_file})에는 {', '.join(regions)} 리전만 포함")
+        self.query_scheduler.manifest.record(output_file, query, time.time() - start_time,
+                                             complete=not failed_regions)
+        return writer.row_count
+
     def collect_all_data(self):
         """모든 모니터링 데이터 병렬 수집"""
-        queries = self.get_monitoring_queries()
+        regional_queries = self.get_monitoring_queries(self.regions)
+        global_queries = self.get_global_queries()
+        queries = {**regional_queries, **global_queries}
         successful_collections = 0
         total_items = 0
         
         print(f"🚀 모니터링 및 리소스 관리 데이터 수집 시작 ({len(queries)}개 서비스)")
+        print(f"🌏 대상 리전: {', '.join(self.regions)}" + (" (멀티 리전 병렬 모드)" if self.multi_region else ""))
         print("=" * 80)
         
         start_time = time.time()
         
-        # 병렬 처리로 성능 향상
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            future_to_service = {
-                executor.submit(self.run_steampipe_query, service, query): service 
-                for service, query in queries.items()
-            }
-            
-            for future in as_completed(future_to_service):
-                service = future_to_service[future]
+        if self.multi_region:
+            # 리전별 쿼리를 하나의 작업 목록으로 만들어 병렬 실행 후 리전 파티션 병합
+            tasks = []
+            task_regions = []
+            for region in self.regions:
+                for service_name, query in self.get_monitoring_queries([region]).items():
+                    tasks.append((service_name, query, self.get_partition_filename(service_name, region)))
+                    task_regions.append(region)
+            tasks.extend((service_name, query, self.get_output_filename(service_name))
+                         for service_name, query in global_queries.items())
+            task_regions.extend([None] * len(global_queries))
+        else:
+            tasks = [(service_name, query, self.get_output_filename(service_name))
+                     for service_name, query in queries.items()]
+            task_regions = [None] * len(tasks)
+        
+        # 플러그인별 동시 실행 한도 내에서 병렬 처리 (증분 모드에서 최신 파일은 성공으로 처리)
+        results = self.query_scheduler.run(tasks, self.run_steampipe_query, skipped_result=(True, 0))
+        
+        service_results = {}
+        for task, region, (success, count) in zip(tasks, task_regions, results):
+            succeeded_regions, items = service_results.get(task[0], ([], 0))
+            if success:
+                succeeded_regions = succeeded_regions + [region]
+                items += count
+            service_results[task[0]] = (succeeded_regions, items)
+        
+        for service_name, (succeeded_regions, items) in service_results.items():
+            if not succeeded_regions:
+                continue
+            if self.multi_region and service_name in regional_queries:
+                failed_regions = [region for region in self.regions
+                                  if self.get_partition_filename(service_name, region) in self.failed_outputs]
                 try:
-                    success, count = future.result()
-                    if success:
-                        successful_collections += 1
-                        total_items += count
-                except Exception as e:
-                    print(f"❌ {service}: 처리 중 오류 - {e}")
+                    self.merge_region_partitions(service_name, succeeded_regions, regional_queries[service_name],
+                                                 failed_regions)
+                except (OSError, ValueError) as e:
+                    print(f"❌ {service_name}: 리전 파티션 병합 실패 - {e}")
+                    continue
+            successful_collections += 1
+            total_items += items
+        self.query_scheduler.manifest.save()
         
         end_time = time.time()
         execution_time = end_time - start_time
@@ -182,6 +275,8 @@ class MonitoringDataCollector:
         print(f"📦 총 수집 항목: {total_items:,}개")
         print(f"⏱️  실행 시간: {execution_time:.1f}초")
         print(f"📁 출력 디렉토리: {self.report_dir}")
+        if self.multi_region:
+            print(f"🗂️  리전별 파티션: {self.partition_dir}/<region>/")
         
         # 수집된 파일 목록
         if successful_collections > 0:
@@ -198,6 +293,23 @@ class MonitoringDataCollector:
 
 def main():
     """메인 실행 함수"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="AWS 모니터링 및 리소스 관리 서비스 데이터 수집")
+    parser.add_argument("--region", default=os.getenv("AWS_REGION", "ap-northeast-2"), help="AWS 리전")
+    parser.add_argument("--regions", help="수집 대상 리전 목록 (쉼표 구분, 기본값: --region)")
+    parser.add_argument("--multi-region", action="store_true",
+                        help="리전별 병렬 수집 후 리전 파티션과 병합 결과를 함께 저장")
+    # 스크립트의 실제 위치를 기준으로 기본 경로 설정
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent.parent
+    default_report_dir = str(project_root / "aws-arch-analysis" / "report")
+    
+    parser.add_argument("--report-dir", default=os.getenv("REPORT_DIR", default_report_dir), help="보고서 디렉토리")
+    
+    args = parser.parse_args()
+    regions = [region.strip() for region in args.regions.split(",") if region.strip()] if args.regions else [args.region]
+    
     print("🔍 AWS 모니터링 및 리소스 관리 서비스 데이터 수집기")
     print("=" * 80)
     
@@ -214,7 +326,7 @@ def main():
         sys.exit(1)
     
     # 데이터 수집 실행
-    collector = MonitoringDataCollector()
+    collector = MonitoringDataCollector(regions, args.multi_region, args.report_dir)
     successful_collections, total_items = collector.collect_all_data()
     
     if successful_collections == 0:
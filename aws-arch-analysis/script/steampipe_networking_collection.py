@@ -6,11 +6,22 @@ Shell 스크립트와 동일한 기능 및 출력 형식 제공 - 모든 네트
 
 import os
 import subprocess
+import threading
+import sys
 import glob
 from pathlib import Path
 from typing import List, Tuple
 
-class SteampipeNetworkingCollector:
+# 공용 Steampipe 쿼리 엔진 import
+sys.path.append(str(Path(__file__).parent))
+from steampipe_query_engine import get_query_engine
+from steampipe_derived_datasets import BaseDataset, DerivedDatasetMixin, DerivedOutput
+from steampipe_query_scheduler import QueryScheduler
+from steampipe_collection_manifest import CollectionManifest
+
+class SteampipeNetworkingCollector(DerivedDatasetMixin):
+    min_output_size = 50
+    
     def __init__(self, region: str = "ap-northeast-2", report_dir: str = None):
         # 스크립트의 실제 위치를 기준으로 경로 설정
         if report_dir is None:
@@ -20,6 +31,9 @@ class SteampipeNetworkingCollector:
         self.region = region
         self.report_dir = Path(report_dir)
         self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.query_engine = get_query_engine()
+        self.query_scheduler = QueryScheduler(manifest=CollectionManifest(self.report_dir))
+        self.count_lock = threading.Lock()  # 병렬 쿼리 실행 시 카운터 동기화용
         
         self.log_file = self.report_dir / "steampipe_networking_collection.log"
         self.error_log = self.report_dir / "steampipe_networking_errors.log"
@@ -69,27 +83,19 @@ class SteampipeNetworkingCollector:
 
     def execute_steampipe_query(self, description: str, query: str, output_file: str) -> bool:
         self.log_info(f"수집 중: {description}")
-        self.total_count += 1
+        with self.count_lock:
+            self.total_count += 1
         
         try:
-            # 작업 디렉토리를 report_dir로 변경
-            os.chdir(self.report_dir)
-            
-            result = subprocess.run(
-                ["steampipe", "query", query, "--output", "json"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
+            # 결과를 메모리에 모으지 않고 행 단위로 파일에 기록
             output_path = self.report_dir / output_file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(result.stdout)
+            row_count = self.query_engine.run_query_to_file(query, output_path)
             
             file_size = output_path.stat().st_size
             if file_size > 50:
-                self.log_success(f"{description} 완료 ({output_file}, {file_size} bytes)")
-                self.success_count += 1
+                self.log_success(f"{description} 완료 ({output_file}, {row_count}개 행, {file_size} bytes)")
+                with self.count_lock:
+                    self.success_count += 1
                 return True
             else:
                 self.log_warning(f"{description} - 데이터 없음 ({output_file}, {file_size} bytes)")
@@ -109,6 +115,19 @@ class SteampipeNetworkingCollector:
             
             return False
 
+    def get_derived_datasets(self) -> List[BaseDataset]:
+        """보안 그룹 규칙을 한 번만 조회하고 인바운드/아웃바운드 파일로 분리"""
+        return [
+            BaseDataset(
+                "보안 그룹 규칙 단일 스캔",
+                f"select security_group_rule_id, group_id, is_egress, type, ip_protocol, from_port, to_port, cidr_ipv4, cidr_ipv6, description, referenced_user_id, referenced_vpc_id, prefix_list_id from aws_vpc_security_group_rule where region = '{self.region}'",
+                [
+                    DerivedOutput("보안 그룹 인바운드 규칙", ["security_group_rule_id", "group_id", "is_egress", "type", "ip_protocol", "from_port", "to_port", "cidr_ipv4", "cidr_ipv6", "description", "referenced_user_id", "referenced_vpc_id", "prefix_list_id"], "security_groups_ingress_rules.json", where={"is_egress": False}),
+                    DerivedOutput("보안 그룹 아웃바운드 규칙", ["security_group_rule_id", "group_id", "is_egress", "type", "ip_protocol", "from_port", "to_port", "cidr_ipv4", "cidr_ipv6", "description", "referenced_user_id", "referenced_vpc_id", "prefix_list_id"], "security_groups_egress_rules.json", where={"is_egress": True})
+                ]
+            )
+        ]
+
     def get_networking_queries(self) -> List[Tuple[str, str, str]]:
         """실제 Steampipe 스키마에 맞춘 완전한 쿼리 구조"""
         return [
@@ -309,9 +328,8 @@ class SteampipeNetworkingCollector:
         
         self.log_info("📡 네트워킹 리소스 수집 시작...")
         
-        queries = self.get_networking_queries()
-        for description, query, output_file in queries:
-            self.execute_steampipe_query(description, query, output_file)
+        queries = self.plan_collection_tasks(self.get_networking_queries())
+        self.query_scheduler.run(queries, self.execute_collection_task)
         
         self.log_success("네트워킹 리소스 데이터 수집 완료!")
         self.log_info(f"성공: {self.success_count}/{self.total_count}")
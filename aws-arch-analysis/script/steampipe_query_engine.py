@@ -0,0 +1,702 @@
+#!/usr/bin/env python3
+"""
+Steampipe 공용 쿼리 엔진
+`steampipe service`를 한 번만 기동하고 Postgres 연결 풀을 통해 모든 수집기의 쿼리를 실행
+
+- STEAMPIPE_DATABASE_URL 환경 변수가 있으면 해당 DB에 바로 연결 (collect_all_data.py 또는 로컬 Postgres)
+- 없으면 `steampipe service start`로 서비스를 기동하고, 직접 기동한 경우에만 종료 시 정리
+- psycopg2가 없거나 서비스 연결에 실패하면 기존 `steampipe query --output json` CLI 방식으로 동작
+- STEAMPIPE_QUERY_CACHE_DIR가 있으면 같은 실행(run) 안의 모든 수집기 프로세스가 정규화된 SQL 기준으로 결과를 공유
+- 쿼리 실행마다 소요 시간, 바이트, 행 수, 재시도, 종료 상태를 collection_telemetry 기록 파일에 남김
+- run_query_to_file()은 결과 전체를 문자열로 모으지 않고 행 단위로 파일에 기록 (서버 측 커서 또는 CLI 출력 직접 저장)
+- read_result_columns()/iter_result_rows()는 결과 파일을 한 줄씩 읽어 컬럼 정의와 행을 하나씩 반환
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import psycopg2
+    import psycopg2.extensions
+    import psycopg2.pool
+except ImportError:
+    psycopg2 = None
+
+from collection_telemetry import measure_query, note
+from steampipe_query_scheduler import detect_plugin, run_with_backoff
+
+DATABASE_URL_ENV = "STEAMPIPE_DATABASE_URL"
+POOL_SIZE_ENV = "STEAMPIPE_POOL_SIZE"
+QUERY_CACHE_DIR_ENV = "STEAMPIPE_QUERY_CACHE_DIR"
+STREAM_BATCH_SIZE_ENV = "STEAMPIPE_STREAM_BATCH_SIZE"
+
+# Postgres 타입 OID -> `steampipe query --output json`의 data_type 표기
+PG_TYPE_NAMES = {
+    16: "BOOL",
+    20: "INT8",
+    21: "INT2",
+    23: "INT4",
+    25: "TEXT",
+    114: "JSON",
+    650: "CIDR",
+    700: "FLOAT4",
+    701: "FLOAT8",
+    869: "INET",
+    1009: "_TEXT",
+    1043: "VARCHAR",
+    1082: "DATE",
+    1114: "TIMESTAMP",
+    1184: "TIMESTAMPTZ",
+    1700: "NUMERIC",
+    2950: "UUID",
+    3802: "JSONB",
+}
+
+
+def _json_default(value: Any):
+    """Postgres 값을 Steampipe JSON 출력과 같은 표기로 변환"""
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).decode("utf-8", errors="replace")
+    return str(value)
+
+
+def _encode_json(value: Any, sort_keys: bool = False) -> str:
+    """Steampipe(Go json 인코더)와 같은 들여쓰기/이스케이프로 값 하나를 직렬화
+
+    행은 Go의 map으로 출력되므로 sort_keys=True로 (중첩 객체 포함) 키를 정렬
+    """
+    text = json.dumps(value, indent=1, ensure_ascii=False, sort_keys=sort_keys, default=_json_default)
+    # Go json 인코더와 동일하게 HTML 특수 문자와 줄/문단 구분 문자 이스케이프
+    return (text.replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+            .replace("\u2028", "\\u2028").replace("\u2029", "\\u2029"))
+
+
+def _encode_rows(rows: List[Dict[str, Any]]) -> str:
+    """행 목록만 출력하는 형태(JSON 배열)의 직렬화"""
+    return _encode_json(rows, sort_keys=True) + "\n"
+
+
+class StreamingResultWriter:
+    """`steampipe query --output json`과 같은 형태의 JSON을 행 단위로 파일에 기록
+
+    format_query_output()과 같은 내용을 만들지만 전체 행 목록을 메모리에 두지 않음
+    """
+
+    def __init__(self, path, columns: List[Dict[str, str]]):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.row_count = 0
+        columns_text = _encode_json(columns).replace("\n", "\n ")
+        self.file.write(f'{{\n "columns": {columns_text},\n "rows": [')
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.file.write(",\n  " if self.row_count else "\n  ")
+            self.file.write(_encode_json(row, sort_keys=True).replace("\n", "\n  "))
+            self.row_count += 1
+
+    def close(self):
+        self.file.write("\n ]\n}\n" if self.row_count else "]\n}\n")
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+
+
+def count_result_rows(path) -> int:
+    """`steampipe query --output json` 결과 파일의 행 수 (한 줄씩 읽어 메모리 사용량 일정)
+
+    들여쓰기된 출력이 아니거나 끝이 잘린 경우 파일 전체를 파싱하며,
+    JSON이 아니거나 형식이 다르면(rows 없음 등) ValueError 발생
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first_line = f.readline().rstrip("\n")
+        if first_line in ("{", "["):
+            # 행 객체는 {"rows": [...]} 형태에서 2칸, 목록 형태에서 1칸 들여쓰기로 시작
+            row_start = "  {" if first_line == "{" else " {"
+            closing = "}" if first_line == "{" else "]"
+            in_rows = first_line == "["
+            rows = 0
+            last_line = first_line
+            for line in f:
+                line = line.rstrip("\n")
+                if line:
+                    last_line = line
+                if not in_rows:
+                    in_rows = line.startswith(' "rows": [')
+                elif line == row_start:
+                    rows += 1
+            if in_rows and last_line == closing:
+                return rows
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict) and isinstance(data.get("rows"), list):
+        return len(data["rows"])
+    if isinstance(data, list):
+        return len(data)
+    raise ValueError(f"예상하지 못한 결과 형식: {path}")
+
+
+def _iter_result_items(path) -> Iterator[Any]:
+    """결과 파일의 컬럼 정의(행 목록만 있는 형태면 None)와 행들을 차례로 반환
+
+    들여쓰기된 출력(StreamingResultWriter, `steampipe query --output json`)은 행 하나씩 파싱하고,
+    그 밖의 JSON은 파일 전체를 파싱하며, 형식이 다르거나 끝이 잘린 경우 ValueError 발생
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        first_line = f.readline().rstrip("\n")
+        if first_line not in ("{", "["):
+            f.seek(0)
+            data = json.load(f)
+            if isinstance(data, dict) and isinstance(data.get("rows"), list):
+                yield data.get("columns") or []
+                yield from data["rows"]
+                return
+            if isinstance(data, list):
+                yield None
+                yield from data
+                return
+            raise ValueError(f"예상하지 못한 결과 형식: {path}")
+
+        if first_line == "[":
+            yield None
+            indent, rows_end = " ", "]"
+        else:
+            line = f.readline().rstrip("\n")
+            if line == ' "columns": [],':
+                yield []
+            elif line == ' "columns": [':
+                column_lines = []
+                for line in f:
+                    line = line.rstrip("\n")
+                    if line == " ],":
+                        break
+                    column_lines.append(line)
+                else:
+                    raise ValueError(f"컬럼 정의가 끝나지 않은 결과 파일: {path}")
+                yield json.loads("[" + "\n".join(column_lines) + "]")
+            else:
+                raise ValueError(f"예상하지 못한 결과 형식: {path}")
+            line = f.readline().rstrip("\n")
+            if line == ' "rows": []':
+                return
+            if line != ' "rows": [':
+                raise ValueError(f"예상하지 못한 결과 형식: {path}")
+            indent, rows_end = "  ", " ]"
+
+        # 행 객체는 indent 위치의 "{"로 시작해 같은 위치의 "}" 또는 "},"로 끝남 (중첩 객체는 더 깊게 들여쓰기)
+        row_lines = None
+        for line in f:
+            line = line.rstrip("\n")
+            if row_lines is not None:
+                if line in (indent + "}", indent + "},"):
+                    row_lines.append("}")
+                    yield json.loads("\n".join(row_lines))
+                    row_lines = None
+                else:
+                    row_lines.append(line)
+            elif line == indent + "{":
+                row_lines = ["{"]
+            elif line in (indent + "{}", indent + "{},"):
+                yield {}
+            elif line == rows_end:
+                return
+            else:
+                raise ValueError(f"예상하지 못한 결과 형식: {path}")
+        raise ValueError(f"끝이 잘린 결과 파일: {path}")
+
+
+def read_result_columns(path) -> Optional[List[Dict[str, str]]]:
+    """결과 파일의 컬럼 정의 (행 목록만 있는 형태면 None, 들여쓰기된 출력은 행을 읽지 않음)"""
+    items = _iter_result_items(path)
+    try:
+        return next(items)
+    except StopIteration:
+        raise ValueError(f"빈 결과 파일: {path}")
+    finally:
+        items.close()
+
+
+def iter_result_rows(path) -> Iterator[Dict[str, Any]]:
+    """결과 파일의 행을 하나씩 반환 (들여쓰기된 출력은 메모리 사용량이 행 하나 크기로 일정)"""
+    items = _iter_result_items(path)
+    next(items, None)
+    yield from items
+
+
+def _count_output_rows(path, query: str) -> int:
+    """결과 파일의 행 수 (형식이 잘못된 출력은 쿼리 실패로 처리)"""
+    try:
+        return count_result_rows(path)
+    except ValueError as e:
+        raise subprocess.CalledProcessError(1, query, output="", stderr=f"Error: 잘못된 쿼리 결과 - {e}")
+
+
+def format_query_output(columns: List[Dict[str, str]], rows: List[Dict[str, Any]]) -> str:
+    """`steampipe query --output json`과 동일한 형태의 JSON 문자열 생성 (StreamingResultWriter와 같은 바이트)"""
+    columns_text = _encode_json(columns).replace("\n", "\n ")
+    if not rows:
+        return f'{{\n "columns": {columns_text},\n "rows": []\n}}\n'
+    rows_text = ",\n  ".join(_encode_json(row, sort_keys=True).replace("\n", "\n  ") for row in rows)
+    return f'{{\n "columns": {columns_text},\n "rows": [\n  {rows_text}\n ]\n}}\n'
+
+
+
+def project_query_output(result: Any, columns: List[str],
+                         row_filter: Optional[Callable[[Dict[str, Any]], bool]] = None) -> str:
+    """파싱된 쿼리 결과에서 조건에 맞는 행의 일부 컬럼만 선택한 JSON 문자열 생성
+
+    `select <columns> from ... where <조건>`을 직접 실행한 결과와 같은 형태로 출력
+    """
+    if isinstance(result, dict):
+        rows = result.get("rows") or []
+        column_defs = {column["name"]: column for column in result.get("columns") or []}
+    else:
+        rows = result or []
+        column_defs = {}
+
+    if row_filter:
+        rows = [row for row in rows if row_filter(row)]
+    rows = [{name: row.get(name) for name in columns} for row in rows]
+
+    if not isinstance(result, dict):
+        return _encode_rows(rows)
+    projected_columns = [column_defs.get(name, {"name": name, "data_type": "TEXT"}) for name in columns]
+    return format_query_output(projected_columns, rows)
+
+
+def project_result_file(source_path, output_path, columns: List[str],
+                        row_filter: Optional[Callable[[Dict[str, Any]], bool]] = None) -> int:
+    """결과 파일에서 조건에 맞는 행의 일부 컬럼만 선택해 output_path에 기록하고 행 수 반환
+
+    project_query_output()과 같은 바이트를 만들지만 결과 파일을 한 행씩 읽어 메모리 사용량이 일정
+    (행 목록만 있는 형태의 결과는 전체를 읽어 project_query_output() 사용)
+    """
+    column_defs = read_result_columns(source_path)
+    if column_defs is None:
+        with open(source_path, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        Path(output_path).write_text(project_query_output(result, columns, row_filter), encoding='utf-8')
+        return count_result_rows(output_path)
+
+    column_defs = {column["name"]: column for column in column_defs}
+    projected_columns = [column_defs.get(name, {"name": name, "data_type": "TEXT"}) for name in columns]
+    with StreamingResultWriter(output_path, projected_columns) as writer:
+        writer.write_rows({name: row.get(name) for name in columns} for row in iter_result_rows(source_path)
+                          if row_filter is None or row_filter(row))
+    return writer.row_count
+
+
+def get_service_database_url() -> Optional[str]:
+    """실행 중인 Steampipe 서비스의 연결 문자열 조회"""
+    try:
+        result = subprocess.run(
+            ["steampipe", "service", "status", "--show-password"],
+            capture_output=True,
+            text=True,
+            timeout=30
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+
+    match = re.search(r"Connection string:\s*(\S+)", result.stdout)
+    return match.group(1) if match else None
+
+
+def start_service() -> Tuple[Optional[str], bool]:
+    """Steampipe 서비스 기동 후 (연결 문자열, 새로 기동 여부) 반환"""
+    database_url = get_service_database_url()
+    if database_url:
+        return database_url, False
+
+    try:
+        subprocess.run(
+            ["steampipe", "service", "start"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=120
+        )
+    except (FileNotFoundError, subprocess.CalledProcessError, subprocess.TimeoutExpired):
+        return None, False
+
+    return get_service_database_url(), True
+
+
+def stop_service():
+    """Steampipe 서비스 종료"""
+    try:
+        subprocess.run(["steampipe", "service", "stop"], capture_output=True, text=True, timeout=60)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키용 SQL 정규화 (문자열 리터럴 밖의 공백 축소 및 소문자화, 끝의 세미콜론 제거)"""
+    parts = re.split(r"('(?:[^']|'')*')", query.strip().rstrip(";").strip())
+    normalized = []
+    for i, part in enumerate(parts):
+        if i % 2 == 1:
+            normalized.append(part)
+        else:
+            normalized.append(re.sub(r"\s+", " ", part).lower())
+    return "".join(normalized).strip()
+
+
+class QueryResultCache:
+    """실행(run) 범위의 프로세스 간 쿼리 결과 캐시
+
+    정규화된 SQL의 해시로 결과 파일을 저장하며, 다른 프로세스가 같은 쿼리를 실행 중이면
+    잠금 파일이 사라지거나 결과가 기록될 때까지 기다린 뒤 결과를 재사용
+    """
+
+    def __init__(self, cache_dir, wait_timeout: float = 900, poll_interval: float = 0.5):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+
+    def get_or_run(self, query: str, run: Callable[[], str]) -> str:
+        """캐시된 결과 문자열 반환 (없으면 실행 후 저장)"""
+        result_path, _ = self.get_or_create(query, lambda path: path.write_text(run(), encoding="utf-8"))
+        if result_path is None:
+            return run()
+        return result_path.read_text(encoding="utf-8")
+
+    def get_or_run_to_file(self, query: str, output_path: Path, run_to_file: Callable[[Path], int]) -> int:
+        """캐시된 결과 파일을 output_path로 복사하고 행 수 반환 (없으면 캐시 파일로 실행 후 복사)"""
+        result_path, row_count = self.get_or_create(query, run_to_file)
+        if result_path is None:
+            return run_to_file(output_path)
+        shutil.copyfile(result_path, output_path)
+        return _count_output_rows(output_path, query) if row_count is None else row_count
+
+    def get_or_create(self, query: str, produce: Callable[[Path], Any]) -> Tuple[Optional[Path], Any]:
+        """쿼리 결과 캐시 파일 경로와 (직접 생성한 경우) produce 반환값
+
+        produce(path)는 결과를 path에 기록하며, 대기 시간을 넘기면 (None, None) 반환
+        """
+        key = hashlib.sha256(normalize_query(query).encode("utf-8")).hexdigest()
+        result_path = self.cache_dir / f"{key}.json"
+        lock_path = self.cache_dir / f"{key}.lock"
+        deadline = time.time() + self.wait_timeout
+
+        while True:
+            if result_path.exists():
+                return result_path, None
+
+            try:
+                fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._is_stale(lock_path):
+                    _remove_file(lock_path)
+                elif time.time() > deadline:
+                    # 너무 오래 기다린 경우 직접 실행
+                    return None, None
+                else:
+                    time.sleep(self.poll_interval)
+                continue
+
+            temp_path = self.cache_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                value = produce(temp_path)
+                os.replace(temp_path, result_path)
+                return result_path, value
+            finally:
+                # 실패한 경우 결과 없이 잠금만 해제되어 대기 중인 프로세스가 직접 실행
+                _remove_file(temp_path)
+                _remove_file(lock_path)
+
+    @staticmethod
+    def _is_stale(lock_path: Path) -> bool:
+        """잠금을 잡은 프로세스가 종료되었는지 확인"""
+        try:
+            pid = int(lock_path.read_text() or "0")
+        except (OSError, ValueError):
+            return False
+        if pid <= 0:
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+        return False
+
+
+def _remove_file(path: Path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class SteampipeQueryEngine:
+    """Steampipe 서비스 연결 풀 기반 쿼리 실행기 (스레드 안전)"""
+
+    def __init__(self, pool_size: int = None, database_url: str = None, cache_dir: str = None):
+        self.pool_size = pool_size or int(os.environ.get(POOL_SIZE_ENV, "8"))
+        self.database_url = database_url or os.environ.get(DATABASE_URL_ENV)
+        cache_dir = cache_dir or os.environ.get(QUERY_CACHE_DIR_ENV)
+        self.result_cache = QueryResultCache(cache_dir) if cache_dir else None
+        self.pool = None
+        self.started_service = False
+        self.started = False
+        self.lock = threading.Lock()
+        # ThreadedConnectionPool은 연결이 모두 사용 중이면 대기하지 않고 예외를 발생시키므로 세마포어로 대기
+        self.pool_slots = threading.BoundedSemaphore(self.pool_size)
+        self.stream_batch_size = int(os.environ.get(STREAM_BATCH_SIZE_ENV, "1000"))
+
+    @property
+    def uses_service(self) -> bool:
+        return self.pool is not None
+
+    def start(self) -> bool:
+        """연결 풀 초기화 (실패 시 CLI 방식으로 동작하며 False 반환)"""
+        with self.lock:
+            if self.started:
+                return self.uses_service
+            self.started = True
+
+            if psycopg2 is None:
+                return False
+
+            if not self.database_url:
+                self.database_url, self.started_service = start_service()
+                if not self.database_url:
+                    return False
+
+            try:
+                # 서버 기본 인코딩과 관계없이 한글 등 비ASCII 쿼리/결과를 주고받도록 UTF-8 고정
+                self.pool = psycopg2.pool.ThreadedConnectionPool(1, self.pool_size, self.database_url,
+                                                                 client_encoding="UTF8")
+            except psycopg2.Error:
+                self.pool = None
+                if self.started_service:
+                    stop_service()
+                    self.started_service = False
+                return False
+
+            return True
+
+    def close(self):
+        """연결 풀 정리 및 직접 기동한 서비스 종료"""
+        with self.lock:
+            if self.pool is not None:
+                self.pool.closeall()
+                self.pool = None
+            if self.started_service:
+                stop_service()
+                self.started_service = False
+
+    def run_query(self, query: str, timeout: Optional[int] = None) -> str:
+        """쿼리 실행 후 `steampipe query --output json`과 동일한 JSON 문자열 반환
+
+        스로틀링/일시적 오류는 백오프 후 재시도하며,
+        실패 시 subprocess.CalledProcessError, 타임아웃 시 subprocess.TimeoutExpired 발생
+        """
+        with measure_query(query, detect_plugin(query)) as record:
+            # 캐시에서 가져오면 _execute가 호출되지 않아 cached=True로 남음
+            record["cached"] = self.result_cache is not None
+            if self.result_cache is not None:
+                result = self.result_cache.get_or_run(query, lambda: self._execute(query, timeout))
+            else:
+                result = self._execute(query, timeout)
+            record["bytes"] = len(result.encode("utf-8"))
+            return result
+
+    def _execute(self, query: str, timeout: Optional[int] = None) -> str:
+        self.start()
+        note(cached=False)
+        if not self.uses_service:
+            return run_with_backoff(query, lambda: self._run_cli(query, timeout), self._error_message)
+
+        return run_with_backoff(query, lambda: self._run_pooled(query, timeout), self._error_message)
+
+    def run_query_to_file(self, query: str, output_path, timeout: Optional[int] = None) -> int:
+        """쿼리 결과를 행 단위로 output_path에 기록하고 행 수 반환
+
+        결과 전체를 메모리에 두지 않으므로 결과 크기와 관계없이 메모리 사용량이 일정하며,
+        실패 시 기존 파일은 그대로 두고 run_query()와 같은 예외 발생
+        """
+        output_path = Path(output_path)
+        with measure_query(query, detect_plugin(query)) as record:
+            record["cached"] = self.result_cache is not None
+            if self.result_cache is not None:
+                row_count = self.result_cache.get_or_run_to_file(
+                    query, output_path, lambda path: self._execute_to_file(query, path, timeout)
+                )
+            else:
+                row_count = self._execute_to_file(query, output_path, timeout)
+            record.update(rows=row_count, bytes=output_path.stat().st_size)
+            return row_count
+
+    def _execute_to_file(self, query: str, output_path: Path, timeout: Optional[int] = None) -> int:
+        self.start()
+        note(cached=False)
+        run = self._run_pooled_to_file if self.uses_service else self._run_cli_to_file
+        # 완료된 결과만 출력 파일로 교체
+        temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            row_count = run_with_backoff(query, lambda: run(query, temp_path, timeout), self._error_message)
+            os.replace(temp_path, output_path)
+            return row_count
+        finally:
+            _remove_file(temp_path)
+
+    @staticmethod
+    def _error_message(error: Exception) -> str:
+        return getattr(error, "stderr", None) or str(error)
+
+    def _run_pooled(self, query: str, timeout: Optional[int] = None) -> str:
+        """연결 풀에서 연결을 빌려 쿼리 실행"""
+        with self.pool_slots:
+            return self._run_on_connection(query, timeout)
+
+    def _run_on_connection(self, query: str, timeout: Optional[int] = None) -> str:
+        connection = self.pool.getconn()
+        discard = False
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                if timeout:
+                    cursor.execute(f"set statement_timeout = {int(timeout * 1000)}")
+                try:
+                    cursor.execute(query)
+                finally:
+                    if timeout:
+                        cursor.execute("set statement_timeout = 0")
+                columns, rows = self._fetch_result(cursor)
+            note(rows=len(rows))
+            return format_query_output(columns, rows)
+        except psycopg2.extensions.QueryCanceledError:
+            raise subprocess.TimeoutExpired(query, timeout)
+        except psycopg2.Error as e:
+            discard = connection.closed != 0
+            raise subprocess.CalledProcessError(1, query, output="", stderr=f"Error: {str(e).strip()}")
+        finally:
+            self.pool.putconn(connection, close=discard)
+
+    def _run_pooled_to_file(self, query: str, output_path: Path, timeout: Optional[int] = None) -> int:
+        """연결 풀에서 연결을 빌려 서버 측 커서로 쿼리 결과를 파일에 기록"""
+        with self.pool_slots:
+            return self._stream_on_connection(query, output_path, timeout)
+
+    def _stream_on_connection(self, query: str, output_path: Path, timeout: Optional[int] = None) -> int:
+        connection = self.pool.getconn()
+        discard = False
+        try:
+            # 서버 측(named) 커서는 트랜잭션 안에서만 사용 가능
+            connection.autocommit = False
+            try:
+                with connection.cursor() as cursor:
+                    if timeout:
+                        cursor.execute(f"set local statement_timeout = {int(timeout * 1000)}")
+                with connection.cursor(name=f"steampipe_stream_{threading.get_ident()}") as cursor:
+                    cursor.itersize = self.stream_batch_size
+                    cursor.execute(query)
+                    rows = cursor.fetchmany(self.stream_batch_size)
+                    columns = self._describe(cursor)
+                    names = [column["name"] for column in columns]
+                    with StreamingResultWriter(output_path, columns) as writer:
+                        while rows:
+                            writer.write_rows(dict(zip(names, row)) for row in rows)
+                            rows = cursor.fetchmany(self.stream_batch_size)
+                connection.commit()
+                return writer.row_count
+            except Exception:
+                if not connection.closed:
+                    connection.rollback()
+                raise
+        except psycopg2.extensions.QueryCanceledError:
+            raise subprocess.TimeoutExpired(query, timeout)
+        except psycopg2.Error as e:
+            discard = connection.closed != 0
+            raise subprocess.CalledProcessError(1, query, output="", stderr=f"Error: {str(e).strip()}")
+        finally:
+            self.pool.putconn(connection, close=discard)
+
+    @staticmethod
+    def _describe(cursor) -> List[Dict[str, str]]:
+        """커서의 컬럼 정의를 Steampipe JSON 출력 형태로 변환"""
+        if cursor.description is None:
+            return []
+        return [
+            {"name": column.name, "data_type": PG_TYPE_NAMES.get(column.type_code, "TEXT")}
+            for column in cursor.description
+        ]
+
+    def _fetch_result(self, cursor) -> Tuple[List[Dict[str, str]], List[Dict[str, Any]]]:
+        """커서 결과를 (컬럼 정의, 행 목록)으로 변환"""
+        columns = self._describe(cursor)
+        if not columns:
+            return [], []
+
+        names = [column["name"] for column in columns]
+        rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+        return columns, rows
+
+    def _run_cli(self, query: str, timeout: Optional[int] = None) -> str:
+        """서비스를 사용할 수 없을 때의 기존 CLI 실행 방식"""
+        result = subprocess.run(
+            ["steampipe", "query", query, "--output", "json"],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=timeout
+        )
+        return result.stdout
+
+    def _run_cli_to_file(self, query: str, output_path: Path, timeout: Optional[int] = None) -> int:
+        """CLI 출력을 파이프로 받지 않고 파일에 바로 기록"""
+        with open(output_path, 'w', encoding='utf-8') as stdout:
+            result = subprocess.run(
+                ["steampipe", "query", query, "--output", "json"],
+                stdout=stdout,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=timeout
+            )
+        if result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, result.args, output="", stderr=result.stderr)
+        return _count_output_rows(output_path, query)
+
+
+_shared_engine = None
+_shared_lock = threading.Lock()
+
+
+def get_query_engine() -> SteampipeQueryEngine:
+    """프로세스 전역 공유 쿼리 엔진 반환"""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            _shared_engine = SteampipeQueryEngine()
+            atexit.register(_shared_engine.close)
+        return _shared_engine
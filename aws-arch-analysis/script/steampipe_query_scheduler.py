@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Steampipe 쿼리 병렬 실행 스케줄러
+수집기의 쿼리 목록을 플러그인별(aws, kubernetes 등) 동시 실행 한도 내에서 병렬로 실행
+
+- 동시 실행 한도: STEAMPIPE_CONCURRENCY 환경 변수 (예: "aws=6,kubernetes=2")
+- 쿼리가 조회하는 AWS 서비스별로 다른 수집기 프로세스와 공유하는 호출 예산(aws_rate_limiter.py)의 토큰을 받아 실행
+- 스로틀링 오류 발생 시 해당 플러그인의 동시 실행 수를 절반으로 줄이고 공유 예산을 비운 뒤 지터가 있는 지수 백오프 후 재시도
+- 일시적 오류(ServiceUnavailable, 연결 오류 등)는 백오프 후 재시도, 그 외 오류(권한 등)는 재시도하지 않음
+- 이후 연속 성공 시 동시 실행 수를 점진적으로 원래 한도까지 복구
+- 수집 매니페스트(CollectionManifest)를 지정하면 작업별 수집 이력 기록 및 증분 모드의 건너뛰기 적용
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Sequence
+
+from collection_telemetry import note_retry, query_context
+from aws_rate_limiter import (FATAL, THROTTLING, backoff_delay, classify_error,
+                              detect_query_services, get_bucket)
+
+CONCURRENCY_ENV = "STEAMPIPE_CONCURRENCY"
+DEFAULT_CONCURRENCY = {
+    "aws": 4,
+    "kubernetes": 2,
+    "other": 2,
+}
+
+# Steampipe aws 플러그인은 연결에 설정된 모든 리전을 조회하므로 리전 구분 없이 하나의 예산 사용
+STEAMPIPE_REGION = "all"
+
+PLUGIN_PATTERN = re.compile(r"\b(?:from|join)\s+(aws|kubernetes)_\w+", re.IGNORECASE)
+
+
+def detect_plugin(query: str) -> str:
+    """쿼리가 사용하는 Steampipe 플러그인 판별 (aws, kubernetes, other)"""
+    match = PLUGIN_PATTERN.search(query)
+    return match.group(1).lower() if match else "other"
+
+
+def is_throttling_error(message: str) -> bool:
+    """오류 메시지가 API 스로틀링에 의한 것인지 확인"""
+    return classify_error(message) == THROTTLING
+
+
+def parse_concurrency(value: str) -> Dict[str, int]:
+    """"aws=6,kubernetes=2" 형식의 동시 실행 한도 설정 파싱"""
+    concurrency = {}
+    for item in (value or "").split(","):
+        if "=" not in item:
+            continue
+        plugin, limit = item.split("=", 1)
+        try:
+            concurrency[plugin.strip().lower()] = max(1, int(limit))
+        except ValueError:
+            continue
+    return concurrency
+
+
+class AdaptiveConcurrencyLimiter:
+    """플러그인별 동시 실행 한도 (스로틀링 시 감소, 성공 시 점진 복구)"""
+
+    def __init__(self, plugin: str, max_concurrency: int, base_backoff: float = 1.0, max_backoff: float = 30.0):
+        self.plugin = plugin
+        self.max_concurrency = max_concurrency
+        self.limit = max_concurrency
+        self.active = 0
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.successes_since_throttle = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        with self.condition:
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.active += 1
+
+    def release(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    def on_throttle(self, attempt: int) -> float:
+        """스로틀링 발생 시 한도를 절반으로 줄이고 대기 시간(초) 반환"""
+        with self.condition:
+            self.limit = max(1, self.limit // 2)
+            self.successes_since_throttle = 0
+        return backoff_delay(attempt, self.base_backoff, self.max_backoff)
+
+    def on_success(self):
+        """연속 성공이 한도만큼 쌓이면 한도를 1 증가"""
+        with self.condition:
+            if self.limit >= self.max_concurrency:
+                return
+            self.successes_since_throttle += 1
+            if self.successes_since_throttle >= self.limit:
+                self.limit += 1
+                self.successes_since_throttle = 0
+                self.condition.notify_all()
+
+
+def get_concurrency_config() -> Dict[str, int]:
+    """기본값에 STEAMPIPE_CONCURRENCY 설정을 덮어쓴 플러그인별 동시 실행 한도"""
+    concurrency = dict(DEFAULT_CONCURRENCY)
+    concurrency.update(parse_concurrency(os.environ.get(CONCURRENCY_ENV, "")))
+    return concurrency
+
+
+_limiters: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_plugin_limiter(plugin: str) -> AdaptiveConcurrencyLimiter:
+    """프로세스 전역 플러그인별 동시 실행 한도 반환"""
+    with _limiters_lock:
+        if plugin not in _limiters:
+            concurrency = get_concurrency_config()
+            max_concurrency = concurrency.get(plugin, concurrency["other"])
+            _limiters[plugin] = AdaptiveConcurrencyLimiter(plugin, max_concurrency)
+        return _limiters[plugin]
+
+
+def run_with_backoff(query: str, execute: Callable[[], Any], get_error_message: Callable[[Exception], str],
+                     max_retries: int = 3) -> Any:
+    """공유 호출 예산의 토큰을 받아 실행하고 스로틀링/일시적 오류는 백오프 후 재시도, 그 외 오류는 그대로 전달
+
+    스로틀링이면 플러그인 한도를 낮추고 쿼리가 조회하는 서비스의 공유 예산을 비워 다른 프로세스도 함께 대기
+    """
+    limiter = get_plugin_limiter(detect_plugin(query))
+    buckets = [get_bucket(service, STEAMPIPE_REGION) for service in detect_query_services(query)]
+    attempt = 0
+    while True:
+        for bucket in buckets:
+            bucket.acquire()
+        try:
+            result = execute()
+        except Exception as e:
+            error_class = classify_error(get_error_message(e))
+            if attempt >= max_retries or error_class == FATAL:
+                raise
+            if error_class == THROTTLING:
+                delay = limiter.on_throttle(attempt)
+                for bucket in buckets:
+                    bucket.penalize(delay)
+            else:
+                delay = backoff_delay(attempt, limiter.base_backoff, limiter.max_backoff)
+            note_retry()
+            time.sleep(delay)
+            attempt += 1
+            continue
+        limiter.on_success()
+        return result
+
+
+class QueryScheduler:
+    """수집기 쿼리 목록을 플러그인별 동시 실행 한도 내에서 병렬 실행"""
+
+    def __init__(self, max_workers: int = None, manifest=None):
+        if max_workers is None:
+            max_workers = sum(get_concurrency_config().values())
+        self.max_workers = max_workers
+        self.manifest = manifest
+
+    def run(self, tasks: Sequence[tuple], execute: Callable[..., Any], skipped_result: Any = True) -> List[Any]:
+        """각 작업 튜플을 execute(*task)로 실행하고 입력 순서대로 결과 반환
+
+        작업 튜플의 두 번째 요소를 쿼리, 세 번째 요소를 출력 파일로 보고 플러그인을 판별하며,
+        증분 모드에서 최신 상태라 건너뛴 작업의 결과는 skipped_result
+        """
+        if not tasks:
+            return []
+
+        if self.manifest is not None:
+            execute = self.manifest.track(execute, skipped_result)
+
+        def run_task(task: tuple):
+            limiter = get_plugin_limiter(detect_plugin(task[1]))
+            limiter.acquire()
+            try:
+                # 텔레메트리 기록에 작업 설명과 출력 파일 라벨 추가
+                with query_context(description=task[0], output=task[2] if isinstance(task[2], str) else None):
+                    return execute(*task)
+            finally:
+                limiter.release()
+
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+                return list(executor.map(run_task, tasks))
+        finally:
+            if self.manifest is not None:
+                self.manifest.save()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+컴퓨팅/컨테이너 수집기 공용 테이블 스캔
+steampipe_compute_collection.py와 steampipe_container_collection.py는 ECS/EKS/Kubernetes 테이블을
+서로 다른 컬럼으로 조회해 같은 출력 파일을 생성하므로, 쿼리 결과 캐시만으로는 중복 조회가 제거되지 않음
+
+- 두 수집기가 공유하는 테이블은 양쪽 컬럼의 합집합으로 정해진 동일한 기준 쿼리를 실행
+- 정규화된 SQL이 같으므로 STEAMPIPE_QUERY_CACHE_DIR 캐시를 통해 같은 실행(run)에서 한 번만 조회
+- 각 출력 파일은 기준 쿼리 결과에서 원래 쿼리의 컬럼/조건으로 생성하며,
+  기준 쿼리가 실패하면 원래 쿼리로 개별 수집
+"""
+
+from typing import Dict, List, Sequence
+
+from steampipe_derived_datasets import BaseDataset, DerivedOutput, parse_simple_query
+
+# 테이블별 공용 기준 쿼리 컬럼 (컴퓨팅 수집기 컬럼 순서 + 컨테이너 수집기에만 있는 컬럼)
+SHARED_TABLE_COLUMNS: Dict[str, List[str]] = {
+    "aws_ecs_cluster": [
+        "cluster_name", "cluster_arn", "status", "running_tasks_count", "pending_tasks_count",
+        "active_services_count", "statistics", "tags", "settings", "configuration",
+        "service_connect_defaults", "capacity_providers", "default_capacity_provider_strategy",
+        "registered_container_instances_count", "attachments", "attachments_status"
+    ],
+    "aws_ecs_service": [
+        "service_name", "service_arn", "cluster_arn", "task_definition", "desired_count", "running_count",
+        "pending_count", "status", "task_sets", "deployment_controller", "deployments", "role_arn",
+        "events", "created_at", "platform_version", "platform_family", "tags", "propagate_tags",
+        "enable_ecs_managed_tags", "created_by", "enable_execute_command",
+        "health_check_grace_period_seconds", "scheduling_strategy", "deployment_configuration",
+        "network_configuration", "service_registries", "scale_in_protection", "capacity_provider_strategy",
+        "placement_constraints", "placement_strategy", "service_connect_configuration",
+        "volume_configurations"
+    ],
+    "aws_ecs_task": [
+        "task_arn", "cluster_arn", "task_definition_arn", "container_instance_arn", "overrides",
+        "last_status", "desired_status", "cpu", "memory", "containers", "started_by", "version",
+        "stopped_reason", "stopped_at", "connectivity", "connectivity_at", "pull_started_at",
+        "pull_stopped_at", "execution_stopped_at", "created_at", "started_at", "stopping_at",
+        "platform_version", "platform_family", "attributes", "health_status", "tags", "group_name",
+        "launch_type", "capacity_provider_name", "availability_zone", "ephemeral_storage", "starting_at",
+        "inference_accelerators", "group", "attachments"
+    ],
+    "aws_ecs_task_definition": [
+        "task_definition_arn", "family", "task_role_arn", "execution_role_arn", "network_mode", "revision",
+        "volumes", "status", "requires_attributes", "placement_constraints", "compatibilities",
+        "runtime_platform", "requires_compatibilities", "cpu", "memory", "inference_accelerators",
+        "pid_mode", "ipc_mode", "proxy_configuration", "registered_at", "deregistered_at", "registered_by",
+        "ephemeral_storage", "tags"
+    ],
+    "aws_ecs_container_instance": [
+        "container_instance_arn", "ec2_instance_id", "capacity_provider_name", "version", "version_info",
+        "remaining_resources", "registered_resources", "status", "status_reason", "agent_connected",
+        "running_tasks_count", "pending_tasks_count", "agent_update_status", "attributes", "registered_at",
+        "attachments", "tags", "health_status"
+    ],
+    "aws_eks_cluster": [
+        "name", "arn", "created_at", "version", "endpoint", "role_arn", "resources_vpc_config",
+        "kubernetes_network_config", "logging", "identity", "status", "certificate_authority",
+        "client_request_token", "platform_version", "tags", "encryption_config", "connector_config", "id",
+        "health", "outpost_config", "access_config"
+    ],
+    "aws_eks_node_group": [
+        "cluster_name", "nodegroup_name", "nodegroup_arn", "status", "capacity_type", "scaling_config",
+        "instance_types", "subnets", "remote_access", "ami_type", "node_role", "labels", "taints",
+        "resources", "health", "update_config", "launch_template", "version", "release_version",
+        "created_at", "modified_at", "tags", "arn", "disk_size"
+    ],
+    "aws_eks_fargate_profile": [
+        "fargate_profile_name", "fargate_profile_arn", "cluster_name", "created_at",
+        "pod_execution_role_arn", "subnets", "selectors", "status", "tags"
+    ],
+    "aws_eks_addon": [
+        "addon_name", "cluster_name", "addon_arn", "addon_version", "status", "health",
+        "configuration_values", "resolve_conflicts", "service_account_role_arn", "created_at",
+        "modified_at", "tags", "arn", "health_issues", "marketplace_information", "publisher", "owner"
+    ],
+    "aws_eks_identity_provider_config": [
+        "cluster_name", "identity_provider_config_name", "identity_provider_config_arn", "type", "status",
+        "tags", "name", "arn", "client_id", "groups_claim", "groups_prefix", "issuer_url", "username_claim",
+        "username_prefix", "required_claims"
+    ],
+    "kubernetes_namespace": [
+        "name", "uid", "creation_timestamp", "deletion_timestamp", "labels", "annotations", "phase",
+        "conditions", "spec_finalizers"
+    ],
+    "kubernetes_pod": [
+        "name", "namespace", "uid", "node_name", "phase", "pod_ip", "host_ip", "qos_class",
+        "restart_policy", "service_account_name", "node_selector", "tolerations", "affinity", "priority",
+        "priority_class_name", "runtime_class_name", "overhead", "topology_spread_constraints",
+        "preemption_policy", "os", "host_network", "host_pid", "host_ipc", "share_process_namespace",
+        "security_context", "dns_policy", "dns_config", "hostname", "subdomain", "scheduler_name",
+        "creation_timestamp", "deletion_timestamp", "labels", "annotations", "containers",
+        "init_containers", "volumes", "conditions"
+    ],
+    "kubernetes_deployment": [
+        "name", "namespace", "uid", "replicas", "updated_replicas", "ready_replicas", "available_replicas",
+        "unavailable_replicas", "observed_generation", "creation_timestamp", "labels", "annotations",
+        "conditions", "strategy", "min_ready_seconds", "progress_deadline_seconds",
+        "revision_history_limit", "paused"
+    ],
+    "kubernetes_service": [
+        "name", "namespace", "uid", "type", "cluster_ip", "cluster_ips", "external_ips", "session_affinity",
+        "external_name", "external_traffic_policy", "health_check_node_port", "publish_not_ready_addresses",
+        "ip_families", "ip_family_policy", "allocate_load_balancer_node_ports", "load_balancer_class",
+        "internal_traffic_policy", "creation_timestamp", "labels", "annotations", "load_balancer_ip",
+        "ports", "selector"
+    ],
+    "kubernetes_node": [
+        "name", "uid", "pod_cidr", "pod_cidrs", "provider_id", "unschedulable", "creation_timestamp",
+        "labels", "annotations", "taints", "allocatable", "capacity", "conditions", "addresses",
+        "node_info", "images", "volumes_in_use", "volumes_attached", "config"
+    ],
+}
+
+# 따옴표가 필요한 예약어 컬럼
+RESERVED_COLUMNS = {"group", "order", "user", "default"}
+
+
+def quote_column(column: str) -> str:
+    """예약어 컬럼 이름을 따옴표로 감싸기"""
+    return f'"{column}"' if column in RESERVED_COLUMNS else column
+
+
+def build_shared_table_query(table: str, region: str = None) -> str:
+    """공용 테이블 기준 쿼리 (같은 테이블/리전이면 항상 같은 SQL)"""
+    query = f"select {', '.join(quote_column(column) for column in SHARED_TABLE_COLUMNS[table])} from {table}"
+    if region:
+        query += f" where region = '{region}'"
+    return query
+
+
+def get_shared_table_datasets(queries: Sequence[tuple]) -> List[BaseDataset]:
+    """쿼리 목록 중 공용 테이블을 조회하는 쿼리를 테이블/리전별 기준 쿼리의 파생 출력으로 변환"""
+    datasets: Dict[tuple, List[DerivedOutput]] = {}
+    for description, query, output_file in queries:
+        parsed = parse_simple_query(query)
+        if parsed is None or parsed.table not in SHARED_TABLE_COLUMNS:
+            continue
+
+        available = set(SHARED_TABLE_COLUMNS[parsed.table])
+        required = list(parsed.columns) + ([parsed.not_null] if parsed.not_null else []) + list(parsed.where or {})
+        if not available.issuperset(required):
+            continue
+
+        datasets.setdefault((parsed.table, parsed.region), []).append(
+            DerivedOutput(description, parsed.columns, output_file, parsed.not_null, parsed.where, query)
+        )
+
+    return [
+        BaseDataset(f"{table} 공용 스캔", build_shared_table_query(table, region), outputs)
+        for (table, region), outputs in datasets.items()
+    ]
@@ -5,6 +5,7 @@ Shell 스크립트와 동일한 쿼리 구조 사용
 """
 
 import subprocess
+import threading
 import json
 import os
 import sys
@@ -12,7 +13,14 @@ from pathlib import Path
 from typing import List, Tuple
 from datetime import datetime
 
-class SteampipeStorageCollector:
+# 공용 Steampipe 쿼리 엔진 import
+sys.path.append(str(Path(__file__).parent))
+from steampipe_query_engine import get_query_engine
+from steampipe_derived_datasets import BaseDataset, DerivedDatasetMixin, DerivedOutput
+from steampipe_query_scheduler import QueryScheduler
+from steampipe_collection_manifest import CollectionManifest
+
+class SteampipeStorageCollector(DerivedDatasetMixin):
     def __init__(self, region: str = "ap-northeast-2"):
         self.region = region
         # 스크립트의 실제 위치를 기준으로 경로 설정
@@ -20,6 +28,9 @@ class SteampipeStorageCollector:
         project_root = script_dir.parent.parent
         self.report_dir = project_root / "aws-arch-analysis" / "report"
         self.report_dir.mkdir(parents=True, exist_ok=True)
+        self.query_engine = get_query_engine()
+        self.query_scheduler = QueryScheduler(manifest=CollectionManifest(self.report_dir))
+        self.count_lock = threading.Lock()  # 병렬 쿼리 실행 시 카운터 동기화용
         self.total_count = 0
         self.success_count = 0
         self.error_log = self.report_dir / "storage_collection_errors.log"
@@ -61,27 +72,19 @@ class SteampipeStorageCollector:
 
     def execute_steampipe_query(self, description: str, query: str, output_file: str) -> bool:
         self.log_info(f"수집 중: {description}")
-        self.total_count += 1
+        with self.count_lock:
+            self.total_count += 1
         
         try:
-            # 작업 디렉토리를 report_dir로 변경
-            os.chdir(self.report_dir)
-            
-            result = subprocess.run(
-                ["steampipe", "query", query, "--output", "json"],
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
+            # 결과를 메모리에 모으지 않고 행 단위로 파일에 기록
             output_path = self.report_dir / output_file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(result.stdout)
+            row_count = self.query_engine.run_query_to_file(query, output_path)
             
             file_size = output_path.stat().st_size
             if file_size > 100:
-                self.log_success(f"{description} 완료 ({output_file}, {file_size} bytes)")
-                self.success_count += 1
+                self.log_success(f"{description} 완료 ({output_file}, {row_count}개 행, {file_size} bytes)")
+                with self.count_lock:
+                    self.success_count += 1
                 return True
             else:
                 self.log_warning(f"{description} - 데이터 없음 ({output_file}, {file_size} bytes)")
@@ -101,6 +104,34 @@ class SteampipeStorageCollector:
             
             return False
 
+    def get_derived_datasets(self) -> List[BaseDataset]:
+        """aws_s3_bucket 단일 스캔 결과에서 storage_s3_*.json 파일 생성
+
+        get_storage_queries()의 S3 쿼리와 컬럼 및 조건이 동일해야 함
+        """
+        return [
+            BaseDataset(
+                "S3 버킷 단일 스캔",
+                "select name, arn, region, creation_date, lifecycle_rules, logging, event_notification_configuration, object_lock_configuration, policy, policy_std, replication, server_side_encryption_configuration, versioning_enabled, versioning_mfa_delete, website_configuration, block_public_acls, block_public_policy, ignore_public_acls, restrict_public_buckets, cors_rules, tags from aws_s3_bucket",
+                [
+                    DerivedOutput(
+                        "S3 버킷 상세 정보",
+                        ["name", "arn", "region", "creation_date", "lifecycle_rules", "logging", "event_notification_configuration", "object_lock_configuration", "policy", "policy_std", "replication", "server_side_encryption_configuration", "versioning_enabled", "versioning_mfa_delete", "website_configuration", "block_public_acls", "block_public_policy", "ignore_public_acls", "restrict_public_buckets", "tags"],
+                        "storage_s3_buckets.json"
+                    ),
+                    DerivedOutput("S3 버킷 정책", ["name", "policy", "policy_std"], "storage_s3_bucket_policies.json", not_null="policy"),
+                    DerivedOutput("S3 버킷 퍼블릭 액세스 차단", ["name", "block_public_acls", "block_public_policy", "ignore_public_acls", "restrict_public_buckets"], "storage_s3_public_access_block.json"),
+                    DerivedOutput("S3 버킷 CORS 구성", ["name", "cors_rules"], "storage_s3_cors.json", not_null="cors_rules"),
+                    DerivedOutput("S3 버킷 수명 주기 구성", ["name", "lifecycle_rules"], "storage_s3_lifecycle.json", not_null="lifecycle_rules"),
+                    DerivedOutput("S3 버킷 복제 구성", ["name", "replication"], "storage_s3_replication.json", not_null="replication"),
+                    DerivedOutput("S3 버킷 버전 관리", ["name", "versioning_enabled", "versioning_mfa_delete"], "storage_s3_versioning.json"),
+                    DerivedOutput("S3 버킷 로깅", ["name", "logging"], "storage_s3_logging.json", not_null="logging"),
+                    DerivedOutput("S3 버킷 알림", ["name", "event_notification_configuration"], "storage_s3_notifications.json", not_null="event_notification_configuration"),
+                    DerivedOutput("S3 버킷 웹사이트 구성", ["name", "website_configuration"], "storage_s3_website.json", not_null="website_configuration")
+                ]
+            )
+        ]
+
     def get_storage_queries(self) -> List[Tuple[str, str, str]]:
         """Shell 스크립트와 동일한 쿼리 구조 사용"""
         return [
@@ -288,9 +319,8 @@ class SteampipeStorageCollector:
         self.check_steampipe_plugin()
         
         # 쿼리 실행
-        queries = self.get_storage_queries()
-        for description, query, output_file in queries:
-            self.execute_steampipe_query(description, query, output_file)
+        queries = self.plan_collection_tasks(self.get_storage_queries())
+        self.query_scheduler.run(queries, self.execute_collection_task)
         
         # 결과 요약
         self.log_success("스토리지 리소스 데이터 수집 완료!")
@@ -310,7 +340,8 @@ class SteampipeStorageCollector:
         print(f"총 쿼리 수: {self.total_count}")
         print(f"성공한 쿼리: {self.success_count}")
         print(f"실패한 쿼리: {self.total_count - self.success_count}")
-        print(f"성공률: {(self.success_count/self.total_count*100):.1f}%")
+        if self.total_count > 0:
+            print(f"성공률: {(self.success_count/self.total_count*100):.1f}%")
         
         if self.error_log.exists():
             print(f"\n{self.YELLOW}⚠️ 오류 로그: {self.error_log}{self.NC}")
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+대규모 계정 합성 데이터셋 생성기
+보고서 생성기 확장성 테스트를 위해 compute_*, networking_*, storage_*, security_* 수집 파일을 원하는 규모로 생성
+
+- 출력 파일 목록과 컬럼은 수집기(steampipe_*_collection.py)의 쿼리에서 읽으므로 실제 수집 결과와 스키마가 같음
+- 값은 컬럼 이름 규칙으로 생성 (ID 접두사, 태그, 시각, 상태 분포, AWS API 형태의 중첩 JSON)
+- 각 파일의 첫 컬럼이 리소스 ID면 순번 ID를 부여하고, 다른 파일의 ID 컬럼은 그 ID 풀을 참조 (vpc_id, group_id 등)
+- 행은 `steampipe query --output json`과 같은 형태로 스트리밍 기록 (규모와 관계없이 메모리 사용량 일정)
+- 같은 --seed면 같은 데이터셋 생성
+
+사용법:
+    python synthetic_dataset.py --output-dir /tmp/large-account --scale large
+    python synthetic_dataset.py --output-dir /tmp/custom --instances 20000 --security-group-rules 100000 --snapshots 50000
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+sys.path.append(str(Path(__file__).parent))
+from steampipe_query_engine import StreamingResultWriter
+
+SCRIPT_DIR = Path(__file__).parent
+COLLECTOR_SCRIPTS = {
+    "compute": "steampipe_compute_collection.py",
+    "networking": "steampipe_networking_collection.py",
+    "storage": "steampipe_storage_collection.py",
+    "security": "steampipe_security_collection.py",
+}
+
+QUERY_PATTERN = re.compile(
+    r'f?"(select\s[^"]+?)",\s*(?:#[^\n]*\s*)*"((?:compute|networking|storage|security)_[a-z0-9_]+\.json)"', re.S
+)
+DERIVED_PATTERN = re.compile(
+    r'DerivedOutput\(\s*"[^"]*",\s*\[([^\]]*)\],\s*"((?:compute|networking|storage|security)_[a-z0-9_]+\.json)"'
+)
+SELECT_PATTERN = re.compile(r"select\s+(.*?)\s+from\s+(\w+)", re.S | re.I)
+
+ACCOUNT_ID = "123456789012"
+REGION = "ap-northeast-2"
+BASE_TIME = datetime(2025, 1, 1)
+
+
+class DatasetScale(NamedTuple):
+    """데이터셋 규모 (나머지 리소스 수는 이 값들에서 비례해 결정)"""
+    instances: int
+    security_group_rules: int
+    snapshots: int
+
+
+SCALE_PRESETS = {
+    "lab": DatasetScale(20, 100, 50),
+    "medium": DatasetScale(2000, 10000, 5000),
+    "large": DatasetScale(20000, 100000, 50000),
+}
+
+# 출력 파일별 행 수: (기준, 배율) - 기준은 DatasetScale 필드 또는 vpcs
+ROW_COUNTS = {
+    "compute_ec2_instances.json": ("instances", 1.0),
+    "compute_asg_detailed.json": ("instances", 0.02),
+    "compute_alb_detailed.json": ("instances", 0.01),
+    "compute_nlb_detailed.json": ("instances", 0.005),
+    "compute_target_groups.json": ("instances", 0.02),
+    "compute_lambda_functions.json": ("instances", 0.1),
+    "storage_ebs_volumes.json": ("instances", 1.5),
+    "storage_ebs_snapshots.json": ("snapshots", 1.0),
+    "storage_s3_buckets.json": ("instances", 0.05),
+    "security_groups.json": ("security_group_rules", 0.05),
+    "security_groups_ingress_rules.json": ("security_group_rules", 0.65),
+    "security_groups_egress_rules.json": ("security_group_rules", 0.35),
+    "security_iam_users.json": ("instances", 0.01),
+    "security_iam_roles.json": ("instances", 0.05),
+    "security_iam_policies.json": ("instances", 0.05),
+    "networking_vpc.json": ("vpcs", 1.0),
+    "networking_subnets.json": ("vpcs", 6.0),
+    "networking_route_tables.json": ("vpcs", 4.0),
+    "networking_igw.json": ("vpcs", 1.0),
+    "networking_nat.json": ("vpcs", 2.0),
+    "networking_acl.json": ("vpcs", 2.0),
+    "networking_vpc_endpoints.json": ("vpcs", 3.0),
+    "networking_flow_logs.json": ("vpcs", 1.0),
+    "networking_eip.json": ("instances", 0.03),
+}
+DEFAULT_ROW_COUNT = ("instances", 0.005)
+
+# 리소스 ID 컬럼: (ID 접두사, ID 풀을 만드는 출력 파일)
+ID_COLUMNS = {
+    "instance_id": ("i", "compute_ec2_instances.json"),
+    "vpc_id": ("vpc", "networking_vpc.json"),
+    "subnet_id": ("subnet", "networking_subnets.json"),
+    "group_id": ("sg", "security_groups.json"),
+    "volume_id": ("vol", "storage_ebs_volumes.json"),
+    "snapshot_id": ("snap", "storage_ebs_snapshots.json"),
+    "route_table_id": ("rtb", "networking_route_tables.json"),
+    "internet_gateway_id": ("igw", "networking_igw.json"),
+    "nat_gateway_id": ("nat", "networking_nat.json"),
+    "network_acl_id": ("acl", "networking_acl.json"),
+    "vpc_endpoint_id": ("vpce", "networking_vpc_endpoints.json"),
+    "allocation_id": ("eipalloc", "networking_eip.json"),
+    "flow_log_id": ("fl", "networking_flow_logs.json"),
+    "security_group_rule_id": ("sgr", None),
+    "network_interface_id": ("eni", None),
+    "transit_gateway_id": ("tgw", None),
+    "image_id": ("ami", None),
+    "association_id": ("eipassoc", None),
+    "dhcp_options_id": ("dopt", None),
+}
+
+BOOL_COLUMNS = {
+    "encrypted", "ebs_optimized", "ena_support", "source_dest_check", "multi_attach_enabled", "fast_restored",
+    "default_for_az", "map_public_ip_on_launch", "assign_ipv6_address_on_creation", "is_default", "is_egress",
+    "requester_managed", "private_dns_enabled", "mfa_enabled", "versioning_enabled", "versioning_mfa_delete",
+    "block_public_acls", "block_public_policy", "ignore_public_acls", "restrict_public_buckets",
+}
+
+CHOICES = {
+    "instance_state": (("running", 80), ("stopped", 15), ("terminated", 5)),
+    "instance_type": (("t3.micro", 20), ("t3.large", 20), ("m5.large", 25), ("m5.2xlarge", 15), ("c5.xlarge", 10),
+                      ("r5.4xlarge", 10)),
+    "volume_type": (("gp3", 55), ("gp2", 30), ("io2", 5), ("st1", 5), ("sc1", 5)),
+    "ip_protocol": (("tcp", 80), ("udp", 10), ("-1", 10)),
+    "platform": (("Linux/UNIX", 85), ("windows", 15)),
+    "architecture": (("x86_64", 80), ("arm64", 20)),
+    "monitoring_state": (("disabled", 70), ("enabled", 30)),
+    "root_device_type": (("ebs", 100),),
+    "virtualization_type": (("hvm", 100),),
+    "hypervisor": (("xen", 30), ("nitro", 70)),
+    "instance_tenancy": (("default", 100),),
+    "domain": (("vpc", 100),),
+}
+STATE_CHOICES = {
+    "storage_ebs_volumes.json": (("in-use", 85), ("available", 15)),
+    "storage_ebs_snapshots.json": (("completed", 98), ("pending", 2)),
+    "networking_nat.json": (("available", 95), ("failed", 5)),
+}
+COMMON_PORTS = (22, 80, 443, 3306, 3389, 5432, 6379, 8080, 8443, 9200)
+TAG_ENVIRONMENTS = ("prod", "staging", "dev", "test")
+TAG_TEAMS = ("platform", "payments", "search", "data", "web", "mobile")
+
+# 복수형이지만 목록이 아닌 컬럼
+SCALAR_PLURAL_COLUMNS = {"status", "progress", "engine_version_status", "tags_src"}
+INTEGER_SUFFIXES = ("_capacity", "_size", "_count", "_days", "_seconds", "_port", "_gb", "_mb", "_period")
+
+# 대부분의 계정에서 비어 있는 컬럼
+EMPTY_COLUMNS = {
+    "outpost_arn", "permissions_boundary_arn", "permissions_boundary_type", "cidr_ipv6", "referenced_user_id",
+    "referenced_vpc_id", "prefix_list_id",
+}
+
+
+def load_output_schemas(prefixes=tuple(COLLECTOR_SCRIPTS)) -> Dict[str, Tuple[Optional[str], List[str]]]:
+    """수집기 쿼리에서 출력 파일별 (Steampipe 테이블, 컬럼 목록) 추출"""
+    schemas = {}
+    for prefix in prefixes:
+        source = (SCRIPT_DIR / COLLECTOR_SCRIPTS[prefix]).read_text(encoding="utf-8")
+        for query, output_file in QUERY_PATTERN.findall(source):
+            match = SELECT_PATTERN.match(query)
+            if match and output_file not in schemas:
+                schemas[output_file] = (match.group(2), [column.strip() for column in match.group(1).split(",")])
+        for columns, output_file in DERIVED_PATTERN.findall(source):
+            if output_file not in schemas:
+                schemas[output_file] = (None, re.findall(r'"(\w+)"', columns))
+    return {output_file: schema for output_file, schema in schemas.items()
+            if output_file.split("_", 1)[0] in prefixes}
+
+
+def get_row_counts(scale: DatasetScale, output_files) -> Dict[str, int]:
+    """출력 파일별 생성할 행 수"""
+    bases = dict(scale._asdict(), vpcs=max(1, scale.instances // 500))
+    counts = {}
+    for output_file in output_files:
+        base, factor = ROW_COUNTS.get(output_file, DEFAULT_ROW_COUNT)
+        counts[output_file] = max(1, int(bases[base] * factor))
+    return counts
+
+
+def resource_id(prefix: str, index: int) -> str:
+    return f"{prefix}-{index:017x}"
+
+
+class RowFactory:
+    """컬럼 이름 규칙으로 행 값 생성 (ID 참조는 다른 출력 파일의 행 수 범위 안에서 선택)"""
+
+    def __init__(self, row_counts: Dict[str, int], seed: int = 42):
+        self.row_counts = row_counts
+        self.random = random.Random(seed)
+
+    def pick(self, choices) -> Any:
+        values, weights = zip(*choices)
+        return self.random.choices(values, weights)[0]
+
+    def reference(self, column: str) -> str:
+        prefix, pool_file = ID_COLUMNS[column]
+        pool_size = self.row_counts.get(pool_file, 0) if pool_file else 0
+        return resource_id(prefix, self.random.randrange(pool_size) if pool_size else self.random.randrange(1 << 32))
+
+    def timestamp(self) -> str:
+        return (BASE_TIME - timedelta(seconds=self.random.randrange(3 * 365 * 86400))).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def tags(self, name: str) -> Dict[str, str]:
+        return {
+            "Name": name,
+            "Environment": self.random.choice(TAG_ENVIRONMENTS),
+            "Team": self.random.choice(TAG_TEAMS),
+        }
+
+    def cidr(self, column: str, index: int) -> str:
+        if column in ("cidr_ipv4", "cidr_ip"):
+            if self.random.random() < 0.1:
+                return "0.0.0.0/0"
+            return f"10.{self.random.randrange(256)}.{self.random.randrange(256)}.0/24"
+        return f"10.{index % 256}.{(index // 256) % 256}.0/24" if index >= 0 else "10.0.0.0/16"
+
+    def ip_permissions(self) -> List[Dict[str, Any]]:
+        """AWS API 형태의 보안 그룹 규칙 목록"""
+        permissions = []
+        for _ in range(self.random.randint(1, 6)):
+            port = self.random.choice(COMMON_PORTS)
+            permissions.append({
+                "IpProtocol": "tcp",
+                "FromPort": port,
+                "ToPort": port,
+                "IpRanges": [{"CidrIp": self.cidr("cidr_ipv4", 0)}],
+                "Ipv6Ranges": [],
+                "PrefixListIds": [],
+                "UserIdGroupPairs": [],
+            })
+        return permissions
+
+    def value(self, output_file: str, table: Optional[str], column: str, index: int, is_primary: bool) -> Any:
+        """출력 파일의 index번째 행의 컬럼 값"""
+        if column in EMPTY_COLUMNS:
+            return None
+        if column in ID_COLUMNS:
+            return resource_id(ID_COLUMNS[column][0], index) if is_primary else self.reference(column)
+        if column in BOOL_COLUMNS or column.startswith("is_") or column.endswith("_enabled"):
+            return self.random.random() < 0.7
+        if column == "state" and output_file in STATE_CHOICES:
+            return self.pick(STATE_CHOICES[output_file])
+        if column in CHOICES:
+            return self.pick(CHOICES[column])
+
+        name = f"{output_file.split('.')[0].split('_', 1)[1].replace('_', '-')}-{index}"
+        if column == "tags":
+            return self.tags(name)
+        if column in ("name", "group_name", "function_name", "cluster_name", "key_name", "title"):
+            return name
+        if column == "arn" or column.endswith("_arn"):
+            service, _, resource = (table or "aws_ec2_resource")[4:].partition("_")
+            region = "" if service == "iam" else REGION
+            return f"arn:aws:{service}:{region}:{ACCOUNT_ID}:{resource.replace('_', '-')}/{name}"
+        if column in ("owner_id", "account_id", "referenced_user_id", "network_interface_owner_id"):
+            return ACCOUNT_ID
+        if column == "region":
+            return REGION
+        if column in ("availability_zone", "placement_availability_zone"):
+            return f"{REGION}{'abcd'[index % 4]}"
+        if column.endswith("_time") or column.endswith("_date") or column.endswith("_at") or column in (
+                "creation_date", "last_modified", "password_last_used", "role_last_used_date"):
+            return self.timestamp()
+        if column in ("cidr_block", "cidr_ipv4"):
+            return self.cidr(column, index if output_file != "networking_vpc.json" else -1)
+        if column in ("public_ip", "public_ip_address"):
+            return f"54.{self.random.randrange(256)}.{self.random.randrange(256)}.{self.random.randrange(1, 255)}"
+        if column in ("private_ip_address", "ip_address"):
+            return f"10.{self.random.randrange(256)}.{self.random.randrange(256)}.{self.random.randrange(1, 255)}"
+        if column in ("size", "volume_size"):
+            return self.random.choice((8, 20, 30, 50, 100, 200, 500, 1000))
+        if column in ("iops",):
+            return self.random.choice((3000, 6000, 16000))
+        if column in ("throughput",):
+            return self.random.choice((125, 250, 500))
+        if column in ("from_port", "to_port"):
+            return self.random.choice(COMMON_PORTS)
+        if column in ("available_ip_address_count",):
+            return self.random.randrange(251)
+        if column == "progress":
+            return "100%"
+        if column == "description":
+            return f"synthetic {name}"
+        if column == "ip_permissions":
+            return self.ip_permissions()
+        if column == "ip_permissions_egress":
+            return [{"IpProtocol": "-1", "IpRanges": [{"CidrIp": "0.0.0.0/0"}], "Ipv6Ranges": [],
+                     "PrefixListIds": [], "UserIdGroupPairs": []}]
+        if column == "security_groups":
+            group_id = self.reference("group_id")
+            return [{"GroupId": group_id, "GroupName": f"groups-{group_id[-6:]}"}]
+        if column == "attachments" and output_file == "storage_ebs_volumes.json":
+            return [{"InstanceId": self.reference("instance_id"), "Device": "/dev/xvda", "State": "attached",
+                     "AttachTime": self.timestamp(), "DeleteOnTermination": True}]
+        if column == "block_device_mappings":
+            return [{"DeviceName": "/dev/xvda", "Ebs": {"VolumeId": self.reference("volume_id"), "Status": "attached",
+                                                       "DeleteOnTermination": True}}]
+        if column == "assume_role_policy_document":
+            service = self.random.choice(("ec2", "lambda", "ecs-tasks", "eks"))
+            return {"Version": "2012-10-17", "Statement": [{
+                "Effect": "Allow", "Principal": {"Service": f"{service}.amazonaws.com"}, "Action": "sts:AssumeRole"}]}
+        if column == "routes":
+            return [{"DestinationCidrBlock": "10.0.0.0/16", "GatewayId": "local", "State": "active"},
+                    {"DestinationCidrBlock": "0.0.0.0/0", "GatewayId": self.reference("internet_gateway_id"),
+                     "State": "active"}]
+        if column in ("state", "status"):
+            return "available"
+        if column == "path":
+            return "/service-role/" if self.random.random() < 0.3 else "/"
+        if column.endswith(INTEGER_SUFFIXES) or column in ("port", "version", "priority", "rule_number"):
+            return self.random.randint(1, 10)
+        if column.endswith("_name"):
+            return name
+        if column.endswith("_id"):
+            return f"{column[:-3].replace('_', '-')}-{self.random.getrandbits(68):017x}"
+        # 목록 컬럼은 비어 있더라도 null이 아닌 빈 배열로 조회됨
+        if column.endswith("s") and not column.endswith("ss") and column not in SCALAR_PLURAL_COLUMNS:
+            return []
+        return None
+
+    def rows(self, output_file: str, table: Optional[str], columns: List[str],
+             count: int) -> Iterator[Dict[str, Any]]:
+        primary = columns[0] if columns and columns[0] in ID_COLUMNS else None
+        for index in range(count):
+            row = {column: self.value(output_file, table, column, index, column == primary) for column in columns}
+            self.fix_row(output_file, row, index)
+            yield row
+
+    @staticmethod
+    def fix_row(output_file: str, row: Dict[str, Any], index: int):
+        """컬럼 간 관계 보정"""
+        # 분리된 볼륨은 연결 정보가 없음
+        if output_file == "storage_ebs_volumes.json" and row.get("state") == "available" and "attachments" in row:
+            row["attachments"] = []
+        if "from_port" in row and "to_port" in row:
+            if row.get("ip_protocol") == "-1":
+                row["from_port"] = row["to_port"] = -1
+            else:
+                row["to_port"] = row["from_port"]
+        if "is_egress" in row:
+            row["is_egress"] = "egress" in output_file
+        if "is_default" in row:
+            row["is_default"] = index == 0
+
+
+def data_type(value: Any) -> str:
+    """값의 Steampipe data_type 표기"""
+    if isinstance(value, bool):
+        return "BOOL"
+    if isinstance(value, int):
+        return "INT8"
+    if isinstance(value, float):
+        return "FLOAT8"
+    if isinstance(value, (dict, list)):
+        return "JSONB"
+    return "TEXT"
+
+
+def generate_dataset(output_dir, scale: DatasetScale, prefixes=tuple(COLLECTOR_SCRIPTS),
+                     seed: int = 42) -> Dict[str, int]:
+    """출력 디렉토리에 합성 수집 파일 생성 후 파일별 행 수 반환"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    schemas = load_output_schemas(prefixes)
+    row_counts = get_row_counts(scale, schemas)
+    factory = RowFactory(row_counts, seed)
+
+    for output_file, (table, columns) in sorted(schemas.items()):
+        rows = factory.rows(output_file, table, columns, row_counts[output_file])
+        first_row = next(rows)
+        column_types = [{"name": column, "data_type": data_type(first_row[column])} for column in columns]
+        with StreamingResultWriter(output_dir / output_file, column_types) as writer:
+            writer.write_rows([first_row])
+            writer.write_rows(rows)
+    return row_counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대규모 계정 합성 데이터셋 생성")
+    parser.add_argument("--output-dir", required=True, help="수집 파일을 생성할 디렉토리")
+    parser.add_argument("--scale", choices=sorted(SCALE_PRESETS), default="large", help="규모 프리셋 (기본값: large)")
+    parser.add_argument("--instances", type=int, default=None, help="EC2 인스턴스 수")
+    parser.add_argument("--security-group-rules", type=int, default=None, help="보안 그룹 규칙 수")
+    parser.add_argument("--snapshots", type=int, default=None, help="EBS 스냅샷 수")
+    parser.add_argument("--prefixes", default=",".join(COLLECTOR_SCRIPTS),
+                        help="생성할 파일 접두사 (기본값: compute,networking,storage,security)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (기본값: 42)")
+    args = parser.parse_args()
+
+    preset = SCALE_PRESETS[args.scale]
+    scale = DatasetScale(
+        args.instances if args.instances is not None else preset.instances,
+        args.security_group_rules if args.security_group_rules is not None else preset.security_group_rules,
+        args.snapshots if args.snapshots is not None else preset.snapshots,
+    )
+    prefixes = tuple(prefix.strip() for prefix in args.prefixes.split(",") if prefix.strip() in COLLECTOR_SCRIPTS)
+
+    start_time = time.time()
+    row_counts = generate_dataset(args.output_dir, scale, prefixes, args.seed)
+    output_dir = Path(args.output_dir)
+    total_bytes = sum((output_dir / output_file).stat().st_size for output_file in row_counts)
+    print(f"합성 데이터셋 생성 완료: {len(row_counts)}개 파일, {sum(row_counts.values())}행, "
+          f"{total_bytes / 1024 / 1024:.1f} MB ({time.time() - start_time:.1f}초)")
+    for output_file, count in sorted(row_counts.items(), key=lambda item: item[1], reverse=True)[:10]:
+        print(f"  {output_file:<45} {count:>8}행")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+수집 스크립트 테스트 공용 설정
+- script/ 디렉토리를 import 경로에 추가
+- 측정 기록, 호출 예산 상태 파일을 테스트별 임시 디렉토리에 기록하고 호출 속도 제한은 해제
+- Kubernetes 페이로드 요약 HMAC 키 파일도 테스트별 임시 디렉토리에 생성 (~/.config에 기록하지 않음)
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPT_DIR = Path(__file__).resolve().parent.parent / "script"
+sys.path.insert(0, str(SCRIPT_DIR))
+
+
+@pytest.fixture(autouse=True)
+def collection_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("COLLECTION_METRICS_FILE", str(tmp_path / "collection_metrics.jsonl"))
+    monkeypatch.setenv("AWS_RATE_LIMIT_DIR", str(tmp_path / ".ratelimit"))
+    monkeypatch.setenv("AWS_RATE_LIMITS", "default=0")
+    monkeypatch.setenv("K8S_SUMMARY_KEY_FILE", str(tmp_path / ".config" / "k8s_summary_key"))
+    monkeypatch.delenv("K8S_SUMMARY_KEY", raising=False)
+    monkeypatch.delenv("STEAMPIPE_QUERY_CACHE_DIR", raising=False)
+    monkeypatch.delenv("STEAMPIPE_DATABASE_URL", raising=False)
+    return tmp_path
@@ -0,0 +1,41 @@
+"""
+aws_cli_application_collection 테스트
+수집 명령에 설정된 jq 필터가 내장 필터 엔진으로 적용되고, 지원하지 않는 문법만 jq 프로세스로 처리되는지 확인
+"""
+
+import shutil
+
+import pytest
+
+from aws_cli_application_collection import AWSApplicationCollector
+
+RESPONSE = {"Functions": [{"FunctionName": "b", "Runtime": "python3.12"},
+                          {"FunctionName": "a", "Runtime": "nodejs20.x"}],
+            "NextMarker": None}
+
+
+@pytest.fixture
+def collector(tmp_path):
+    return AWSApplicationCollector("ap-northeast-2", report_dir=str(tmp_path / "report"), backend="cli")
+
+
+@pytest.mark.parametrize("jq_filter, expected", [
+    (".Functions", RESPONSE["Functions"]),
+    (".Functions | map({FunctionName})", [{"FunctionName": "b"}, {"FunctionName": "a"}]),
+    (".Missing", None),
+])
+def test_supported_filters_apply_in_process(collector, monkeypatch, jq_filter, expected):
+    monkeypatch.setattr("subprocess.run", lambda *args, **kwargs: pytest.fail("jq 프로세스 호출"))
+    assert collector.apply_jq_filter(RESPONSE, jq_filter) == expected
+
+
+def test_unsupported_filter_falls_back_to_jq(collector):
+    if not shutil.which("jq"):
+        pytest.skip("jq 없음")
+    assert collector.apply_jq_filter(RESPONSE, ".Functions | sort_by(.FunctionName) | map(.FunctionName)") == ["a", "b"]
+
+
+def test_filter_errors_keep_unfiltered_data(collector):
+    assert collector.apply_jq_filter(RESPONSE, ".Functions | length | .x") == RESPONSE
+    if shutil.which("jq"):
+        assert collector.apply_jq_filter(RESPONSE, ".Functions | no_such_function") == RESPONSE
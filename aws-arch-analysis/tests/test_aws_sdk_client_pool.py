@@ -0,0 +1,116 @@
+"""
+aws_sdk_client_pool 테스트
+botocore Stubber로 응답을 고정해 페이지 병합, CLI 인자 타입 변환, aws CLI 경로와의 출력 파일 동일성 확인
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+from botocore.stub import Stubber  # noqa: E402
+
+from aws_cli_application_collection import AWSApplicationCollector  # noqa: E402
+from aws_sdk_client_pool import AWSClientPool, json_default, parse_cli_command  # noqa: E402
+
+REGION = "ap-northeast-2"
+FUNCTION_PAGES = [
+    {"Functions": [{"FunctionName": "a<b", "Runtime": "python3.12",
+                    "LastModified": "2024-01-02T03:04:05.000+0000"}], "NextMarker": "page-2"},
+    {"Functions": [{"FunctionName": "서울", "Runtime": "nodejs20.x",
+                    "LastModified": "2024-02-03T04:05:06.000+0000"}]},
+]
+
+
+@pytest.fixture(autouse=True)
+def aws_credentials(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+    monkeypatch.delenv("AWS_ENDPOINT_URL", raising=False)
+
+
+@pytest.fixture
+def stubbed(request):
+    """클라이언트 풀의 서비스 클라이언트에 Stubber 연결 (테스트 종료 시 모든 응답 사용 여부 확인)"""
+    stubbers = []
+
+    def stub(pool: AWSClientPool, service: str) -> Stubber:
+        stubber = Stubber(pool.get_client(service))
+        stubber.activate()
+        stubbers.append(stubber)
+        return stubber
+
+    yield stub
+    for stubber in stubbers:
+        stubber.assert_no_pending_responses()
+        stubber.deactivate()
+
+
+def test_parse_cli_command_keeps_values_as_strings():
+    service, operation, params = parse_cli_command(
+        ["aws", "cloudformation", "describe-stack-events", "--stack-name", "12345", "--region", REGION,
+         "--output", "json"])
+    assert (service, operation, params) == ("cloudformation", "describe_stack_events", {"StackName": "12345"})
+
+    _, _, params = parse_cli_command(["aws", "ec2", "describe-instances", "--instance-ids", "i-1", "i-2",
+                                      "--dry-run"])
+    assert params == {"InstanceIds": ["i-1", "i-2"], "DryRun": True}
+
+
+def test_call_cli_command_coerces_by_shape(stubbed):
+    pool = AWSClientPool(REGION)
+    cloudformation = stubbed(pool, "cloudformation")
+    cloudformation.add_response("describe_stack_events", {"StackEvents": []}, {"StackName": "12345"})
+    assert pool.call_cli_command(["aws", "cloudformation", "describe-stack-events", "--stack-name", "12345",
+                                  "--region", REGION]) == {"StackEvents": []}
+
+    cognito = stubbed(pool, "cognito-idp")
+    cognito.add_response("list_user_pools", {"UserPools": []}, {"MaxResults": 60})
+    assert pool.call_cli_command(["aws", "cognito-idp", "list-user-pools", "--max-results", "60",
+                                  "--region", REGION]) == {"UserPools": []}
+
+
+def test_call_merges_all_pages(stubbed):
+    pool = AWSClientPool(REGION)
+    stubber = stubbed(pool, "lambda")
+    stubber.add_response("list_functions", FUNCTION_PAGES[0], {})
+    stubber.add_response("list_functions", FUNCTION_PAGES[1], {"Marker": "page-2"})
+
+    result = pool.call("lambda", "list_functions")
+    assert [function["FunctionName"] for function in result["Functions"]] == ["a<b", "서울"]
+    assert "NextMarker" not in result and "ResponseMetadata" not in result
+
+
+def test_json_default_matches_cli_timestamps():
+    value = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    assert json.dumps({"t": value}, default=json_default) == '{"t": "2024-01-02T03:04:05+00:00"}'
+
+
+def test_sdk_output_file_matches_cli(tmp_path, monkeypatch, stubbed):
+    """같은 응답이면 SDK 경로와 aws CLI 경로의 출력 파일이 바이트 단위로 같음"""
+    cli_response = {"Functions": FUNCTION_PAGES[0]["Functions"] + FUNCTION_PAGES[1]["Functions"]}
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    (tmp_path / "cli_response.json").write_text(json.dumps(cli_response, ensure_ascii=False), encoding="utf-8")
+    aws = bin_dir / "aws"
+    aws.write_text(f"#!/bin/sh\ncat '{tmp_path / 'cli_response.json'}'\n")
+    aws.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    outputs = {}
+    for backend in ("cli", "sdk"):
+        report_dir = tmp_path / backend
+        collector = AWSApplicationCollector(REGION, report_dir=str(report_dir), backend=backend)
+        if backend == "sdk":
+            stubber = stubbed(collector.client_pool, "lambda")
+            stubber.add_response("list_functions", FUNCTION_PAGES[0], {})
+            stubber.add_response("list_functions", FUNCTION_PAGES[1], {"Marker": "page-2"})
+        collector.collect_lambda_data()
+        assert collector.success_count == 1
+        outputs[backend] = (report_dir / "iac_lambda_functions.json").read_bytes()
+
+    assert outputs["sdk"] == outputs["cli"]
+    assert "서울" in outputs["sdk"].decode("utf-8")
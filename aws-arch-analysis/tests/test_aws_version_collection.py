@@ -0,0 +1,84 @@
+"""
+aws_version_collection 테스트
+botocore Stubber로 응답을 고정해 수집 실패 시 기존 출력 파일 유지와 Auto Scaling 그룹 조회 실패 시의 부분 수집 확인
+"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+boto3 = pytest.importorskip("boto3")
+from botocore.stub import Stubber  # noqa: E402
+
+from aws_version_collection import LAUNCH_TEMPLATE_VERSIONS, LATEST, VersionCollector  # noqa: E402
+
+REGION = "ap-northeast-2"
+LATEST_VERSIONS = {"Versions": ["$Latest", "$Default"]}
+
+
+def template_version(template_id: str, number: int, default: bool = False):
+    return {"LaunchTemplateId": template_id, "LaunchTemplateName": template_id, "VersionNumber": number,
+            "CreateTime": datetime(2024, 1, 2, tzinfo=timezone.utc), "CreatedBy": "arn:aws:iam::123456789012:root",
+            "DefaultVersion": default, "LaunchTemplateData": {"InstanceType": "t3.micro"}}
+
+
+@pytest.fixture(autouse=True)
+def aws_credentials(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.delenv("AWS_PROFILE", raising=False)
+    monkeypatch.delenv("AWS_ENDPOINT_URL", raising=False)
+    monkeypatch.delenv("VERSION_HISTORY_DIR", raising=False)
+
+
+@pytest.fixture
+def collector(tmp_path):
+    """Lambda/레이어는 빈 목록을 반환하는 SDK 경로 수집기 (테스트 종료 시 모든 응답 사용 여부 확인)"""
+    messages = []
+    collector = VersionCollector(REGION, tmp_path, mode=LATEST, backend="sdk", log=messages.append)
+    collector.messages = messages
+    stubbers = {}
+    for service in ("ec2", "autoscaling", "lambda"):
+        stubbers[service] = Stubber(collector.client_pool.get_client(service))
+        stubbers[service].activate()
+    stubbers["lambda"].add_response("list_functions", {"Functions": []}, {})
+    stubbers["lambda"].add_response("list_layers", {"Layers": []}, {})
+    collector.stubbers = stubbers
+    yield collector
+    for stubber in stubbers.values():
+        stubber.assert_no_pending_responses()
+        stubber.deactivate()
+
+
+def test_autoscaling_failure_keeps_latest_versions(collector, tmp_path):
+    ec2, autoscaling = collector.stubbers["ec2"], collector.stubbers["autoscaling"]
+    ec2.add_response("describe_launch_template_versions",
+                     {"LaunchTemplateVersions": [template_version("lt-1", 3), template_version("lt-1", 1, True)]},
+                     LATEST_VERSIONS)
+    autoscaling.add_client_error("describe_auto_scaling_groups", "AccessDenied", "not authorized")
+
+    assert collector.collect() == [True, True, True]
+    rows = json.loads((tmp_path / LAUNCH_TEMPLATE_VERSIONS.output_file).read_text(encoding="utf-8"))["rows"]
+    assert [(row["launch_template_id"], row["version_number"]) for row in rows] == [("lt-1", 3), ("lt-1", 1)]
+    assert any("Auto Scaling" in message and "not authorized" in message for message in collector.messages)
+
+
+def test_failed_collection_keeps_previous_output(collector, tmp_path):
+    output_path = tmp_path / LAUNCH_TEMPLATE_VERSIONS.output_file
+    output_path.write_text("previous", encoding="utf-8")
+    ec2, autoscaling = collector.stubbers["ec2"], collector.stubbers["autoscaling"]
+    ec2.add_response("describe_launch_template_versions",
+                     {"LaunchTemplateVersions": [template_version("lt-1", 3, True)]}, LATEST_VERSIONS)
+    autoscaling.add_response("describe_auto_scaling_groups", {"AutoScalingGroups": [
+        {"AutoScalingGroupName": "asg", "MinSize": 1, "MaxSize": 1, "DesiredCapacity": 1, "DefaultCooldown": 300,
+         "AvailabilityZones": ["ap-northeast-2a"], "HealthCheckType": "EC2",
+         "CreatedTime": datetime(2024, 1, 2, tzinfo=timezone.utc),
+         "LaunchTemplate": {"LaunchTemplateId": "lt-1", "Version": "2"}}]}, {})
+    # 번호로 지정한 버전 조회가 행 생성 도중 실패
+    ec2.add_client_error("describe_launch_template_versions", "UnauthorizedOperation", "denied",
+                         expected_params={"LaunchTemplateId": "lt-1", "Versions": ["2"]})
+
+    assert collector.collect() == [False, True, True]
+    assert output_path.read_text(encoding="utf-8") == "previous"
+    assert not list(tmp_path.glob(".*.tmp"))
@@ -0,0 +1,45 @@
+"""
+collection_replay 테스트
+가짜 steampipe 실행 파일로 기록/재생하며 Kubernetes 요약 쿼리의 HMAC 키가 기록 파일에 남지 않는지 확인
+"""
+
+import json
+import re
+
+import collection_replay
+from collection_replay import DEFAULT_REPLAY_DIR, REPORT_DIR, recording_key, recording_path, run_shim
+from k8s_payload_summary import summarize_queries
+
+CONFIG_MAP_QUERY = "select name, data, binary_data from kubernetes_config_map"
+
+
+def test_recording_redacts_summary_key(tmp_path, monkeypatch, capsys):
+    real_dir = tmp_path / "real"
+    real_dir.mkdir()
+    steampipe = real_dir / "steampipe"
+    steampipe.write_text("#!/bin/sh\necho '{\"rows\": []}'\necho \"error near $3\" >&2\n")
+    steampipe.chmod(0o755)
+    replay_dir = tmp_path / "replay"
+    monkeypatch.setenv(collection_replay.REPLAY_DIR_ENV, str(replay_dir))
+    monkeypatch.setenv(collection_replay.REAL_PATH_ENV, str(real_dir))
+
+    query = summarize_queries([("ConfigMap", CONFIG_MAP_QUERY, "k8s_config_maps.json")])[0][1]
+    args = ["query", "--output", query]
+    monkeypatch.setenv(collection_replay.REPLAY_MODE_ENV, "record")
+    assert run_shim("steampipe", args) == 0
+    recorded = capsys.readouterr()
+
+    # 기록 파일 이름은 원래 명령 텍스트 기준이지만 내용에는 키에서 유도한 16진수 문자열이 없음
+    path = recording_path(replay_dir, "steampipe", recording_key("steampipe", args))
+    text = path.read_text(encoding="utf-8")
+    assert not re.search(r"[0-9a-f]{32,}", text)
+    assert "<redacted>" in json.loads(text)["key"] and "<redacted>" in json.loads(text)["stderr"]
+
+    monkeypatch.setenv(collection_replay.REPLAY_MODE_ENV, "replay")
+    monkeypatch.setenv(collection_replay.LATENCY_SCALE_ENV, "0")
+    assert run_shim("steampipe", args) == 0
+    assert capsys.readouterr().out == recorded.out
+
+
+def test_default_replay_dir_is_outside_report_dir():
+    assert REPORT_DIR.resolve() not in DEFAULT_REPLAY_DIR.resolve().parents
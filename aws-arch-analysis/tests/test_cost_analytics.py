@@ -0,0 +1,51 @@
+"""
+cost_analytics 테스트
+확정일 이후의 부분 반영된 날짜가 이상 탐지, 주간 변화, 예측에서 제외되는지 확인
+"""
+
+import json
+from datetime import date, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import cost_analytics  # noqa: E402
+from cost_timeseries_store import CostTimeSeriesStore  # noqa: E402
+
+SETTLED_THROUGH = "2026-08-12"
+
+
+@pytest.fixture
+def store(tmp_path):
+    """일정한 일간 비용에 확정일 이후 이틀이 부분 반영된 서비스별 이력"""
+    rows = []
+    day = date(2026, 6, 1)
+    while day <= date(2026, 8, 14):
+        for service, amount in (("Amazon EC2", 100.0), ("Amazon S3", 20.0)):
+            if day.isoformat() > SETTLED_THROUGH:
+                amount *= 0.05
+            rows.append({"service": service, "period_start": f"{day}T00:00:00Z", "blended_cost_amount": amount,
+                         "unblended_cost_amount": amount, "blended_cost_unit": "USD"})
+        day += timedelta(days=1)
+    history_dir = tmp_path / ".cost_history"
+    history_dir.mkdir()
+    (history_dir / "service_daily.json").write_text(
+        json.dumps({"series": "service_daily", "settled_through": SETTLED_THROUGH, "columns": [], "rows": rows}))
+    with CostTimeSeriesStore(tmp_path) as store:
+        store.sync()
+        yield store
+
+
+def test_matrix_stops_at_settled_day(store):
+    matrix = cost_analytics.load_cost_matrix(store)
+    assert matrix.days[0] == "2026-06-01" and matrix.days[-1] == SETTLED_THROUGH
+    assert matrix.values.shape == (2, len(matrix.days))
+
+
+def test_unsettled_days_do_not_skew_analysis(store):
+    result = cost_analytics.analyze(store)
+    assert result["last_day"] == SETTLED_THROUGH
+    assert result["anomalies"] == []
+    assert result["week_over_week"] == []
+    assert result["forecast"]["total"] == pytest.approx(120.0 * cost_analytics.FORECAST_HORIZON_DAYS)
@@ -0,0 +1,156 @@
+"""
+k8s_multi_cluster_collection 테스트
+로컬 HTTP 서버를 대체 Kubernetes API 서버로 사용해 목록 API 페이지 처리, 클러스터별 cluster_name 병합,
+수집 매니페스트 기록과 증분 수집의 건너뛰기 확인
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import aws_rate_limiter
+from k8s_multi_cluster_collection import KubeCluster, MultiClusterCollector
+from steampipe_collection_manifest import CollectionManifest
+
+TOKEN = "test-token"
+# 클러스터(서버 경로 접두사)별 네임스페이스
+NAMESPACES = {
+    "alpha": [f"alpha-{index}" for index in range(5)],
+    "beta": ["default", "kube-system"],
+}
+QUERIES = [
+    ("Kubernetes 네임스페이스", "select name, uid, creation_timestamp, labels from kubernetes_namespace",
+     "k8s_namespaces.json"),
+]
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    """/<클러스터>/api/v1/namespaces 목록 API (limit/continue 페이지)"""
+    requests = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        prefix, _, resource = url.path.strip("/").partition("/")
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        type(self).requests.append((prefix, resource, params, self.headers.get("Authorization")))
+        if self.headers.get("Authorization") != f"Bearer {TOKEN}":
+            self.send_error(401)
+            return
+        if resource != "api/v1/namespaces" or prefix not in NAMESPACES:
+            self.send_error(404)
+            return
+
+        names = NAMESPACES[prefix]
+        start = int(params.get("continue") or 0)
+        end = start + int(params["limit"])
+        body = {
+            "kind": "NamespaceList",
+            "metadata": {"continue": str(end) if end < len(names) else ""},
+            "items": [{"metadata": {"name": name, "uid": f"uid-{name}", "labels": {"team": prefix},
+                                    "creationTimestamp": "2024-01-02T03:04:05Z"},
+                       "status": {"phase": "Active"}} for name in names[start:end]],
+        }
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def api_server():
+    FakeApiHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_clusters(base_url: str):
+    return [KubeCluster(name, f"{base_url}/{name}", "kubeconfig", name, {"server": f"{base_url}/{name}"},
+                        {"token": TOKEN}) for name in NAMESPACES]
+
+
+def test_pages_are_merged_with_cluster_name(api_server, tmp_path):
+    collector = MultiClusterCollector(tmp_path, make_clusters(api_server), log=lambda message: None, page_size=2)
+    assert collector.collect(QUERIES) == [True]
+
+    data = json.loads((tmp_path / "k8s_namespaces.json").read_text(encoding="utf-8"))
+    assert [column["name"] for column in data["columns"]] == ["cluster_name", "name", "uid", "creation_timestamp",
+                                                              "labels"]
+    assert [(row["cluster_name"], row["name"]) for row in data["rows"]] == (
+        [("alpha", name) for name in NAMESPACES["alpha"]] + [("beta", name) for name in NAMESPACES["beta"]])
+    assert data["rows"][0]["labels"] == {"team": "alpha"}
+    assert data["rows"][0]["uid"] == "uid-alpha-0"
+
+    # 5개 네임스페이스는 limit=2로 3페이지, continue 토큰을 이어서 전달
+    alpha_pages = [params for prefix, _, params, _ in FakeApiHandler.requests if prefix == "alpha"]
+    assert [page.get("continue") for page in alpha_pages] == [None, "2", "4"]
+    assert all(page["limit"] == "2" for page in alpha_pages)
+
+
+def test_failed_cluster_is_left_out_of_merge(api_server, tmp_path):
+    clusters = make_clusters(api_server) + [KubeCluster("gamma", f"{api_server}/gamma", "kubeconfig", "gamma",
+                                                        {"server": f"{api_server}/gamma"}, {"token": TOKEN})]
+    manifest = CollectionManifest(tmp_path, incremental=True)
+    collector = MultiClusterCollector(tmp_path, clusters, log=lambda message: None, manifest=manifest)
+    assert collector.collect(QUERIES) == [True]
+
+    rows = json.loads((tmp_path / "k8s_namespaces.json").read_text(encoding="utf-8"))["rows"]
+    assert {row["cluster_name"] for row in rows} == {"alpha", "beta"}
+    # 일부 클러스터가 실패한 출력은 증분 모드에서도 다시 수집
+    assert CollectionManifest(tmp_path).load()["outputs"]["k8s_namespaces.json"]["complete"] is False
+    assert not CollectionManifest(tmp_path, incremental=True).is_fresh(
+        "k8s_namespaces.json", collector.manifest_query(QUERIES[0][1]))
+
+
+def test_incremental_collection_skips_fresh_outputs(api_server, tmp_path, monkeypatch):
+    clusters = make_clusters(api_server)
+    monkeypatch.setenv("COLLECTION_RUN_ID", "run-1")
+    first = MultiClusterCollector(tmp_path, clusters, log=lambda message: None,
+                                  manifest=CollectionManifest(tmp_path, incremental=True))
+    assert first.collect(QUERIES) == [True]
+    entry = CollectionManifest(tmp_path).load()["outputs"]["k8s_namespaces.json"]
+    assert entry["rows"] == 7 and entry["ttl_class"] == "standard" and "complete" not in entry
+
+    # 다른 실행이라 클러스터 분할은 재사용하지 않지만 매니페스트 기준으로 최신이므로 API를 호출하지 않음
+    monkeypatch.setenv("COLLECTION_RUN_ID", "run-2")
+    request_count = len(FakeApiHandler.requests)
+    manifest = CollectionManifest(tmp_path, incremental=True)
+    second = MultiClusterCollector(tmp_path, clusters, log=lambda message: None, manifest=manifest)
+    assert second.collect(QUERIES) == [True]
+    assert len(FakeApiHandler.requests) == request_count
+    assert manifest.skipped == ["k8s_namespaces.json"]
+
+    # 대상 클러스터가 바뀌면 다시 수집
+    third = MultiClusterCollector(tmp_path, clusters[:1], log=lambda message: None,
+                                  manifest=CollectionManifest(tmp_path, incremental=True))
+    assert third.collect(QUERIES) == [True]
+    assert len(FakeApiHandler.requests) > request_count
+    rows = json.loads((tmp_path / "k8s_namespaces.json").read_text(encoding="utf-8"))["rows"]
+    assert {row["cluster_name"] for row in rows} == {"alpha"}
+
+
+def test_rate_limited_cluster_with_arn_context_name(api_server, tmp_path, monkeypatch):
+    """EKS ARN처럼 "/"가 들어간 컨텍스트 이름도 호출 속도 제한 버킷 파일을 만들 수 있음"""
+    monkeypatch.setenv("AWS_RATE_LIMITS", "default=1000")
+    monkeypatch.setattr(aws_rate_limiter, "_buckets", {})
+    name = "arn:aws:eks:us-east-1:123456789012:cluster/alpha"
+    clusters = [KubeCluster(name, f"{api_server}/alpha", "kubeconfig", name, {"server": f"{api_server}/alpha"},
+                            {"token": TOKEN})]
+    collector = MultiClusterCollector(tmp_path, clusters, log=lambda message: None, page_size=2)
+    assert collector.collect(QUERIES) == [True]
+
+    rows = json.loads((tmp_path / "k8s_namespaces.json").read_text(encoding="utf-8"))["rows"]
+    assert {row["cluster_name"] for row in rows} == {name} and len(rows) == len(NAMESPACES["alpha"])
+    assert [path.name for path in (tmp_path / ".ratelimit").iterdir()] == [
+        "kubernetes.arn_aws_eks_us-east-1_123456789012_cluster_alpha.bucket"]
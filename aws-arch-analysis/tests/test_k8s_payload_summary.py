@@ -0,0 +1,90 @@
+"""
+k8s_payload_summary 테스트
+ConfigMap은 키별 크기와 HMAC, Secret은 크기만 기록하는지, HMAC 키가 보고서 디렉토리 밖에 있는지,
+Steampipe 요약 SQL이 Python 요약과 같은 결과(올바르지 않은 base64 포함)를 내는지 확인
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import stat
+
+import pytest
+
+from k8s_payload_summary import (BASE64, TEXT, get_summary_key, redact_summary_key, summarize_payload,
+                                 summarize_queries, summarize_query, summary_sql)
+
+KEY = b"test-key"
+SECRET_QUERY = "select name, namespace, data, string_data from kubernetes_secret order by name"
+CONFIG_MAP_QUERY = "select name, data, binary_data from kubernetes_config_map"
+# SQL/Python 비교용 값 (올바르지 않은 base64, 빈 값, 멀티바이트 문자 포함)
+PAYLOADS = [
+    ({"a": base64.b64encode(b"\x00\xffbinary").decode(), "b": "not base64!", "c": "AAAA=", "d": "",
+      "e": "YWI=", "f": "YWI"}, BASE64),
+    ({"a": "서울", "b": "", "c": "x" * 1000}, TEXT),
+]
+
+
+def hmac_hex(key: bytes, raw: bytes) -> str:
+    return hmac.new(key, raw, hashlib.sha256).hexdigest()
+
+
+def test_summarize_payload_hashes_decoded_values():
+    summary = summarize_payload({"a": base64.b64encode(b"abc").decode(), "b": "%%%"}, BASE64, KEY)
+    assert summary == {"a": {"size": 3, "hmac_sha256": hmac_hex(KEY, b"abc")},
+                       "b": {"size": 3, "hmac_sha256": hmac_hex(KEY, b"%%%")}}
+    assert summarize_payload({"a": "abc"}, TEXT, None) == {"a": {"size": 3}}
+    assert summarize_payload({}, TEXT, KEY) is None
+
+
+def test_secrets_are_summarized_without_hashes():
+    secret = summarize_query(SECRET_QUERY, KEY)
+    config_map = summarize_query(CONFIG_MAP_QUERY, KEY)
+    assert "hmac_sha256" not in secret and "sha256" not in secret
+    assert secret.endswith("from kubernetes_secret order by name")
+    assert "as data_keys" in secret and "as string_data_keys" in secret
+    assert config_map.count("hmac_sha256") == 2
+    assert summarize_query("select name from kubernetes_pod", KEY) == "select name from kubernetes_pod"
+
+
+def test_key_file_is_created_outside_report_dir(collection_env):
+    key_path = collection_env / ".config" / "k8s_summary_key"
+    queries = summarize_queries([("ConfigMap", CONFIG_MAP_QUERY, "k8s_config_maps.json")])
+    assert key_path.exists() and stat.S_IMODE(key_path.stat().st_mode) == 0o600
+    assert get_summary_key() == key_path.read_bytes().strip()
+    # 키 파일은 재사용하고, 쿼리를 오류 로그에 기록할 때는 키에서 유도한 값을 가림
+    assert summarize_queries([("ConfigMap", CONFIG_MAP_QUERY, "k8s_config_maps.json")]) == queries
+    assert key_path.read_text() not in queries[0][1]
+    assert redact_summary_key(queries[0][1]).count("<redacted>") == 4
+    assert not [name for name in os.listdir(collection_env) if "salt" in name]
+
+
+def test_key_env_overrides_key_file(collection_env, monkeypatch):
+    monkeypatch.setenv("K8S_SUMMARY_KEY", "from-env")
+    assert get_summary_key() == b"from-env"
+    assert not (collection_env / ".config" / "k8s_summary_key").exists()
+
+
+@pytest.fixture(scope="module")
+def database_url():
+    pytest.importorskip("psycopg2")
+    url = os.environ.get("STEAMPIPE_TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("Postgres 없음 (STEAMPIPE_TEST_DATABASE_URL 필요)")
+    return url
+
+
+@pytest.mark.parametrize("key", [KEY, b"k" * 100, None])
+def test_summary_sql_matches_python(database_url, key):
+    import psycopg2
+
+    with psycopg2.connect(database_url) as conn, conn.cursor() as cursor:
+        conn.set_client_encoding("UTF8")
+        for values, encoding in PAYLOADS + [({}, TEXT), (None, TEXT)]:
+            # 컬럼 값이 SQL NULL인 경우도 확인
+            for payload in (json.dumps(values, ensure_ascii=False), None):
+                cursor.execute(f"select {summary_sql('payload', encoding, key)} from (select %s::jsonb as payload) t",
+                               (payload,))
+                assert cursor.fetchone()[0] == summarize_payload(json.loads(payload or "null"), encoding, key)
@@ -0,0 +1,80 @@
+"""
+steampipe_derived_datasets 테스트
+가짜 쿼리 엔진으로 기준 쿼리 결과 파일에서 파생 출력 파일을 한 행씩 생성한 결과가
+기존 메모리 투영(project_query_output)과 같은지, 기준 쿼리 실패 시 개별 쿼리로 대체되는지 확인
+"""
+
+import subprocess
+import threading
+
+from steampipe_derived_datasets import DerivedDatasetMixin, DerivedOutput
+from steampipe_query_engine import format_query_output, project_query_output
+
+COLUMNS = [{"name": "name", "data_type": "TEXT"}, {"name": "phase", "data_type": "TEXT"},
+           {"name": "containers", "data_type": "JSONB"}]
+ROWS = [{"name": "api <1>", "phase": "Running", "containers": [{"name": "app", "ports": [{"containerPort": 80}]}]},
+        {"name": "job", "phase": "Succeeded", "containers": []},
+        {"name": "서울", "phase": "Running", "containers": None}]
+OUTPUTS = [
+    DerivedOutput("Kubernetes 파드", ["name", "phase", "containers"], "k8s_pods.json"),
+    DerivedOutput("실행 중인 파드", ["name"], "k8s_running_pods.json", where={"phase": "Running"}),
+    DerivedOutput("파드 노드", ["name", "node_name"], "k8s_pod_nodes.json",
+                  query="select name, node_name from kubernetes_pod"),
+]
+
+
+class FakeQueryEngine:
+    def __init__(self, error: Exception = None):
+        self.error = error
+
+    def run_query(self, query, timeout=None):
+        raise AssertionError("기준 쿼리 결과를 문자열로 읽으면 안 됨")
+
+    def run_query_to_file(self, query, output_path, timeout=None):
+        if self.error:
+            raise self.error
+        output_path.write_text(format_query_output(COLUMNS, ROWS), encoding="utf-8")
+        return len(ROWS)
+
+
+class FakeCollector(DerivedDatasetMixin):
+    min_output_size = 10
+
+    def __init__(self, report_dir, query_engine):
+        self.report_dir = report_dir
+        self.query_engine = query_engine
+        self.error_log = report_dir / "errors.log"
+        self.count_lock = threading.Lock()
+        self.total_count = self.success_count = 0
+        self.messages = []
+        self.individual_queries = []
+        self.log_info = self.log_success = self.log_warning = self.log_error = self.messages.append
+
+    def execute_steampipe_query(self, description, query, output_file):
+        self.individual_queries.append((query, output_file))
+        return True
+
+
+def test_outputs_are_projected_from_base_result_file(tmp_path):
+    collector = FakeCollector(tmp_path, FakeQueryEngine())
+    assert collector.execute_collection_task("Kubernetes 파드 기준", "select * from kubernetes_pod", OUTPUTS)
+
+    result = {"columns": COLUMNS, "rows": ROWS}
+    assert (tmp_path / "k8s_pods.json").read_text(encoding="utf-8") == project_query_output(
+        result, ["name", "phase", "containers"])
+    assert (tmp_path / "k8s_running_pods.json").read_text(encoding="utf-8") == project_query_output(
+        result, ["name"], lambda row: row["phase"] == "Running")
+    # 기준 쿼리에 없는 컬럼이 필요한 출력은 원래 쿼리로 개별 수집
+    assert collector.individual_queries == [("select name, node_name from kubernetes_pod", "k8s_pod_nodes.json")]
+    assert collector.success_count == 2
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_failed_base_query_falls_back_to_individual_queries(tmp_path):
+    error = subprocess.CalledProcessError(1, "steampipe", output="", stderr="Error: timeout")
+    collector = FakeCollector(tmp_path, FakeQueryEngine(error))
+    assert not collector.execute_collection_task("Kubernetes 파드 기준", "select * from kubernetes_pod", OUTPUTS)
+
+    assert collector.individual_queries == [("select name, node_name from kubernetes_pod", "k8s_pod_nodes.json")]
+    assert "Error: timeout" in (tmp_path / "errors.log").read_text()
+    assert not list(tmp_path.glob(".*.tmp"))
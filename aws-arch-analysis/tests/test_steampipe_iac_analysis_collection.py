@@ -0,0 +1,32 @@
+"""
+steampipe_iac_analysis_collection 테스트
+스택별 리소스/이벤트 수집 실패가 해당 스택의 "Errors" 항목으로 기록되고 다른 스택 수집은 계속되는지 확인
+"""
+
+import json
+
+import steampipe_iac_analysis_collection
+from steampipe_iac_analysis_collection import SteampipeIaCCollector
+
+
+def test_stack_errors_are_recorded_per_stack(tmp_path, monkeypatch):
+    monkeypatch.setenv("AWS_COLLECTION_BACKEND", "cli")
+    collector = SteampipeIaCCollector(max_workers=2)
+    collector.report_dir = tmp_path
+    collector.error_log = tmp_path / "iac_collection_errors.log"
+    (tmp_path / "iac_cloudformation_stacks.json").write_text(
+        json.dumps({"Stacks": [{"StackName": "missing-cli"}, {"StackName": "ok"}]}))
+
+    def fetch_stack_items(command, list_key, stack_name):
+        if stack_name == "missing-cli":
+            raise FileNotFoundError(2, "No such file or directory", "aws")
+        return [{"LogicalResourceId": "Bucket"}]
+
+    monkeypatch.setattr(collector, "fetch_stack_items", fetch_stack_items)
+    collector.collect_stack_details()
+
+    for *_, output_file in steampipe_iac_analysis_collection.STACK_DETAIL_COMMANDS:
+        output = json.loads((tmp_path / output_file).read_text())
+        assert output["Stacks"] == {"ok": [{"LogicalResourceId": "Bucket"}]}
+        assert "No such file or directory" in output["Errors"]["missing-cli"]
+    assert "missing-cli" in collector.error_log.read_text()
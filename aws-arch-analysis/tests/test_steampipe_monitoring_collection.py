@@ -0,0 +1,74 @@
+"""
+steampipe_monitoring_collection 테스트
+가짜 쿼리 엔진으로 멀티 리전 수집을 실행해 리전 파티션 병합 결과가 단일 리전 출력과 같은 형식인지,
+쿼리 오류로 빠진 리전이 매니페스트에 일부 수집으로 기록되는지 확인
+"""
+
+import re
+import subprocess
+
+import pytest
+
+import steampipe_monitoring_collection
+from steampipe_collection_manifest import CollectionManifest
+from steampipe_monitoring_collection import MonitoringDataCollector
+from steampipe_query_engine import format_query_output
+
+REGIONS = ["ap-northeast-2", "us-east-1", "eu-west-1"]
+COLUMNS = [{"name": "name", "data_type": "TEXT"}, {"name": "tags", "data_type": "JSONB"},
+           {"name": "region", "data_type": "TEXT"}]
+
+
+def region_rows(region):
+    return [{"name": f"{region}-{index} <&>", "tags": {"b": [1, None], "a": "서울"}, "region": region}
+            for index in range(3)]
+
+
+class FakeQueryEngine:
+    """리전 조건에 따라 고정 결과를 기록하는 쿼리 엔진 (failed_regions는 쿼리 오류, empty_regions는 빈 결과)"""
+
+    def __init__(self, failed_regions=(), empty_regions=()):
+        self.failed_regions = set(failed_regions)
+        self.empty_regions = set(empty_regions)
+
+    def run_query_to_file(self, query, output_path, timeout=None):
+        region = re.search(r"region = '([^']+)'", query).group(1)
+        if region in self.failed_regions:
+            raise subprocess.CalledProcessError(1, query, output="", stderr="Error: AccessDenied")
+        rows = [] if region in self.empty_regions else region_rows(region)
+        output_path.write_text(format_query_output(COLUMNS, rows), encoding="utf-8")
+        return len(rows)
+
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    monkeypatch.setattr(steampipe_monitoring_collection, "get_query_engine", lambda: FakeQueryEngine())
+    collector = MonitoringDataCollector(REGIONS, multi_region=True, report_dir=str(tmp_path))
+    monkeypatch.setattr(collector, "get_monitoring_queries", lambda regions: {
+        "CloudWatch Log Streams": "select name, tags, region from aws_cloudwatch_log_stream "
+                                  + collector.build_region_filter(regions)})
+    monkeypatch.setattr(collector, "get_global_queries", lambda: {})
+    return collector
+
+
+def test_merged_output_matches_single_region_format(collector, tmp_path):
+    collector.query_engine = FakeQueryEngine(empty_regions=["eu-west-1"])
+    assert collector.collect_all_data() == (1, 6)
+
+    output_file = collector.get_output_filename("CloudWatch Log Streams")
+    expected = format_query_output(COLUMNS, region_rows("ap-northeast-2") + region_rows("us-east-1"))
+    assert (tmp_path / output_file).read_text(encoding="utf-8") == expected
+    # 데이터가 없는 리전은 실패가 아니므로 완전한 병합 결과
+    assert "complete" not in CollectionManifest(tmp_path).load()["outputs"][output_file]
+
+
+def test_failed_region_marks_merge_incomplete(collector, tmp_path, capsys):
+    collector.query_engine = FakeQueryEngine(failed_regions=["us-east-1"])
+    assert collector.collect_all_data() == (1, 6)
+
+    output_file = collector.get_output_filename("CloudWatch Log Streams")
+    expected = format_query_output(COLUMNS, region_rows("ap-northeast-2") + region_rows("eu-west-1"))
+    assert (tmp_path / output_file).read_text(encoding="utf-8") == expected
+    assert CollectionManifest(tmp_path).load()["outputs"][output_file]["complete"] is False
+    assert "일부 리전 수집 실패 (us-east-1)" in capsys.readouterr().out
+    assert not list(tmp_path.glob(".*.tmp"))
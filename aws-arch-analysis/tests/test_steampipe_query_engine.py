@@ -0,0 +1,149 @@
+"""
+steampipe_query_engine 테스트
+연결 풀 경로의 결과 파일이 `steampipe query --output json` CLI 경로와 바이트 단위로 같은지 확인
+
+- Postgres: STEAMPIPE_TEST_DATABASE_URL 또는 PATH의 initdb/pg_ctl로 임시 클러스터 생성 (root 불가, 없으면 건너뜀)
+- CLI: fixtures/steampipe_cli_output.json(같은 쿼리의 CLI 출력)을 내보내는 가짜 steampipe 실행 파일
+"""
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+from pathlib import Path
+
+import pytest
+
+import steampipe_query_engine
+from steampipe_query_engine import (SteampipeQueryEngine, StreamingResultWriter, _encode_rows, count_result_rows,
+                                    format_query_output, iter_result_rows, read_result_columns)
+
+CLI_OUTPUT = Path(__file__).parent / "fixtures" / "steampipe_cli_output.json"
+
+PARITY_QUERY = """
+select 42::int8 as id, 'a<b & c>d'::text as name, true as enabled,
+       '{"b": 1, "aa": {"z": null, "y": [1, "x"]}}'::jsonb as tags, null::text as note,
+       array['x', 'y']::text[] as zones, 2.5::float8 as ratio
+union all
+select 7, '서울', false, '{}'::jsonb, 'n', array[]::text[], 0.25
+order by id
+"""
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture(scope="module")
+def database_url(tmp_path_factory):
+    """테스트용 Postgres 연결 문자열 (임시 클러스터는 모듈 종료 시 정리)"""
+    pytest.importorskip("psycopg2")
+    url = os.environ.get("STEAMPIPE_TEST_DATABASE_URL")
+    if url:
+        yield url
+        return
+
+    initdb, pg_ctl = shutil.which("initdb"), shutil.which("pg_ctl")
+    if not (initdb and pg_ctl):
+        pytest.skip("Postgres 없음 (STEAMPIPE_TEST_DATABASE_URL 또는 initdb/pg_ctl 필요)")
+    if os.geteuid() == 0:
+        pytest.skip("root로는 임시 Postgres를 기동할 수 없음 (STEAMPIPE_TEST_DATABASE_URL 지정)")
+
+    data_dir = tmp_path_factory.mktemp("postgres")
+    port = free_port()
+    subprocess.run([initdb, "-D", str(data_dir / "data"), "-A", "trust", "-U", "postgres"],
+                   check=True, capture_output=True)
+    subprocess.run([pg_ctl, "-D", str(data_dir / "data"), "-l", str(data_dir / "postgres.log"), "-w",
+                    "-o", f"-p {port} -k {data_dir} -c listen_addresses=127.0.0.1", "start"],
+                   check=True, capture_output=True)
+    try:
+        yield f"postgresql://postgres@127.0.0.1:{port}/postgres"
+    finally:
+        subprocess.run([pg_ctl, "-D", str(data_dir / "data"), "-m", "fast", "stop"], capture_output=True)
+
+
+@pytest.fixture
+def cli_engine(tmp_path, monkeypatch):
+    """CLI 경로로 동작하는 엔진 (PATH의 steampipe는 기록된 CLI 출력을 내보냄)"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    steampipe = bin_dir / "steampipe"
+    steampipe.write_text(f"#!/bin/sh\ncat '{CLI_OUTPUT}'\n")
+    steampipe.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(steampipe_query_engine, "psycopg2", None)
+    return SteampipeQueryEngine()
+
+
+@pytest.fixture
+def pooled_engine(database_url):
+    engine = SteampipeQueryEngine(pool_size=2, database_url=database_url)
+    assert engine.start()
+    yield engine
+    engine.close()
+
+
+def test_streaming_writer_matches_format_query_output(tmp_path):
+    columns = [{"name": "name", "data_type": "TEXT"}, {"name": "size", "data_type": "INT8"}]
+    rows = [{"name": "a&b", "size": 1, "extra": {"z": 1, "a": [None]}}, {"name": " ", "size": None}]
+    for expected_rows in (rows, []):
+        path = tmp_path / "result.json"
+        with StreamingResultWriter(path, columns) as writer:
+            writer.write_rows(expected_rows)
+        assert path.read_text(encoding="utf-8") == format_query_output(columns, expected_rows)
+        assert count_result_rows(path) == writer.row_count == len(expected_rows)
+
+
+def test_count_result_rows_rejects_malformed_output(tmp_path):
+    path = tmp_path / "result.json"
+    path.write_text('{\n "columns": [],\n "rows": [\n  {\n   "a": 1\n  }', encoding="utf-8")
+    with pytest.raises(ValueError):
+        count_result_rows(path)
+    path.write_text('{"columns": []}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        count_result_rows(path)
+
+
+def test_iter_result_rows_reads_each_format(tmp_path):
+    columns = [{"name": "name", "data_type": "TEXT"}]
+    rows = [{"name": "a }", "extra": {"z": [{}, {"y": "{"}]}}, {}, {"name": "서울"}]
+    path = tmp_path / "result.json"
+    for text, expected_columns in ((format_query_output(columns, rows), columns), (_encode_rows(rows), None),
+                                   ('{"columns": [], "rows": %s}' % json.dumps(rows), [])):
+        path.write_text(text, encoding="utf-8")
+        assert read_result_columns(path) == expected_columns
+        assert list(iter_result_rows(path)) == rows
+    path.write_text(format_query_output(columns, []), encoding="utf-8")
+    assert read_result_columns(path) == columns and list(iter_result_rows(path)) == []
+
+    # 끝이 잘린 출력은 읽은 행까지 반환한 뒤 오류
+    path.write_text(format_query_output(columns, rows)[:-12], encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_result_rows(path))
+
+
+def test_cli_path_writes_cli_output(cli_engine, tmp_path):
+    output_path = tmp_path / "cli.json"
+    assert cli_engine.run_query_to_file(PARITY_QUERY, output_path) == 2
+    assert output_path.read_bytes() == CLI_OUTPUT.read_bytes()
+    assert cli_engine.run_query(PARITY_QUERY) == CLI_OUTPUT.read_text(encoding="utf-8")
+
+
+def test_pooled_path_is_byte_compatible_with_cli(pooled_engine, tmp_path):
+    output_path = tmp_path / "pooled.json"
+    assert pooled_engine.uses_service
+    assert pooled_engine.run_query_to_file(PARITY_QUERY, output_path) == 2
+    assert output_path.read_bytes() == CLI_OUTPUT.read_bytes()
+    assert pooled_engine.run_query(PARITY_QUERY) == CLI_OUTPUT.read_text(encoding="utf-8")
+
+
+def test_pooled_path_reports_query_errors(pooled_engine, tmp_path):
+    output_path = tmp_path / "existing.json"
+    output_path.write_text("previous")
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        pooled_engine.run_query_to_file("select * from aws_missing_table", output_path)
+    assert "aws_missing_table" in error.value.stderr
+    assert output_path.read_text() == "previous"